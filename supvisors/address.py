@@ -30,7 +30,8 @@ class AddressStatus(object):
     - state: the state of the Supervisor instance in AddressStates,
     - remote_time: the last date received from the Supvisors instance,
     - local_time: the last date received from the Supvisors instance, in the local reference time,
-    - processes: the list of processes that are available on this address. """
+    - processes: the list of processes that are available on this address,
+    - version: a counter incremented each time the state or the processes of the address change. """
 
     def __init__(self, address_name, logger):
         """ Initialization of the attributes. """
@@ -42,6 +43,7 @@ class AddressStatus(object):
         self.remote_time = 0
         self.local_time = 0
         self.processes = {}
+        self.version = 0
 
     # accessors / mutators
     @property
@@ -54,6 +56,7 @@ class AddressStatus(object):
         if self._state != newState:
             if self.check_transition(newState):
                 self._state = newState
+                self.version += 1
                 self.logger.info('Address {} is {}'.format(self.address_name, self.state_string()))
             else:
                 raise InvalidTransition('Address: transition rejected {} to {}'.format(self.state_string(), AddressStates._to_string(newState)))
@@ -89,6 +92,7 @@ class AddressStatus(object):
     def add_process(self, process):
         """ Add a new process to the process list. """
         self.processes[process.namespec()] = process
+        self.version += 1
 
     def running_processes(self):
         """ Return the process running on the address.
@@ -0,0 +1,233 @@
+#!/usr/bin/python
+#-*- coding: utf-8 -*-
+
+# ======================================================================
+# Copyright 2016 Julien LE CLEACH
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# 
+#     http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ======================================================================
+
+from supvisors.ttypes import AlertConditions, AlertSeries, AlertStatistics, RunningFailureStrategies
+from supvisors.utils import supvisors_short_cuts
+
+
+class AlertRules(object):
+    """ Definition of an alert rule, iaw deployment file.
+
+    Attributes are:
+
+        - name: the name of the alert,
+        - series: the statistics series watched (in AlertSeries),
+        - target: a part of the address name (host series) or of the process namespec (process series)
+            that the series must match, empty means all,
+        - statistic: the value of the series compared to the threshold (in AlertStatistics),
+        - condition: the comparison applied to the threshold (in AlertConditions),
+        - threshold: the value that the statistic must not cross,
+        - periods: the number of consecutive statistics periods where the condition must be met to raise the alert,
+        - period: the statistics period considered, 0 means the smallest period of the stats_periods option,
+        - running_failure_strategy: the strategy (in RunningFailureStrategies) to apply to the process
+            when the alert is raised, None means no strategy.
+    """
+
+    # quantile probabilities per statistic
+    QUANTILES = {AlertStatistics.P50: 0.5, AlertStatistics.P95: 0.95, AlertStatistics.P99: 0.99}
+
+    def __init__(self, name):
+        """ Initialization of the attributes. """
+        self.name = name
+        self.series = AlertSeries.HOST_CPU
+        self.target = ''
+        self.statistic = AlertStatistics.VALUE
+        self.condition = AlertConditions.ABOVE
+        self.threshold = 0.0
+        self.periods = 1
+        self.period = 0
+        self.running_failure_strategy = None
+
+    def __str__(self):
+        """ Contents as string. """
+        return 'name={} series={} target={} statistic={} condition={} threshold={} periods={} period={}'\
+            ' running_failure_strategy={}'.format(self.name,
+                AlertSeries._to_string(self.series), self.target,
+                AlertStatistics._to_string(self.statistic),
+                AlertConditions._to_string(self.condition), self.threshold,
+                self.periods, self.period,
+                RunningFailureStrategies._to_string(self.running_failure_strategy))
+
+    def process_series(self):
+        """ Return True if the rule applies to process series. """
+        return self.series in [AlertSeries.PROCESS_CPU, AlertSeries.PROCESS_MEM]
+
+    def get_value(self, series):
+        """ Return the statistic of the series, or None if it cannot be evaluated.
+        The last value is None if it is a gap. """
+        if not series or not series.nb_values:
+            return None
+        if self.statistic == AlertStatistics.VALUE:
+            return series[-1]
+        if self.statistic == AlertStatistics.MEAN:
+            return series.get_stats()[0]
+        if self.statistic == AlertStatistics.SLOPE:
+            return series.get_stats()[2][0]
+        return series.sketch.quantiles([self.QUANTILES[self.statistic]])[0]
+
+    def check(self, value):
+        """ Return True if the value meets the condition of the rule. """
+        if value is None:
+            return False
+        if self.condition == AlertConditions.ABOVE:
+            return value > self.threshold
+        return value < self.threshold
+
+
+class AlertStatus(object):
+    """ Status of an alert rule applied to a series.
+
+    Attributes are:
+
+        - rules: the AlertRules instance applied,
+        - address_name: the address of the series,
+        - namespec: the process of the series, empty for host series,
+        - date: the date of the last statistics evaluated,
+        - value: the last statistic evaluated,
+        - count: the number of consecutive statistics periods where the condition has been met,
+        - active: True if the alert is raised.
+    """
+
+    def __init__(self, rules, address_name, namespec):
+        """ Initialization of the attributes. """
+        self.rules = rules
+        self.address_name = address_name
+        self.namespec = namespec
+        self.date = None
+        self.value = None
+        self.count = 0
+        self.active = False
+
+    # serialization
+    def serial(self):
+        """ Return a serializable form of the AlertStatus. """
+        return {'alert_name': self.rules.name, 'address_name': self.address_name,
+            'namespec': self.namespec, 'series': AlertSeries._to_string(self.rules.series),
+            'statistic': AlertStatistics._to_string(self.rules.statistic),
+            'condition': AlertConditions._to_string(self.rules.condition),
+            'threshold': self.rules.threshold, 'value': self.value,
+            'date': self.date, 'active': self.active}
+
+
+class AlertHandler(object):
+    """ Evaluation of the alert rules each time new statistics are received.
+    An alert is raised when the condition is met for a number of consecutive periods
+    and it is cleared as soon as the condition is not met anymore.
+    Each change is published through the EventPublisher.
+
+    Attributes are:
+
+        - rules: the list of AlertRules loaded from the deployment file,
+        - statuses: the AlertStatus per rule name, address and namespec.
+    """
+
+    def __init__(self, supvisors):
+        """ Initialization of the attributes. """
+        self.supvisors = supvisors
+        supvisors_short_cuts(self, ['context', 'failure_handler', 'logger', 'statistician'])
+        periods = supvisors.options.stats_periods
+        self.rules = []
+        if supvisors.parser:
+            for rules in supvisors.parser.load_alert_rules():
+                if rules.period and rules.period not in periods:
+                    self.logger.warn('alert {} ignored: period {} not in statistics periods {}'.format(
+                        rules.name, rules.period, periods))
+                else:
+                    self.rules.append(rules)
+        self.statuses = {}
+
+    def get_series(self, rules, address, instance):
+        """ Return the series of the address instance that are watched by the rule, with their namespec.
+        The series released by the memory budget are given as None. """
+        if rules.process_series():
+            # the series watched are requested as in the views so that the memory budget does not release them
+            # the series already released are requested too, so that they are rebuilt from the next statistics
+            namespecs = [namespec for namespec in list(instance.proc.keys()) + list(instance.evicted)
+                if rules.target in namespec]
+            proc_stats = map(instance.find_process_stats, namespecs)
+            return [(namespec, None if stats is None else
+                    stats.cpu if rules.series == AlertSeries.PROCESS_CPU else stats.mem)
+                for namespec, stats in zip(namespecs, proc_stats)]
+        if rules.target in address:
+            if rules.series == AlertSeries.HOST_CPU:
+                return [('', instance.cpu[0])] if instance.cpu else []
+            return [('', instance.mem)]
+        return []
+
+    def on_statistics(self, address):
+        """ Evaluate the alert rules against the statistics of the address.
+        Only the series that have received new statistics are evaluated.
+        The status of a series being rebuilt is kept until the series is evaluated again. """
+        instances = self.statistician.data[address]
+        for rules in self.rules:
+            instance = instances[rules.period or min(instances.keys())]
+            if not instance.dates:
+                continue
+            date = instance.dates[-1]
+            namespecs = set()
+            for namespec, series in self.get_series(rules, address, instance):
+                namespecs.add(namespec)
+                if series is None:
+                    continue
+                key = rules.name, address, namespec
+                status = self.statuses.get(key)
+                if status is None:
+                    status = self.statuses[key] = AlertStatus(rules, address, namespec)
+                if status.date != date:
+                    status.date = date
+                    self.evaluate(status, series)
+            # forget the series that do not exist anymore
+            for key, status in self.statuses.items():
+                if key[0] == rules.name and key[1] == address and key[2] not in namespecs:
+                    del self.statuses[key]
+                    if status.active:
+                        status.active = False
+                        self.publish(status)
+
+    def evaluate(self, status, series):
+        """ Update the status with the last value of the series and raise or clear the alert if needed. """
+        rules = status.rules
+        status.value = rules.get_value(series)
+        if rules.check(status.value):
+            status.count += 1
+            if status.count == rules.periods:
+                status.active = True
+                self.publish(status)
+                self.apply_strategy(status)
+        else:
+            status.count = 0
+            if status.active:
+                status.active = False
+                self.publish(status)
+
+    def publish(self, status):
+        """ Log and publish the alert status. """
+        self.logger.warn('alert {} {} on address={} namespec={} value={}'.format(status.rules.name,
+            'raised' if status.active else 'cleared', status.address_name, status.namespec, status.value))
+        self.supvisors.zmq.publisher.send_alert_status(status)
+
+    def apply_strategy(self, status):
+        """ Apply the running failure strategy of the rule to the process.
+        As for process crashes, only the master is allowed to trigger an automatic behaviour. """
+        strategy = status.rules.running_failure_strategy
+        if strategy is not None and status.namespec and self.context.master:
+            process = self.context.processes.get(status.namespec)
+            if process:
+                self.failure_handler.add_job(strategy, process)
+                self.failure_handler.trigger_jobs()
@@ -67,6 +67,7 @@ class ApplicationStatus(object):
             The value corresponds to a list of processes having the same sequence order, used as key.
         - stop_sequence: the sequencing to stop the processes belonging to the application, as a dictionary.
             The value corresponds to a list of processes having the same sequence order, used as key.
+        - version: a counter incremented each time the state, the failures or the processes of the application change.
     """
 
     def __init__(self, application_name, logger):
@@ -83,6 +84,7 @@ class ApplicationStatus(object):
         self.rules = ApplicationRules()
         self.start_sequence = {} # {sequence: [process]}
         self.stop_sequence = {} # {sequence: [process]}
+        self.version = 0
 
     # access
     def running(self):
@@ -102,6 +104,7 @@ class ApplicationStatus(object):
     def state(self, newState):
         if self._state != newState:
             self._state = newState
+            self.version += 1
             self.logger.info('Application {} is {}'.format(
                 self.application_name, self.state_string()))
 
@@ -121,6 +124,7 @@ class ApplicationStatus(object):
     def add_process(self, process):
         """ Add a new process to the process list. """
         self.processes[process.process_name] = process
+        self.version += 1
 
     def update_sequences(self):
         """ Evaluate the sequencing of the starting / stopping application from its list of processes. """
@@ -174,5 +178,7 @@ class ApplicationStatus(object):
         else:
             self.state = ApplicationStates.STOPPED
         # update major_failure and minor_failure status (only for running applications)
-        self.major_failure = major_failure and self.running()
-        self.minor_failure = minor_failure and self.running()
+        failures = major_failure and self.running(), minor_failure and self.running()
+        if failures != (self.major_failure, self.minor_failure):
+            self.major_failure, self.minor_failure = failures
+            self.version += 1
@@ -103,6 +103,8 @@ class SupvisorsEventInterface(threading.Thread):
                         self.on_application_status(message[1])
                     elif message[0] == EventHeaders.PROCESS:
                         self.on_process_status(message[1])
+                    elif message[0] == EventHeaders.ALERT:
+                        self.on_alert_status(message[1])
         self.logger.warn('exiting main loop')
         self.subscriber.close()
 
@@ -122,6 +124,10 @@ class SupvisorsEventInterface(threading.Thread):
         """ Just logs the contents of the ProcessStatus message. """
         self.logger.info('got ApplicationStatus message: {}'.format(data))
 
+    def on_alert_status(self, data):
+        """ Just logs the contents of the AlertStatus message. """
+        self.logger.info('got AlertStatus message: {}'.format(data))
+
 
 if __name__ == '__main__':
     # get arguments
@@ -86,6 +86,8 @@ class Context(object):
             status.state = AddressStates.ISOLATING
         else:
             status.state = AddressStates.SILENT
+        # the address does not contribute anymore to the cluster and application statistics
+        self.supvisors.statistician.remove_contributions(status.address_name)
         # invalidate address in concerned processes
         # if local Supvisors is master, failure handler will be notified
         # for processes running on this address
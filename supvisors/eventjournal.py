@@ -0,0 +1,57 @@
+#!/usr/bin/python
+#-*- coding: utf-8 -*-
+
+# ======================================================================
+# Copyright 2016 Julien LE CLEACH
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ======================================================================
+
+from collections import deque
+from threading import Lock
+
+
+class EventJournal(object):
+    """ Journal of the last events published by Supvisors, so that the web pages are updated without being reloaded.
+    The events are numbered, so that a browser requests the events following the last one it has received.
+    The journal is fed by the thread of the main loop and read by the thread of the web server.
+
+    Attributes are:
+
+        - events: the last events, as tuples of number, header and payload,
+        - last: the number of the last event,
+        - lock: the lock protecting the journal. """
+
+    # maximum number of events kept
+    MAX_EVENTS = 1000
+
+    def __init__(self):
+        """ Initialization of the attributes. """
+        self.events = deque(maxlen=self.MAX_EVENTS)
+        self.last = 0
+        self.lock = Lock()
+
+    def add_event(self, header, payload):
+        """ Add an event to the journal. """
+        with self.lock:
+            self.last += 1
+            self.events.append((self.last, header, payload))
+
+    def get_events(self, since):
+        """ Return the events following the event numbered since, as a list of tuples of number, header and payload.
+        None is returned if some of these events are not in the journal anymore,
+        or if the number is unknown, e.g. after a restart of Supervisor. """
+        with self.lock:
+            if since > self.last or since < self.last - len(self.events):
+                return None
+            return list(self.events)[len(self.events) - (self.last - since):]
@@ -38,6 +38,8 @@ class SupervisordSource(object):
         # shortcuts (not available yet)
         self._supervisor_rpc_interface = None
         self._supvisors_rpc_interface = None
+        # process orderings per application, with the group configuration they are built from
+        self._orderings = {}
 
     @property
     def supervisor_rpc_interface(self):
@@ -88,6 +90,19 @@ class SupervisordSource(object):
         # WARN: the following line may throw a KeyError exception
         return self.supervisord.process_groups[application_name].config
 
+    def get_process_ordering(self, application_name):
+        """ This method returns the rank of the processes in the group configuration related to an application,
+        as a dictionary indexed by process name.
+        The ordering is built once and rebuilt only when the group configuration is replaced,
+        i.e. when the group is reloaded in Supervisor. """
+        # WARN: the following line may throw a KeyError exception
+        group_config = self.get_group_config(application_name)
+        config, ordering = self._orderings.get(application_name, (None, None))
+        if config is not group_config:
+            ordering = {process_config.name: rank for rank, process_config in enumerate(group_config.process_configs)}
+            self._orderings[application_name] = group_config, ordering
+        return ordering
+
     def get_process(self, namespec):
         """ This method returns the process configuration related to a namespec. """
         # WARN: the following line may throw a KeyError exception
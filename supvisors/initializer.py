@@ -21,11 +21,15 @@ from supervisor.loggers import getLogger
 from supervisor.xmlrpc import Faults, RPCError
 
 from supvisors.addressmapper import AddressMapper
+from supvisors.alerts import AlertHandler
 from supvisors.commander import Starter, Stopper
 from supvisors.context import Context
+from supvisors.eventjournal import EventJournal
 from supvisors.infosource import SupervisordSource
 from supvisors.listener import SupervisorListener
 from supvisors.options import SupvisorsServerOptions
+from supvisors.plotpool import PlotPool
+from supvisors.registry import NamespecRegistry
 from supvisors.sparser import Parser
 from supvisors.statemachine import FiniteStateMachine
 from supvisors.statscompiler import StatisticsCompiler
@@ -61,11 +65,17 @@ class Supvisors(object):
                 'local host unexpected in address list: {}'.format(self.options.address_list))
         # create context data
         self.context = Context(self)
+        # create the journal of the events published, used to update the web pages
+        self.event_journal = EventJournal()
+        # create the registry of namespec identifiers
+        self.registry = NamespecRegistry()
         # create application starter and stopper
         self.starter = Starter(self)
         self.stopper = Stopper(self)
         # create statistics handler
         self.statistician = StatisticsCompiler(self)
+        # create the pool of plot workers
+        self.plot_pool = PlotPool(self)
         # create the failure handler of crashing processes
         self.failure_handler = RunningFailureHandler(self)
         # create state machine
@@ -76,5 +86,7 @@ class Supvisors(object):
         except:
             self.logger.warn('cannot parse deployment file: {}'.format(self.options.deployment_file))
             self.parser = None
+        # create the handler of the alert rules
+        self.alerter = AlertHandler(self)
         # create event subscriber
         self.listener = SupervisorListener(self)
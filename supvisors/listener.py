@@ -22,7 +22,7 @@ import time
 
 from supervisor import events
 from supervisor.datatypes import boolean
-from supervisor.options import split_namespec
+from supervisor.options import make_namespec, split_namespec
 
 from supvisors.mainloop import SupvisorsMainLoop
 from supvisors.ttypes import ProcessStates
@@ -46,11 +46,12 @@ class SupervisorListener(object):
         """ Initialization of the attributes. """
         self.supvisors = supvisors
         # shortcuts for source code readability
-        supvisors_short_cuts(self, ['fsm', 'info_source', 'logger', 'statistician'])
+        supvisors_short_cuts(self, ['alerter', 'fsm', 'info_source', 'logger', 'registry', 'statistician'])
         # test if statistics collector can be created for local host
         try:
-            from supvisors.statscollector import instant_statistics
-            self.collector = instant_statistics
+            from supvisors.statscollector import StatisticsCollector
+            self.collector = StatisticsCollector(self.supvisors.options.stats_cgroup,
+                self.supvisors.options.stats_max_skip)
         except ImportError:
             self.logger.warn('psutil not installed. this Supvisors will not publish statistics')
             self.collector = None
@@ -71,6 +72,8 @@ class SupervisorListener(object):
         self.logger.info('local supervisord is RUNNING')
         # replace the default handler for web ui
         self.info_source.replace_default_handler()
+        # fork the plot workers before any thread and before the zmq context
+        self.supvisors.plot_pool.start()
         # create zmq sockets
         self.supvisors.zmq = SupvisorsZmq(self.supvisors)
         # keep a reference to the internal events publisher
@@ -91,6 +94,10 @@ class SupervisorListener(object):
         self.main_loop.stop()
         # close zmq sockets
         self.supvisors.zmq.close()
+        # release the statistics store
+        self.statistician.close()
+        # terminate the plot workers
+        self.supvisors.plot_pool.close()
         # finally, close logger
         self.logger.close()
 
@@ -107,7 +114,8 @@ class SupervisorListener(object):
             'pid': event.process.pid,
             'expected': event.expected}
         self.logger.debug('payload={}'.format(payload))
-        self.publisher.send_process_event(payload)
+        namespec = make_namespec(payload['groupname'], payload['processname'])
+        self.publisher.send_process_event(self.registry.encode_process_event(namespec, payload))
 
     def on_tick(self, event):
         """ Called when a TickEvent is notified.
@@ -119,7 +127,8 @@ class SupervisorListener(object):
         # get and publish statistics at tick time (optional)
         if self.collector:
             status = self.supvisors.context.addresses[self.address]
-            self.publisher.send_statistics(self.collector(status.pid_processes()))
+            stats = self.collector(status.pid_processes())
+            self.publisher.send_statistics(self.registry.encode_statistics(stats))
         # periodic task
         addresses = self.fsm.on_timer_event()
         # pushes isolated addresses to main loop
@@ -135,6 +144,8 @@ class SupervisorListener(object):
             self.unstack_event(event.data)
         elif event.type == RemoteCommEvents.SUPVISORS_INFO:
             self.unstack_info(event.data)
+        elif event.type == RemoteCommEvents.SUPVISORS_REGISTRY:
+            self.unstack_registry(event.data)
 
     def unstack_event(self, message):
         """ Unstack and process one event from the event queue. """
@@ -144,18 +155,60 @@ class SupervisorListener(object):
             self.fsm.on_tick_event(event_address, event_data)
         elif event_type == InternalEventHeaders.PROCESS:
             self.logger.blather('got process event from {}: {}'.format(event_address, event_data))
-            self.fsm.on_process_event(event_address, event_data)
+            self.process_event(event_address, event_data, True)
         elif event_type == InternalEventHeaders.STATISTICS:
             # this Supvisors could handle statistics even if psutil is not installed
             self.logger.blather('got statistics event from {}: {}'.format(event_address, event_data))
-            self.statistician.push_statistics(event_address, event_data)
+            stats = self.registry.decode_statistics(event_address, event_data)
+            if len(stats[4]) < len(event_data[4]):
+                # the statistics of the processes whose namespec is unknown are lost but the next ones are not
+                self.logger.warn('got statistics with unknown namespecs from {}'.format(event_address))
+                self.load_registry(event_address)
+            self.statistician.push_statistics(event_address, stats)
+            self.alerter.on_statistics(event_address)
+
+    def process_event(self, address_name, payload, hold):
+        """ Decode and process a process event.
+        If the namespec is unknown, the event is held until the namespec registry of the address is loaded. """
+        # the payload is altered by the decoding
+        decoded = self.registry.decode_process_event(address_name, dict(payload))
+        if decoded:
+            self.fsm.on_process_event(address_name, decoded)
+        elif hold:
+            self.logger.warn('hold process event with unknown namespec from {}'.format(address_name))
+            self.load_registry(address_name, payload)
+        else:
+            self.logger.warn('reject process event with unknown namespec from {}'.format(address_name))
+
+    def load_registry(self, address_name, payload=None):
+        """ Request the namespec registry of the address, unless already requested. """
+        if self.registry.hold(address_name, payload):
+            self.supvisors.zmq.pusher.send_load_registry(address_name)
+
+    def replay_events(self, address_name, payloads):
+        """ Process the events held until the namespec registry of the address is loaded. """
+        for payload in payloads:
+            self.process_event(address_name, payload, False)
 
     def unstack_info(self, message):
         """ Unstack the process info received. """
         # unstack the queue for process info
-        address_name, info = json.loads(message)
+        address_name, info, namespecs = json.loads(message)
         self.logger.blather('got process info event from {}'.format(address_name))
+        payloads = self.registry.load(address_name, namespecs)
         self.fsm.on_process_info(address_name, info)
+        self.replay_events(address_name, payloads)
+
+    def unstack_registry(self, message):
+        """ Unstack the namespec registry received and replay the events held.
+        If the registry could not be obtained, the events held are dropped. """
+        address_name, namespecs = json.loads(message)
+        self.logger.blather('got namespec registry event from {}'.format(address_name))
+        if namespecs is None:
+            self.logger.error('drop {} process events with unknown namespec from {}'.format(
+                self.registry.release(address_name), address_name))
+        else:
+            self.replay_events(address_name, self.registry.load(address_name, namespecs))
 
     def authorization(self, data):
         """ Extract authorization and address from data and process event. """
@@ -183,4 +236,4 @@ class SupervisorListener(object):
             'pid': 0,
             'expected': False}
         self.logger.debug('payload={}'.format(payload))
-        self.publisher.send_process_event(payload)
+        self.publisher.send_process_event(self.registry.encode_process_event(namespec, payload))
@@ -123,6 +123,9 @@ class SupvisorsMainLoop(Thread):
         elif header == DeferredRequestHeaders.SHUTDOWN:
             address_name, = body
             self.shutdown(address_name)
+        elif header == DeferredRequestHeaders.LOAD_REGISTRY:
+            address_name, = body
+            self.load_registry(address_name)
 
     def check_address(self, address_name):
         """ Check isolation and get all process info asynchronously. """
@@ -134,12 +137,26 @@ class SupvisorsMainLoop(Thread):
             # get process info if authorized
             if authorized:
                 all_info = remote_proxy.supervisor.getAllProcessInfo()
-                self.send_remote_comm_event(RemoteCommEvents.SUPVISORS_INFO, json.dumps((address_name, all_info)))
+                # get the namespec identifiers used by the address in its events
+                namespecs = remote_proxy.supvisors.get_namespec_registry()
+                self.send_remote_comm_event(RemoteCommEvents.SUPVISORS_INFO,
+                    json.dumps((address_name, all_info, namespecs)))
             # inform local Supvisors that authorization is available
             self.send_remote_comm_event(RemoteCommEvents.SUPVISORS_AUTH, 'address_name:{} authorized:{}'.format(address_name, authorized))
         except:
             self.logger.error('failed to check address {}'.format(address_name))
 
+    def load_registry(self, address_name):
+        """ Get the namespec identifiers used by the address in its events asynchronously. """
+        try:
+            remote_proxy = getRPCInterface(address_name, self.env)
+            namespecs = remote_proxy.supvisors.get_namespec_registry()
+        except:
+            self.logger.error('failed to get namespec registry of address {}'.format(address_name))
+            # inform local Supvisors so that the registry can be requested again
+            namespecs = None
+        self.send_remote_comm_event(RemoteCommEvents.SUPVISORS_REGISTRY, json.dumps((address_name, namespecs)))
+
     def start_process(self, address_name, namespec, extra_args):
         """ Start process asynchronously. """
         try:
@@ -20,10 +20,11 @@
 from collections import OrderedDict
 from socket import gethostname
 
-from supervisor.datatypes import boolean, integer, existing_dirpath, byte_size, logging_level, list_of_strings
+from supervisor.datatypes import (boolean, integer, existing_directory, existing_dirpath, byte_size,
+    logging_level, list_of_strings)
 from supervisor.options import ServerOptions
 
-from supvisors.ttypes import ConciliationStrategies, DeploymentStrategies
+from supvisors.ttypes import ConciliationStrategies, DeploymentStrategies, StatisticsCharts
 
 
 # Options of main section
@@ -42,6 +43,15 @@ class SupvisorsOptions():
         - deployment_strategy: strategy used to start applications on addresses,
         - stats_periods: list of periods for which the statistics will be provided in the Supvisors web page,
         - stats_histo: depth of statistics history,
+        - stats_irix_mode: way of presenting process CPU values,
+        - stats_cgroup: when True, process statistics are taken from the cgroup of the process if possible,
+        - stats_max_skip: maximum number of consecutive ticks during which the measure of an idle process is skipped,
+        - stats_store: directory where the statistics are persisted, if set,
+        - stats_store_size: maximum size of the persisted statistics,
+        - stats_vectorized: when True, the statistics are compiled using numpy if installed,
+        - stats_memory: maximum memory used by the statistics kept in memory (no limit if null),
+        - stats_plot_workers: number of worker processes rendering the statistics plots,
+        - stats_charts: renderer of the statistics charts displayed in the web pages,
         - logfile: absolute or relative path of the Supvisors log file,
         - logfile_maxbytes: maximum size of the Supvisors log file,
         - logfile_backups: number of Supvisors backup log files,
@@ -52,7 +62,8 @@ class SupvisorsOptions():
 
     _Options = ['address_list', 'deployment_file', 'internal_port', 'event_port', 'auto_fence', 'synchro_timeout',
             'conciliation_strategy', 'deployment_strategy', 'stats_periods', 'stats_histo', 'stats_irix_mode',
-            'logfile', 'logfile_maxbytes', 'logfile_backups', 'loglevel']
+            'stats_cgroup', 'stats_max_skip', 'stats_store', 'stats_store_size',
+            'stats_vectorized', 'stats_memory', 'stats_plot_workers', 'stats_charts', 'logfile', 'logfile_maxbytes', 'logfile_backups', 'loglevel']
 
     def __init__(self):
         """ Initialization of the attributes. """
@@ -66,10 +77,12 @@ class SupvisorsOptions():
         """ Contents as string. """
         return ('address_list={} deployment_file={} internal_port={} event_port={} auto_fence={} synchro_timeout={} '
             'conciliation_strategy={} deployment_strategy={} stats_periods={} stats_histo={} stats_irix_mode={} '
-            'logfile={} logfile_maxbytes={} logfile_backups={} loglevel={}'.format(self.address_list,
+            'stats_cgroup={} stats_max_skip={} stats_store={} stats_store_size={} stats_vectorized={} '
+            'stats_memory={} stats_plot_workers={} stats_charts={} logfile={} logfile_maxbytes={} logfile_backups={} loglevel={}'.format(self.address_list,
             self.deployment_file, self.internal_port, self.event_port, self.auto_fence, self.synchro_timeout, 
             self.conciliation_strategy, self.deployment_strategy, self.stats_periods, self.stats_histo, self.stats_irix_mode,
-            self.logfile, self.logfile_maxbytes, self.logfile_backups, self.loglevel))
+            self.stats_cgroup, self.stats_max_skip, self.stats_store, self.stats_store_size, self.stats_vectorized,
+            self.stats_memory, self.stats_plot_workers, self.stats_charts, self.logfile, self.logfile_maxbytes, self.logfile_backups, self.loglevel))
 
 
 class SupvisorsServerOptions(ServerOptions):
@@ -126,6 +139,16 @@ class SupvisorsServerOptions(ServerOptions):
         opt.stats_periods = self.to_periods(list_of_strings(parser.getdefault('stats_periods', '10')))
         opt.stats_histo = self.to_histo(parser.getdefault('stats_histo', 200))
         opt.stats_irix_mode = boolean(parser.getdefault('stats_irix_mode', 'false'))
+        opt.stats_cgroup = boolean(parser.getdefault('stats_cgroup', 'false'))
+        opt.stats_max_skip = self.to_max_skip(parser.getdefault('stats_max_skip', '0'))
+        opt.stats_store = parser.getdefault('stats_store', None)
+        if opt.stats_store:
+            opt.stats_store = existing_directory(opt.stats_store)
+        opt.stats_store_size = byte_size(parser.getdefault('stats_store_size', '10MB'))
+        opt.stats_vectorized = boolean(parser.getdefault('stats_vectorized', 'false'))
+        opt.stats_memory = byte_size(parser.getdefault('stats_memory', '0'))
+        opt.stats_plot_workers = self.to_plot_workers(parser.getdefault('stats_plot_workers', '1'))
+        opt.stats_charts = self.to_stats_charts(parser.getdefault('stats_charts', 'SVG'))
         # configure logger
         opt.logfile = existing_dirpath(parser.getdefault('logfile', '{}.log'.format(SupvisorsServerOptions._Section)))
         opt.logfile_maxbytes = byte_size(parser.getdefault('logfile_maxbytes', '50MB'))
@@ -173,13 +196,13 @@ class SupvisorsServerOptions(ServerOptions):
         """ Convert a string into a list of period values. """
         if len(value) == 0:
             raise ValueError('unexpected number of stats_periods: {}. minimum is 1'.format(value))
-        if len(value) > 3:
-            raise ValueError('unexpected number of stats_periods: {}. maximum is 3'.format(value))
+        if len(value) > 5:
+            raise ValueError('unexpected number of stats_periods: {}. maximum is 5'.format(value))
         periods = []
         for val in value:
             period = integer(val)
-            if 5 > period or period > 3600:
-                raise ValueError('invalid value for stats_periods: {}. expected in [5;3600] (seconds)'.format(val))
+            if 5 > period or period > 86400:
+                raise ValueError('invalid value for stats_periods: {}. expected in [5;86400] (seconds)'.format(val))
             if period % 5 != 0:
                 raise ValueError('invalid value for stats_periods: %d. expected multiple of 5' % period)
             periods.append(period)
@@ -189,6 +212,30 @@ class SupvisorsServerOptions(ServerOptions):
     def to_histo(value):
         """ Convert a string into a value of historic depth. """
         histo = integer(value)
-        if 10 <= histo <= 1500:
+        if 10 <= histo <= 10000:
             return histo
-        raise ValueError('invalid value for stats_histo: {}. expected in [10;1500] (seconds)'.format(value))
+        raise ValueError('invalid value for stats_histo: {}. expected in [10;10000] (seconds)'.format(value))
+
+    @staticmethod
+    def to_max_skip(value):
+        """ Convert a string into a maximum number of skipped measures. """
+        max_skip = integer(value)
+        if 0 <= max_skip <= 11:
+            return max_skip
+        raise ValueError('invalid value for stats_max_skip: {}. expected in [0;11] (ticks)'.format(value))
+
+    @staticmethod
+    def to_plot_workers(value):
+        """ Convert a string into a number of plot worker processes. """
+        workers = integer(value)
+        if 0 <= workers <= 8:
+            return workers
+        raise ValueError('invalid value for stats_plot_workers: {}. expected in [0;8]'.format(value))
+
+    @staticmethod
+    def to_stats_charts(value):
+        """ Convert a string into a StatisticsCharts enum. """
+        charts = StatisticsCharts._from_string(value)
+        if charts is None:
+            raise ValueError('invalid value for stats_charts: {}. expected in {}'.format(value, StatisticsCharts._strings()))
+        return charts
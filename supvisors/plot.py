@@ -18,62 +18,87 @@
 # ======================================================================
 
 import math
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
+from io import BytesIO
 
 from supvisors.utils import get_stats
 
 
-# class to create statistics graph using matplotlib 
+def render_image(curves):
+    """ Return the PNG image of the curves.
+    Each curve is given as a tuple of title, unit, values and statistics, as returned by utils.get_stats.
+    The None values are gaps that are not plotted.
+    matplotlib is imported here so that the curves can be built without it. """
+    import matplotlib
+    matplotlib.use('Agg', warn=False)
+    import matplotlib.pyplot as plt
+    plt.figure(figsize=(6, 3))
+    # calculate and apply max range
+    all_ydata = []
+    map(all_ydata.extend, [[y for y in ydata if y is not None] for _, _, ydata, _ in curves])
+    plt.ylim(StatisticsPlot.get_range(all_ydata))
+    # create plots for each series of data
+    for i, (title, unit, ydata, stats) in enumerate(curves):
+        # create X axis
+        xdata = [x for x in range(len(ydata))]
+        avg, rate, (a, b), dev = stats
+        # plot the data, the gaps breaking the line
+        dataLine, = plt.plot(xdata, [float('nan') if y is None else y for y in ydata], label=title)
+        plotColor = dataLine.get_color()
+        # plot the mean line
+        avg_data = [avg for _ in ydata]
+        meanLine, = plt.plot(xdata, avg_data, label='Mean: {:.2f}{}'.format(avg, unit), linestyle='--', color=plotColor)
+        if a is not None:
+            # plot the linear regression
+            plt.plot([xdata[0], xdata[-1]], [a * xdata[0] + b,  a * xdata[-1] + b], linestyle=':', color=plotColor)
+        if dev is not None:
+            # plot the standard deviation
+            plt.fill_between(xdata, avg-dev, avg+dev, facecolor=plotColor, alpha=.3)
+        # create the legend
+        legend = plt.legend(handles=[dataLine, meanLine], loc=i+1, fontsize='small', fancybox=True, shadow=True)
+        # add the legend to the current axes
+        plt.gca().add_artist(legend)
+    # save image to memory buffer
+    contents = BytesIO()
+    plt.savefig(contents, dpi=80, bbox_inches='tight', format='png')
+    # close plot
+    plt.close()
+    return contents.getvalue()
+
+
+# class to create statistics graph
 class StatisticsPlot(object):
-    """ Class used to export statistics data into a PNG graph. """
+    """ Class used to export statistics data into a PNG graph or into the curves of the client charts. """
 
     def __init__(self):
         """ Initialization of the plot. """
-        plt.figure(figsize=(6, 3))
         self.ydata = {}
 
     def add_plot(self, title, unit, ydata):
-        """ Add a defined series of values to the plot. """
-        if len(ydata) > 0:
+        """ Add a defined series of values to the plot, unless it holds only gaps. """
+        if any(value is not None for value in ydata):
             self.ydata[title, unit] = ydata
 
-    def export_image(self, image_contents):
-        """ Write curves into a PNG image. """
-        if self.ydata:
-            # calculate and apply max range
-            all_ydata = []
-            map(all_ydata.extend, [ydata for ydata in self.ydata.values()])
-            plt.ylim(self.get_range(all_ydata))
-            # create plots for each series of data
-            for i, ((title, unit), ydata) in enumerate(self.ydata.items()):
-                # create X axis
-                xdata = [x for x in range(len(ydata))]
-                # get additional statistics
-                avg, rate, (a, b), dev = get_stats(ydata)
-                # plot the data
-                dataLine, = plt.plot(xdata, ydata, label=title)
-                plotColor = dataLine.get_color()
-                # plot the mean line
-                avg_data = [avg for _ in ydata]
-                meanLine, = plt.plot(xdata, avg_data, label='Mean: {:.2f}{}'.format(avg, unit), linestyle='--', color=plotColor)
-                if a is not None:
-                    # plot the linear regression
-                    plt.plot([xdata[0], xdata[-1]], [a * xdata[0] + b,  a * xdata[-1] + b], linestyle=':', color=plotColor)
-                if dev is not None:
-                    # plot the standard deviation
-                    plt.fill_between(xdata, avg-dev, avg+dev, facecolor=plotColor, alpha=.3)
-                # create the legend
-                legend = plt.legend(handles=[dataLine, meanLine], loc=i+1, fontsize='small', fancybox=True, shadow=True)
-                # add the legend to the current axes
-                plt.gca().add_artist(legend)
-            # save image to internal memory buffer
-            plt.savefig(image_contents.new_image(), dpi=80, bbox_inches='tight', format='png')
-            # reset yData
-            self.ydata = {}
-        # close plot
-        plt.close()
+    def get_key(self):
+        """ Return the key identifying the curves, or None if they cannot be identified.
+        The series of the statscompiler module are identified by their version. """
+        versions = [getattr(ydata, 'version', None) for ydata in self.ydata.values()]
+        if None not in versions:
+            return tuple(sorted(zip(self.ydata.keys(), versions)))
+
+    def get_curves(self):
+        """ Return the curves to render, as expected by render_image. """
+        # series of the statscompiler module maintain their own statistics
+        return [(title, unit, list(ydata), ydata.get_stats() if hasattr(ydata, 'get_stats') else get_stats(ydata))
+            for (title, unit), ydata in self.ydata.items()]
+
+    def export_image(self, image_contents, plot_pool):
+        """ Write curves into a PNG image, using the pool of plot workers.
+        Nothing is rendered if the image already holds the same curves. """
+        key = self.get_key()
+        if self.ydata and not image_contents.is_cached(key):
+            plot_pool.export_image(self.get_curves(), key, image_contents)
+        # reset yData
+        self.ydata = {}
 
     @staticmethod
     def get_range(lst):
@@ -0,0 +1,126 @@
+#!/usr/bin/python
+#-*- coding: utf-8 -*-
+
+# ======================================================================
+# Copyright 2016 Julien LE CLEACH
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ======================================================================
+
+import signal
+
+from multiprocessing import Pool
+from time import time
+
+from supvisors.ttypes import StatisticsCharts
+
+
+def init_worker():
+    """ Restore the default signal handlers in a worker process.
+    The handlers of supervisord would prevent the worker from being terminated. """
+    for signum in [signal.SIGTERM, signal.SIGINT, signal.SIGQUIT, signal.SIGHUP, signal.SIGUSR2, signal.SIGCHLD]:
+        signal.signal(signum, signal.SIG_DFL)
+
+
+def render_plot(curves):
+    """ Return the PNG image of the curves and the time spent to render it. """
+    from supvisors.plot import render_image
+    start = time()
+    contents = render_image(curves)
+    return contents, time() - start
+
+
+def render_svg_plot(curves):
+    """ Return the SVG image of the curves and the time spent to render it. """
+    from supvisors.svgplot import render_svg
+    start = time()
+    contents = render_svg(curves)
+    return contents, time() - start
+
+
+class PlotPool(object):
+    """ Bounded pool of worker processes rendering the statistics plots,
+    so that matplotlib does not block the main loop of supervisord.
+    The worker processes are forked when supervisord is running, i.e. once it has been daemonized,
+    but before the Supvisors threads and the ZeroMQ context are created, so that the workers do not inherit them.
+    If no worker is configured or started, the plots are rendered synchronously.
+    The SVG plots are cheap enough to be always rendered synchronously.
+
+    Attributes are:
+
+        - logger: the Supvisors logger,
+        - charts: the renderer of the statistics charts,
+        - workers: the number of worker processes,
+        - pool: the multiprocessing pool,
+        - results: the results of the renderings in progress,
+        - renderings: the number of plots rendered,
+        - render_time: the total time spent to render the plots,
+        - last_render_time: the time spent to render the last plot. """
+
+    # maximum number of renderings in progress per worker
+    MAX_PENDING = 2
+
+    def __init__(self, supvisors):
+        """ Initialization of the attributes. """
+        self.logger = supvisors.logger
+        self.charts = supvisors.options.stats_charts
+        self.workers = supvisors.options.stats_plot_workers
+        self.pool = None
+        self.results = []
+        self.renderings = 0
+        self.render_time = 0.0
+        self.last_render_time = 0.0
+
+    def start(self):
+        """ Fork the worker processes, if any is used.
+        This must be called before any thread is started and before the ZeroMQ context is created. """
+        if self.workers and self.charts != StatisticsCharts.SVG and self.pool is None:
+            self.pool = Pool(self.workers, init_worker)
+
+    def pending(self):
+        """ Return the number of renderings in progress. """
+        self.results = [result for result in self.results if not result.ready()]
+        return len(self.results)
+
+    def export_image(self, curves, key, image_contents):
+        """ Render the curves into the image buffer.
+        Using workers, the rendering is only submitted and the buffer is updated once the image is requested.
+        The rendering is skipped if too many renderings are in progress, so the previous image is kept. """
+        if self.charts == StatisticsCharts.SVG:
+            contents, duration = render_svg_plot(curves)
+            self.on_rendered((contents, duration))
+            image_contents.new_image(key, 'image/svg+xml').write(contents)
+        elif self.pool is None:
+            contents, duration = render_plot(curves)
+            self.on_rendered((contents, duration))
+            image_contents.new_image(key).write(contents)
+        elif self.pending() < self.MAX_PENDING * self.workers:
+            result = self.pool.apply_async(render_plot, (curves, ), callback=self.on_rendered)
+            self.results.append(result)
+            image_contents.set_pending(key, result)
+        else:
+            self.logger.debug('plot rendering skipped: {} renderings in progress'.format(len(self.results)))
+
+    def on_rendered(self, result):
+        """ Update the rendering counters.
+        Using workers, this is called from the result thread of the pool. """
+        self.renderings += 1
+        self.last_render_time = result[1]
+        self.render_time += result[1]
+
+    def close(self):
+        """ Terminate the worker processes. """
+        if self.pool:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
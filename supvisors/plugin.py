@@ -26,7 +26,10 @@ from supvisors.rpcinterface import RPCInterface
 from supvisors.viewprocaddress import ProcAddressView
 from supvisors.viewhostaddress import HostAddressView
 from supvisors.viewapplication import ApplicationView
+from supvisors.viewchart import AddressChartView, ProcessChartView
+from supvisors.viewevents import EventView
 from supvisors.viewimage import *
+from supvisors.viewmetrics import MetricsView
 from supvisors.viewsupvisors import SupvisorsView
 
 
@@ -61,6 +64,13 @@ def update_views():
     VIEWS['address_cpu.png'] =  {'template': path.join(here, 'ui/empty.html'), 'view': AddressCpuImageView}
     VIEWS['address_mem.png'] =  {'template': path.join(here, 'ui/empty.html'), 'view': AddressMemoryImageView}
     VIEWS['address_io.png'] =  {'template': path.join(here, 'ui/empty.html'), 'view': AddressNetworkImageView}
+    # set fake page to export the curves of the charts
+    VIEWS['process_stats.json'] =  {'template': path.join(here, 'ui/empty.html'), 'view': ProcessChartView}
+    VIEWS['address_stats.json'] =  {'template': path.join(here, 'ui/empty.html'), 'view': AddressChartView}
+    # set fake page to export the events published
+    VIEWS['events.json'] =  {'template': path.join(here, 'ui/empty.html'), 'view': EventView}
+    # set fake page to export metrics
+    VIEWS['metrics'] =  {'template': path.join(here, 'ui/empty.html'), 'view': MetricsView}
 
 
 def make_supvisors_rpcinterface(supervisord, **config):
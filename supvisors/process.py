@@ -121,7 +121,8 @@ class ProcessStatus(object):
         - infos: a Supervisor-like process info dictionary for each address (running or not),
         - rules: the rules related to this process,
         - extra_args: optional extra arguments to be passed to the command line,
-        - ignore_wait_exit: a status telling if the wait_exit rule is applicable (should be temporary).
+        - ignore_wait_exit: a status telling if the wait_exit rule is applicable (should be temporary),
+        - version: a counter incremented each time the process information changes.
     """
 
     def __init__(self, application_name, process_name, supvisors):
@@ -142,6 +143,7 @@ class ProcessStatus(object):
         self.rules = ProcessRules(supvisors)
         self.extra_args = ''
         self.ignore_wait_exit = False
+        self.version = 0
 
     # access
     def namespec(self):
@@ -217,6 +219,7 @@ class ProcessStatus(object):
         # add info entry to process
         self.logger.debug('adding {} for {}'.format(info, address))
         self.infos[address] = info
+        self.version += 1
         # update process status
         self.update_status(address, info['state'], info['expected']) 
         # fix address rule
@@ -230,6 +233,7 @@ class ProcessStatus(object):
         if address in self.infos:
             info = self.infos[address]
             self.logger.trace('inserting {} into {} at {}'.format(event, info, address))
+            self.version += 1
             new_state = event['state']
             info['state'] = new_state
             # manage times and pid
@@ -275,6 +279,7 @@ class ProcessStatus(object):
         """ Update status of a process that was running on a lost address. """
         self.logger.debug('{} invalidateAddress {} / {}'.format(
             self.namespec(), self.addresses, address))
+        self.version += 1
         # reassign the difference between current set and parameter
         if address in self.addresses:
             self.addresses.remove(address)
@@ -0,0 +1,155 @@
+#!/usr/bin/python
+#-*- coding: utf-8 -*-
+
+# ======================================================================
+# Copyright 2016 Julien LE CLEACH
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# 
+#     http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ======================================================================
+
+from collections import deque
+
+from supervisor.options import split_namespec
+
+
+class NamespecRegistry(object):
+    """ Registry of the compact integer identifiers used instead of the namespecs in the internal events.
+
+    Each Supvisors instance assigns the identifiers of the namespecs that it publishes, in its local table.
+    The remote tables are loaded when an address is checked and completed by the events themselves,
+    as a namespec is declared in the event where its identifier is published for the first time.
+    As a declaration may be missed, e.g. by a subscriber that joins late, the table of an address is requested
+    again when an unknown identifier is received, and the process events held in the meantime are replayed.
+    The namespecs decoded are shared string instances, so that the dictionaries keyed by namespec
+    hold a single copy of them and benefit from the cached hash.
+
+    Attributes are:
+
+        - namespecs: the local namespecs, indexed by identifier,
+        - ids: the local identifiers, per namespec,
+        - declared: the local identifiers already published,
+        - remotes: the namespecs per identifier for each address,
+        - held: the process event payloads held until the table of the address is loaded, per address,
+        - strings: the shared instances of the namespecs. """
+
+    # maximum number of process events held per address
+    MAX_HELD = 64
+
+    def __init__(self):
+        """ Initialization of the attributes. """
+        self.namespecs = []
+        self.ids = {}
+        self.declared = set()
+        self.remotes = {}
+        self.held = {}
+        self.strings = {}
+
+    def shared(self, namespec):
+        """ Return the shared instance of the namespec. """
+        return self.strings.setdefault(namespec, namespec)
+
+    # local part
+    def get_id(self, namespec):
+        """ Return the local identifier of the namespec, assigning a new one if unknown. """
+        ident = self.ids.get(namespec)
+        if ident is None:
+            ident = self.ids[self.shared(namespec)] = len(self.namespecs)
+            self.namespecs.append(self.shared(namespec))
+        return ident
+
+    def declare(self, ident):
+        """ Return True if the identifier is published for the first time. """
+        if ident in self.declared:
+            return False
+        self.declared.add(ident)
+        return True
+
+    def serial(self):
+        """ Return the local namespecs, indexed by identifier. """
+        return list(self.namespecs)
+
+    def encode_process_event(self, namespec, payload):
+        """ Replace the process and group names of a process event payload with the identifier of the namespec. """
+        del payload['groupname'], payload['processname']
+        ident = payload['id'] = self.get_id(namespec)
+        if self.declare(ident):
+            payload['namespec'] = namespec
+        return payload
+
+    def encode_statistics(self, stats):
+        """ Replace the namespecs of the process statistics with their identifier.
+        The process statistics are sent as a list of (identifier, pid, values) and the namespecs published
+        for the first time are added at the end of the statistics as a list of (identifier, namespec). """
+        proc, declarations = [], []
+        for namespec, (pid, values) in stats[4].items():
+            ident = self.get_id(namespec)
+            if self.declare(ident):
+                declarations.append((ident, namespec))
+            proc.append((ident, pid, values))
+        return stats[:4] + (proc, ) + stats[5:] + (declarations, )
+
+    # remote part
+    def load(self, address, namespecs):
+        """ Store the namespecs of an address, indexed by identifier.
+        The table is merged as declarations received in the meantime must not be lost.
+        Return the process event payloads held for the address, that can be decoded now. """
+        table = self.remotes.setdefault(address, {})
+        for ident, namespec in enumerate(namespecs):
+            table[ident] = self.shared(namespec)
+        return list(self.held.pop(address, ()))
+
+    def hold(self, address, payload=None):
+        """ Keep a process event payload whose identifier is unknown until the table of the address is loaded.
+        Return True if the table of the address has to be requested, i.e. if it is not requested yet. """
+        requested = address in self.held
+        held = self.held.setdefault(address, deque(maxlen=self.MAX_HELD))
+        if payload is not None:
+            held.append(payload)
+        return not requested
+
+    def release(self, address):
+        """ Forget the request of the table of the address, when it could not be obtained.
+        The table will be requested again at the next unknown identifier.
+        Return the number of process events held that are lost. """
+        return len(self.held.pop(address, ()))
+
+    def add(self, address, ident, namespec):
+        """ Store a namespec declared by an address. """
+        self.remotes.setdefault(address, {})[ident] = self.shared(namespec)
+
+    def get_namespec(self, address, ident):
+        """ Return the namespec corresponding to an identifier of the address, or None if unknown. """
+        return self.remotes.get(address, {}).get(ident)
+
+    def decode_process_event(self, address, payload):
+        """ Restore the process and group names of a process event payload.
+        None is returned if the identifier is unknown. """
+        if 'namespec' in payload:
+            self.add(address, payload['id'], payload.pop('namespec'))
+        namespec = self.get_namespec(address, payload.pop('id'))
+        if namespec is None:
+            return None
+        payload['groupname'], payload['processname'] = split_namespec(namespec)
+        return payload
+
+    def decode_statistics(self, address, stats):
+        """ Restore the namespecs of the process statistics.
+        The statistics of the processes whose identifier is unknown are discarded. """
+        for ident, namespec in stats[-1]:
+            self.add(address, ident, namespec)
+        proc = {}
+        for ident, pid, values in stats[4]:
+            namespec = self.get_namespec(address, ident)
+            if namespec is not None:
+                proc[namespec] = (pid, values)
+        return tuple(stats[:4]) + (proc, ) + tuple(stats[5:-1])
@@ -41,7 +41,7 @@ class RPCInterface(object):
         # create a new Supvisors instance
         self.supvisors = Supvisors(supervisord)
         supvisors_short_cuts(self, ['context', 'fsm', 'info_source',
-            'logger', 'starter', 'stopper'])
+            'logger', 'starter', 'statistician', 'stopper'])
 
     # RPC Status methods
     def get_api_version(self):
@@ -177,6 +177,107 @@ class RPCInterface(object):
                 for process in application.processes.values()
                     if process.conflicting()]
 
+    def get_namespec_registry(self):
+        """ Get the namespecs identified by an integer in the events published by this **Supvisors** instance.
+        This is used internally when an address is checked.
+
+        *@return* ``list(str)``: the namespecs, indexed by identifier.
+        """
+        return self.supvisors.registry.serial()
+
+    def get_address_statistics(self, address_name, period, since=0, max_points=0):
+        """ Get the statistics of the host named address_name for the period.
+
+        *@param* ``str address_name``: the address name where the Supervisor daemon is running.
+
+        *@param* ``int period``: the statistics period, as set in the ``stats_periods`` option.
+
+        *@param* ``float since``: only the values whose date is after since are returned.
+
+        *@param* ``int max_points``: the maximum number of values per series (no limit if null).
+
+        *@throws* ``RPCError``:
+
+            * with code ``Faults.BAD_ADDRESS`` if address name is unknown to **Supvisors**,
+            * with code ``Faults.BAD_ARGUMENTS`` if period is not a statistics period of **Supvisors**.
+
+        *@return* ``dict``: a structure containing the series of the host.
+        """
+        result = self._get_statistics_instance(address_name, period).get_address_series(since, max_points)
+        result.update({'address_name': address_name, 'period': period})
+        return result
+
+    def get_process_statistics(self, namespec, period, since=0, max_points=0):
+        """ Get the statistics of the process named namespec for the period.
+
+        *@param* ``str namespec``: the process namespec (``name`` or ``group:name``).
+
+        *@param* ``int period``: the statistics period, as set in the ``stats_periods`` option.
+
+        *@param* ``float since``: only the values whose date is after since are returned.
+
+        *@param* ``int max_points``: the maximum number of values per series (no limit if null).
+
+        *@throws* ``RPCError``:
+
+            * with code ``Faults.BAD_SUPVISORS_STATE`` if **Supvisors** is still in state ``INITIALIZATION``,
+            * with code ``Faults.BAD_NAME`` if namespec is unknown to **Supvisors**,
+            * with code ``Faults.BAD_ARGUMENTS`` if period is not a statistics period of **Supvisors**.
+
+        *@return* ``list(dict)``: a list of structures containing the series of the process, one per address
+        where the process is running.
+        """
+        self._check_from_deployment()
+        process = self._get_process(namespec)
+        result = []
+        for address_name in sorted(process.addresses):
+            series = self._get_statistics_instance(address_name, period).get_process_series(namespec,
+                since, max_points)
+            if series:
+                series.update({'address_name': address_name, 'namespec': namespec, 'period': period})
+                result.append(series)
+        return result
+
+    def get_application_statistics(self, application_name, period):
+        """ Get the resources consumed by the application named application_name for the period,
+        from the last statistics of all addresses.
+
+        *@param* ``str application_name``: the name of the application.
+
+        *@param* ``int period``: the statistics period, as set in the ``stats_periods`` option.
+
+        *@throws* ``RPCError``:
+
+            * with code ``Faults.BAD_SUPVISORS_STATE`` if **Supvisors** is still in state ``INITIALIZATION``,
+            * with code ``Faults.BAD_NAME`` if application_name is unknown to **Supvisors**,
+            * with code ``Faults.BAD_ARGUMENTS`` if period is not a statistics period of **Supvisors**.
+
+        *@return* ``dict``: a structure containing the resources consumed by the application.
+        """
+        self._check_from_deployment()
+        self._get_application(application_name)
+        result = self._get_cluster_statistics(period).get_application_stats(application_name)
+        result.update({'application_name': application_name, 'period': period})
+        # add the quantiles of the process values on all addresses
+        for name, sketch in zip(['cpu_quantiles', 'mem_quantiles'],
+                self.statistician.get_application_sketches(application_name, period)):
+            if sketch.count:
+                result[name] = sketch.quantiles()
+        return result
+
+    def get_cluster_statistics(self, period):
+        """ Get the resources consumed on all addresses for the period, from the last statistics of all addresses.
+
+        *@param* ``int period``: the statistics period, as set in the ``stats_periods`` option.
+
+        *@throws* ``RPCError``: with code ``Faults.BAD_ARGUMENTS`` if period is not a statistics period of **Supvisors**.
+
+        *@return* ``dict``: a structure containing the resources consumed on all addresses.
+        """
+        result = self._get_cluster_statistics(period).get_cluster_stats()
+        result['period'] = period
+        return result
+
     # RPC Command methods
     def start_application(self, strategy, application_name, wait=True):
         """ Start the application named application_name iaw the strategy and the rules file.
@@ -567,6 +668,32 @@ class RPCInterface(object):
                 'process {} unknown in Supvisors'.format(namespec))
         return process
 
+    def _get_statistics_instance(self, address_name, period):
+        """ Return the statistics instance corresponding to the address name and the period.
+        A BAD_ADDRESS exception is raised if the address is not found.
+        A BAD_ARGUMENTS exception is raised if the period is not found. """
+        try:
+            instances = self.statistician.data[address_name]
+        except KeyError:
+            raise RPCError(Faults.BAD_ADDRESS,
+                'address {} unknown in Supvisors'.format(address_name))
+        try:
+            instance = instances[period]
+        except KeyError:
+            raise RPCError(Faults.BAD_ARGUMENTS,
+                'period {} not in statistics periods {}'.format(period, sorted(instances.keys())))
+        return instance
+
+    def _get_cluster_statistics(self, period):
+        """ Return the cluster statistics corresponding to the period.
+        A BAD_ARGUMENTS exception is raised if the period is not found. """
+        try:
+            cluster = self.statistician.clusters[period]
+        except KeyError:
+            raise RPCError(Faults.BAD_ARGUMENTS,
+                'period {} not in statistics periods {}'.format(period, sorted(self.statistician.clusters.keys())))
+        return cluster
+
     def _get_internal_process_rules(self, process):
         """ Return a dictionary with the rules of the process. """
         result = process.rules.serial()
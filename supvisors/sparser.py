@@ -23,7 +23,9 @@ from sys import stderr
 
 from supervisor.datatypes import boolean, list_of_strings
 
-from supvisors.ttypes import StartingFailureStrategies, RunningFailureStrategies
+from supvisors.alerts import AlertRules
+from supvisors.ttypes import (AlertConditions, AlertSeries, AlertStatistics,
+    StartingFailureStrategies, RunningFailureStrategies)
 from supvisors.utils import supvisors_short_cuts
 
 
@@ -51,6 +53,43 @@ XSDContents = StringIO('''\
             <xs:enumeration value="RESTART_APPLICATION" />
         </xs:restriction>
     </xs:simpleType>
+    <xs:simpleType name="AlertSeries" final="restriction" >
+        <xs:restriction base="xs:string">
+            <xs:enumeration value="HOST_CPU" />
+            <xs:enumeration value="HOST_MEM" />
+            <xs:enumeration value="PROCESS_CPU" />
+            <xs:enumeration value="PROCESS_MEM" />
+        </xs:restriction>
+    </xs:simpleType>
+    <xs:simpleType name="AlertStatistic" final="restriction" >
+        <xs:restriction base="xs:string">
+            <xs:enumeration value="VALUE" />
+            <xs:enumeration value="MEAN" />
+            <xs:enumeration value="SLOPE" />
+            <xs:enumeration value="P50" />
+            <xs:enumeration value="P95" />
+            <xs:enumeration value="P99" />
+        </xs:restriction>
+    </xs:simpleType>
+    <xs:simpleType name="AlertCondition" final="restriction" >
+        <xs:restriction base="xs:string">
+            <xs:enumeration value="ABOVE" />
+            <xs:enumeration value="BELOW" />
+        </xs:restriction>
+    </xs:simpleType>
+    <xs:complexType name="AlertModel">
+        <xs:all>
+            <xs:element type="AlertSeries" name="series"/>
+            <xs:element type="xs:string" name="target" minOccurs="0"/>
+            <xs:element type="AlertStatistic" name="statistic" minOccurs="0"/>
+            <xs:element type="AlertCondition" name="condition" minOccurs="0"/>
+            <xs:element type="xs:double" name="threshold"/>
+            <xs:element type="xs:positiveInteger" name="periods" minOccurs="0"/>
+            <xs:element type="xs:positiveInteger" name="period" minOccurs="0"/>
+            <xs:element type="RunningFailureStrategy" name="running_failure_strategy" minOccurs="0"/>
+        </xs:all>
+        <xs:attribute type="xs:string" name="name" use="required"/>
+    </xs:complexType>
     <xs:complexType name="ProgramModel">
         <xs:choice>
             <xs:element type="xs:string" name="reference"/>
@@ -85,6 +124,7 @@ XSDContents = StringIO('''\
                 <xs:choice minOccurs="0" maxOccurs="unbounded">
                     <xs:element type="ProgramModel" name="model"/>
                     <xs:element type="ApplicationModel" name="application"/>
+                    <xs:element type="AlertModel" name="alert"/>
                 </xs:choice>
             </xs:sequence>
         </xs:complexType>
@@ -187,6 +227,47 @@ class Parser(object):
             rules.check_dependencies(process.namespec())
             self.logger.debug('process {} - rules {}'.format(process.namespec(), rules))
 
+    def load_alert_rules(self):
+        """ Return the alert rules defined in the deployment file.
+        An alert rule without valid series or threshold is ignored. """
+        alerts = []
+        for alert_elt in self.root.findall("./alert[@name]"):
+            rules = AlertRules(alert_elt.get('name'))
+            # get series and threshold rules
+            series = AlertSeries._from_string(alert_elt.findtext('series'))
+            try:
+                rules.threshold = float(alert_elt.findtext('threshold'))
+            except:
+                series = None
+            if series is None:
+                self.logger.warn('alert {} ignored: series and threshold required'.format(rules.name))
+                continue
+            rules.series = series
+            # get target rule
+            rules.target = (alert_elt.findtext('target') or '').strip()
+            # get statistic and condition rules
+            value = AlertStatistics._from_string(alert_elt.findtext('statistic'))
+            if value is not None:
+                rules.statistic = value
+            value = AlertConditions._from_string(alert_elt.findtext('condition'))
+            if value is not None:
+                rules.condition = value
+            # get periods and period rules
+            for name in ['periods', 'period']:
+                try:
+                    value = int(alert_elt.findtext(name))
+                    if value > 0:
+                        setattr(rules, name, value)
+                except:
+                    pass
+            # get running_failure_strategy rule (applicable to process series only)
+            value = RunningFailureStrategies._from_string(alert_elt.findtext('running_failure_strategy'))
+            if value is not None and rules.process_series():
+                rules.running_failure_strategy = value
+            self.logger.debug('alert {}'.format(rules))
+            alerts.append(rules)
+        return alerts
+
     def get_program_addresses(self, program_elt, rules):
         value = program_elt.findtext('addresses')
         if value:
@@ -17,11 +17,14 @@
 # limitations under the License.
 # ======================================================================
 
-from psutil import (cpu_times, net_io_counters, virtual_memory,
+import os
+
+from collections import deque
+from psutil import (cpu_times, net_io_counters, swap_memory, virtual_memory,
     Process, NoSuchProcess)
 from time import time
 
-from supvisors.utils import mean
+from supvisors.utils import mean, stddev
 
 
 # CPU statistics
@@ -51,6 +54,27 @@ def instant_memory_statistics():
     return virtual_memory().percent
 
 
+# Host pressure statistics
+def instant_pressure_statistics():
+    """ Return the instant values of the load averages, the swap occupation and the memory available.
+    When supported by the kernel, the pressure stall totals (in microseconds) are added for CPU, memory and IO. """
+    load1, load5, load15 = os.getloadavg()
+    result = {'load1': load1, 'load5': load5, 'load15': load15,
+        'swap': swap_memory().percent, 'available': virtual_memory().available}
+    for resource in ['cpu', 'memory', 'io']:
+        try:
+            with open('/proc/pressure/{}'.format(resource)) as pressure_file:
+                # lines are like: some avg10=0.00 avg60=0.00 avg300=0.00 total=0
+                for line in pressure_file:
+                    kind, fields = line.split(None, 1)
+                    total = next(field for field in fields.split() if field.startswith('total='))
+                    result['{}_{}'.format(resource, kind)] = int(total.split('=')[1])
+        except (IOError, StopIteration, ValueError):
+            # pressure stall information is not available
+            pass
+    return result
+
+
 # Network statistics
 def instant_io_statistics():
     """ Return the instant values of receive / sent bytes per network interface. """
@@ -63,8 +87,13 @@ def instant_io_statistics():
 
 
 # Process statistics
-def instant_process_statistics(pid):
-    """ Return the instant jiffies and memory values for the process identified by pid. """
+def instant_process_statistics(pid, cgroup=False):
+    """ Return the instant jiffies and memory values for the process identified by pid.
+    When cgroup is True, the values are taken from the cgroup of the process if it has its own one. """
+    if cgroup:
+        stats = instant_cgroup_statistics(pid)
+        if stats is not None:
+            return stats
     work = memory = 0
     try:
         proc = Process(pid)
@@ -78,10 +107,178 @@ def instant_process_statistics(pid):
     return work, memory
 
 
+# cgroup accounting
+CGROUP_ROOT = '/sys/fs/cgroup'
+
+def process_cgroups(pid):
+    """ Return the cgroups of the process identified by pid, as a dictionary giving the cgroup path per controller.
+    The path of the cgroup v2 unified hierarchy is stored under an empty controller name. """
+    cgroups = {}
+    try:
+        with open('/proc/{}/cgroup'.format(pid)) as cgroup_file:
+            for line in cgroup_file:
+                _, controllers, path = line.strip().split(':', 2)
+                for controller in controllers.split(','):
+                    cgroups[controller] = path
+    except (IOError, ValueError):
+        # process may have disappeared in the interval or cgroups are not supported
+        pass
+    return cgroups
+
+def read_cgroup_values(filename):
+    """ Return the key / value pairs of a cgroup flat keyed file as a dictionary. """
+    with open(filename) as cgroup_file:
+        return {key: int(value) for key, value in (line.split() for line in cgroup_file)}
+
+def read_cgroup_value(filename):
+    """ Return the single value of a cgroup file. """
+    with open(filename) as cgroup_file:
+        return int(cgroup_file.read())
+
+def instant_cgroup_statistics(pid):
+    """ Return the instant jiffies and memory values for the cgroup of the process identified by pid.
+    None is returned if the cgroup of the process is shared with supervisord or if its accounting is not available.
+    Unlike psutil, the cgroup takes into account all the processes spawned in the interval. """
+    cgroups = process_cgroups(pid)
+    if not cgroups or cgroups == process_cgroups(os.getpid()):
+        # the cgroup would include supervisord and all its children
+        return None
+    try:
+        if 'cpuacct' in cgroups and 'memory' in cgroups:
+            # cgroup v1: cpu usage is given in nanoseconds
+            cpuacct_path = os.path.join(CGROUP_ROOT, 'cpuacct', cgroups['cpuacct'].lstrip('/'))
+            work = read_cgroup_value(os.path.join(cpuacct_path, 'cpuacct.usage')) / 1e9
+            memory_path = os.path.join(CGROUP_ROOT, 'memory', cgroups['memory'].lstrip('/'))
+            memory = read_cgroup_value(os.path.join(memory_path, 'memory.usage_in_bytes'))
+            memory -= read_cgroup_values(os.path.join(memory_path, 'memory.stat')).get('total_inactive_file', 0)
+        elif '' in cgroups:
+            # cgroup v2: cpu usage is given in microseconds
+            unified_path = os.path.join(CGROUP_ROOT, cgroups[''].lstrip('/'))
+            work = read_cgroup_values(os.path.join(unified_path, 'cpu.stat'))['usage_usec'] / 1e6
+            memory = read_cgroup_value(os.path.join(unified_path, 'memory.current'))
+            memory -= read_cgroup_values(os.path.join(unified_path, 'memory.stat')).get('inactive_file', 0)
+        else:
+            return None
+    except (IOError, KeyError, ValueError):
+        # cgroup may have been removed in the interval or controllers are not enabled
+        return None
+    # memory is expressed like psutil memory_percent
+    return work, 100.0 * max(memory, 0) / virtual_memory().total
+
+
+# Adaptive sampling of processes
+class ProcessSample(object):
+    """ History of the measures taken on a process, used to adapt its sampling rate.
+    An idle process, i.e. whose CPU rate is low and stable, is measured less often and its values are extrapolated
+    in the meantime. A busy process is measured at every tick, even if its CPU rate is stable.
+    The CPU work reported never decreases, so that the CPU of the process is never negative when the process
+    slows down after an extrapolation.
+
+    Attributes are:
+
+        - max_interval: the maximum number of ticks between two measures,
+        - date: the date of the last measure,
+        - work: the CPU work of the last measure,
+        - reported: the last CPU work reported, measured or extrapolated,
+        - memory: the memory of the last measure,
+        - rates: the recent CPU rates of the process, in CPU seconds per second,
+        - interval: the current number of ticks between two measures,
+        - countdown: the number of ticks before the next measure.
+    """
+
+    # maximum mean CPU rate for a process considered as idle (5% of a processor)
+    IDLE_RATE = 0.05
+    # maximum standard deviation of the CPU rate for a process considered as idle (0.5% of a processor)
+    IDLE_DEVIATION = 0.005
+    # number of CPU rates considered
+    RATES_DEPTH = 4
+
+    def __init__(self, max_interval):
+        """ Initialization of the attributes. """
+        self.max_interval = max_interval
+        self.date = None
+        self.work = self.reported = self.memory = 0
+        self.rates = deque(maxlen=ProcessSample.RATES_DEPTH)
+        self.interval = 1
+        self.countdown = 0
+
+    def skip(self):
+        """ Return True if the measure can be skipped at this tick. """
+        if self.countdown > 0:
+            self.countdown -= 1
+            return True
+        return False
+
+    def estimate(self, now):
+        """ Return the CPU work and memory of the process, extrapolated from the last measures. """
+        rate = mean(self.rates) if self.rates else 0
+        self.reported = max(self.reported, self.work + rate * (now - self.date))
+        return self.reported, self.memory
+
+    def update(self, now, stats):
+        """ Store a new measure, adapt the sampling interval iaw the mean and the variance of the CPU rate
+        and return the values to report.
+        If the CPU work has been overestimated, the work reported is held until the measures catch up. """
+        work, memory = stats
+        if self.date is not None and now > self.date:
+            self.rates.append((work - self.work) / (now - self.date))
+        self.date, self.work, self.memory = now, work, memory
+        # sample less often while the process is idle, otherwise come back to the nominal rate
+        if len(self.rates) > 1:
+            rate = mean(self.rates)
+            idle = rate < ProcessSample.IDLE_RATE and stddev(self.rates, rate) < ProcessSample.IDLE_DEVIATION
+        else:
+            idle = False
+        self.interval = min(2 * self.interval, self.max_interval) if idle else 1
+        self.countdown = self.interval - 1
+        self.reported = max(self.reported, work)
+        return self.reported, memory
+
+
 # Snapshot of all resources
-def instant_statistics(named_pid_list):
-    """ Return a tuple of all measures taken on the CPU, Memory and IO resources. """
-    proc_statistics = {process_name: (pid, instant_process_statistics(pid))
-        for process_name, pid in named_pid_list}
-    return (time(), instant_cpu_statistics(), instant_memory_statistics(),
-        instant_io_statistics(), proc_statistics)
+class StatisticsCollector(object):
+    """ Class used to take snapshots of the local resources.
+
+    Attributes are:
+
+        - cgroup: when True, process statistics are taken from the cgroup of the process if possible,
+        - max_skip: the maximum number of consecutive ticks during which a process measure can be skipped,
+        - samples: a dictionary giving the ProcessSample instance per pid.
+    """
+
+    def __init__(self, cgroup=False, max_skip=0):
+        """ Initialization of the attributes. """
+        self.cgroup = cgroup
+        self.max_skip = max_skip
+        self.samples = {}
+
+    def process_statistics(self, pid, now):
+        """ Return the instant jiffies and memory values for the process identified by pid.
+        With adaptive sampling, the values of an idle process are interpolated between two measures. """
+        if not self.max_skip:
+            return instant_process_statistics(pid, self.cgroup)
+        sample = self.samples.get(pid)
+        if sample is None:
+            sample = self.samples[pid] = ProcessSample(self.max_skip + 1)
+        elif sample.skip():
+            return sample.estimate(now)
+        stats = instant_process_statistics(pid, self.cgroup)
+        return sample.update(now, stats)
+
+    def __call__(self, named_pid_list):
+        """ Return a tuple of all measures taken on the CPU, Memory, IO and host pressure resources. """
+        now = time()
+        proc_statistics = {process_name: (pid, self.process_statistics(pid, now))
+            for process_name, pid in named_pid_list}
+        # forget the processes that are not running anymore
+        pids = {pid for _, pid in named_pid_list}
+        for pid in self.samples.keys():
+            if pid not in pids:
+                del self.samples[pid]
+        return (now, instant_cpu_statistics(), instant_memory_statistics(),
+            instant_io_statistics(), proc_statistics, instant_pressure_statistics())
+
+
+def instant_statistics(named_pid_list, cgroup=False):
+    """ Return a tuple of all measures taken on the CPU, Memory, IO and host pressure resources. """
+    return StatisticsCollector(cgroup)(named_pid_list)
@@ -17,6 +17,24 @@
 # limitations under the License.
 # ======================================================================
 
+from collections import deque
+from functools import partial
+from itertools import chain, count, islice, izip
+from math import ceil, log, sqrt
+from sys import getsizeof
+from time import time
+
+from supervisor.options import split_namespec
+
+from supvisors.ttypes import AddressStates
+from supvisors.utils import get_lttb_indexes, srate
+
+try:
+    import numpy
+except ImportError:
+    # numpy not available: the statistics are compiled in pure Python
+    numpy = None
+
 
 # CPU statistics
 def cpu_statistics(last, ref):
@@ -55,6 +73,25 @@ def io_statistics(last, ref, duration):
     return io_stats
 
 
+# Host pressure statistics
+def pressure_statistics(last, ref, duration):
+    """ Return the host pressure values between last and ref measures.
+    The load averages and the swap occupation are instant values. The available memory is converted in MB.
+    The pressure stall totals are converted into the percentage of time stalled in the interval. """
+    pressure = {}
+    for name, value in last.items():
+        if name.endswith(('_some', '_full')):
+            ref_value = ref.get(name)
+            if ref_value is not None and ref_value <= value:
+                # totals are given in microseconds
+                pressure[name] = (value - ref_value) / duration / 10000.0
+        elif name == 'available':
+            pressure[name] = value / 1048576.0
+        else:
+            pressure[name] = value
+    return pressure
+
+
 # Process statistics
 def cpu_process_statistics(last, ref, total_work):
     """ Return the CPU loading of the process between last and ref measures. """
@@ -62,9 +99,91 @@ def cpu_process_statistics(last, ref, total_work):
     return 100.0 * (last - ref) / total_work
 
 
+def process_statistics(last, ref, work):
+    """ Return the CPU and memory of the processes between last and ref measures. """
+    proc = {}
+    # when tuples are unserialized through JSON, they become lists
+    for process_name, last_pid_stats in last.items():
+        # find same process in ref
+        ref_pid_stats = ref.get(process_name, None)
+        # pid must be identical (in case of process restart in the interval)
+        if ref_pid_stats and last_pid_stats[0] == ref_pid_stats[0]:
+            # need the work jiffies in the interval
+            proc_cpu = cpu_process_statistics(last_pid_stats[1][0], ref_pid_stats[1][0], work)
+            proc[process_name, last_pid_stats[0]] = proc_cpu, last_pid_stats[1][1]
+    return proc
+
+
+# Instant statistics prepared for vectorized operations
+class StatisticsSnapshot(tuple):
+    """ Instant statistics, as built by the statscollector module, along with numpy arrays of their values.
+    Snapshots are still usable as the original tuple.
+
+    Attributes are:
+
+        - cpu: the array of work and idle jiffies per processor,
+        - io_names: the sorted names of the network interfaces,
+        - io: the array of received and sent bytes per network interface,
+        - proc_names: the sorted namespecs of the processes,
+        - proc_pids: the array of process ids,
+        - proc_work: the array of work jiffies of the processes,
+        - proc_mem: the list of memory values of the processes. """
+
+    def __new__(cls, stats):
+        """ Build the numpy arrays from the instant statistics. """
+        snapshot = tuple.__new__(cls, stats)
+        # numpy.fromiter is much faster than numpy.array on sequences of tuples
+        snapshot.cpu = numpy.fromiter(chain.from_iterable(stats[1]), float, 2 * len(stats[1])).reshape(-1, 2)
+        snapshot.io_names = sorted(stats[3].keys())
+        snapshot.io = numpy.fromiter(chain.from_iterable(stats[3][intf] for intf in snapshot.io_names),
+            float, 2 * len(snapshot.io_names)).reshape(-1, 2)
+        snapshot.proc_names = sorted(stats[4].keys())
+        pid_stats = [stats[4][namespec] for namespec in snapshot.proc_names]
+        snapshot.proc_pids = numpy.fromiter((pid for pid, _ in pid_stats), int, len(pid_stats))
+        snapshot.proc_work = numpy.fromiter((values[0] for _, values in pid_stats), float, len(pid_stats))
+        snapshot.proc_mem = [values[1] for _, values in pid_stats]
+        return snapshot
+
+
+def vectorized_statistics(last, ref):
+    """ Return the same resources statistics as the statistics function, using numpy vectorized operations.
+    When the processors, the network interfaces or the processes differ between the snapshots,
+    the related statistics are computed in pure Python. """
+    duration = last[0] - ref[0]
+    if last.cpu.shape == ref.cpu.shape:
+        delta = last.cpu - ref.cpu
+        total = delta.sum(axis=1)
+        cpu = numpy.divide(100.0 * delta[:, 0], total, out=numpy.zeros_like(total), where=total != 0).tolist()
+        work = float(total[0])
+    else:
+        cpu = cpu_statistics(last[1], ref[1])
+        work = cpu_total_work(last[1], ref[1])
+    if last.io_names == ref.io_names:
+        delta = last.io - ref.io
+        valid = (delta >= 0).all(axis=1).tolist()
+        rates = (delta / duration / 128).tolist()
+        io = {intf: tuple(rate) for intf, rate, ok in zip(last.io_names, rates, valid) if ok}
+    else:
+        io = io_statistics(last[3], ref[3], duration)
+    if last.proc_names == ref.proc_names:
+        same_pid = (last.proc_pids == ref.proc_pids).tolist()
+        proc_cpu = (100.0 * (last.proc_work - ref.proc_work) / work).tolist()
+        proc = {(namespec, pid): (value, mem)
+            for namespec, pid, value, mem, ok in zip(last.proc_names, last.proc_pids.tolist(), proc_cpu,
+                last.proc_mem, same_pid) if ok}
+    else:
+        proc = process_statistics(last[4], ref[4], work)
+    # host pressure statistics are not provided by older versions
+    pressure = pressure_statistics(last[5], ref[5], duration) if len(last) > 5 and len(ref) > 5 else {}
+    return last[0], cpu, last[2], io, proc, pressure
+
+
 # Calculate resources taken between two snapshots
 def statistics(last, ref):
-    """ Return resources statistics from two series of measures. """
+    """ Return resources statistics from two series of measures.
+    Vectorized operations are used when both measures are snapshots. """
+    if isinstance(last, StatisticsSnapshot) and isinstance(ref, StatisticsSnapshot):
+        return vectorized_statistics(last, ref)
     # for use in client display
     duration = last[0] - ref[0]
     cpu = cpu_statistics(last[1], ref[1])
@@ -72,46 +191,422 @@ def statistics(last, ref):
     io = io_statistics(last[3], ref[3], duration)
     # process statistics
     work = cpu_total_work(last[1], ref[1])
-    proc = {}
-    # when tuples are unserialized through JSON, they become lists
-    for process_name, last_pid_stats in last[4].items():
-        # find same process in ref
-        ref_pid_stats = ref[4].get(process_name, None)
-        # calculate cpu if ref is found
-        proc_cpu = 0
-        # pid must be identical (in case of process restart in the interval)
-        if ref_pid_stats and last_pid_stats[0] == ref_pid_stats[0]:
-            # need the work jiffies in the interval
-            proc_cpu = cpu_process_statistics(last_pid_stats[1][0], ref_pid_stats[1][0], work)
-            proc[process_name, last_pid_stats[0]] = proc_cpu, last_pid_stats[1][1]
-    return last[0], cpu, mem, io, proc
+    proc = process_statistics(last[4], ref[4], work)
+    # host pressure statistics are not provided by older versions
+    pressure = pressure_statistics(last[5], ref[5], duration) if len(last) > 5 and len(ref) > 5 else {}
+    return last[0], cpu, mem, io, proc, pressure
+
+
+# memory used by a float value stored in a series
+FLOAT_SIZE = getsizeof(0.0)
+
+# versions of the series contents, unique among all series
+series_versions = count(1)
+
+
+def mean_value(value):
+    """ Return the value of compiled statistics.
+    The statistics rolled up provide triplets of mean, minimum and maximum values: the mean value is returned. """
+    return value[0] if isinstance(value, (list, tuple)) else value
+
+
+# Class for the distribution of a series of statistics
+class QuantileSketch(object):
+    """ Fixed-memory sketch of the distribution of a series of values, giving approximate quantiles.
+    Values are counted in buckets of logarithmic width, so that the quantiles have a relative accuracy (DDSketch).
+    When the number of buckets is exceeded, the lowest buckets are collapsed, so that the accuracy of the
+    high quantiles is kept.
+    Two sketches are merged by adding their bucket counts.
+
+    Attributes are:
+
+        - buckets: the number of values per bucket index,
+        - zeros: the number of values too small to be counted in a bucket,
+        - count: the total number of values. """
+
+    # relative accuracy of the quantiles
+    ACCURACY = 0.01
+    GAMMA = (1 + ACCURACY) / (1 - ACCURACY)
+    LOG_GAMMA = log(GAMMA)
+    # values lower than this limit are considered as null
+    MIN_VALUE = 1e-6
+    # maximum number of buckets
+    MAX_BUCKETS = 256
+    # quantiles provided by default
+    QUANTILES = (0.5, 0.95, 0.99)
+
+    def __init__(self):
+        """ Initialization of the attributes. """
+        self.clear()
+
+    def clear(self):
+        """ Remove all values. """
+        self.buckets = {}
+        self.zeros = 0
+        self.count = 0
+
+    def add(self, value):
+        """ Count a new value. """
+        self.count += 1
+        if value < self.MIN_VALUE:
+            self.zeros += 1
+        else:
+            index = int(ceil(log(value) / self.LOG_GAMMA))
+            buckets = self.buckets
+            if index in buckets:
+                buckets[index] += 1
+            else:
+                buckets[index] = 1
+                if len(buckets) > self.MAX_BUCKETS:
+                    self.collapse()
+
+    def merge(self, other):
+        """ Add the values counted in another sketch. """
+        self.count += other.count
+        self.zeros += other.zeros
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.collapse()
+
+    def collapse(self):
+        """ Merge the lowest buckets until the maximum number of buckets is respected. """
+        if len(self.buckets) > self.MAX_BUCKETS:
+            indexes = sorted(self.buckets.keys())
+            excess = len(indexes) - self.MAX_BUCKETS
+            target = indexes[excess]
+            for index in indexes[:excess]:
+                self.buckets[target] += self.buckets.pop(index)
+
+    def quantiles(self, probabilities=QUANTILES):
+        """ Return the approximate values of the quantiles, or None if no value has been counted. """
+        if not self.count:
+            return [None] * len(probabilities)
+        result = []
+        indexes = iter(sorted(self.buckets.keys()))
+        cumulated, value = self.zeros, 0.0
+        for probability in probabilities:
+            # the rank is rounded up so that rare peaks show in the high quantiles
+            rank = ceil(probability * (self.count - 1))
+            while cumulated <= rank:
+                index = next(indexes)
+                cumulated += self.buckets[index]
+                # estimate of the values counted in the bucket
+                value = 2.0 * self.GAMMA ** index / (self.GAMMA + 1)
+            result.append(value)
+        return result
+
+
+# Class for a series of statistics
+class StatisticsSeries(deque):
+    """ Fixed-capacity ring buffer of statistics values.
+    Appending a value is O(1) and the oldest value is discarded when the depth is reached.
+    Values are iterated and indexed from the oldest to the newest without copy.
+
+    Running sums are maintained so that the mean, the standard deviation and the linear regression
+    are updated in O(1) when values are appended and discarded.
+    The sums involving the index of the values use an absolute index, the index of the oldest value being first.
+
+    A None value is a gap marker, appended when no value is available at a date, so that the values stay aligned
+    on the dates of the statistics instance. Gaps are ignored by the running sums and by the quantile sketch.
+
+    The values are also counted in a quantile sketch, windowed on the history of the series: each time the depth
+    of the series has been renewed, the sketch is rebuilt from the values of the series, so that it describes
+    the values of the series and at most depth values discarded since.
+
+    The version of the series changes each time its contents change and is never used by another series,
+    so that anything derived from the series, like a plot, can be cached using the version as a key. """
+
+    def __init__(self, depth, iterable=()):
+        """ Initialization of the attributes. """
+        deque.__init__(self, (), depth)
+        self.sketch = QuantileSketch()
+        self.reset_sums()
+        self.extend(iterable)
+
+    def reset_sums(self):
+        """ Compute the running sums from the values of the series. """
+        self.version = next(series_versions)
+        self.first = 0
+        points = [(x, y) for x, y in enumerate(self) if y is not None]
+        self.nb_values = len(points)
+        self.sum_x = float(sum(x for x, _ in points))
+        self.sum_xx = float(sum(x * x for x, _ in points))
+        self.sum_y = float(sum(y for _, y in points))
+        self.sum_yy = float(sum(y * y for _, y in points))
+        self.sum_xy = float(sum(x * y for x, y in points))
+
+    def add_sums(self, x, y, sign):
+        """ Add (sign 1) or remove (sign -1) a point to the running sums. """
+        self.nb_values += sign
+        self.sum_x += sign * x
+        self.sum_xx += sign * x * x
+        self.sum_y += sign * y
+        self.sum_yy += sign * y * y
+        self.sum_xy += sign * x * y
+
+    def append(self, value):
+        """ Add a value, or a None gap marker, to the series and update the running sums. """
+        if len(self) == self.maxlen:
+            # the oldest value is about to be discarded
+            oldest = self[0]
+            if oldest is not None:
+                self.add_sums(self.first, oldest, -1)
+            self.first += 1
+        deque.append(self, value)
+        self.version = next(series_versions)
+        if value is not None:
+            self.sketch.add(value)
+            self.add_sums(self.first + len(self) - 1, value, 1)
+        # rebuild the sums periodically to avoid the drift of floating point operations
+        # the quantile sketch is windowed at the same time
+        if self.first >= self.maxlen:
+            self.reset_sketch()
+            self.reset_sums()
+
+    def extend(self, iterable):
+        """ Add values to the series and update the running sums. """
+        for value in iterable:
+            self.append(value)
+
+    def reset_sketch(self):
+        """ Count the values of the series in a new quantile sketch. """
+        self.sketch.clear()
+        for value in self:
+            if value is not None:
+                self.sketch.add(value)
+
+    def add_gaps(self, size):
+        """ Add gap markers to the series, so that a series created late is aligned on the dates. """
+        self.extend([None] * min(size, self.maxlen))
+
+    def clear(self):
+        """ Remove all values. """
+        deque.clear(self)
+        self.sketch.clear()
+        self.reset_sums()
+
+    def downsample(self, indexes):
+        """ Remove the values at the indexes given.
+        The quantile sketch is kept until the next window as it describes the values appended. """
+        values = [value for idx, value in enumerate(self) if idx not in indexes]
+        deque.clear(self)
+        deque.extend(self, values)
+        self.reset_sums()
+
+    def memory_size(self):
+        """ Return an estimate of the memory used by the series, in bytes. """
+        return getsizeof(self) + len(self) * FLOAT_SIZE + getsizeof(self.sketch.buckets)
+
+    def get_stats(self):
+        """ Return the same statistics as utils.get_stats, using the running sums:
+        - the mean value,
+        - the instant rate between the two last values,
+        - the coefficients of the linear regression,
+        - the standard deviation.
+        The series must hold at least one value that is not a gap. """
+        rate, a, b, dev = (None, )*4
+        size = self.nb_values
+        avg = self.sum_y / size
+        if size > 1:
+            # calculate instant rate value between last 2 values, unless one of them is a gap
+            if self[-1] is not None and self[-2] is not None:
+                rate = srate(self[-1], self[-2])
+            # calculate the linear regression with X data starting from 0 for the oldest value
+            first = self.first
+            sum_x = self.sum_x - first * size
+            sum_xx = self.sum_xx - 2 * first * self.sum_x + first * first * size
+            sum_xy = self.sum_xy - first * self.sum_y
+            a = (size * sum_xy - sum_x * self.sum_y) / (size * sum_xx - sum_x * sum_x)
+            b = (self.sum_y - a * sum_x) / size
+            # calculate standard deviation
+            dev = sqrt(max(self.sum_yy / size - avg * avg, 0))
+        return avg, rate, (a, b), dev
+
+
+# Class for a series of rolled-up statistics
+class RollupSeries(StatisticsSeries):
+    """ Series of mean values rolled up from a finer series, along with the minimum and maximum values.
+
+    Attributes are:
+
+        - minimum: the series of minimum values,
+        - maximum: the series of maximum values,
+        - pending: the sum, count, minimum and maximum of the values accumulated since the last rollup. """
+
+    def __init__(self, depth, iterable=()):
+        """ Initialization of the attributes. """
+        StatisticsSeries.__init__(self, depth, iterable)
+        self.minimum = StatisticsSeries(depth)
+        self.maximum = StatisticsSeries(depth)
+        self.pending = None
+
+    def clear(self):
+        """ Remove all values. """
+        StatisticsSeries.clear(self)
+        self.minimum.clear()
+        self.maximum.clear()
+        self.pending = None
+
+    def add_gaps(self, size):
+        """ Add gap markers to the series and to the related extrema. """
+        StatisticsSeries.add_gaps(self, size)
+        self.minimum.add_gaps(size)
+        self.maximum.add_gaps(size)
+
+    def downsample(self, indexes):
+        """ Remove the values at the indexes given, along with the related extrema. """
+        StatisticsSeries.downsample(self, indexes)
+        self.minimum.downsample(indexes)
+        self.maximum.downsample(indexes)
+
+    def memory_size(self):
+        """ Return an estimate of the memory used by the series and its extrema, in bytes. """
+        return StatisticsSeries.memory_size(self) + self.minimum.memory_size() + self.maximum.memory_size()
+
+    def accumulate(self, values):
+        """ Accumulate a triplet of mean, minimum and maximum values from the finer series. """
+        avg, low, high = values
+        if self.pending is None:
+            self.pending = [avg, 1, low, high]
+        else:
+            self.pending[0] += avg
+            self.pending[1] += 1
+            self.pending[2] = min(self.pending[2], low)
+            self.pending[3] = max(self.pending[3], high)
+
+    def flush(self):
+        """ Store the rollup of the accumulated values.
+        Return the triplet of mean, minimum and maximum values stored,
+        or None if nothing was accumulated, in which case a gap is stored. """
+        if self.pending is None:
+            self.append(None)
+            self.minimum.append(None)
+            self.maximum.append(None)
+            return None
+        total, count, low, high = self.pending
+        self.pending = None
+        avg = total / count
+        self.append(avg)
+        self.minimum.append(low)
+        self.maximum.append(high)
+        return avg, low, high
+
+
+# Class for the statistics of a process
+class ProcessStatistics(object):
+    """ This class holds the CPU and memory series of a process.
+
+    Attributes are:
+
+        - pid: the process id related to the series,
+        - cpu: the series of CPU values,
+        - mem: the series of memory values,
+        - viewed: the last time when the series have been requested, or created. """
+
+    def __init__(self, pid, cpu, mem):
+        """ Initialization of the attributes.
+        The series are considered as viewed at creation, so that the memory budget does not release them
+        before they could be requested. """
+        self.pid = pid
+        self.cpu = cpu
+        self.mem = mem
+        self.viewed = time()
+
+    def memory_size(self):
+        """ Return an estimate of the memory used by the series, in bytes. """
+        return self.cpu.memory_size() + self.mem.memory_size()
+
+    def reset(self, pid):
+        """ Clear the series for a new process id. """
+        self.pid = pid
+        self.cpu.clear()
+        self.mem.clear()
 
 
 # Class for statistics storage
 class StatisticsInstance(object):
     """ This class handles resources statistics for a given address and period. """
 
-    def __init__(self, period, depth):
+    def __init__(self, period, depth, writer=None):
         """ Initalization of the attributes.
         As period is a multiple of 5 and a call to pushStatistics is expected every 5 seconds,
-        period is used as a simple counter. """
+        period is used as a simple counter.
+        The optional writer is called with the statistics compiled, so that they are persisted. """
         self.period = period / 5
         self.depth = depth
+        self.writer = writer
+        # coarser instances rolled up from this one
+        self.rollups = []
         self.clear()
 
     def clear(self):
         """ Reset all attributes. """
         self.counter = -1
         self.ref_stats = None
+        # dates of the statistics stored
+        self.dates = deque(maxlen=self.depth)
         # data structures
         self.cpu = []
-        self.mem = []
+        self.mem = self.new_series()
         self.io = {}
         self.proc = {}
+        self.pressure = {}
+        # processes whose series have been released to respect the memory budget
+        self.evicted = set()
 
     def find_process_stats(self, namespec):
-        """ Return the process statistics related to the namespec. """
-        return next((stats for (process_name, pid), stats in self.proc.items() if process_name == namespec), None)
+        """ Return the process statistics related to the namespec.
+        The series released to respect the memory budget are rebuilt from the next statistics. """
+        proc_stats = self.proc.get(namespec)
+        if proc_stats:
+            proc_stats.viewed = time()
+        else:
+            self.evicted.discard(namespec)
+        return proc_stats
+
+    def peek_process_stats(self, namespec):
+        """ Return the process statistics related to the namespec, without considering them as requested.
+        The series released to respect the memory budget are not rebuilt. """
+        return self.proc.get(namespec)
+
+    def evict(self, namespec):
+        """ Release the series of the process until they are requested again. """
+        del self.proc[namespec]
+        self.evicted.add(namespec)
+
+    def iter_series(self):
+        """ Iterate over all the series of the instance. """
+        for series in self.cpu:
+            yield series
+        yield self.mem
+        for recv, sent in self.io.values():
+            yield recv
+            yield sent
+        for series in self.pressure.values():
+            yield series
+        for proc_stats in self.proc.values():
+            yield proc_stats.cpu
+            yield proc_stats.mem
+
+    def memory_size(self):
+        """ Return an estimate of the memory used by the series of the instance, in bytes. """
+        return (getsizeof(self.dates) + len(self.dates) * FLOAT_SIZE
+            + sum(series.memory_size() for series in self.iter_series()))
+
+    def downsample(self):
+        """ Remove every other value from the oldest half of the dates and of the series.
+        As the series are aligned on the most recent date, the values removed from a shorter series are
+        the ones related to the dates removed.
+        Return False if there are not enough values to downsample. """
+        size = len(self.dates)
+        indexes = set(range(1, size // 2, 2))
+        if not indexes:
+            return False
+        self.dates = deque((date for idx, date in enumerate(self.dates) if idx not in indexes), self.depth)
+        for series in self.iter_series():
+            offset = size - len(series)
+            series.downsample({idx - offset for idx in indexes if idx >= offset})
+        return True
 
     def push_statistics(self, stats):
         """ Calculates new statistics given a new series of measures. """
@@ -120,54 +615,282 @@ class StatisticsInstance(object):
             if self.ref_stats:
                 # rearrange data so that there is less processing afterwards
                 integ_stats = statistics(stats, self.ref_stats)
+                if self.writer:
+                    self.writer(integ_stats)
+                self.push_rollups(integ_stats)
+                self.dates.append(integ_stats[0])
                 # add new CPU values to CPU lists
+                # too old values are discarded by the series when max depth is reached
                 for lst in self.cpu:
                 	lst.append(integ_stats[1].pop(0))
-                	self.trunc_depth(lst)
                 # add new Mem value to MEM list
                 self.mem.append(integ_stats[2])
-                self.trunc_depth(self.mem)
                 # add new IO values to IO list
+                # a gap is recorded when the counters of the interface are not consistent
                 for intf, bytes in self.io.items():
-                    new_bytes = integ_stats[3].pop(intf)
+                    new_bytes = integ_stats[3].pop(intf, (None, None))
                     bytes[0].append(new_bytes[0])
                     bytes[1].append(new_bytes[1])
-                    # remove too old values when max depth is reached
-                    self.trunc_depth(bytes[0])
-                    self.trunc_depth(bytes[1])
+                # add new host pressure values to pressure lists
+                # a gap is recorded when the value is missing or when the pressure stall total has been reset
+                for name, lst in self.pressure.items():
+                    lst.append(integ_stats[5].get(name))
+                # add the host pressure values that were not available so far, after gaps for the previous dates
+                for name, new_value in integ_stats[5].items():
+                    if name not in self.pressure:
+                        series = self.pressure[name] = self.new_series()
+                        series.add_gaps(len(self.dates) - 1)
+                        series.append(new_value)
                 # add new Process CPU / Mem values to Process list
                 # as process list is dynamic, there are special rules
                 destroy_list = []
-                for named_pid, (cpu_stats, mem_stats) in self.proc.items():
-                    new_values = integ_stats[4].pop(named_pid, None)
+                for namespec, proc_stats in self.proc.items():
+                    new_values = integ_stats[4].pop((namespec, proc_stats.pid), None)
                     if new_values is None:
-                        # element is obsolete
-                        destroy_list.append(named_pid)
+                        pid_stats = stats[4].get(namespec)
+                        if pid_stats and pid_stats[0] != proc_stats.pid:
+                            # process has been restarted in the interval: restart its series
+                            proc_stats.reset(pid_stats[0])
+                        else:
+                            # element is obsolete
+                            destroy_list.append(namespec)
                     else:
                         new_cpu_value, new_mem_value = new_values
-                        cpu_stats.append(new_cpu_value)
-                        mem_stats.append(new_mem_value)
-                        # remove too old values when max depth is reached
-                        self.trunc_depth(cpu_stats)
-                        self.trunc_depth(mem_stats)
+                        proc_stats.cpu.append(new_cpu_value)
+                        proc_stats.mem.append(new_mem_value)
                 # destroy obsolete elements
-                for named_pid in destroy_list:
-                	del self.proc[named_pid]
-                # add new elements
-                for named_pid, (new_cpu_value, new_mem_value) in integ_stats[4].items():
-                	self.proc[named_pid] = [new_cpu_value], [new_mem_value]
+                for namespec in destroy_list:
+                	del self.proc[namespec]
+                # add new elements, except the ones released to respect the memory budget
+                for (namespec, pid), (new_cpu_value, new_mem_value) in integ_stats[4].items():
+                    if namespec in self.evicted:
+                        continue
+                    proc_stats = self.proc[namespec] = ProcessStatistics(pid, self.new_series(), self.new_series())
+                    proc_stats.cpu.append(new_cpu_value)
+                    proc_stats.mem.append(new_mem_value)
             else:
                 # init data structures (mem unchanged)
-                self.cpu = [[] for _ in stats[1]]
-                self.io = {intf: ([], []) for intf in stats[3].keys()}
-                self.proc = {(process_name, pid_stats[0]): ([], []) for process_name, pid_stats in stats[4].items()}
+                self.cpu = [self.new_series() for _ in stats[1]]
+                self.io = {intf: (self.new_series(), self.new_series()) for intf in stats[3].keys()}
+                self.proc = {namespec: ProcessStatistics(pid_stats[0], self.new_series(), self.new_series())
+                    for namespec, pid_stats in stats[4].items()}
+                self.pressure = {name: self.new_series() for name in stats[5]} if len(stats) > 5 else {}
             self.ref_stats = stats
 
-    # remove first data of all lists if size exceeds depth
-    def trunc_depth(self, lst):
-        """ Ensure that the list does not exceed the maimum historic size. """
-        while len(lst) > self.depth:
-            lst.pop(0)
+    def get_series(self, series, since=0, max_points=0):
+        """ Return the dates and the values of a series as compact lists.
+        The series are aligned on the most recent date, as the values are all appended at the same time.
+        Only the values whose date is after since are returned, downsampled to max_points if not null.
+        The gaps of the series are not returned.
+        The quantiles of the series are added if any value has been counted. """
+        # walk the dates of the series along with the values, without copying the whole deque of dates
+        columns = [islice(self.dates, max(0, len(self.dates) - len(series)), None), series]
+        rollup = isinstance(series, RollupSeries)
+        if rollup:
+            columns.extend([series.minimum, series.maximum])
+        rows = [row for row in izip(*columns) if row[0] > since and row[1] is not None]
+        dates, values = [row[0] for row in rows], [row[1] for row in rows]
+        indexes = get_lttb_indexes(dates, values, max_points)
+        result = {'dates': [dates[idx] for idx in indexes], 'values': [values[idx] for idx in indexes]}
+        if rollup:
+            result['minimum'] = [rows[idx][2] for idx in indexes]
+            result['maximum'] = [rows[idx][3] for idx in indexes]
+        if series.sketch.count:
+            result['quantiles'] = series.sketch.quantiles()
+        return result
+
+    def get_address_series(self, since=0, max_points=0):
+        """ Return the series of the address as compact lists. """
+        get_series = lambda x: self.get_series(x, since, max_points)
+        return {'cpu': map(get_series, self.cpu), 'mem': get_series(self.mem),
+            'io': {intf: {'recv': get_series(recv), 'sent': get_series(sent)} for intf, (recv, sent) in self.io.items()},
+            'pressure': {name: get_series(series) for name, series in self.pressure.items()}}
+
+    def get_process_series(self, namespec, since=0, max_points=0):
+        """ Return the series of the process as compact lists, or None if the process has no statistics. """
+        proc_stats = self.find_process_stats(namespec)
+        if proc_stats:
+            return {'pid': proc_stats.pid, 'cpu': self.get_series(proc_stats.cpu, since, max_points),
+                'mem': self.get_series(proc_stats.mem, since, max_points)}
+
+    def push_rollups(self, integ_stats):
+        """ Provide the new statistics to the coarser instances.
+        Each value is given as a triplet of mean, minimum and maximum values. """
+        if self.rollups:
+            extrema = lambda x: (x, x, x)
+            date, cpu, mem, io, proc, pressure = integ_stats
+            rolled_stats = (date, map(extrema, cpu), extrema(mem),
+                {intf: (extrema(recv), extrema(sent)) for intf, (recv, sent) in io.items()},
+                {named_pid: (extrema(proc_cpu), extrema(proc_mem)) for named_pid, (proc_cpu, proc_mem) in proc.items()},
+                {name: extrema(value) for name, value in pressure.items()})
+            for rollup in self.rollups:
+                rollup.push_rollup(rolled_stats)
+
+    def new_series(self, iterable=()):
+        """ Return a new series limited to the maximum historic size. """
+        return StatisticsSeries(self.depth, iterable)
+
+
+# Class for rolled-up statistics storage
+class RollupInstance(StatisticsInstance):
+    """ This class handles resources statistics for a given address and period,
+    derived from the statistics of a finer period instead of the raw measures.
+    Every ratio values of the finer period, the mean, minimum and maximum values are stored. """
+
+    def __init__(self, period, depth, ratio, writer=None):
+        """ Initalization of the attributes. """
+        self.ratio = ratio
+        StatisticsInstance.__init__(self, period, depth, writer)
+
+    def clear(self):
+        """ Reset all attributes. """
+        StatisticsInstance.clear(self)
+        # processes that got values since the last rollup
+        self.active = set()
+
+    def push_statistics(self, stats):
+        """ Raw measures are ignored as the statistics are provided by the finer instance. """
+
+    def push_rollup(self, rolled_stats):
+        """ Accumulate the statistics of the finer instance and store their rollup every ratio calls. """
+        date, cpu, mem, io, proc, pressure = rolled_stats
+        if not self.cpu:
+            self.cpu = [self.new_series() for _ in cpu]
+        for series, values in zip(self.cpu, cpu):
+            series.accumulate(values)
+        self.mem.accumulate(mem)
+        for intf, (recv, sent) in io.items():
+            series = self.io.get(intf)
+            if series is None:
+                # the new series hold gaps for the dates already stored
+                series = self.io[intf] = self.new_series(), self.new_series()
+                series[0].add_gaps(len(self.dates))
+                series[1].add_gaps(len(self.dates))
+            series[0].accumulate(recv)
+            series[1].accumulate(sent)
+        for name, values in pressure.items():
+            series = self.pressure.get(name)
+            if series is None:
+                series = self.pressure[name] = self.new_series()
+                series.add_gaps(len(self.dates))
+            series.accumulate(values)
+        for (namespec, pid), (proc_cpu, proc_mem) in proc.items():
+            if namespec in self.evicted:
+                continue
+            proc_stats = self.proc.get(namespec)
+            if proc_stats is None:
+                proc_stats = self.proc[namespec] = ProcessStatistics(pid, self.new_series(), self.new_series())
+            elif proc_stats.pid != pid:
+                # process has been restarted: restart its series
+                proc_stats.reset(pid)
+            proc_stats.cpu.accumulate(proc_cpu)
+            proc_stats.mem.accumulate(proc_mem)
+            self.active.add(namespec)
+        self.counter += 1
+        if self.counter % self.ratio == self.ratio - 1:
+            self.flush(date)
+
+    def flush(self, date):
+        """ Store the rollup of all series and provide it to the coarser instances. """
+        # destroy the processes that got no value in the interval
+        for namespec in set(self.proc.keys()) - self.active:
+            del self.proc[namespec]
+        self.active = set()
+        # store the rollups, the series that got no value in the interval storing a gap
+        cpu = [series.flush() for series in self.cpu]
+        mem = self.mem.flush()
+        io = {}
+        for intf, (recv, sent) in self.io.items():
+            values = recv.flush(), sent.flush()
+            if None not in values:
+                io[intf] = values
+        proc = {(namespec, proc_stats.pid): (proc_stats.cpu.flush(), proc_stats.mem.flush())
+            for namespec, proc_stats in self.proc.items()}
+        pressure = {}
+        for name, series in self.pressure.items():
+            values = series.flush()
+            if values is not None:
+                pressure[name] = values
+        self.dates.append(date)
+        rolled_stats = date, cpu, mem, io, proc, pressure
+        if self.writer:
+            self.writer(rolled_stats)
+        for rollup in self.rollups:
+            rollup.push_rollup(rolled_stats)
+
+    def new_series(self, iterable=()):
+        """ Return a new rollup series limited to the maximum historic size. """
+        return RollupSeries(self.depth, iterable)
+
+
+# Class for the resources consumed by the applications and the cluster
+class ClusterStatistics(object):
+    """ This class handles the resources consumed by the applications and by the whole cluster for a given period.
+    The totals are updated incrementally from the last statistics compiled for each address:
+    when new statistics of an address are received, its previous contribution is replaced.
+
+    Attributes are:
+
+        - contributions: the last contribution of each address, as a tuple of the number of processor cores,
+          the host CPU and memory values and the CPU, memory and number of processes per application,
+        - nbcores: the total number of processor cores,
+        - cpu: the sum of the host CPU values weighted by their number of processor cores,
+        - mem: the sum of the host memory values,
+        - applications: the sum of the process CPU and memory values and the number of processes per application. """
+
+    def __init__(self):
+        """ Initialization of the attributes. """
+        self.contributions = {}
+        self.nbcores = 0
+        self.cpu = 0.0
+        self.mem = 0.0
+        self.applications = {}
+
+    def update(self, address, nbcores, stats):
+        """ Replace the contribution of the address with the statistics compiled. """
+        applications = {}
+        for (namespec, pid), (proc_cpu, proc_mem) in stats[4].items():
+            totals = applications.setdefault(split_namespec(namespec)[0], [0.0, 0.0, 0])
+            totals[0] += mean_value(proc_cpu)
+            totals[1] += mean_value(proc_mem)
+            totals[2] += 1
+        self.remove(address)
+        contribution = self.contributions[address] = (nbcores, mean_value(stats[1][0]), mean_value(stats[2]),
+            applications)
+        self.add(contribution, 1)
+
+    def remove(self, address):
+        """ Remove the contribution of the address, if any. """
+        contribution = self.contributions.pop(address, None)
+        if contribution:
+            self.add(contribution, -1)
+
+    def add(self, contribution, sign):
+        """ Add (sign=1) or subtract (sign=-1) a contribution to the totals. """
+        nbcores, cpu, mem, applications = contribution
+        self.nbcores += sign * nbcores
+        self.cpu += sign * cpu * nbcores
+        self.mem += sign * mem
+        for application_name, (app_cpu, app_mem, count) in applications.items():
+            totals = self.applications.setdefault(application_name, [0.0, 0.0, 0])
+            totals[0] += sign * app_cpu
+            totals[1] += sign * app_mem
+            totals[2] += sign * count
+            if not totals[2]:
+                del self.applications[application_name]
+
+    def get_cluster_stats(self):
+        """ Return the CPU and memory occupation of the whole cluster, in %. """
+        nb_addresses = len(self.contributions)
+        return {'cpu': self.cpu / self.nbcores if self.nbcores else 0.0,
+            'mem': self.mem / nb_addresses if nb_addresses else 0.0,
+            'nbcores': self.nbcores, 'addresses': nb_addresses}
+
+    def get_application_stats(self, application_name):
+        """ Return the sum of the CPU and memory values of the processes of the application.
+        As for the processes, the CPU value is given in IRIX mode, i.e. 100% corresponds to a full processor core. """
+        cpu, mem, count = self.applications.get(application_name, (0.0, 0.0, 0))
+        return {'cpu': cpu, 'mem': mem, 'processes': count}
 
 
 # Class used to compile statistics coming from all addresses
@@ -177,25 +900,177 @@ class StatisticsCompiler(object):
     Attributes are:
     
         - data: a dictionary containing a StatisticsInstance entry for each pair of address and period,
-        - cores: a dictionary giving the number of processor cores per address.
+        - cores: a dictionary giving the number of processor cores per address,
+        - store: the optional on-disk store of the statistics,
+        - vectorized: True if the statistics are compiled using numpy,
+        - clusters: a dictionary containing a ClusterStatistics entry for each period,
+        - version: a counter incremented each time the statistics change,
+        - budget: the maximum memory used by the statistics instances (no limit if null),
+        - usage: a dictionary giving the memory used by the statistics instances per address,
+        - pushes: a dictionary giving the number of statistics pushed per address.
         """
 
+    # the budget is enforced until the memory usage is lower than this ratio of the budget
+    LOW_WATERMARK = 0.9
+    # number of statistics pushed between two estimates of the memory usage of an address
+    USAGE_PERIOD = 12
+    # delay in seconds after which the process series that have not been requested can be released
+    VIEW_TIMEOUT = 600
+    # states of the addresses whose statistics are released first
+    DEAD_STATES = [AddressStates.SILENT, AddressStates.ISOLATING, AddressStates.ISOLATED]
+
     def __init__(self, supvisors):
         """ Initialization of the attributes. """
-        self.data = {address: {period: StatisticsInstance(period, supvisors.options.stats_histo)
-            for period in supvisors.options.stats_periods}
-            for address in supvisors.address_mapper.addresses}
+        self.supvisors = supvisors
+        options = supvisors.options
+        self.vectorized = False
+        if options.stats_vectorized:
+            if numpy:
+                self.vectorized = True
+            else:
+                supvisors.logger.warn('numpy not installed: statistics compiled in pure Python')
+        self.store = None
+        if options.stats_store:
+            from supvisors.statsstore import StatisticsStore
+            self.store = StatisticsStore(options.stats_store, options.stats_store_size, options.stats_histo,
+                supvisors.logger)
+        self.clusters = {period: ClusterStatistics() for period in options.stats_periods}
+        self.data = {address: self.create_instances(options.stats_periods, options.stats_histo,
+            self.write_statistics, address) for address in supvisors.address_mapper.addresses}
         self.nbcores = {address: 1 for address in supvisors.address_mapper.addresses}
+        self.version = 0
+        self.budget = options.stats_memory
+        self.usage = {address: 0 for address in supvisors.address_mapper.addresses}
+        self.pushes = {address: 0 for address in supvisors.address_mapper.addresses}
+        for address in self.data:
+            self.update_usage(address)
+
+    @staticmethod
+    def create_instances(periods, depth, writer=None, address=None):
+        """ Return a StatisticsInstance per period.
+        A period that is a multiple of a finer period is rolled up from the coarsest of them.
+        The other ones are computed from the raw measures.
+        When a writer is provided, it is called with the address, the period and the statistics compiled. """
+        instances = {}
+        for period in sorted(periods):
+            period_writer = partial(writer, address, period) if writer else None
+            finer_period = next((finer_period for finer_period in sorted(instances.keys(), reverse=True)
+                if period % finer_period == 0), None)
+            if finer_period:
+                instance = RollupInstance(period, depth, period / finer_period, period_writer)
+                instances[finer_period].rollups.append(instance)
+            else:
+                instance = StatisticsInstance(period, depth, period_writer)
+            instances[period] = instance
+        return instances
+
+    def close(self):
+        """ Release the on-disk store, if any. """
+        if self.store:
+            self.store.close()
+
+    def get_application_sketches(self, application_name, period):
+        """ Return the merged sketches of the CPU and memory values of the application processes on all addresses. """
+        cpu, mem = QuantileSketch(), QuantileSketch()
+        for instances in self.data.values():
+            for namespec, proc_stats in instances[period].proc.items():
+                if split_namespec(namespec)[0] == application_name:
+                    cpu.merge(proc_stats.cpu.sketch)
+                    mem.merge(proc_stats.mem.sketch)
+        return cpu, mem
+
+    def write_statistics(self, address, period, stats):
+        """ Store the statistics compiled for the address and the period and update the cluster totals.
+        The addresses that are not alive anymore do not contribute to the cluster totals. """
+        if self.store:
+            self.store.append(address, period, stats)
+        status = self.supvisors.context.addresses.get(address)
+        if not status or status.state not in self.DEAD_STATES:
+            self.clusters[period].update(address, self.nbcores[address], stats)
+
+    def remove_contributions(self, address):
+        """ Remove the contribution of the address to the cluster totals, for all periods. """
+        for cluster in self.clusters.values():
+            cluster.remove(address)
+        self.version += 1
 
     def clear(self, address):
         """ For a given address, clear the StatisticsInstance for all periods. """
         for period in self.data[address].values():
             period.clear()
+        self.remove_contributions(address)
+        self.update_usage(address)
 
     def push_statistics(self, address, stats):
-        """ Insert a new statistics measure for address. """
-        for period in self.data[address].values():
-            period.push_statistics(stats)
+        """ Insert a new statistics measure for address.
+        In vectorized mode, the measure is converted once into a snapshot shared by all periods. """
         # set the number of processor cores
         nb = len(stats[1])
         self.nbcores[address] = nb if nb == 1 else nb-1
+        if self.vectorized:
+            stats = StatisticsSnapshot(stats)
+        for period in self.data[address].values():
+            period.push_statistics(stats)
+        if self.budget:
+            # the estimate of the memory usage is proportional to the number of series,
+            # so it is only updated periodically
+            self.pushes[address] += 1
+            if self.pushes[address] % self.USAGE_PERIOD == 0:
+                self.update_usage(address)
+                if self.get_memory_usage() > self.budget:
+                    self.enforce_budget()
+        self.version += 1
+
+    def update_usage(self, address):
+        """ Compute the memory used by the statistics instances of the address. """
+        self.usage[address] = sum(instance.memory_size() for instance in self.data[address].values())
+
+    def get_memory_usage(self):
+        """ Return an estimate of the memory used by all statistics instances, in bytes.
+        Without budget, the usage is not maintained when the statistics are pushed, so it is computed here. """
+        if not self.budget:
+            for address in self.data:
+                self.update_usage(address)
+        return sum(self.usage.values())
+
+    def enforce_budget(self):
+        """ Release statistics until the memory usage gets lower than the low watermark of the budget.
+        The statistics are released in the following order:
+            - the statistics of the addresses that are not alive anymore,
+            - the process series that have not been requested for VIEW_TIMEOUT seconds, the least recently used first,
+            - every other value of the oldest half of the series, starting with the largest instances. """
+        target = self.budget * self.LOW_WATERMARK
+        # start from an up-to-date usage
+        for address in self.data:
+            self.update_usage(address)
+        # release the statistics of the dead addresses
+        addresses = self.supvisors.context.addresses
+        for address in self.data:
+            status = addresses.get(address)
+            if status and status.state in self.DEAD_STATES and self.usage[address] > 0:
+                self.clear(address)
+        # release the process series that have not been requested recently
+        if self.get_memory_usage() > target:
+            limit = time() - self.VIEW_TIMEOUT
+            candidates = sorted((proc_stats.viewed, address, period, namespec)
+                for address, instances in self.data.items()
+                for period, instance in instances.items()
+                for namespec, proc_stats in instance.proc.items() if proc_stats.viewed < limit)
+            for _, address, period, namespec in candidates:
+                if self.get_memory_usage() <= target:
+                    break
+                instance = self.data[address][period]
+                self.usage[address] -= instance.proc[namespec].memory_size()
+                instance.evict(namespec)
+        # downsample the oldest values of the largest instances
+        while self.get_memory_usage() > target:
+            instances = sorted(((instance.memory_size(), address, period)
+                for address, instances in self.data.items()
+                for period, instance in instances.items()), reverse=True)
+            address = next((address for _, address, period in instances
+                if self.data[address][period].downsample()), None)
+            if address is None:
+                self.supvisors.logger.warn('statistics memory budget cannot be respected: {} bytes used'.format(
+                    self.get_memory_usage()))
+                break
+            self.update_usage(address)
@@ -0,0 +1,278 @@
+#!/usr/bin/python
+#-*- coding: utf-8 -*-
+
+# ======================================================================
+# Copyright 2016 Julien LE CLEACH
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ======================================================================
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+
+from collections import OrderedDict
+from fnmatch import fnmatch
+from time import time
+
+from supvisors.statscompiler import mean_value
+
+
+# Segment file format: a header followed by a ring buffer of (date, value) records
+SEGMENT_MAGIC = 'SUPVSEG1'
+SEGMENT_HEADER = struct.Struct('<8sIII')
+SEGMENT_RECORD = struct.Struct('<dd')
+SEGMENT_DATA_OFFSET = 32
+SEGMENT_EXTENSION = '.seg'
+
+
+def segment_size(capacity):
+    """ Return the size in bytes of a segment file holding capacity records. """
+    return SEGMENT_DATA_OFFSET + capacity * SEGMENT_RECORD.size
+
+
+class StatisticsSegment(object):
+    """ Fixed-size memory-mapped file holding the last values of a statistics series.
+
+    Attributes are:
+
+        - filename: the path of the segment file,
+        - capacity: the maximum number of records,
+        - count: the number of records stored,
+        - head: the index of the next record to write,
+        - mapping: the memory map of the file. """
+
+    def __init__(self, filename, capacity):
+        """ Open the segment file, or create it if it does not exist or if its capacity has changed. """
+        self.filename = filename
+        self.capacity = capacity
+        size = segment_size(capacity)
+        with open(filename, 'r+b' if os.path.exists(filename) else 'w+b') as segment_file:
+            segment_file.seek(0, os.SEEK_END)
+            if segment_file.tell() != size:
+                segment_file.truncate(0)
+                segment_file.truncate(size)
+            # the memory map keeps its own reference on the file
+            self.mapping = mmap.mmap(segment_file.fileno(), size)
+        magic, capacity, self.count, self.head = SEGMENT_HEADER.unpack_from(self.mapping)
+        if magic != SEGMENT_MAGIC or capacity != self.capacity or self.count > capacity or self.head >= capacity:
+            self.count = self.head = 0
+            self.write_header()
+
+    def write_header(self):
+        """ Write the header of the segment file. """
+        SEGMENT_HEADER.pack_into(self.mapping, 0, SEGMENT_MAGIC, self.capacity, self.count, self.head)
+
+    def append(self, date, value):
+        """ Write a new record, overwriting the oldest one when the capacity is reached. """
+        SEGMENT_RECORD.pack_into(self.mapping, SEGMENT_DATA_OFFSET + self.head * SEGMENT_RECORD.size, date, value)
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        self.write_header()
+
+    def close(self):
+        """ Write the memory map to the file and release it. """
+        self.mapping.flush()
+        self.mapping.close()
+
+
+def read_segment(filename):
+    """ Return the records of a segment file, from the oldest to the newest.
+    The file is read without memory map so that it can be used offline. """
+    with open(filename, 'rb') as segment_file:
+        contents = segment_file.read()
+    magic, capacity, count, head = SEGMENT_HEADER.unpack_from(contents)
+    if magic != SEGMENT_MAGIC or len(contents) != segment_size(capacity) or count > capacity or head >= capacity:
+        raise ValueError('invalid statistics segment file: {}'.format(filename))
+    indexes = range(head - count, head)
+    return [SEGMENT_RECORD.unpack_from(contents, SEGMENT_DATA_OFFSET + (index % capacity) * SEGMENT_RECORD.size)
+        for index in indexes]
+
+
+def series_values(stats):
+    """ Return the name and the value of each series included in compiled statistics. """
+    date, cpu, mem, io, proc, pressure = stats
+    for idx, value in enumerate(cpu):
+        yield 'cpu.{}'.format(idx - 1 if idx > 0 else 'all'), mean_value(value)
+    yield 'mem', mean_value(mem)
+    for intf, (recv, sent) in io.items():
+        yield 'io.{}.recv'.format(intf), mean_value(recv)
+        yield 'io.{}.sent'.format(intf), mean_value(sent)
+    for (namespec, pid), (proc_cpu, proc_mem) in proc.items():
+        yield 'proc.{}.cpu'.format(namespec), mean_value(proc_cpu)
+        yield 'proc.{}.mem'.format(namespec), mean_value(proc_mem)
+    for name, value in pressure.items():
+        yield 'pressure.{}'.format(name), mean_value(value)
+
+
+class StatisticsStore(object):
+    """ On-disk store of the compiled statistics.
+    There is one segment file per address, period and series, under directory/address/period.
+    The total size of the segment files is bounded by a size budget. When the budget is reached, the segment files
+    of the series that have not been stored for IDLE_DELAY seconds are deleted, the least recently stored first,
+    including the files of the series unknown since the store has been opened.
+    The segments are kept mapped while their series are stored, so that the statistics are appended without
+    file operations. Beyond MAX_MAPPED segments, the idle segments are unmapped, the least recently stored first.
+
+    Attributes are:
+
+        - directory: the root directory of the store,
+        - budget: the maximum size in bytes of all segment files,
+        - capacity: the number of records per segment,
+        - logger: the Supvisors logger,
+        - used: the size in bytes of the existing segment files,
+        - segments: the segments mapped, indexed by address, period and series name, the least recently stored first,
+        - stored: the time when a series has been stored for the last time, per segment file,
+        - exhausted: True when a segment could not be created because of the budget,
+        - reclaimed: the time of the last failed attempt to reclaim segment files. """
+
+    # maximum number of segments kept mapped, unless they are all in use
+    MAX_MAPPED = 1024
+    # delay in seconds after which a series that has not been stored is idle
+    IDLE_DELAY = 60
+
+    def __init__(self, directory, budget, capacity, logger):
+        """ Initialization of the attributes.
+        The existing segment files are only counted, their contents are not loaded. """
+        self.directory = directory
+        self.budget = budget
+        self.capacity = capacity
+        self.logger = logger
+        self.segments = OrderedDict()
+        self.stored = {}
+        self.exhausted = False
+        self.reclaimed = None
+        self.used = 0
+        for root, dirs, files in os.walk(directory):
+            self.used += sum(os.path.getsize(os.path.join(root, filename))
+                for filename in files if filename.endswith(SEGMENT_EXTENSION))
+
+    def get_filename(self, address, period, name):
+        """ Return the path of the segment file for the address, the period and the series name. """
+        return os.path.join(self.directory, address, str(period), name.replace(os.sep, '_') + SEGMENT_EXTENSION)
+
+    def get_segment(self, address, period, name, now):
+        """ Return the segment of the series, or None if the size budget does not allow its creation.
+        The segment is moved to the end of the mapped segments, as the most recently stored. """
+        key = address, period, name
+        segment = self.segments.pop(key, None)
+        if segment is None:
+            filename = self.get_filename(address, period, name)
+            # the size of an existing file changes if the capacity has changed
+            current = os.path.getsize(filename) if os.path.exists(filename) else 0
+            size = segment_size(self.capacity) - current
+            if size > 0 and self.used + size > self.budget and not self.reclaim(size, now, filename):
+                if not self.exhausted:
+                    self.logger.warn('statistics store budget reached: new series are not stored')
+                    self.exhausted = True
+                return None
+            if not current:
+                dirname = os.path.dirname(filename)
+                if not os.path.isdir(dirname):
+                    os.makedirs(dirname)
+            segment = StatisticsSegment(filename, self.capacity)
+            self.used += size
+            self.exhausted = False
+        self.segments[key] = segment
+        self.stored[segment.filename] = now
+        return segment
+
+    def reclaim(self, size, now, excluded):
+        """ Delete the segment files of the idle series, the least recently stored first, except the excluded one,
+        until size bytes can be added within the budget.
+        The files of the series unknown since the store has been opened are dated by their modification time.
+        The directory is scanned at most once per IDLE_DELAY while nothing can be reclaimed.
+        Return True if the size is available. """
+        if self.reclaimed is not None and now - self.reclaimed < self.IDLE_DELAY:
+            return False
+        candidates = []
+        for root, dirs, files in os.walk(self.directory):
+            for filename in files:
+                filename = os.path.join(root, filename)
+                if filename.endswith(SEGMENT_EXTENSION) and filename != excluded:
+                    stored = self.stored.get(filename)
+                    if stored is None:
+                        stored = os.path.getmtime(filename)
+                    if now - stored >= self.IDLE_DELAY:
+                        candidates.append((stored, filename))
+        mapped = {segment.filename: key for key, segment in self.segments.items()}
+        for _, filename in sorted(candidates):
+            if self.used + size <= self.budget:
+                break
+            key = mapped.get(filename)
+            if key:
+                self.segments.pop(key).close()
+            self.used -= os.path.getsize(filename)
+            os.remove(filename)
+            self.stored.pop(filename, None)
+        if self.used + size <= self.budget:
+            self.reclaimed = None
+            return True
+        self.reclaimed = now
+        return False
+
+    def unmap_idle(self, now):
+        """ Unmap the idle segments, the least recently stored first, while more than MAX_MAPPED are mapped. """
+        while len(self.segments) > self.MAX_MAPPED:
+            key = next(iter(self.segments))
+            if now - self.stored[self.segments[key].filename] < self.IDLE_DELAY:
+                break
+            self.segments.pop(key).close()
+
+    def append(self, address, period, stats):
+        """ Store the compiled statistics of the address for the period. """
+        date, now = stats[0], time()
+        for name, value in series_values(stats):
+            segment = self.get_segment(address, period, name, now)
+            if segment:
+                segment.append(date, value)
+        self.unmap_idle(now)
+
+    def close(self):
+        """ Release all segments. """
+        for segment in self.segments.values():
+            segment.close()
+        self.segments.clear()
+
+
+def read_store(directory):
+    """ Return the records of all the segment files of the store, as tuples of address, period, series name and records. """
+    for address in sorted(os.listdir(directory)):
+        address_dir = os.path.join(directory, address)
+        for period in sorted(os.listdir(address_dir), key=int):
+            period_dir = os.path.join(address_dir, period)
+            for filename in sorted(os.listdir(period_dir)):
+                if filename.endswith(SEGMENT_EXTENSION):
+                    name = filename[:-len(SEGMENT_EXTENSION)]
+                    yield address, int(period), name, read_segment(os.path.join(period_dir, filename))
+
+
+def main(args):
+    """ Offline export of a statistics store in CSV format. """
+    parser = argparse.ArgumentParser(description='Export the statistics stored by Supvisors in CSV format.')
+    parser.add_argument('directory', help='the directory of the statistics store (stats_store option)')
+    parser.add_argument('-a', '--address', help='the address to export')
+    parser.add_argument('-p', '--period', type=int, help='the period to export')
+    parser.add_argument('-s', '--series', default='*', help='the pattern of the series names to export')
+    options = parser.parse_args(args)
+    sys.stdout.write('address,period,series,date,value\n')
+    for address, period, name, records in read_store(options.directory):
+        if options.address in [None, address] and options.period in [None, period] and fnmatch(name, options.series):
+            for date, value in records:
+                sys.stdout.write('{},{},{},{},{}\n'.format(address, period, name, date, value))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
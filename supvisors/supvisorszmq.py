@@ -116,7 +116,8 @@ class InternalEventSubscriber(object):
 
 
 class EventPublisher(object):
-    """ Class for ZMQ publication of Supvisors events. """
+    """ Class for ZMQ publication of Supvisors events.
+    The events are also kept in the event journal of Supvisors, so that the web pages are updated with them. """
 
     def __init__(self, zmq_context, supvisors):
         """ Initialization of the attributes. """
@@ -131,29 +132,36 @@ class EventPublisher(object):
         """ This method closes the PyZMQ socket. """
         self.socket.close()
 
+    def send_status(self, header, payload):
+        """ This method sends the serialized status through the socket and adds it to the event journal. """
+        self.socket.send_string(header, zmq.SNDMORE)
+        self.socket.send_json(payload)
+        self.supvisors.event_journal.add_event(header, payload)
+
     def send_supvisors_status(self, status):
         """ This method sends a serialized form of the supvisors status through the socket. """
         self.supvisors.logger.debug('send SupvisorsStatus {}'.format(status))
-        self.socket.send_string(EventHeaders.SUPVISORS, zmq.SNDMORE)
-        self.socket.send_json(status.serial())
+        self.send_status(EventHeaders.SUPVISORS, status.serial())
 
     def send_address_status(self, status):
         """ This method sends a serialized form of the address status through the socket. """
         self.supvisors.logger.debug('send RemoteStatus {}'.format(status))
-        self.socket.send_string(EventHeaders.ADDRESS, zmq.SNDMORE)
-        self.socket.send_json(status.serial())
+        self.send_status(EventHeaders.ADDRESS, status.serial())
 
     def send_application_status(self, status):
         """ This method sends a serialized form of the application status through the socket. """
         self.supvisors.logger.debug('send ApplicationStatus {}'.format(status))
-        self.socket.send_string(EventHeaders.APPLICATION, zmq.SNDMORE)
-        self.socket.send_json(status.serial())
+        self.send_status(EventHeaders.APPLICATION, status.serial())
 
     def send_process_status(self, status):
         """ This method sends a serialized form of the process status through the socket. """
         self.supvisors.logger.debug('send ProcessStatus {}'.format(status))
-        self.socket.send_string(EventHeaders.PROCESS, zmq.SNDMORE)
-        self.socket.send_json(status.serial())
+        self.send_status(EventHeaders.PROCESS, status.serial())
+
+    def send_alert_status(self, status):
+        """ This method sends a serialized form of the alert status through the socket. """
+        self.supvisors.logger.debug('send AlertStatus {}'.format(status))
+        self.send_status(EventHeaders.ALERT, status.serial())
 
 
 class EventSubscriber(object):
@@ -210,6 +218,10 @@ class EventSubscriber(object):
         """ Subscription to Process status events. """
         self.subscribe(EventHeaders.PROCESS)
 
+    def subscribe_alert_status(self):
+        """ Subscription to Alert status events. """
+        self.subscribe(EventHeaders.ALERT)
+
     def subscribe(self, code):
         """ Subscription to the event named code. """
         self.socket.setsockopt(zmq.SUBSCRIBE, code.encode('utf-8'))
@@ -235,6 +247,10 @@ class EventSubscriber(object):
         """ Subscription to Process status events. """
         self.unsubscribe(EventHeaders.PROCESS)
 
+    def unsubscribe_alert_status(self):
+        """ Subscription to Alert status events. """
+        self.unsubscribe(EventHeaders.ALERT)
+
     def unsubscribe(self, code):
         """ Remove subscription to the event named code. """
         self.socket.setsockopt(zmq.UNSUBSCRIBE, code.encode('utf-8'))
@@ -328,6 +344,11 @@ class RequestPusher(object):
         self.logger.debug('send SHUTDOWN {}'.format(address_name))
         self.socket.send_pyobj((DeferredRequestHeaders.SHUTDOWN, (address_name, )))
 
+    def send_load_registry(self, address_name):
+        """ Send request to get the namespec identifiers used by an address. """
+        self.logger.debug('send LOAD_REGISTRY {}'.format(address_name))
+        self.socket.send_pyobj((DeferredRequestHeaders.LOAD_REGISTRY, (address_name, )))
+
 
 class SupvisorsZmq():
     """ Class for PyZmq context and sockets.  """
@@ -0,0 +1,99 @@
+#!/usr/bin/python
+#-*- coding: utf-8 -*-
+
+# ======================================================================
+# Copyright 2016 Julien LE CLEACH
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ======================================================================
+
+from xml.sax.saxutils import escape
+
+from supvisors.plot import StatisticsPlot
+
+
+# size of the image, same as the matplotlib figure (6x3 inches at 80 dpi)
+WIDTH, HEIGHT = 480, 240
+# margins of the drawing area
+LEFT, RIGHT, TOP, BOTTOM = 40, 10, 10, 20
+# colors of the curves, same as the default cycle of matplotlib
+COLORS = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728']
+
+
+def get_segments(ydata):
+    """ Return the lists of consecutive (index, value) pairs of the values, split at the None gaps. """
+    segments, segment = [], []
+    for idx, value in enumerate(ydata):
+        if value is None:
+            if segment:
+                segments.append(segment)
+            segment = []
+        else:
+            segment.append((idx, value))
+    if segment:
+        segments.append(segment)
+    return segments
+
+
+def render_svg(curves):
+    """ Return the SVG image of the curves.
+    Each curve is given as a tuple of title, unit, values and statistics, as returned by utils.get_stats.
+    The same elements as the matplotlib plot are drawn: the values with a plain line, the mean value with
+    a dashed line, the linear regression with a dotted line and the standard deviation with a colored area.
+    The None values are gaps that break the plain line. """
+    # calculate max range
+    all_ydata = [value for _, _, ydata, _ in curves for value in ydata if value is not None]
+    min_range, max_range = StatisticsPlot.get_range(all_ydata)
+    if max_range <= min_range:
+        max_range = min_range + 1
+    width, height = WIDTH - LEFT - RIGHT, HEIGHT - TOP - BOTTOM
+    size = max(len(ydata) for _, _, ydata, _ in curves)
+    x = lambda idx: LEFT + (idx * width / float(size - 1) if size > 1 else 0)
+    y = lambda value: TOP + height * (max_range - value) / (max_range - min_range)
+    lines = ['<svg xmlns="http://www.w3.org/2000/svg" width="{}" height="{}" font-family="sans-serif" '
+        'font-size="10">'.format(WIDTH, HEIGHT),
+        '<rect width="{}" height="{}" fill="white"/>'.format(WIDTH, HEIGHT),
+        '<rect x="{}" y="{}" width="{}" height="{}" fill="none" stroke="black"/>'.format(LEFT, TOP, width, height)]
+    # draw the ticks of the values
+    for tick in range(5):
+        value = min_range + tick * (max_range - min_range) / 4.0
+        lines.append('<text x="{}" y="{:.1f}" text-anchor="end" dominant-baseline="middle">{:.{}f}</text>'.format(
+            LEFT - 4, y(value), value, 1 if value < 10 else 0))
+    # draw each series of data
+    for idx, (title, unit, ydata, stats) in enumerate(curves):
+        color = COLORS[idx % len(COLORS)]
+        last = len(ydata) - 1
+        avg, rate, (a, b), dev = stats
+        if dev is not None:
+            # draw the standard deviation
+            lines.append('<rect x="{:.1f}" y="{:.1f}" width="{:.1f}" height="{:.1f}" fill="{}" fill-opacity="0.3"/>'.format(
+                x(0), y(avg + dev), x(last) - x(0), y(avg - dev) - y(avg + dev), color))
+        # draw the values, one line per segment between the gaps
+        for segment in get_segments(ydata):
+            lines.append('<polyline points="{}" fill="none" stroke="{}"/>'.format(
+                ' '.join('{:.1f},{:.1f}'.format(x(i), y(value)) for i, value in segment), color))
+        # draw the mean line
+        lines.append('<line x1="{:.1f}" y1="{:.1f}" x2="{:.1f}" y2="{:.1f}" stroke="{}" stroke-dasharray="6,4"/>'.format(
+            x(0), y(avg), x(last), y(avg), color))
+        if a is not None:
+            # draw the linear regression
+            lines.append('<line x1="{:.1f}" y1="{:.1f}" x2="{:.1f}" y2="{:.1f}" stroke="{}" stroke-dasharray="2,3"/>'.format(
+                x(0), y(b), x(last), y(a * last + b), color))
+        # draw the legend
+        top = TOP + 8 + idx * 28
+        lines.append('<rect x="{}" y="{}" width="12" height="2" fill="{}"/>'.format(LEFT + 6, top - 1, color))
+        lines.append('<text x="{}" y="{}" dominant-baseline="middle">{}</text>'.format(LEFT + 22, top, escape(title)))
+        lines.append('<text x="{}" y="{}" dominant-baseline="middle">{}</text>'.format(LEFT + 22, top + 12,
+            escape('Mean: {:.2f}{}'.format(avg, unit))))
+    lines.append('</svg>')
+    return '\n'.join(lines)
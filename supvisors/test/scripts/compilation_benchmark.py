@@ -0,0 +1,94 @@
+#!/usr/bin/python
+#-*- coding: utf-8 -*-
+
+# ======================================================================
+# Copyright 2016 Julien LE CLEACH
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ======================================================================
+
+import argparse
+import sys
+import time
+
+from supvisors import statscompiler
+from supvisors.statscompiler import StatisticsCompiler, StatisticsSnapshot, statistics
+from scripts.statistics_benchmark import create_measures
+
+
+def run_statistics(measures, vectorized):
+    """ Compile the statistics between the consecutive measures of all addresses and return the duration.
+    The conversion of the measures into snapshots is included. """
+    start = time.time()
+    for address_measures in measures.values():
+        ref = None
+        for stats in address_measures:
+            if vectorized:
+                stats = StatisticsSnapshot(stats)
+            if ref:
+                statistics(stats, ref)
+            ref = stats
+    return time.time() - start
+
+
+def run_compilation(measures, periods, depth, vectorized):
+    """ Push the measures of all addresses, as done by the StatisticsCompiler, and return the duration. """
+    data = {address: StatisticsCompiler.create_instances(periods, depth) for address in measures}
+    start = time.time()
+    for idx in range(len(measures.values()[0])):
+        for address, address_measures in measures.items():
+            stats = address_measures[idx]
+            if vectorized:
+                stats = StatisticsSnapshot(stats)
+            for instance in data[address].values():
+                instance.push_statistics(stats)
+    return time.time() - start
+
+
+def run_benchmark(nb_addresses, count, periods, depth, nb_cores, nb_interfaces, nb_processes):
+    """ Compare the compilation of the statistics in pure Python and with numpy. """
+    measures = {'10.0.{}.{}'.format(idx / 256, idx % 256): create_measures(count, nb_cores, nb_interfaces, nb_processes)
+        for idx in range(nb_addresses)}
+    print('addresses={} measures={} periods={} cores={} interfaces={} processes={}'.format(
+        nb_addresses, count, periods, nb_cores, nb_interfaces, nb_processes))
+    nb_pushes = nb_addresses * count
+    modes = [('pure Python', False)]
+    if statscompiler.numpy:
+        modes.append(('numpy', True))
+    else:
+        print('    numpy: not installed')
+    for name, vectorized in modes:
+        duration = run_statistics(measures, vectorized)
+        print('    {}: {:.3f} ms per compilation'.format(name, 1000.0 * duration / nb_pushes))
+        duration = run_compilation(measures, periods, depth, vectorized)
+        print('    {}: {:.3f} ms per push into all periods'.format(name, 1000.0 * duration / nb_pushes))
+
+
+def main(args):
+    """ Parse the arguments and run the benchmark. """
+    parser = argparse.ArgumentParser(description='Benchmark of the Supvisors statistics compilation.')
+    parser.add_argument('-a', '--addresses', type=int, default=100, help='the number of addresses')
+    parser.add_argument('-m', '--measures', type=int, default=20, help='the number of measures pushed per address')
+    parser.add_argument('-P', '--periods', type=int, nargs='+', default=[5, 15, 60],
+        help='the statistics periods (stats_periods)')
+    parser.add_argument('-d', '--depth', type=int, default=200, help='the statistics history depth (stats_histo)')
+    parser.add_argument('-c', '--cores', type=int, default=128, help='the number of processor cores')
+    parser.add_argument('-i', '--interfaces', type=int, default=4, help='the number of network interfaces')
+    parser.add_argument('-p', '--processes', type=int, default=100, help='the number of processes per address')
+    options = parser.parse_args(args)
+    run_benchmark(options.addresses, options.measures, options.periods, options.depth,
+        options.cores, options.interfaces, options.processes)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,87 @@
+#!/usr/bin/python
+#-*- coding: utf-8 -*-
+
+# ======================================================================
+# Copyright 2016 Julien LE CLEACH
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ======================================================================
+
+import argparse
+import random
+import resource
+import sys
+import time
+
+from supvisors.statscompiler import StatisticsInstance
+
+
+def create_measures(count, nb_cores, nb_interfaces, nb_processes):
+    """ Return a list of consistent instant statistics, as built by the statscollector module. """
+    measures = []
+    cpu = [[0.0, 0.0] for _ in range(nb_cores + 1)]
+    io = {'eth{}'.format(idx): [0, 0] for idx in range(nb_interfaces)}
+    proc = {'group:process_{}'.format(idx): [idx + 1000, [0.0, 0.0]] for idx in range(nb_processes)}
+    for idx in range(count):
+        for jiffies in cpu:
+            jiffies[0] += random.uniform(0.0, 5.0)
+            jiffies[1] += random.uniform(0.0, 5.0)
+        for bytes in io.values():
+            bytes[0] += random.randint(0, 100000)
+            bytes[1] += random.randint(0, 100000)
+        for pid_stats in proc.values():
+            pid_stats[1][0] += random.uniform(0.0, 0.5)
+            pid_stats[1][1] = random.uniform(0.0, 10.0)
+        measures.append((idx * 5.0, [tuple(jiffies) for jiffies in cpu], random.uniform(0.0, 100.0),
+            {intf: tuple(bytes) for intf, bytes in io.items()},
+            {namespec: (pid, tuple(values)) for namespec, (pid, values) in proc.items()},
+            {'load1': random.uniform(0.0, 4.0), 'cpu_some': idx * 1000}))
+    return measures
+
+
+def run_benchmark(depth, count, nb_cores, nb_interfaces, nb_processes):
+    """ Push the measures into a StatisticsInstance and print the time and memory consumed. """
+    measures = create_measures(count + 100, nb_cores, nb_interfaces, nb_processes)
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    instance = StatisticsInstance(5, depth)
+    start = time.time()
+    for stats in measures[:count]:
+        instance.push_statistics(stats)
+    duration = time.time() - start
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # measure the push time once the depth is reached, i.e. when the oldest values are discarded
+    start = time.time()
+    for stats in measures[count:]:
+        instance.push_statistics(stats)
+    full_duration = time.time() - start
+    nb_series = len(instance.cpu) + 1 + 2 * len(instance.io) + 2 * len(instance.proc) + len(instance.pressure)
+    print('depth={} measures={} series={}'.format(depth, count, nb_series))
+    print('    mean push time: {:.3f} ms'.format(1000.0 * duration / count))
+    print('    mean push time at full depth: {:.3f} ms'.format(1000.0 * full_duration / 100))
+    print('    max RSS increase: {} kB'.format(rss_after - rss_before))
+
+
+def main(args):
+    """ Parse the arguments and run the benchmark. """
+    parser = argparse.ArgumentParser(description='Benchmark of the Supvisors statistics storage.')
+    parser.add_argument('-d', '--depth', type=int, default=1500, help='the statistics history depth (stats_histo)')
+    parser.add_argument('-m', '--measures', type=int, default=3000, help='the number of measures pushed')
+    parser.add_argument('-c', '--cores', type=int, default=8, help='the number of processor cores')
+    parser.add_argument('-i', '--interfaces', type=int, default=2, help='the number of network interfaces')
+    parser.add_argument('-p', '--processes', type=int, default=100, help='the number of processes')
+    options = parser.parse_args(args)
+    run_benchmark(options.depth, options.measures, options.cores, options.interfaces, options.processes)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -51,6 +51,14 @@ class DummyOptions:
         self.conciliation_strategy = 0
         self.stats_periods = 5, 15, 60
         self.stats_histo = 10
+        self.stats_cgroup = False
+        self.stats_max_skip = 0
+        self.stats_store = None
+        self.stats_store_size = 10485760
+        self.stats_vectorized = False
+        self.stats_memory = 0
+        self.stats_plot_workers = 0
+        self.stats_charts = 0
         # additional process configuration
         self.procnumbers = {'xclock': 2}
 
@@ -67,9 +75,14 @@ class MockedSupvisors:
         self.context.__init__()
         self.context.addresses = {}
         self.context.applications = {}
+        from supvisors.registry import NamespecRegistry
+        self.registry = NamespecRegistry()
         # simple mocks
+        self.alerter = Mock()
         self.deployer = Mock()
+        self.event_journal = Mock()
         self.fsm = Mock()
+        self.plot_pool = Mock()
         self.pool = Mock()
         self.requester = Mock()
         self.statistician = Mock()
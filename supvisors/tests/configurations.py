@@ -84,6 +84,14 @@ conciliation_strategy=SENICIDE
 stats_periods=5,60,600
 stats_histo=100
 stats_irix_mode=true
+stats_cgroup=true
+stats_max_skip=5
+stats_store=/tmp
+stats_store_size=5MB
+stats_vectorized=true
+stats_memory=20MB
+stats_plot_workers=2
+stats_charts=MATPLOTLIB
 logfile=/tmp/supvisors.log
 logfile_maxbytes=50KB
 logfile_backups=5
@@ -237,6 +245,34 @@ InvalidXmlTest = '''\
 
 	</application>
 
+    <alert name="dummy_alert_01">
+        <series>PROCESS_CPU</series>
+        <target>dummy_application_B:</target>
+        <statistic>P95</statistic>
+        <threshold>80</threshold>
+        <periods>3</periods>
+        <running_failure_strategy>RESTART_PROCESS</running_failure_strategy>
+    </alert>
+
+    <alert name="dummy_alert_02">
+        <series>HOST_MEM</series>
+        <statistic>MEDIAN</statistic>
+        <condition>BELOW</condition>
+        <threshold>10</threshold>
+        <periods>-2</periods>
+        <running_failure_strategy>RESTART_PROCESS</running_failure_strategy>
+    </alert>
+
+    <alert name="dummy_alert_03">
+        <series>PROCESS_MEM</series>
+        <threshold>high</threshold>
+    </alert>
+
+    <alert name="dummy_alert_04">
+        <series>NETWORK</series>
+        <threshold>10</threshold>
+    </alert>
+
 </root>
 '''
 
@@ -360,5 +396,22 @@ XmlTest = '''\
 
 	</application>
 
+    <alert name="dummy_alert_01">
+        <series>PROCESS_CPU</series>
+        <target>dummy_application_B:</target>
+        <statistic>P95</statistic>
+        <threshold>80</threshold>
+        <periods>3</periods>
+        <running_failure_strategy>RESTART_PROCESS</running_failure_strategy>
+    </alert>
+
+    <alert name="dummy_alert_02">
+        <series>HOST_MEM</series>
+        <statistic>SLOPE</statistic>
+        <condition>ABOVE</condition>
+        <threshold>0.5</threshold>
+        <period>15</period>
+    </alert>
+
 </root>
 '''
@@ -46,6 +46,7 @@ class AddressTest(unittest.TestCase):
         self.assertEqual(0, status.remote_time)
         self.assertEqual(0, status.local_time)
         self.assertDictEqual({}, status.processes)
+        self.assertEqual(0, status.version)
 
     def test_isolation(self):
         """ Test the in_isolation method. """
@@ -107,6 +108,7 @@ class AddressTest(unittest.TestCase):
         # check that process is stored
         self.assertIn(process.namespec(), status.processes.keys())
         self.assertIs(process, status.processes[process.namespec()])
+        self.assertEqual(1, status.version)
 
     def test_times(self):
         """ Test the update_times method. """
@@ -0,0 +1,260 @@
+#!/usr/bin/python
+#-*- coding: utf-8 -*-
+
+# ======================================================================
+# Copyright 2016 Julien LE CLEACH
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# 
+#     http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ======================================================================
+
+import sys
+import unittest
+
+from mock import call, patch, Mock
+
+from supvisors.tests.base import MockedSupvisors
+
+
+class AlertRulesTest(unittest.TestCase):
+    """ Test case for the AlertRules class of the alerts module. """
+
+    def test_create(self):
+        """ Test the values set at construction. """
+        from supvisors.alerts import AlertRules
+        from supvisors.ttypes import AlertConditions, AlertSeries, AlertStatistics
+        rules = AlertRules('dummy')
+        self.assertEqual('dummy', rules.name)
+        self.assertEqual(AlertSeries.HOST_CPU, rules.series)
+        self.assertEqual('', rules.target)
+        self.assertEqual(AlertStatistics.VALUE, rules.statistic)
+        self.assertEqual(AlertConditions.ABOVE, rules.condition)
+        self.assertEqual(0.0, rules.threshold)
+        self.assertEqual(1, rules.periods)
+        self.assertEqual(0, rules.period)
+        self.assertIsNone(rules.running_failure_strategy)
+        self.assertFalse(rules.process_series())
+        self.assertEqual('name=dummy series=HOST_CPU target= statistic=VALUE condition=ABOVE threshold=0.0'
+            ' periods=1 period=0 running_failure_strategy=None', str(rules))
+
+    def test_get_value(self):
+        """ Test the evaluation of the statistic of a series. """
+        from supvisors.alerts import AlertRules
+        from supvisors.statscompiler import StatisticsSeries
+        from supvisors.ttypes import AlertStatistics
+        rules = AlertRules('dummy')
+        series = StatisticsSeries(10)
+        self.assertIsNone(rules.get_value(series))
+        # series holding only gaps
+        series.add_gaps(2)
+        for statistic in [AlertStatistics.MEAN, AlertStatistics.VALUE]:
+            rules.statistic = statistic
+            self.assertIsNone(rules.get_value(series))
+        series.clear()
+        series.extend([10.0, 20.0, 30.0, 60.0])
+        self.assertEqual(60.0, rules.get_value(series))
+        rules.statistic = AlertStatistics.MEAN
+        self.assertEqual(30.0, rules.get_value(series))
+        rules.statistic = AlertStatistics.SLOPE
+        self.assertAlmostEqual(16.0, rules.get_value(series))
+        rules.statistic = AlertStatistics.P99
+        self.assertAlmostEqual(60.0, rules.get_value(series), delta=0.6)
+
+    def test_check(self):
+        """ Test the comparison with the threshold. """
+        from supvisors.alerts import AlertRules
+        from supvisors.ttypes import AlertConditions
+        rules = AlertRules('dummy')
+        rules.threshold = 50.0
+        self.assertFalse(rules.check(None))
+        self.assertFalse(rules.check(50.0))
+        self.assertTrue(rules.check(50.5))
+        rules.condition = AlertConditions.BELOW
+        self.assertFalse(rules.check(None))
+        self.assertFalse(rules.check(50.0))
+        self.assertTrue(rules.check(49.5))
+
+
+class AlertStatusTest(unittest.TestCase):
+    """ Test case for the AlertStatus class of the alerts module. """
+
+    def test_serial(self):
+        """ Test the serialization of the AlertStatus. """
+        from supvisors.alerts import AlertRules, AlertStatus
+        rules = AlertRules('dummy')
+        status = AlertStatus(rules, '10.0.0.1', 'sample:xclock')
+        self.assertIsNone(status.date)
+        self.assertEqual(0, status.count)
+        self.assertFalse(status.active)
+        status.date, status.value, status.active = 10, 12.5, True
+        self.assertDictEqual({'alert_name': 'dummy', 'address_name': '10.0.0.1', 'namespec': 'sample:xclock',
+            'series': 'HOST_CPU', 'statistic': 'VALUE', 'condition': 'ABOVE', 'threshold': 0.0,
+            'value': 12.5, 'date': 10, 'active': True}, status.serial())
+
+
+class AlertHandlerTest(unittest.TestCase):
+    """ Test case for the AlertHandler class of the alerts module. """
+
+    def setUp(self):
+        """ Create a Supvisors structure holding real statistics. """
+        from supvisors.statscompiler import StatisticsCompiler
+        self.supvisors = MockedSupvisors()
+        self.supvisors.statistician = StatisticsCompiler(self.supvisors)
+        self.supvisors.context.master = True
+        self.supvisors.context.processes = {}
+
+    def create_handler(self, *rules):
+        """ Return an AlertHandler using the rules given. """
+        from supvisors.alerts import AlertHandler
+        self.supvisors.parser.load_alert_rules.return_value = list(rules)
+        return AlertHandler(self.supvisors)
+
+    def push_statistics(self, date, mem, proc_mem):
+        """ Push statistics to the address 10.0.0.1. """
+        proc = {'sample:xclock': (1234, (date / 100.0, proc_mem))} if proc_mem is not None else {}
+        self.supvisors.statistician.push_statistics('10.0.0.1', (date, [(date, date)], mem, {}, proc, {}))
+
+    def test_create(self):
+        """ Test the values set at construction. """
+        from supvisors.alerts import AlertRules
+        rules_1, rules_2, rules_3 = AlertRules('1'), AlertRules('2'), AlertRules('3')
+        rules_2.period, rules_3.period = 15, 20
+        handler = self.create_handler(rules_1, rules_2, rules_3)
+        self.assertListEqual([rules_1, rules_2], handler.rules)
+        self.assertEqual(1, self.supvisors.logger.warn.call_count)
+        self.assertDictEqual({}, handler.statuses)
+        # no parser
+        from supvisors.alerts import AlertHandler
+        self.supvisors.parser = None
+        self.assertListEqual([], AlertHandler(self.supvisors).rules)
+
+    def test_host_alert(self):
+        """ Test that a host alert is raised after the number of periods required and cleared. """
+        from supvisors.alerts import AlertRules
+        from supvisors.ttypes import AlertSeries
+        rules = AlertRules('mem')
+        rules.series, rules.threshold, rules.periods = AlertSeries.HOST_MEM, 50.0, 2
+        handler = self.create_handler(rules)
+        publisher = self.supvisors.zmq.publisher
+        # no statistics compiled
+        self.push_statistics(5, 60.0, None)
+        handler.on_statistics('10.0.0.1')
+        self.assertDictEqual({}, handler.statuses)
+        # first period above threshold
+        self.push_statistics(10, 60.0, None)
+        handler.on_statistics('10.0.0.1')
+        status = handler.statuses['mem', '10.0.0.1', '']
+        self.assertEqual((10, 60.0, 1, False), (status.date, status.value, status.count, status.active))
+        # no new statistics
+        handler.on_statistics('10.0.0.1')
+        self.assertEqual(1, status.count)
+        self.assertFalse(publisher.send_alert_status.called)
+        # second period above threshold
+        self.push_statistics(15, 70.0, None)
+        handler.on_statistics('10.0.0.1')
+        self.assertEqual((15, 70.0, 2, True), (status.date, status.value, status.count, status.active))
+        self.assertEqual([call(status)], publisher.send_alert_status.call_args_list)
+        # still above threshold: no new event
+        self.push_statistics(20, 80.0, None)
+        handler.on_statistics('10.0.0.1')
+        self.assertEqual(1, publisher.send_alert_status.call_count)
+        # below threshold
+        self.push_statistics(25, 40.0, None)
+        handler.on_statistics('10.0.0.1')
+        self.assertEqual((0, False), (status.count, status.active))
+        self.assertEqual(2, publisher.send_alert_status.call_count)
+        # no strategy for host series
+        self.assertFalse(self.supvisors.failure_handler.add_job.called)
+        # target not matching the address
+        rules.target = '10.0.0.2'
+        handler.statuses = {}
+        self.push_statistics(30, 60.0, None)
+        handler.on_statistics('10.0.0.1')
+        self.assertDictEqual({}, handler.statuses)
+
+    def test_process_alert(self):
+        """ Test that a process alert triggers the running failure strategy and is cleared with the process. """
+        from supvisors.alerts import AlertRules
+        from supvisors.ttypes import AlertSeries, RunningFailureStrategies
+        rules = AlertRules('proc_mem')
+        rules.series, rules.target, rules.threshold = AlertSeries.PROCESS_MEM, 'sample:', 5.0
+        rules.running_failure_strategy = RunningFailureStrategies.RESTART_PROCESS
+        handler = self.create_handler(rules)
+        process = self.supvisors.context.processes['sample:xclock'] = Mock()
+        failure_handler = self.supvisors.failure_handler
+        publisher = self.supvisors.zmq.publisher
+        self.push_statistics(5, 60.0, 2.0)
+        self.push_statistics(10, 60.0, 10.0)
+        handler.on_statistics('10.0.0.1')
+        status = handler.statuses['proc_mem', '10.0.0.1', 'sample:xclock']
+        self.assertTrue(status.active)
+        # the series watched are protected from the memory budget
+        self.assertGreater(self.supvisors.statistician.data['10.0.0.1'][5].proc['sample:xclock'].viewed, 0)
+        self.assertEqual([call(status)], publisher.send_alert_status.call_args_list)
+        self.assertEqual([call(RunningFailureStrategies.RESTART_PROCESS, process)],
+            failure_handler.add_job.call_args_list)
+        self.assertEqual(1, failure_handler.trigger_jobs.call_count)
+        # the process disappears: the alert is cleared
+        self.push_statistics(15, 60.0, None)
+        handler.on_statistics('10.0.0.1')
+        self.assertDictEqual({}, handler.statuses)
+        self.assertFalse(status.active)
+        self.assertEqual(2, publisher.send_alert_status.call_count)
+        # only the master applies the strategy
+        self.supvisors.context.master = False
+        failure_handler.add_job.reset_mock()
+        self.push_statistics(20, 60.0, 10.0)
+        self.push_statistics(25, 60.0, 10.0)
+        handler.on_statistics('10.0.0.1')
+        self.assertTrue(handler.statuses['proc_mem', '10.0.0.1', 'sample:xclock'].active)
+        self.assertFalse(failure_handler.add_job.called)
+
+    def test_process_alert_budget(self):
+        """ Test that a process alert is still evaluated when the memory budget releases the series. """
+        from supvisors.alerts import AlertRules
+        from supvisors.ttypes import AlertSeries
+        rules = AlertRules('proc_mem')
+        rules.series, rules.target, rules.threshold, rules.periods = AlertSeries.PROCESS_MEM, 'sample:', 5.0, 2
+        handler = self.create_handler(rules)
+        statistician = self.supvisors.statistician
+        instance = statistician.data['10.0.0.1'][5]
+        publisher = self.supvisors.zmq.publisher
+        # the series are created and evaluated long ago
+        with patch('supvisors.statscompiler.time', return_value=0):
+            self.push_statistics(5, 60.0, 2.0)
+            self.push_statistics(10, 60.0, 10.0)
+            handler.on_statistics('10.0.0.1')
+        status = handler.statuses['proc_mem', '10.0.0.1', 'sample:xclock']
+        self.assertEqual(1, status.count)
+        # budget squeeze: the process series are released
+        statistician.budget = statistician.get_memory_usage()
+        statistician.enforce_budget()
+        self.assertSetEqual({'sample:xclock'}, instance.evicted)
+        statistician.budget = 0
+        # the status is kept and the series are requested again
+        self.push_statistics(15, 60.0, 10.0)
+        handler.on_statistics('10.0.0.1')
+        self.assertIs(status, handler.statuses['proc_mem', '10.0.0.1', 'sample:xclock'])
+        self.assertSetEqual(set(), instance.evicted)
+        # the series are rebuilt and the alert is raised
+        self.push_statistics(20, 60.0, 10.0)
+        handler.on_statistics('10.0.0.1')
+        self.assertEqual(2, status.count)
+        self.assertTrue(status.active)
+        self.assertEqual([call(status)], publisher.send_alert_status.call_args_list)
+
+
+def test_suite():
+    return unittest.findTestCases(sys.modules[__name__])
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='test_suite')
@@ -66,6 +66,7 @@ class ApplicationStatusTest(unittest.TestCase):
         self.assertFalse(application.processes)
         self.assertFalse(application.start_sequence)
         self.assertFalse(application.stop_sequence)
+        self.assertEqual(0, application.version)
         # check application default rules
         self.assertEqual(0, application.rules.start_sequence)
         self.assertEqual(0, application.rules.stop_sequence)
@@ -147,6 +148,7 @@ class ApplicationStatusTest(unittest.TestCase):
         # check that process is stored
         self.assertIn(process.process_name, application.processes.keys())
         self.assertIs(process, application.processes[process.process_name])
+        self.assertEqual(1, application.version)
 
     def test_update_sequences(self):
         """ Test the sequencing of the deployment method. """
@@ -203,10 +205,15 @@ class ApplicationStatusTest(unittest.TestCase):
         fatal_process = next((process for process in application.processes.values() if process.state == ProcessStates.FATAL), None)
         fatal_process.rules.required = True
         # update status. major failure is now expected
+        version = application.version
         application.update_status()
         self.assertEqual(ApplicationStates.STARTING, application.state)
         self.assertTrue(application.major_failure)
         self.assertFalse(application.minor_failure)
+        self.assertEqual(version + 1, application.version)
+        # no change: the version is kept
+        application.update_status()
+        self.assertEqual(version + 1, application.version)
         # set STARTING process to RUNNING
         starting_process = next((process for process in application.processes.values() if process.state == ProcessStates.STARTING), None)
         starting_process.state = ProcessStates.RUNNING
@@ -127,6 +127,8 @@ class ContextTest(unittest.TestCase):
             self.assertEqual([call()], mocked_running.call_args_list)
             self.assertEqual([call(address_name, False)], proc_1.invalidate_address.call_args_list)
             self.assertEqual([call(address_name, False)], proc_2.invalidate_address.call_args_list)
+            # test that the address does not contribute to the cluster statistics anymore
+            self.assertEqual(call(address_name), self.supvisors.statistician.remove_contributions.call_args)
             # restore address state
             address_status._state = AddressStates.UNKNOWN
         # test address state with auto_fence and local_address
@@ -0,0 +1,68 @@
+#!/usr/bin/python
+#-*- coding: utf-8 -*-
+
+# ======================================================================
+# Copyright 2016 Julien LE CLEACH
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ======================================================================
+
+import sys
+import unittest
+
+
+class EventJournalTest(unittest.TestCase):
+    """ Test case for the EventJournal class of the eventjournal module. """
+
+    def test_create(self):
+        """ Test the values set at construction. """
+        from supvisors.eventjournal import EventJournal
+        journal = EventJournal()
+        self.assertEqual(0, len(journal.events))
+        self.assertEqual(EventJournal.MAX_EVENTS, journal.events.maxlen)
+        self.assertEqual(0, journal.last)
+        self.assertListEqual([], journal.get_events(0))
+
+    def test_get_events(self):
+        """ Test the events returned after a given event. """
+        from supvisors.eventjournal import EventJournal
+        journal = EventJournal()
+        journal.add_event(u'address', {'address_name': '10.0.0.1'})
+        journal.add_event(u'process', {'process_name': 'xclock'})
+        self.assertEqual(2, journal.last)
+        self.assertListEqual([(1, u'address', {'address_name': '10.0.0.1'}), (2, u'process', {'process_name': 'xclock'})],
+            journal.get_events(0))
+        self.assertListEqual([(2, u'process', {'process_name': 'xclock'})], journal.get_events(1))
+        self.assertListEqual([], journal.get_events(2))
+        # unknown event number
+        self.assertIsNone(journal.get_events(3))
+
+    def test_lost_events(self):
+        """ Test that the events older than the journal are reported as lost. """
+        from supvisors.eventjournal import EventJournal
+        EventJournal.MAX_EVENTS, max_events = 3, EventJournal.MAX_EVENTS
+        try:
+            journal = EventJournal()
+        finally:
+            EventJournal.MAX_EVENTS = max_events
+        for value in range(5):
+            journal.add_event(u'alert', value)
+        self.assertIsNone(journal.get_events(1))
+        self.assertListEqual([(3, u'alert', 2), (4, u'alert', 3), (5, u'alert', 4)], journal.get_events(2))
+
+
+def test_suite():
+    return unittest.findTestCases(sys.modules[__name__])
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='test_suite')
@@ -98,6 +98,27 @@ class InfoSourceTest(unittest.TestCase):
         # test normal behaviour
         self.assertEqual('dummy_application_config', source.get_group_config('dummy_application'))
 
+    def test_process_ordering(self):
+        """ Test the ordering of the processes in a group configuration. """
+        from supvisors.infosource import SupervisordSource
+        source = SupervisordSource(self.supervisor)
+        # test unknown application
+        with self.assertRaises(KeyError):
+            source.get_process_ordering('unknown_application')
+        # test normal behaviour
+        group = self.supervisor.process_groups['dummy_application']
+        group.config = Mock(process_configs=[Mock(), Mock()])
+        group.config.process_configs[0].name = 'dummy_process_2'
+        group.config.process_configs[1].name = 'dummy_process_1'
+        ordering = source.get_process_ordering('dummy_application')
+        self.assertDictEqual({'dummy_process_2': 0, 'dummy_process_1': 1}, ordering)
+        # test that the ordering is built once for the same configuration
+        self.assertIs(ordering, source.get_process_ordering('dummy_application'))
+        # test that the ordering is rebuilt when the configuration is replaced
+        group.config = Mock(process_configs=[Mock()])
+        group.config.process_configs[0].name = 'dummy_process_1'
+        self.assertDictEqual({'dummy_process_1': 0}, source.get_process_ordering('dummy_application'))
+
     def test_process(self):
         """ Test the access of a supervisord process. """
         from supvisors.infosource import SupervisordSource
@@ -32,7 +32,7 @@ class InitializerTest(unittest.TestCase):
     @patch('supvisors.initializer.Parser')
     @patch('supvisors.initializer.AddressMapper', local_address='127.0.0.1')
     @patch('supvisors.initializer.getLogger')
-    @patch('supvisors.initializer.SupvisorsServerOptions')
+    @patch('supvisors.initializer.SupvisorsServerOptions', **{'return_value.supvisors_options.stats_store': None})
     def test_creation(self, *args, **kwargs):
         """ Test the values set at construction. """
         from supvisors.initializer import Supvisors
@@ -52,11 +52,14 @@ class InitializerTest(unittest.TestCase):
         self.assertIsNotNone(supvisors.info_source)
         self.assertIsNotNone(supvisors.address_mapper)
         self.assertIsNotNone(supvisors.context)
+        self.assertIsNotNone(supvisors.event_journal)
         self.assertIsNotNone(supvisors.starter)
         self.assertIsNotNone(supvisors.stopper)
         self.assertIsNotNone(supvisors.statistician)
+        self.assertIsNotNone(supvisors.plot_pool)
         self.assertIsNotNone(supvisors.fsm)
         self.assertIsNotNone(supvisors.parser)
+        self.assertIsNotNone(supvisors.alerter)
         self.assertIsNotNone(supvisors.listener)
 
     @patch('supvisors.initializer.getLogger')
@@ -75,7 +78,7 @@ class InitializerTest(unittest.TestCase):
     @patch('supvisors.initializer.Parser', side_effect=Exception)
     @patch('supvisors.initializer.AddressMapper', local_address='127.0.0.1')
     @patch('supvisors.initializer.getLogger')
-    @patch('supvisors.initializer.SupvisorsServerOptions')
+    @patch('supvisors.initializer.SupvisorsServerOptions', **{'return_value.supvisors_options.stats_store': None})
     def test_parser_exception(self, *args, **kwargs):
         """ Test the values set at construction. """
         from supvisors.initializer import Supvisors
@@ -84,6 +87,7 @@ class InitializerTest(unittest.TestCase):
         supvisors = Supvisors(supervisord)
         # test that parser exception is accepted
         self.assertIsNone(supvisors.parser)
+        self.assertListEqual([], supvisors.alerter.rules)
 
 
 def test_suite():
@@ -52,7 +52,7 @@ class ListenerTest(unittest.TestCase):
         self.assertIn((RemoteCommunicationEvent, listener.on_remote_event), callbacks)
 
     @patch.dict('sys.modules', **{'supvisors.statscollector':
-        Mock(**{'instant_statistics.side_effect': lambda: True})})
+        Mock(**{'StatisticsCollector.return_value.return_value': True})})
     def test_creation(self):
         """ Test the values set at construction. """
         from supvisors.listener import SupervisorListener
@@ -87,6 +87,27 @@ class ListenerTest(unittest.TestCase):
                     self.assertTrue(mocked_loop.called)
                     self.assertIsNot(ref_main_loop, listener.main_loop)
                     self.assertTrue(listener.main_loop.start.called)
+                    # the plot workers are forked before the zmq context is created
+                    self.assertTrue(self.supvisors.plot_pool.start.called)
+
+    def test_plot_workers(self):
+        """ Test that the plot workers forked when Supervisor is RUNNING are terminated when it is STOPPING. """
+        from supvisors.listener import SupervisorListener
+        from supvisors.plotpool import PlotPool
+        self.supvisors.options.stats_plot_workers = 1
+        self.supvisors.plot_pool = PlotPool(self.supvisors)
+        listener = SupervisorListener(self.supvisors)
+        with patch.object(self.supvisors.info_source, 'replace_default_handler'):
+            with patch('supvisors.listener.SupvisorsZmq', return_value=self.supvisors.zmq):
+                with patch('supvisors.listener.SupvisorsMainLoop'):
+                    listener.on_running('')
+        workers = list(self.supvisors.plot_pool.pool._pool)
+        self.assertEqual(1, len(workers))
+        self.assertTrue(workers[0].is_alive())
+        with patch.object(self.supvisors.info_source, 'close_httpservers'):
+            listener.on_stopping('')
+        self.assertIsNone(self.supvisors.plot_pool.pool)
+        self.assertFalse(workers[0].is_alive())
 
     def test_on_stopping(self):
         """ Test the reception of a Supervisor STOPPING event. """
@@ -100,6 +121,8 @@ class ListenerTest(unittest.TestCase):
             self.assertTrue(mocked_infosource.called)
             self.assertTrue(listener.main_loop.stop.called)
             self.assertTrue(self.supvisors.zmq.close.called)
+            self.assertTrue(self.supvisors.statistician.close.called)
+            self.assertTrue(self.supvisors.plot_pool.close.called)
             self.assertTrue(self.supvisors.logger.close.called)
 
     @patch('supvisors.listener.time.time', return_value=77)
@@ -116,13 +139,18 @@ class ListenerTest(unittest.TestCase):
         process = Mock(pid=1234, **{'config.name': 'dummy_process', 'group.config.name': 'dummy_group'})
         event = ProcessStateFatalEvent(process, '')
         listener.on_process(event)
-        self.assertEqual([call({'processname': 'dummy_process', 'groupname': 'dummy_group',
+        self.assertEqual([call({'id': 0, 'namespec': 'dummy_group:dummy_process',
             'state': 200, 'now': 77, 'pid': 1234, 'expected': True})],
             listener.publisher.send_process_event.call_args_list)
+        # the namespec is declared only once
+        listener.publisher.send_process_event.reset_mock()
+        listener.on_process(event)
+        self.assertEqual([call({'id': 0, 'state': 200, 'now': 77, 'pid': 1234, 'expected': True})],
+            listener.publisher.send_process_event.call_args_list)
 
     @patch.dict('sys.modules', **{'supvisors.statscollector':
-        Mock(**{'instant_statistics.return_value':
-            (8.5, [(25, 400)], 76.1, {'lo': (500, 500)}, {})})})
+        Mock(**{'StatisticsCollector.return_value.return_value':
+            (8.5, [(25, 400)], 76.1, {'lo': (500, 500)}, {'appli:proc': (1234, (0.5, 1.5))}, {})})})
     def test_on_tick(self):
         """ Test the reception of a Supervisor TICK event. """
         from supvisors.listener import SupervisorListener
@@ -140,8 +168,8 @@ class ListenerTest(unittest.TestCase):
         listener.on_tick(event)
         self.assertEqual([call({'when': 120})],
             listener.publisher.send_tick_event.call_args_list)
-        self.assertEqual([call((8.5, [(25, 400)], 76.1, {'lo': (500, 500)}, {}))],
-            listener.publisher.send_statistics.call_args_list)
+        self.assertEqual([call((8.5, [(25, 400)], 76.1, {'lo': (500, 500)}, [(0, 1234, (0.5, 1.5))], {},
+            [(0, 'appli:proc')]))], listener.publisher.send_statistics.call_args_list)
         self.assertEqual([call()], listener.fsm.on_timer_event.call_args_list)
         self.assertEqual([call(['10.0.0.1', '10.0.0.4'])],
             self.supvisors.zmq.pusher.send_isolate_addresses.call_args_list)
@@ -157,28 +185,80 @@ class ListenerTest(unittest.TestCase):
         self.assertFalse(listener.fsm.on_process_event.called)
         self.assertFalse(listener.statistician.push_statistics.called)
         listener.fsm.on_tick_event.reset_mock()
+        # test process event with unknown identifier: the event is held and the registry is requested
+        listener.unstack_event('[1, "10.0.0.2", {"id": 1, "state": 20}]')
+        self.assertFalse(listener.fsm.on_process_event.called)
+        self.assertEqual([call('10.0.0.2')], self.supvisors.zmq.pusher.send_load_registry.call_args_list)
+        self.assertEqual([{"id": 1, "state": 20}], list(self.supvisors.registry.held['10.0.0.2']))
         # test process event
-        listener.unstack_event('[1, "10.0.0.2", {"name": "dummy"}]')
+        listener.unstack_event('[1, "10.0.0.2", {"id": 1, "namespec": "appli:proc", "state": 20}]')
         self.assertFalse(listener.fsm.on_tick_event.called)
-        self.assertEqual([call('10.0.0.2', {"name": "dummy"})],
+        self.assertEqual([call('10.0.0.2', {"groupname": "appli", "processname": "proc", "state": 20})],
             listener.fsm.on_process_event.call_args_list)
         self.assertFalse(listener.statistician.push_statistics.called)
         listener.fsm.on_process_event.reset_mock()
         # test statistics event
-        listener.unstack_event('[2, "10.0.0.3", [0, [[20, 30]], {"lo": [100, 200]}, {}]]')
+        listener.unstack_event('[2, "10.0.0.3", [0, [[20, 30]], 10, {"lo": [100, 200]}, [[0, 12, [1, 2]]], {},'
+            ' [[0, "appli:proc"]]]]')
         self.assertFalse(listener.fsm.on_tick_event.called)
         self.assertFalse(listener.fsm.on_process_event.called)
-        self.assertEqual([call('10.0.0.3', [0, [[20, 30]], {"lo": [100, 200]}, {}])],
+        self.assertEqual([call('10.0.0.3', (0, [[20, 30]], 10, {"lo": [100, 200]}, {"appli:proc": (12, [1, 2])}, {}))],
+            listener.statistician.push_statistics.call_args_list)
+        self.assertEqual([call('10.0.0.3')], listener.alerter.on_statistics.call_args_list)
+        self.assertEqual(1, self.supvisors.zmq.pusher.send_load_registry.call_count)
+        listener.statistician.push_statistics.reset_mock()
+        # test statistics event with unknown identifier: the registry is requested
+        listener.unstack_event('[2, "10.0.0.3", [5, [[20, 30]], 10, {"lo": [100, 200]}, [[0, 12, [1, 2]], [1, 14, [3, 4]]],'
+            ' {}, []]]')
+        self.assertEqual([call('10.0.0.3', (5, [[20, 30]], 10, {"lo": [100, 200]}, {"appli:proc": (12, [1, 2])}, {}))],
             listener.statistician.push_statistics.call_args_list)
+        self.assertEqual(call('10.0.0.3'), self.supvisors.zmq.pusher.send_load_registry.call_args)
+
+    def test_unstack_registry(self):
+        """ Test the replay of the process events held until the namespec registry is received. """
+        from supvisors.listener import SupervisorListener
+        listener = SupervisorListener(self.supvisors)
+        listener.unstack_event('[1, "10.0.0.2", {"id": 1, "state": 10}]')
+        listener.unstack_event('[1, "10.0.0.2", {"id": 1, "state": 20}]')
+        listener.unstack_event('[1, "10.0.0.2", {"id": 2, "state": 20}]')
+        self.assertEqual([call('10.0.0.2')], self.supvisors.zmq.pusher.send_load_registry.call_args_list)
+        self.assertFalse(listener.fsm.on_process_event.called)
+        # the events are replayed in order, the ones still unknown are rejected
+        listener.unstack_registry('["10.0.0.2", ["appli:proc_0", "appli:proc_1"]]')
+        self.assertEqual([call('10.0.0.2', {"groupname": "appli", "processname": "proc_1", "state": 10}),
+            call('10.0.0.2', {"groupname": "appli", "processname": "proc_1", "state": 20})],
+            listener.fsm.on_process_event.call_args_list)
+        self.assertNotIn('10.0.0.2', self.supvisors.registry.held)
+        # a new unknown identifier leads to a new request
+        listener.unstack_event('[1, "10.0.0.2", {"id": 3, "state": 20}]')
+        self.assertEqual(2, self.supvisors.zmq.pusher.send_load_registry.call_count)
+        # the registry could not be obtained: the events held are dropped
+        listener.fsm.on_process_event.reset_mock()
+        listener.unstack_registry('["10.0.0.2", null]')
+        self.assertFalse(listener.fsm.on_process_event.called)
+        self.assertNotIn('10.0.0.2', self.supvisors.registry.held)
+        self.assertTrue(self.supvisors.logger.error.called)
+        # the next unknown identifier leads to a new request
+        listener.unstack_event('[1, "10.0.0.2", {"id": 3, "state": 30}]')
+        self.assertEqual(3, self.supvisors.zmq.pusher.send_load_registry.call_count)
+        listener.unstack_registry('["10.0.0.2", ["appli:proc_0", "appli:proc_1", "appli:proc_2", "appli:proc_3"]]')
+        self.assertEqual([call('10.0.0.2', {"groupname": "appli", "processname": "proc_3", "state": 30})],
+            listener.fsm.on_process_event.call_args_list)
 
     def test_unstack_info(self):
         """ Test the processing of a Supvisors information. """
         from supvisors.listener import SupervisorListener
         listener = SupervisorListener(self.supvisors)
         # test info event
-        listener.unstack_info('["10.0.0.4", {"name": "dummy"}]')
+        listener.unstack_info('["10.0.0.4", {"name": "dummy"}, ["appli:proc"]]')
         self.assertEqual([call('10.0.0.4', {"name": "dummy"})],
             listener.fsm.on_process_info.call_args_list)
+        self.assertEqual('appli:proc', self.supvisors.registry.get_namespec('10.0.0.4', 0))
+        # the events held are replayed after the process info
+        listener.unstack_event('[1, "10.0.0.4", {"id": 1, "state": 20}]')
+        listener.unstack_info('["10.0.0.4", {"name": "dummy"}, ["appli:proc", "appli:other"]]')
+        self.assertEqual([call('10.0.0.4', {"groupname": "appli", "processname": "other", "state": 20})],
+            listener.fsm.on_process_event.call_args_list)
 
     def test_authorization(self):
         """ Test the processing of a Supvisors authorization. """
@@ -194,7 +274,7 @@ class ListenerTest(unittest.TestCase):
         listener = SupervisorListener(self.supvisors)
         # add patches for what is tested just above
         with patch.multiple(listener, unstack_event=DEFAULT,
-                unstack_info=DEFAULT, authorization=DEFAULT):
+                unstack_info=DEFAULT, unstack_registry=DEFAULT, authorization=DEFAULT):
             # test unknown type
             event = Mock(type='unknown', data='')
             listener.on_remote_event(event)
@@ -217,6 +297,12 @@ class ListenerTest(unittest.TestCase):
                 listener.unstack_info.call_args_list)
             self.assertFalse(listener.authorization.called)
             listener.unstack_info.reset_mock()
+            # test registry
+            event = Mock(type='registry', data='["10.0.0.1", []]')
+            listener.on_remote_event(event)
+            self.assertEqual([call('["10.0.0.1", []]')], listener.unstack_registry.call_args_list)
+            self.assertFalse(listener.unstack_event.called)
+            self.assertFalse(listener.unstack_info.called)
             # test authorization
             event = Mock(type='auth', data=('10.0.0.1', True))
             listener.on_remote_event(event)
@@ -234,7 +320,7 @@ class ListenerTest(unittest.TestCase):
         listener.publisher = Mock(**{'send_process_event.return_value': None})
         # test the call
         listener.force_process_state('appli:process', 200)
-        self.assertEqual([call({'processname': 'process', 'groupname': 'appli', 'state': 200,
+        self.assertEqual([call({'id': 0, 'namespec': 'appli:process', 'state': 200,
             'now': 56, 'pid': 0, 'expected': False})],
             listener.publisher.send_process_event.call_args_list)
 
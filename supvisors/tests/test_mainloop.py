@@ -134,6 +134,7 @@ class MainLoopTest(unittest.TestCase):
                         mocked_evt.reset_mock()
                         self.mocked_rpc.reset_mock()
             # test with address not in isolation
+            rpc_intf.supvisors.supvisors.registry.get_id('appli:proc')
             with patch.object(rpc_intf.supervisor, 'getAllProcessInfo', return_value=['dummy_list']) as mocked_supervisor:
                 for state in [AddressStates.UNKNOWN, AddressStates.CHECKING, AddressStates.RUNNING, AddressStates.SILENT]:
                     with patch.object(rpc_intf.supvisors, 'get_address_info', return_value={'statecode': state}):
@@ -141,7 +142,7 @@ class MainLoopTest(unittest.TestCase):
                         self.assertEqual(1, self.mocked_rpc.call_count)
                         self.assertEqual(call('10.0.0.1', main_loop.env), self.mocked_rpc.call_args)
                         self.assertEqual(2, mocked_evt.call_count)
-                        self.assertEqual([call('info', '["10.0.0.1", ["dummy_list"]]'),
+                        self.assertEqual([call('info', '["10.0.0.1", ["dummy_list"], ["appli:proc"]]'),
                             call('auth', 'address_name:10.0.0.1 authorized:True')], mocked_evt.call_args_list)
                         self.assertEqual(1, mocked_supervisor.call_count)
                         # reset counters
@@ -149,6 +150,25 @@ class MainLoopTest(unittest.TestCase):
                         mocked_supervisor.reset_mock()
                         self.mocked_rpc.reset_mock()
 
+    def test_load_registry(self):
+        """ Test the protocol to get the namespec registry of a remote Supvisors. """
+        from supvisors.mainloop import SupvisorsMainLoop
+        main_loop = SupvisorsMainLoop(self.supvisors)
+        with patch.object(main_loop, 'send_remote_comm_event') as mocked_evt:
+            # test rpc error: the failure is sent to local Supervisor
+            self.mocked_rpc.side_effect = Exception
+            main_loop.load_registry('10.0.0.1')
+            self.assertEqual(call('10.0.0.1', main_loop.env), self.mocked_rpc.call_args)
+            self.assertEqual([call('registry', '["10.0.0.1", null]')], mocked_evt.call_args_list)
+            mocked_evt.reset_mock()
+            # test with a mocked rpc interface
+            rpc_intf = DummyRpcInterface()
+            self.mocked_rpc.side_effect = None
+            self.mocked_rpc.return_value = rpc_intf
+            rpc_intf.supvisors.supvisors.registry.get_id('appli:proc')
+            main_loop.load_registry('10.0.0.1')
+            self.assertEqual([call('registry', '["10.0.0.1", ["appli:proc"]]')], mocked_evt.call_args_list)
+
     def test_start_process(self):
         """ Test the protocol to start a process handled by a remote Supervisor. """
         from supvisors.mainloop import SupvisorsMainLoop
@@ -270,7 +290,7 @@ class MainLoopTest(unittest.TestCase):
         # patch main loop subscriber
         with patch.multiple(main_loop, check_address=DEFAULT,
             start_process=DEFAULT, stop_process=DEFAULT,
-            restart=DEFAULT, shutdown=DEFAULT) as mocked_loop:
+            restart=DEFAULT, shutdown=DEFAULT, load_registry=DEFAULT) as mocked_loop:
             # test check address
             self.check_call(main_loop, mocked_loop, 'check_address',
                 DeferredRequestHeaders.CHECK_ADDRESS, ('10.0.0.2', ))
@@ -289,6 +309,9 @@ class MainLoopTest(unittest.TestCase):
             # test shutdown
             self.check_call(main_loop, mocked_loop, 'shutdown',
                 DeferredRequestHeaders.SHUTDOWN, ('10.0.0.2', ))
+            # test load registry
+            self.check_call(main_loop, mocked_loop, 'load_registry',
+                DeferredRequestHeaders.LOAD_REGISTRY, ('10.0.0.2', ))
 
 
 def test_suite():
@@ -47,6 +47,14 @@ class SupvisorsOptionsTest(unittest.TestCase):
         self.assertIsNone(opt.stats_periods)
         self.assertIsNone(opt.stats_histo)
         self.assertIsNone(opt.stats_irix_mode)
+        self.assertIsNone(opt.stats_cgroup)
+        self.assertIsNone(opt.stats_max_skip)
+        self.assertIsNone(opt.stats_store)
+        self.assertIsNone(opt.stats_store_size)
+        self.assertIsNone(opt.stats_vectorized)
+        self.assertIsNone(opt.stats_memory)
+        self.assertIsNone(opt.stats_plot_workers)
+        self.assertIsNone(opt.stats_charts)
         self.assertIsNone(opt.logfile)
         self.assertIsNone(opt.logfile_maxbytes)
         self.assertIsNone(opt.logfile_backups)
@@ -60,7 +68,9 @@ class SupvisorsOptionsTest(unittest.TestCase):
             'internal_port=None event_port=None auto_fence=None '
             'synchro_timeout=None conciliation_strategy=None '
             'deployment_strategy=None stats_periods=None stats_histo=None '
-            'stats_irix_mode=None logfile=None logfile_maxbytes=None '
+            'stats_irix_mode=None stats_cgroup=None stats_max_skip=None stats_store=None stats_store_size=None '
+            'stats_vectorized=None stats_memory=None stats_plot_workers=None stats_charts=None '
+            'logfile=None logfile_maxbytes=None '
             'logfile_backups=None loglevel=None', str(opt))
 
 
@@ -144,17 +154,19 @@ class SupvisorsServerOptionsTest(unittest.TestCase):
         with self.assertRaisesRegexp(ValueError, 'unexpected number of stats_periods'):
             SupvisorsServerOptions.to_periods([])
         with self.assertRaisesRegexp(ValueError, 'unexpected number of stats_periods'):
-            SupvisorsServerOptions.to_periods(['1', '2', '3', '4'])
+            SupvisorsServerOptions.to_periods(['1', '2', '3', '4', '5', '6'])
         with self.assertRaisesRegexp(ValueError, error_message):
             SupvisorsServerOptions.to_periods(['4', '3600'])
         with self.assertRaisesRegexp(ValueError, error_message):
-            SupvisorsServerOptions.to_periods(['5', '3601'])
+            SupvisorsServerOptions.to_periods(['5', '86401'])
         with self.assertRaisesRegexp(ValueError, error_message):
             SupvisorsServerOptions.to_periods(['6', '3599'])
         # test valid values
         self.assertEqual([5], SupvisorsServerOptions.to_periods(['5']))
         self.assertEqual([60, 3600], SupvisorsServerOptions.to_periods(['60', '3600']))
         self.assertEqual([120, 720, 1800], SupvisorsServerOptions.to_periods(['120', '720', '1800']))
+        self.assertEqual([5, 60, 900, 3600, 86400],
+            SupvisorsServerOptions.to_periods(['86400', '5', '60', '900', '3600']))
 
     def test_histo(self):
         """ Test the conversion of a string to a history depth. """
@@ -166,10 +178,50 @@ class SupvisorsServerOptionsTest(unittest.TestCase):
         with self.assertRaisesRegexp(ValueError, error_message):
             SupvisorsServerOptions.to_histo('9')
         with self.assertRaisesRegexp(ValueError, error_message):
-            SupvisorsServerOptions.to_histo('1501')
+            SupvisorsServerOptions.to_histo('10001')
         # test valid values
         self.assertEqual(10, SupvisorsServerOptions.to_histo('10'))
         self.assertEqual(1500, SupvisorsServerOptions.to_histo('1500'))
+        self.assertEqual(10000, SupvisorsServerOptions.to_histo('10000'))
+
+    def test_max_skip(self):
+        """ Test the conversion of a string to a maximum number of skipped measures. """
+        from supvisors.options import SupvisorsServerOptions
+        error_message = self.common_error_message.format('stats_max_skip')
+        # test invalid values
+        with self.assertRaisesRegexp(ValueError, error_message):
+            SupvisorsServerOptions.to_max_skip('-1')
+        with self.assertRaisesRegexp(ValueError, error_message):
+            SupvisorsServerOptions.to_max_skip('12')
+        # test valid values
+        self.assertEqual(0, SupvisorsServerOptions.to_max_skip('0'))
+        self.assertEqual(11, SupvisorsServerOptions.to_max_skip('11'))
+
+    def test_plot_workers(self):
+        """ Test the conversion of a string to a number of plot worker processes. """
+        from supvisors.options import SupvisorsServerOptions
+        error_message = self.common_error_message.format('stats_plot_workers')
+        # test invalid values
+        with self.assertRaisesRegexp(ValueError, error_message):
+            SupvisorsServerOptions.to_plot_workers('-1')
+        with self.assertRaisesRegexp(ValueError, error_message):
+            SupvisorsServerOptions.to_plot_workers('9')
+        # test valid values
+        self.assertEqual(0, SupvisorsServerOptions.to_plot_workers('0'))
+        self.assertEqual(8, SupvisorsServerOptions.to_plot_workers('8'))
+
+    def test_stats_charts(self):
+        """ Test the conversion of a string to a renderer of statistics charts. """
+        from supvisors.options import SupvisorsServerOptions
+        from supvisors.ttypes import StatisticsCharts
+        error_message = self.common_error_message.format('stats_charts')
+        # test invalid values
+        with self.assertRaisesRegexp(ValueError, error_message):
+            SupvisorsServerOptions.to_stats_charts('BROWSER')
+        # test valid values
+        self.assertEqual(StatisticsCharts.CLIENT, SupvisorsServerOptions.to_stats_charts('CLIENT'))
+        self.assertEqual(StatisticsCharts.MATPLOTLIB, SupvisorsServerOptions.to_stats_charts('MATPLOTLIB'))
+        self.assertEqual(StatisticsCharts.SVG, SupvisorsServerOptions.to_stats_charts('SVG'))
 
     def test_incorrect_supvisors(self):
         """ Test that exception is raised when the supvisors section is missing. """
@@ -184,7 +236,7 @@ class SupvisorsServerOptionsTest(unittest.TestCase):
 
     def test_default_options(self):
         """ Test the default values of options with empty Supvisors configuration. """
-        from supvisors.ttypes import ConciliationStrategies, DeploymentStrategies
+        from supvisors.ttypes import ConciliationStrategies, DeploymentStrategies, StatisticsCharts
         server = self.create_server(DefaultOptionConfiguration)
         opt = server.supvisors_options
         self.assertListEqual([gethostname()], opt.address_list)
@@ -198,6 +250,14 @@ class SupvisorsServerOptionsTest(unittest.TestCase):
         self.assertListEqual([10], opt.stats_periods)
         self.assertEqual(200, opt.stats_histo)
         self.assertFalse(opt.stats_irix_mode)
+        self.assertFalse(opt.stats_cgroup)
+        self.assertEqual(0, opt.stats_max_skip)
+        self.assertIsNone(opt.stats_store)
+        self.assertEqual(10*1024*1024, opt.stats_store_size)
+        self.assertFalse(opt.stats_vectorized)
+        self.assertEqual(0, opt.stats_memory)
+        self.assertEqual(1, opt.stats_plot_workers)
+        self.assertEqual(StatisticsCharts.SVG, opt.stats_charts)
         self.assertEqual('supvisors.log', opt.logfile)
         self.assertEqual(50*1024*1024, opt.logfile_maxbytes)
         self.assertEqual(10, opt.logfile_backups)
@@ -205,7 +265,7 @@ class SupvisorsServerOptionsTest(unittest.TestCase):
 
     def test_defined_options(self):
         """ Test the values of options with defined Supvisors configuration. """
-        from supvisors.ttypes import ConciliationStrategies, DeploymentStrategies
+        from supvisors.ttypes import ConciliationStrategies, DeploymentStrategies, StatisticsCharts
         server = self.create_server(DefinedOptionConfiguration)
         opt = server.supvisors_options
         self.assertListEqual(['cliche01', 'cliche03', 'cliche02'], opt.address_list)
@@ -219,6 +279,14 @@ class SupvisorsServerOptionsTest(unittest.TestCase):
         self.assertListEqual([5, 60, 600], opt.stats_periods)
         self.assertEqual(100, opt.stats_histo)
         self.assertTrue(opt.stats_irix_mode)
+        self.assertTrue(opt.stats_cgroup)
+        self.assertEqual(5, opt.stats_max_skip)
+        self.assertEqual('/tmp', opt.stats_store)
+        self.assertEqual(5*1024*1024, opt.stats_store_size)
+        self.assertTrue(opt.stats_vectorized)
+        self.assertEqual(20*1024*1024, opt.stats_memory)
+        self.assertEqual(2, opt.stats_plot_workers)
+        self.assertEqual(StatisticsCharts.MATPLOTLIB, opt.stats_charts)
         self.assertEqual('/tmp/supvisors.log', opt.logfile)
         self.assertEqual(50*1024, opt.logfile_maxbytes)
         self.assertEqual(5, opt.logfile_backups)
@@ -21,6 +21,8 @@ import imghdr
 import sys
 import unittest
 
+from supvisors.tests.base import MockedSupvisors
+
 
 class StatisticsPlotTest(unittest.TestCase):
     """ Test case for the plot module. """
@@ -32,6 +34,9 @@ class StatisticsPlotTest(unittest.TestCase):
             matplotlib.__name__
         except ImportError:
             raise unittest.SkipTest('cannot test as optional matplotlib is not installed')
+        # the plots are rendered synchronously
+        from supvisors.plotpool import PlotPool
+        self.plot_pool = PlotPool(MockedSupvisors())
 
     def test_plot(self):
         """ Test a simple plot.
@@ -46,9 +51,58 @@ class StatisticsPlotTest(unittest.TestCase):
         self.assertDictEqual({('dummy_title_1', 'unit_1'): [1, 2, 3], ('dummy_title_2', 'unit_2'): [10, 20, 30]}, plot.ydata)
         # export image in buffer
         contents = StatsImage()
-        plot.export_image(contents)
+        plot.export_image(contents, self.plot_pool)
         # test that result is a PNG file
         self.assertEqual('png', imghdr.what('', h=contents.contents.getvalue()))
+        self.assertEqual(1, self.plot_pool.renderings)
+        self.assertEqual({}, plot.ydata)
+
+    def test_get_curves(self):
+        """ Test the curves provided to the renderer. """
+        from supvisors.plot import StatisticsPlot
+        from supvisors.statscompiler import StatisticsSeries
+        from supvisors.utils import get_stats
+        plot = StatisticsPlot()
+        series = StatisticsSeries(10, [1, 2, 3])
+        plot.add_plot('CPU', '%', series)
+        plot.add_plot('MEM', '%', [4, 5])
+        self.assertItemsEqual([('CPU', '%', [1, 2, 3], series.get_stats()), ('MEM', '%', [4, 5], get_stats([4, 5]))],
+            plot.get_curves())
+        # the gaps are kept in the curves, a series holding only gaps is not plotted
+        plot = StatisticsPlot()
+        series = StatisticsSeries(10, [None, 2, None, 3])
+        plot.add_plot('IO', 'kbits/s', series)
+        plot.add_plot('PRESSURE', '%', StatisticsSeries(10, [None, None]))
+        self.assertListEqual([('IO', 'kbits/s', [None, 2, None, 3], series.get_stats())], plot.get_curves())
+
+    def test_cache(self):
+        """ Test that the image is not rendered again when the series have not changed. """
+        from supvisors.plot import StatisticsPlot
+        from supvisors.statscompiler import StatisticsSeries
+        from supvisors.viewimage import StatsImage
+        series = StatisticsSeries(10, [1, 2, 3])
+        contents = StatsImage()
+        plot = StatisticsPlot()
+        plot.add_plot('CPU', '%', series)
+        key = plot.get_key()
+        self.assertEqual(((('CPU', '%'), series.version), ), key)
+        plot.export_image(contents, self.plot_pool)
+        self.assertEqual(key, contents.key)
+        image = contents.contents
+        # same series: the image is kept
+        plot.add_plot('CPU', '%', series)
+        plot.export_image(contents, self.plot_pool)
+        self.assertIs(image, contents.contents)
+        self.assertEqual({}, plot.ydata)
+        # new value in series: the image is rendered again
+        series.append(4)
+        plot.add_plot('CPU', '%', series)
+        plot.export_image(contents, self.plot_pool)
+        self.assertIsNot(image, contents.contents)
+        self.assertNotEqual(key, contents.key)
+        # series without version are always rendered
+        plot.add_plot('MEM', '%', [1, 2, 3])
+        self.assertIsNone(plot.get_key())
 
     def test_get_range(self):
         """ Test a simple plot.
@@ -0,0 +1,183 @@
+#!/usr/bin/python
+#-*- coding: utf-8 -*-
+
+# ======================================================================
+# Copyright 2016 Julien LE CLEACH
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ======================================================================
+
+import imghdr
+import signal
+import sys
+import time
+import unittest
+
+from mock import Mock, patch
+
+from supvisors.tests.base import MockedSupvisors
+
+
+class PlotPoolTest(unittest.TestCase):
+    """ Test case for the plotpool module. """
+
+    def setUp(self):
+        """ Skip the test if matplotlib is not installed. """
+        try:
+            import matplotlib
+            matplotlib.__name__
+        except ImportError:
+            raise unittest.SkipTest('cannot test as optional matplotlib is not installed')
+        self.supvisors = MockedSupvisors()
+        self.curves = [('CPU', '%', [1.0, 2.0, 3.0], (2.0, 1.0, (1.0, 1.0), 0.8))]
+
+    def test_init_worker(self):
+        """ Test that the default signal handlers are restored. """
+        from supvisors.plotpool import init_worker
+        with patch('signal.signal') as mocked_signal:
+            init_worker()
+        self.assertIn(((signal.SIGTERM, signal.SIG_DFL), ), mocked_signal.call_args_list)
+        self.assertIn(((signal.SIGCHLD, signal.SIG_DFL), ), mocked_signal.call_args_list)
+
+    def test_render_plot(self):
+        """ Test the rendering of curves into a PNG image. """
+        from supvisors.plotpool import render_plot
+        contents, duration = render_plot(self.curves)
+        self.assertEqual('png', imghdr.what('', h=contents))
+        self.assertGreater(duration, 0)
+
+    def test_synchronous(self):
+        """ Test the rendering without worker. """
+        from supvisors.plotpool import PlotPool
+        from supvisors.viewimage import StatsImage
+        plot_pool = PlotPool(self.supvisors)
+        self.assertEqual(0, plot_pool.workers)
+        image = StatsImage()
+        plot_pool.export_image(self.curves, 'key', image)
+        self.assertIsNone(plot_pool.pool)
+        self.assertIsNone(image.pending)
+        self.assertTrue(image.is_cached('key'))
+        self.assertEqual('png', imghdr.what('', h=image.contents.getvalue()))
+        self.assertEqual(1, plot_pool.renderings)
+        self.assertGreater(plot_pool.render_time, 0)
+        self.assertEqual(plot_pool.render_time, plot_pool.last_render_time)
+
+    def test_workers(self):
+        """ Test the rendering in a worker process. """
+        from supvisors.plotpool import PlotPool
+        from supvisors.viewimage import StatsImage
+        self.supvisors.options.stats_plot_workers = 1
+        plot_pool = PlotPool(self.supvisors)
+        image = StatsImage()
+        try:
+            plot_pool.start()
+            self.assertIsNotNone(plot_pool.pool)
+            plot_pool.export_image(self.curves, 'key', image)
+            self.assertIsNotNone(image.pending)
+            self.assertTrue(image.is_cached('key'))
+            self.assertIsNone(image.contents)
+            # wait for the rendering
+            image.pending.wait(10)
+            self.assertTrue(image.resolve(10))
+            self.assertIsNone(image.pending)
+            self.assertEqual('png', imghdr.what('', h=image.contents.getvalue()))
+            # the callback may be called after the result is available
+            for _ in range(100):
+                if plot_pool.renderings:
+                    break
+                time.sleep(0.01)
+            self.assertEqual(1, plot_pool.renderings)
+            self.assertEqual(0, plot_pool.pending())
+        finally:
+            plot_pool.close()
+        self.assertIsNone(plot_pool.pool)
+
+    def test_bounded(self):
+        """ Test that the renderings are skipped when too many are in progress. """
+        from supvisors.plotpool import PlotPool
+        from supvisors.viewimage import StatsImage
+        self.supvisors.options.stats_plot_workers = 1
+        plot_pool = PlotPool(self.supvisors)
+        plot_pool.pool = Mock(**{'apply_async.return_value': Mock(**{'ready.return_value': False})})
+        images = [StatsImage() for _ in range(3)]
+        for idx, image in enumerate(images):
+            plot_pool.export_image(self.curves, idx, image)
+        self.assertEqual(2, plot_pool.pool.apply_async.call_count)
+        self.assertEqual(2, plot_pool.pending())
+        self.assertIsNone(images[2].pending)
+        self.assertFalse(images[2].is_cached(2))
+        pool = plot_pool.pool
+        plot_pool.close()
+        self.assertTrue(pool.terminate.called)
+        self.assertIsNone(plot_pool.pool)
+
+
+class SvgPlotPoolTest(unittest.TestCase):
+    """ Test case for the SVG renderer of the plotpool module. """
+
+    def test_svg(self):
+        """ Test that the SVG images are rendered synchronously, even with workers. """
+        from supvisors.plotpool import PlotPool
+        from supvisors.ttypes import StatisticsCharts
+        from supvisors.viewimage import StatsImage
+        supvisors = MockedSupvisors()
+        supvisors.options.stats_charts = StatisticsCharts.SVG
+        supvisors.options.stats_plot_workers = 1
+        plot_pool = PlotPool(supvisors)
+        image = StatsImage()
+        plot_pool.export_image([('CPU', '%', [1.0, 2.0, 3.0], (2.0, 1.0, (1.0, 1.0), 0.8))], 'key', image)
+        self.assertIsNone(plot_pool.pool)
+        self.assertIsNone(image.pending)
+        self.assertTrue(image.is_cached('key'))
+        self.assertEqual('image/svg+xml', image.content_type)
+        self.assertTrue(image.contents.getvalue().startswith('<svg '))
+        self.assertEqual(1, plot_pool.renderings)
+        # the workers are not forked for the SVG images
+        plot_pool.start()
+        self.assertIsNone(plot_pool.pool)
+
+
+class PlotWorkersTest(unittest.TestCase):
+    """ Test case for the worker processes of the plotpool module. """
+
+    def test_start(self):
+        """ Test that the worker processes are forked when started and terminated when closed. """
+        from supvisors.plotpool import PlotPool
+        supvisors = MockedSupvisors()
+        plot_pool = PlotPool(supvisors)
+        # no worker configured
+        plot_pool.start()
+        self.assertIsNone(plot_pool.pool)
+        supvisors.options.stats_plot_workers = 2
+        plot_pool = PlotPool(supvisors)
+        try:
+            plot_pool.start()
+            pool = plot_pool.pool
+            self.assertIsNotNone(pool)
+            # the pool is not forked twice
+            plot_pool.start()
+            self.assertIs(pool, plot_pool.pool)
+            workers = list(pool._pool)
+            self.assertEqual(2, len(workers))
+            self.assertTrue(all(worker.is_alive() for worker in workers))
+        finally:
+            plot_pool.close()
+        self.assertIsNone(plot_pool.pool)
+        self.assertFalse(any(worker.is_alive() for worker in workers))
+
+
+def test_suite():
+    return unittest.findTestCases(sys.modules[__name__])
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='test_suite')
@@ -49,6 +49,9 @@ class PluginTest(unittest.TestCase):
         from supvisors.viewprocaddress import ProcAddressView
         from supvisors.viewimage import (AddressMemoryImageView, ProcessMemoryImageView,
             AddressCpuImageView, ProcessCpuImageView, AddressNetworkImageView)
+        from supvisors.viewchart import AddressChartView, ProcessChartView
+        from supvisors.viewevents import EventView
+        from supvisors.viewmetrics import MetricsView
         # update Supervisor views
         update_views()
         # check Supvisors views
@@ -85,6 +88,18 @@ class PluginTest(unittest.TestCase):
         view = VIEWS['address_io.png']
         self.assertRegexpMatches(view['template'], 'supvisors/ui/empty.html$')
         self.assertEqual(view['view'], AddressNetworkImageView)
+        view = VIEWS['process_stats.json']
+        self.assertRegexpMatches(view['template'], 'supvisors/ui/empty.html$')
+        self.assertEqual(view['view'], ProcessChartView)
+        view = VIEWS['address_stats.json']
+        self.assertRegexpMatches(view['template'], 'supvisors/ui/empty.html$')
+        self.assertEqual(view['view'], AddressChartView)
+        view = VIEWS['events.json']
+        self.assertRegexpMatches(view['template'], 'supvisors/ui/empty.html$')
+        self.assertEqual(view['view'], EventView)
+        view = VIEWS['metrics']
+        self.assertRegexpMatches(view['template'], 'supvisors/ui/empty.html$')
+        self.assertEqual(view['view'], MetricsView)
 
     @patch('supvisors.plugin.update_views')
     @patch('supvisors.plugin.expand_faults')
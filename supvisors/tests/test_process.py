@@ -173,6 +173,7 @@ class ProcessTest(unittest.TestCase):
         self.assertEqual({}, process.infos)
         self.assertEqual('', process.extra_args)
         self.assertFalse(process.ignore_wait_exit)
+        self.assertEqual(0, process.version)
         # rules part
         self.assertDictEqual(ProcessRules(self.supvisors).__dict__, process.rules.__dict__)
 
@@ -357,6 +358,7 @@ class ProcessTest(unittest.TestCase):
         self.assertEqual(ProcessStates.STOPPED, process.state)
         self.assertFalse(process.addresses)
         local_time = process.infos['10.0.0.1']['local_time']
+        self.assertEqual(1, process.version)
         # update with a STARTING event on an unknown address
         process.update_info('10.0.0.2', {'state': ProcessStates.STARTING, 'now': 10})
         # check no change
@@ -364,10 +366,12 @@ class ProcessTest(unittest.TestCase):
         self.assertEqual(ProcessStates.STOPPED, process.infos['10.0.0.1']['state'])
         self.assertEqual(ProcessStates.STOPPED, process.state)
         self.assertFalse(process.addresses)
+        self.assertEqual(1, process.version)
         # update with a STARTING event
         process.update_info('10.0.0.1', {'state': ProcessStates.STARTING, 'now': 10})
         # check changes
         info = process.infos['10.0.0.1']
+        self.assertEqual(2, process.version)
         self.assertEqual(ProcessStates.STARTING, info['state'])
         self.assertEqual(ProcessStates.STARTING, process.state)
         self.assertSetEqual({'10.0.0.1'}, process.addresses)
@@ -518,7 +522,9 @@ class ProcessTest(unittest.TestCase):
         self.assertTrue(process.conflicting())
         self.assertEqual(ProcessStates.RUNNING, process.state)
         # invalidate RUNNING one
+        version = process.version
         process.invalidate_address('10.0.0.2', False)
+        self.assertEqual(version + 1, process.version)
         # check state became UNKNOWN on invalidated address
         self.assertEqual(ProcessStates.UNKNOWN, process.infos['10.0.0.2']['state'])
         # check the conflict
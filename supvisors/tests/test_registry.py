@@ -0,0 +1,121 @@
+#!/usr/bin/python
+#-*- coding: utf-8 -*-
+
+# ======================================================================
+# Copyright 2016 Julien LE CLEACH
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# 
+#     http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ======================================================================
+
+import sys
+import unittest
+
+
+class NamespecRegistryTest(unittest.TestCase):
+    """ Test case for the NamespecRegistry class of the registry module. """
+
+    def setUp(self):
+        """ Create a registry. """
+        from supvisors.registry import NamespecRegistry
+        self.registry = NamespecRegistry()
+
+    def test_create(self):
+        """ Test the values set at construction. """
+        self.assertListEqual([], self.registry.namespecs)
+        self.assertDictEqual({}, self.registry.ids)
+        self.assertSetEqual(set(), self.registry.declared)
+        self.assertDictEqual({}, self.registry.remotes)
+        self.assertDictEqual({}, self.registry.strings)
+
+    def test_local(self):
+        """ Test the assignment of the local identifiers. """
+        self.assertEqual(0, self.registry.get_id('appli:proc_1'))
+        self.assertEqual(1, self.registry.get_id('appli:proc_2'))
+        self.assertEqual(0, self.registry.get_id('appli:proc_1'))
+        self.assertListEqual(['appli:proc_1', 'appli:proc_2'], self.registry.serial())
+        # declaration
+        self.assertTrue(self.registry.declare(1))
+        self.assertFalse(self.registry.declare(1))
+
+    def test_process_event(self):
+        """ Test the encoding and the decoding of a process event. """
+        payload = self.registry.encode_process_event('appli:proc', {'groupname': 'appli', 'processname': 'proc',
+            'state': 20})
+        self.assertDictEqual({'id': 0, 'namespec': 'appli:proc', 'state': 20}, payload)
+        self.assertDictEqual({'groupname': 'appli', 'processname': 'proc', 'state': 20},
+            self.registry.decode_process_event('10.0.0.1', payload))
+        # the namespec is not declared anymore
+        payload = self.registry.encode_process_event('appli:proc', {'groupname': 'appli', 'processname': 'proc',
+            'state': 0})
+        self.assertDictEqual({'id': 0, 'state': 0}, payload)
+        self.assertDictEqual({'groupname': 'appli', 'processname': 'proc', 'state': 0},
+            self.registry.decode_process_event('10.0.0.1', payload))
+        # unknown identifier for another address
+        self.assertIsNone(self.registry.decode_process_event('10.0.0.2', {'id': 0, 'state': 0}))
+
+    def test_statistics(self):
+        """ Test the encoding and the decoding of the statistics. """
+        stats = (5, [(10, 20)], 25.0, {}, {'appli:proc': (1234, (0.5, 1.5))}, {'load1': 0.5})
+        encoded = self.registry.encode_statistics(stats)
+        self.assertTupleEqual((5, [(10, 20)], 25.0, {}, [(0, 1234, (0.5, 1.5))], {'load1': 0.5},
+            [(0, 'appli:proc')]), encoded)
+        self.assertTupleEqual(stats, self.registry.decode_statistics('10.0.0.1', encoded))
+        # the namespec is not declared anymore
+        encoded = self.registry.encode_statistics(stats)
+        self.assertListEqual([], encoded[-1])
+        self.assertTupleEqual(stats, self.registry.decode_statistics('10.0.0.1', encoded))
+        # unknown identifier for another address
+        self.assertDictEqual({}, self.registry.decode_statistics('10.0.0.2', encoded)[4])
+
+    def test_remote(self):
+        """ Test the tables of the remote addresses. """
+        self.registry.add('10.0.0.1', 2, u'appli:proc_3')
+        self.registry.load('10.0.0.1', ['appli:proc_1', 'appli:proc_2'])
+        self.assertEqual('appli:proc_1', self.registry.get_namespec('10.0.0.1', 0))
+        self.assertEqual('appli:proc_3', self.registry.get_namespec('10.0.0.1', 2))
+        self.assertIsNone(self.registry.get_namespec('10.0.0.1', 3))
+        self.assertIsNone(self.registry.get_namespec('10.0.0.2', 0))
+        # the same namespec instance is shared between addresses
+        self.registry.load('10.0.0.2', [u'appli:proc_3'])
+        self.assertIs(self.registry.get_namespec('10.0.0.1', 2), self.registry.get_namespec('10.0.0.2', 0))
+
+    def test_hold(self):
+        """ Test the process events held until the table of an address is loaded. """
+        # the table is requested once
+        self.assertTrue(self.registry.hold('10.0.0.1', {'id': 1}))
+        self.assertFalse(self.registry.hold('10.0.0.1', {'id': 2}))
+        self.assertFalse(self.registry.hold('10.0.0.1'))
+        self.assertTrue(self.registry.hold('10.0.0.2'))
+        # the events held are returned when the table is loaded
+        self.assertListEqual([{'id': 1}, {'id': 2}], self.registry.load('10.0.0.1', ['appli:proc_1', 'appli:proc_2']))
+        self.assertListEqual([], self.registry.load('10.0.0.1', ['appli:proc_1', 'appli:proc_2']))
+        self.assertListEqual([], self.registry.load('10.0.0.2', []))
+        # the table is requested again when it could not be obtained
+        self.registry.hold('10.0.0.1', {'id': 1})
+        self.assertEqual(1, self.registry.release('10.0.0.1'))
+        self.assertEqual(0, self.registry.release('10.0.0.1'))
+        self.assertTrue(self.registry.hold('10.0.0.1', {'id': 1}))
+        self.registry.load('10.0.0.1', [])
+        # the number of events held is limited
+        for ident in range(self.registry.MAX_HELD + 2):
+            self.registry.hold('10.0.0.1', {'id': ident})
+        payloads = self.registry.load('10.0.0.1', [])
+        self.assertEqual(self.registry.MAX_HELD, len(payloads))
+        self.assertDictEqual({'id': 2}, payloads[0])
+
+
+def test_suite():
+    return unittest.findTestCases(sys.modules[__name__])
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='test_suite')
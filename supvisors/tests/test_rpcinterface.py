@@ -223,6 +223,80 @@ class RpcInterfaceTest(unittest.TestCase):
             rpc.get_conflicts())
         self.assertEqual([call()], mocked_check.call_args_list)
 
+    @patch('supvisors.rpcinterface.RPCInterface._get_statistics_instance')
+    def test_address_statistics(self, mocked_get):
+        """ Test the get_address_statistics RPC. """
+        from supvisors.rpcinterface import RPCInterface
+        mocked_get.return_value.get_address_series.return_value = {'mem': {'dates': [5], 'values': [12.5]}}
+        # create RPC instance
+        rpc = RPCInterface(self.supervisor)
+        # test RPC call
+        self.assertDictEqual({'address_name': '10.0.0.1', 'period': 5, 'mem': {'dates': [5], 'values': [12.5]}},
+            rpc.get_address_statistics('10.0.0.1', 5, 100, 50))
+        self.assertEqual([call('10.0.0.1', 5)], mocked_get.call_args_list)
+        self.assertEqual([call(100, 50)], mocked_get.return_value.get_address_series.call_args_list)
+
+    @patch('supvisors.rpcinterface.RPCInterface._check_from_deployment')
+    @patch('supvisors.rpcinterface.RPCInterface._get_process',
+        return_value=Mock(addresses={'10.0.0.2', '10.0.0.1'}))
+    @patch('supvisors.rpcinterface.RPCInterface._get_statistics_instance')
+    def test_process_statistics(self, mocked_instance, mocked_get, mocked_check):
+        """ Test the get_process_statistics RPC. """
+        from supvisors.rpcinterface import RPCInterface
+        mocked_instance.return_value.get_process_series.side_effect = [{'pid': 1234}, None]
+        # create RPC instance
+        rpc = RPCInterface(self.supervisor)
+        # test RPC call
+        self.assertListEqual([{'address_name': '10.0.0.1', 'namespec': 'appli:proc', 'period': 5, 'pid': 1234}],
+            rpc.get_process_statistics('appli:proc', 5))
+        self.assertEqual([call()], mocked_check.call_args_list)
+        self.assertEqual([call('appli:proc')], mocked_get.call_args_list)
+        self.assertEqual([call('10.0.0.1', 5), call('10.0.0.2', 5)], mocked_instance.call_args_list)
+        self.assertEqual([call('appli:proc', 0, 0)] * 2,
+            mocked_instance.return_value.get_process_series.call_args_list)
+
+    @patch('supvisors.rpcinterface.RPCInterface._check_from_deployment')
+    @patch('supvisors.rpcinterface.RPCInterface._get_application')
+    @patch('supvisors.rpcinterface.RPCInterface._get_cluster_statistics')
+    def test_application_statistics(self, mocked_cluster, mocked_get, mocked_check):
+        """ Test the get_application_statistics RPC. """
+        from supvisors.rpcinterface import RPCInterface
+        mocked_cluster.return_value.get_application_stats.return_value = {'cpu': 10.0}
+        self.supervisor.supvisors.statistician.get_application_sketches.return_value = (
+            Mock(count=2, **{'quantiles.return_value': [1.0, 2.0, 3.0]}), Mock(count=0))
+        # create RPC instance
+        rpc = RPCInterface(self.supervisor)
+        # test RPC call
+        self.assertDictEqual({'application_name': 'appli', 'period': 5, 'cpu': 10.0, 'cpu_quantiles': [1.0, 2.0, 3.0]},
+            rpc.get_application_statistics('appli', 5))
+        self.assertEqual([call('appli', 5)],
+            self.supervisor.supvisors.statistician.get_application_sketches.call_args_list)
+        self.assertEqual([call()], mocked_check.call_args_list)
+        self.assertEqual([call('appli')], mocked_get.call_args_list)
+        self.assertEqual([call(5)], mocked_cluster.call_args_list)
+        self.assertEqual([call('appli')], mocked_cluster.return_value.get_application_stats.call_args_list)
+
+    def test_namespec_registry(self):
+        """ Test the get_namespec_registry RPC. """
+        from supvisors.rpcinterface import RPCInterface
+        self.supervisor.supvisors.registry.get_id('appli:proc_1')
+        self.supervisor.supvisors.registry.get_id('appli:proc_2')
+        # create RPC instance
+        rpc = RPCInterface(self.supervisor)
+        # test RPC call
+        self.assertListEqual(['appli:proc_1', 'appli:proc_2'], rpc.get_namespec_registry())
+
+    @patch('supvisors.rpcinterface.RPCInterface._get_cluster_statistics')
+    def test_cluster_statistics(self, mocked_cluster):
+        """ Test the get_cluster_statistics RPC. """
+        from supvisors.rpcinterface import RPCInterface
+        mocked_cluster.return_value.get_cluster_stats.return_value = {'cpu': 10.0}
+        # create RPC instance
+        rpc = RPCInterface(self.supervisor)
+        # test RPC call
+        self.assertDictEqual({'period': 5, 'cpu': 10.0}, rpc.get_cluster_statistics(5))
+        self.assertEqual([call(5)], mocked_cluster.call_args_list)
+
     @patch('supvisors.rpcinterface.RPCInterface._check_operating')
     def test_start_application(self, mocked_check):
         """ Test the start_application RPC. """
@@ -966,6 +1040,41 @@ class RpcInterfaceTest(unittest.TestCase):
         self.assertTupleEqual(('first application', None),
             rpc._get_application_process('appli_1:*'))
 
+    def test_get_statistics_instance(self):
+        """ Test the _get_statistics_instance utility. """
+        from supvisors.rpcinterface import RPCInterface
+        # prepare context
+        self.supervisor.supvisors.statistician.data = {'10.0.0.1': {5: 'instance_5', 60: 'instance_60'}}
+        # create RPC instance
+        rpc = RPCInterface(self.supervisor)
+        # test with known address and period
+        self.assertEqual('instance_60', rpc._get_statistics_instance('10.0.0.1', 60))
+        # test with unknown address
+        with self.assertRaises(RPCError) as exc:
+            rpc._get_statistics_instance('10.0.0.0', 5)
+        self.assertEqual(Faults.BAD_ADDRESS, exc.exception.code)
+        self.assertEqual('BAD_ADDRESS: address 10.0.0.0 unknown in Supvisors', exc.exception.text)
+        # test with unknown period
+        with self.assertRaises(RPCError) as exc:
+            rpc._get_statistics_instance('10.0.0.1', 15)
+        self.assertEqual(Faults.BAD_ARGUMENTS, exc.exception.code)
+        self.assertEqual('BAD_ARGUMENTS: period 15 not in statistics periods [5, 60]', exc.exception.text)
+
+    def test_get_cluster_statistics(self):
+        """ Test the _get_cluster_statistics utility. """
+        from supvisors.rpcinterface import RPCInterface
+        # prepare context
+        self.supervisor.supvisors.statistician.clusters = {5: 'cluster_5', 60: 'cluster_60'}
+        # create RPC instance
+        rpc = RPCInterface(self.supervisor)
+        # test with known period
+        self.assertEqual('cluster_5', rpc._get_cluster_statistics(5))
+        # test with unknown period
+        with self.assertRaises(RPCError) as exc:
+            rpc._get_cluster_statistics(15)
+        self.assertEqual(Faults.BAD_ARGUMENTS, exc.exception.code)
+        self.assertEqual('BAD_ARGUMENTS: period 15 not in statistics periods [5, 60]', exc.exception.text)
+
     def test_get_internal_process_rules(self):
         """ Test the _get_application_process utility. """
         from supvisors.rpcinterface import RPCInterface
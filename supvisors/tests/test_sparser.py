@@ -134,6 +134,25 @@ class CommonParserTest(unittest.TestCase):
         process = ProcessStatus('dummy_application_D', 'any_dummies_02_', self.supvisors)
         parser.load_process_rules(process)
         self.assert_default_process_rules(process.rules)
+        # check alerts
+        from supvisors.ttypes import AlertConditions, AlertSeries, AlertStatistics
+        alerts = parser.load_alert_rules()
+        self.assertListEqual(['dummy_alert_01', 'dummy_alert_02'], [rules.name for rules in alerts])
+        self.assert_alert_rules(alerts[0], AlertSeries.PROCESS_CPU, 'dummy_application_B:', AlertStatistics.P95,
+            AlertConditions.ABOVE, 80.0, 3, 0, RunningFailureStrategies.RESTART_PROCESS)
+        self.assert_alert_rules(alerts[1], AlertSeries.HOST_MEM, '', AlertStatistics.SLOPE,
+            AlertConditions.ABOVE, 0.5, 1, 15, None)
+
+    def assert_alert_rules(self, rules, series, target, statistic, condition, threshold, periods, period, strategy):
+        """ Test the alert rules. """
+        self.assertEqual(series, rules.series)
+        self.assertEqual(target, rules.target)
+        self.assertEqual(statistic, rules.statistic)
+        self.assertEqual(condition, rules.condition)
+        self.assertEqual(threshold, rules.threshold)
+        self.assertEqual(periods, rules.periods)
+        self.assertEqual(period, rules.period)
+        self.assertEqual(strategy, rules.running_failure_strategy)
 
     def assert_default_application_rules(self, rules):
         """ Check that rules contains default values. """
@@ -351,6 +370,12 @@ class ElementTreeParserTest(CommonParserTest):
         process = ProcessStatus('dummy_application_D', 'any_dummies_02_', self.supvisors)
         parser.load_process_rules(process)
         self.assert_default_process_rules(process.rules)
+        # check alerts: invalid values are replaced by defaults and alerts without series or threshold are ignored
+        from supvisors.ttypes import AlertConditions, AlertSeries, AlertStatistics
+        alerts = parser.load_alert_rules()
+        self.assertListEqual(['dummy_alert_01', 'dummy_alert_02'], [rules.name for rules in alerts])
+        self.assert_alert_rules(alerts[1], AlertSeries.HOST_MEM, '', AlertStatistics.VALUE,
+            AlertConditions.BELOW, 10.0, 1, 0, None)
 
 
 def test_suite():
@@ -19,10 +19,14 @@
 
 import multiprocessing
 import os
+import shutil
 import sys
+import tempfile
 import time
 import unittest
 
+from mock import call, patch
+
 
 class StatisticsCollectorTest(unittest.TestCase):
     """ Test case for the functions of the statscollector module. """
@@ -79,6 +83,23 @@ class StatisticsCollectorTest(unittest.TestCase):
         # for loopback address, recv bytes equals sent bytes
         self.assertEqual(stats['lo'][0], stats['lo'][1])
 
+    def test_instant_pressure_statistics(self):
+        """ Test the instant host pressure statistics. """
+        from supvisors.statscollector import instant_pressure_statistics
+        stats = instant_pressure_statistics()
+        # test gauges
+        for name in ['load1', 'load5', 'load15', 'swap']:
+            self.assertIs(float, type(stats[name]))
+            self.assertGreaterEqual(stats[name], 0)
+        self.assertLessEqual(stats['swap'], 100)
+        self.assertGreater(stats['available'], 0)
+        # test pressure stall totals when the kernel provides them
+        for resource in ['cpu', 'memory', 'io']:
+            if os.path.exists('/proc/pressure/' + resource):
+                self.assertGreaterEqual(stats[resource + '_some'], 0)
+            else:
+                self.assertNotIn(resource + '_some', stats)
+
     def test_instant_process_statistics(self):
         """ Test the instant process statistics. """
         from supvisors.statscollector import instant_process_statistics
@@ -98,13 +119,90 @@ class StatisticsCollectorTest(unittest.TestCase):
         self.assertEqual(work, 0)
         self.assertEqual(memory, 0)
 
+    def test_process_cgroups(self):
+        """ Test the parsing of the cgroups of a process. """
+        from supvisors.statscollector import process_cgroups
+        # check with existing PID
+        cgroups = process_cgroups(os.getpid())
+        self.assertIs(dict, type(cgroups))
+        for controller, path in cgroups.items():
+            self.assertTrue(path.startswith('/'))
+        # check handling of non-existing PID
+        self.assertDictEqual({}, process_cgroups(-1))
+
+    def test_instant_cgroup_statistics(self):
+        """ Test the instant cgroup statistics. """
+        from supvisors.statscollector import instant_cgroup_statistics, virtual_memory
+        total = virtual_memory().total
+        root = tempfile.mkdtemp()
+        try:
+            # create a cgroup v1 tree
+            cpuacct_path = os.path.join(root, 'cpuacct', 'dummy')
+            memory_path = os.path.join(root, 'memory', 'dummy')
+            os.makedirs(cpuacct_path)
+            os.makedirs(memory_path)
+            with open(os.path.join(cpuacct_path, 'cpuacct.usage'), 'w') as cgroup_file:
+                cgroup_file.write('2500000000\n')
+            with open(os.path.join(memory_path, 'memory.usage_in_bytes'), 'w') as cgroup_file:
+                cgroup_file.write('{}\n'.format(total / 10))
+            with open(os.path.join(memory_path, 'memory.stat'), 'w') as cgroup_file:
+                cgroup_file.write('cache 1024\ntotal_inactive_file 0\n')
+            # create a cgroup v2 tree
+            unified_path = os.path.join(root, 'dummy.scope')
+            os.makedirs(unified_path)
+            with open(os.path.join(unified_path, 'cpu.stat'), 'w') as cgroup_file:
+                cgroup_file.write('usage_usec 1500000\nuser_usec 1000000\nsystem_usec 500000\n')
+            with open(os.path.join(unified_path, 'memory.current'), 'w') as cgroup_file:
+                cgroup_file.write('{}\n'.format(total / 4))
+            with open(os.path.join(unified_path, 'memory.stat'), 'w') as cgroup_file:
+                cgroup_file.write('anon 1024\ninactive_file 0\n')
+            with patch('supvisors.statscollector.CGROUP_ROOT', root):
+                with patch('supvisors.statscollector.process_cgroups') as mocked_cgroups:
+                    # test cgroup shared with supervisord
+                    mocked_cgroups.return_value = {'cpuacct': '/dummy', 'memory': '/dummy'}
+                    self.assertIsNone(instant_cgroup_statistics(1234))
+                    # test cgroup v1
+                    mocked_cgroups.side_effect = lambda pid: {'cpuacct': '/dummy', 'memory': '/dummy'} \
+                        if pid == 1234 else {'cpuacct': '/', 'memory': '/'}
+                    work, memory = instant_cgroup_statistics(1234)
+                    self.assertAlmostEqual(2.5, work)
+                    self.assertAlmostEqual(10, memory, 3)
+                    # test cgroup v2
+                    mocked_cgroups.side_effect = lambda pid: {'': '/dummy.scope'} if pid == 1234 else {'': '/'}
+                    work, memory = instant_cgroup_statistics(1234)
+                    self.assertAlmostEqual(1.5, work)
+                    self.assertAlmostEqual(25, memory, 3)
+                    # test missing accounting
+                    mocked_cgroups.side_effect = lambda pid: {'': '/unknown'} if pid == 1234 else {'': '/'}
+                    self.assertIsNone(instant_cgroup_statistics(1234))
+        finally:
+            shutil.rmtree(root)
+
+    def test_instant_process_statistics_cgroup(self):
+        """ Test the fallback of the instant process statistics when cgroup accounting is not available. """
+        from supvisors.statscollector import instant_process_statistics
+        # check with cgroup accounting
+        with patch('supvisors.statscollector.instant_cgroup_statistics', return_value=(1.5, 25.0)) as mocked_cgroup:
+            self.assertTupleEqual((1.5, 25.0), instant_process_statistics(os.getpid(), True))
+            self.assertEqual(1, mocked_cgroup.call_count)
+            # check that cgroup accounting is not used when not requested
+            work, memory = instant_process_statistics(os.getpid())
+            self.assertEqual(1, mocked_cgroup.call_count)
+        # check fallback to psutil
+        with patch('supvisors.statscollector.instant_cgroup_statistics', return_value=None):
+            work, memory = instant_process_statistics(os.getpid(), True)
+            self.assertIs(float, type(work))
+            self.assertGreater(work, 0)
+            self.assertIs(float, type(memory))
+            self.assertGreater(memory, 0)
+
     def test_instant_statistics(self):
         """ Test the instant global statistics. """
         from supvisors.statscollector import instant_statistics
         stats = instant_statistics([('myself', os.getpid())])
         # check result
-        self.assertEqual(5, len(stats))
-        date, cpu_stats, mem_stats, io_stats, proc_stats = stats
+        self.assertEqual(6, len(stats))
+        date, cpu_stats, mem_stats, io_stats, proc_stats, pressure_stats = stats
         #  check time (current is greater)
         self.assertGreater(time.time(), date)
         # check cpu jiffies
@@ -133,6 +231,165 @@ class StatisticsCollectorTest(unittest.TestCase):
             self.assertIs(float, type(value))
             self.assertGreaterEqual(value, 0)
             self.assertLessEqual(value, 100)
+        # check host pressure
+        self.assertIn('load1', pressure_stats)
+        self.assertIn('available', pressure_stats)
+
+
+class ProcessSampleTest(unittest.TestCase):
+    """ Test case for the ProcessSample class of the statscollector module. """
+
+    def setUp(self):
+        """ Skip the tests if psutil is not installed. """
+        try:
+            import psutil
+            psutil.__name__
+        except ImportError:
+            raise unittest.SkipTest('cannot test as optional psutil is not installed')
+
+    def test_create(self):
+        """ Test the values set at construction. """
+        from supvisors.statscollector import ProcessSample
+        sample = ProcessSample(4)
+        self.assertEqual(4, sample.max_interval)
+        self.assertIsNone(sample.date)
+        self.assertEqual(0, sample.work)
+        self.assertEqual(0, sample.memory)
+        self.assertFalse(sample.rates)
+        self.assertEqual(1, sample.interval)
+        self.assertEqual(0, sample.countdown)
+        self.assertFalse(sample.skip())
+
+    def test_idle_process(self):
+        """ Test that the sampling interval of an idle process increases up to its maximum. """
+        from supvisors.statscollector import ProcessSample
+        sample = ProcessSample(4)
+        # first measures: no variance available yet
+        sample.update(0, (10.0, 2.0))
+        self.assertEqual(1, sample.interval)
+        sample.update(5, (10.05, 2.0))
+        self.assertEqual(1, len(sample.rates))
+        self.assertAlmostEqual(0.01, sample.rates[0])
+        self.assertEqual(1, sample.interval)
+        # stable rate: interval doubles
+        sample.update(10, (10.1, 2.0))
+        self.assertEqual(2, sample.interval)
+        self.assertEqual(1, sample.countdown)
+        # next tick is skipped and interpolated
+        self.assertTrue(sample.skip())
+        work, memory = sample.estimate(15)
+        self.assertAlmostEqual(10.15, work)
+        self.assertEqual(2.0, memory)
+        self.assertFalse(sample.skip())
+        # interval is limited
+        sample.update(20, (10.2, 2.1))
+        self.assertEqual(4, sample.interval)
+        sample.update(40, (10.4, 2.1))
+        self.assertEqual(4, sample.interval)
+        self.assertEqual(3, sample.countdown)
+
+    def test_hot_process(self):
+        """ Test that a process with a varying CPU rate is measured at every tick. """
+        from supvisors.statscollector import ProcessSample
+        sample = ProcessSample(4)
+        sample.update(0, (10.0, 2.0))
+        sample.update(5, (10.05, 2.0))
+        sample.update(10, (10.1, 2.0))
+        self.assertEqual(2, sample.interval)
+        # the process wakes up
+        sample.update(20, (15.1, 2.0))
+        self.assertEqual(1, sample.interval)
+        self.assertEqual(0, sample.countdown)
+        self.assertFalse(sample.skip())
+
+    def test_busy_process(self):
+        """ Test that a process with a high and stable CPU rate is measured at every tick. """
+        from supvisors.statscollector import ProcessSample
+        sample = ProcessSample(4)
+        for now in range(0, 50, 5):
+            sample.update(now, (10.0 + now, 2.0))
+            self.assertEqual(1, sample.interval)
+            self.assertFalse(sample.skip())
+        self.assertListEqual([1.0] * 4, list(sample.rates))
+
+    def test_slowing_process(self):
+        """ Test that the CPU work reported does not decrease when the process slows down after an extrapolation. """
+        from supvisors.statscollector import ProcessSample
+        from supvisors.statscompiler import cpu_process_statistics
+        sample = ProcessSample(4)
+        self.assertTupleEqual((10.0, 2.0), sample.update(0, (10.0, 2.0)))
+        sample.update(5, (10.1, 2.0))
+        sample.update(10, (10.2, 2.0))
+        self.assertEqual(2, sample.interval)
+        # the skipped tick is extrapolated
+        self.assertTrue(sample.skip())
+        work, _ = sample.estimate(15)
+        self.assertAlmostEqual(10.3, work)
+        # the process has slowed down: the extrapolated work is held
+        held, memory = sample.update(20, (10.25, 2.5))
+        self.assertAlmostEqual(10.3, held)
+        self.assertEqual(2.5, memory)
+        self.assertEqual(0.0, cpu_process_statistics(held, work, 100.0))
+        self.assertEqual(10.25, sample.work)
+        # the measures catch up
+        self.assertTupleEqual((10.4, 2.5), sample.update(25, (10.4, 2.5)))
+
+
+class StatisticsCollectorTest(unittest.TestCase):
+    """ Test case for the StatisticsCollector class of the statscollector module. """
+
+    def setUp(self):
+        """ Skip the tests if psutil is not installed. """
+        try:
+            import psutil
+            psutil.__name__
+        except ImportError:
+            raise unittest.SkipTest('cannot test as optional psutil is not installed')
+
+    def test_create(self):
+        """ Test the values set at construction. """
+        from supvisors.statscollector import StatisticsCollector
+        collector = StatisticsCollector()
+        self.assertFalse(collector.cgroup)
+        self.assertEqual(0, collector.max_skip)
+        self.assertDictEqual({}, collector.samples)
+        collector = StatisticsCollector(True, 3)
+        self.assertTrue(collector.cgroup)
+        self.assertEqual(3, collector.max_skip)
+
+    @patch('supvisors.statscollector.instant_process_statistics', return_value=(1.5, 2.5))
+    def test_process_statistics(self, mocked_stats):
+        """ Test the adaptive sampling of the process statistics. """
+        from supvisors.statscollector import StatisticsCollector
+        # without adaptive sampling, process is measured at each call
+        collector = StatisticsCollector(True)
+        for now in range(3):
+            self.assertTupleEqual((1.5, 2.5), collector.process_statistics(1234, now))
+        self.assertEqual(3, mocked_stats.call_count)
+        self.assertListEqual([call(1234, True)] * 3, mocked_stats.call_args_list)
+        self.assertDictEqual({}, collector.samples)
+        mocked_stats.reset_mock()
+        # with adaptive sampling, measures of idle processes are skipped
+        collector = StatisticsCollector(False, 3)
+        for now in range(0, 50, 5):
+            self.assertTupleEqual((1.5, 2.5), collector.process_statistics(1234, now))
+        self.assertEqual(5, mocked_stats.call_count)
+        self.assertListEqual([1234], collector.samples.keys())
+        self.assertEqual(4, collector.samples[1234].max_interval)
+
+    @patch('supvisors.statscollector.instant_process_statistics', return_value=(1.5, 2.5))
+    def test_call(self, mocked_stats):
+        """ Test the snapshot of all resources. """
+        from supvisors.statscollector import StatisticsCollector
+        collector = StatisticsCollector(False, 3)
+        stats = collector([('dummy_1', 1234), ('dummy_2', 4321)])
+        self.assertEqual(6, len(stats))
+        self.assertDictEqual({'dummy_1': (1234, (1.5, 2.5)), 'dummy_2': (4321, (1.5, 2.5))}, stats[4])
+        self.assertItemsEqual([1234, 4321], collector.samples.keys())
+        # samples of stopped processes are removed
+        stats = collector([('dummy_1', 1234)])
+        self.assertDictEqual({'dummy_1': (1234, (1.5, 2.5))}, stats[4])
+        self.assertListEqual([1234], collector.samples.keys())
 
 
 def test_suite():
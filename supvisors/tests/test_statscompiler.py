@@ -19,11 +19,27 @@
 
 import multiprocessing
 import sys
+
+from math import ceil
 import unittest
 
+from mock import patch, Mock
+
 from supvisors.tests.base import MockedSupvisors
 
 
+def series_to_lists(dico):
+    """ Convert the statistics series of a dictionary into lists. """
+    return {key: tuple(list(series) for series in value) if type(value) is tuple else list(value)
+        for key, value in dico.items()}
+
+
+def process_to_lists(dico):
+    """ Convert the process statistics of a dictionary into tuples of pid and lists. """
+    return {namespec: (proc_stats.pid, list(proc_stats.cpu), list(proc_stats.mem))
+        for namespec, proc_stats in dico.items()}
+
+
 class StatisticsTest(unittest.TestCase):
     """ Test case for the functions of the statscompiler module. """
 
@@ -66,6 +82,20 @@ class StatisticsTest(unittest.TestCase):
         # test that values
         self.assertDictEqual({'lo': (8, 8), 'eth0': (7, 1)},stats)
  
+    def test_pressure_statistics(self):
+        """ Test the host pressure statistics between 2 dates. """
+        from supvisors.statscompiler import pressure_statistics
+        ref_stats = {'load1': 0.5, 'swap': 12.5, 'available': 1048576, 'cpu_some': 1000000, 'io_full': 50000}
+        last_stats = {'load1': 0.75, 'swap': 12.0, 'available': 3145728, 'cpu_some': 1500000, 'io_full': 150000,
+            'memory_some': 2000}
+        stats = pressure_statistics(last_stats, ref_stats, 5)
+        # gauges are copied, totals are converted into a percentage of the interval
+        # memory_some is ignored as there is no reference
+        self.assertDictEqual({'load1': 0.75, 'swap': 12.0, 'available': 3.0, 'cpu_some': 10.0, 'io_full': 2.0}, stats)
+        # a total that went back (i.e. host reboot) is ignored
+        stats = pressure_statistics(ref_stats, last_stats, 5)
+        self.assertDictEqual({'load1': 0.5, 'swap': 12.5, 'available': 1.0}, stats)
+
     def test_cpu_process_statistics(self):
         """ Test the CPU of the process between 2 dates. """
         from supvisors.statscompiler import cpu_process_statistics
@@ -77,13 +107,13 @@ class StatisticsTest(unittest.TestCase):
         """ Test the global statistics between 2 dates. """
         from supvisors.statscompiler import statistics
         ref_stats = (1000, [(25, 400), (25, 125), (15, 150)], 65, {'eth0': (2000, 200), 'lo': (5000, 5000)},
-            {'myself': (26088, (0.15, 1.85))})
+            {'myself': (26088, (0.15, 1.85))}, {'load1': 0.5, 'cpu_some': 10000})
         last_stats = (1002, [(45, 700), (50, 225), (40, 250)], 67.7, {'eth0': (2768, 456), 'lo': (6024, 6024)},
-            {'myself': (26088, (1.75, 1.9))})
+            {'myself': (26088, (1.75, 1.9))}, {'load1': 0.25, 'cpu_some': 30000})
         stats = statistics(last_stats, ref_stats)
         # check result
-        self.assertEqual(5, len(stats))
-        date, cpu_stats, mem_stats, io_stats, proc_stats = stats
+        self.assertEqual(6, len(stats))
+        date, cpu_stats, mem_stats, io_stats, proc_stats, pressure_stats = stats
         # check date
         self.assertEqual(1002, date)
         # check cpu
@@ -94,6 +124,39 @@ class StatisticsTest(unittest.TestCase):
         self.assertDictEqual({'lo': (4, 4), 'eth0': (3, 1)}, io_stats)
         # check process stats
         self.assertDictEqual({('myself', 26088): (0.5, 1.9)}, proc_stats)
+        # check host pressure
+        self.assertDictEqual({'load1': 0.25, 'cpu_some': 1.0}, pressure_stats)
+        # check compatibility with measures that do not include host pressure
+        stats = statistics(last_stats[:5], ref_stats[:5])
+        self.assertDictEqual({}, stats[5])
+
+    def test_vectorized_statistics(self):
+        """ Test the global statistics between 2 snapshots using numpy. """
+        from supvisors.statscompiler import numpy, statistics, StatisticsSnapshot
+        if not numpy:
+            raise unittest.SkipTest('cannot test as optional numpy is not installed')
+        ref_stats = (1000, [(25, 400), (25, 125), (15, 150), (10, 10)], 65,
+            {'eth0': (2000, 200), 'lo': (5000, 5000), 'eth1': (800, 800)},
+            {'myself': (26088, (0.15, 1.85)), 'restarted': (1234, (0.2, 1.0))},
+            {'load1': 0.5, 'cpu_some': 10000})
+        last_stats = (1002, [(45, 700), (50, 225), (40, 250), (10, 10)], 67.7,
+            {'eth0': (2768, 456), 'lo': (6024, 6024), 'eth1': (0, 1024)},
+            {'myself': (26088, (1.75, 1.9)), 'restarted': (1240, (0.1, 2.0))},
+            {'load1': 0.25, 'cpu_some': 30000})
+        # snapshots behave as the original tuples
+        snapshot = StatisticsSnapshot(last_stats)
+        self.assertEqual(last_stats, snapshot)
+        self.assertListEqual(['eth0', 'eth1', 'lo'], snapshot.io_names)
+        self.assertListEqual(['myself', 'restarted'], snapshot.proc_names)
+        # same results as in pure Python, including idle processors, wrapped counters and restarted processes
+        expected = statistics(last_stats, ref_stats)
+        self.assertEqual(expected, statistics(snapshot, StatisticsSnapshot(ref_stats)))
+        self.assertDictEqual({('myself', 26088): (0.5, 1.9)}, expected[4])
+        # same results when the processors, the interfaces and the processes differ
+        ref_stats = (1000, [(25, 400), (25, 125)], 65, {'eth0': (2000, 200)}, {}, {})
+        expected = statistics(last_stats, ref_stats)
+        self.assertEqual(expected, statistics(snapshot, StatisticsSnapshot(ref_stats)))
+        self.assertDictEqual({'eth0': (3, 1)}, expected[3])
 
 
 class StatisticsInstanceTest(unittest.TestCase):
@@ -101,76 +164,223 @@ class StatisticsInstanceTest(unittest.TestCase):
 
     def test_create(self):
         """ Test the initialization of an instance. """
-        from supvisors.statscompiler import StatisticsInstance
+        from supvisors.statscompiler import StatisticsInstance, StatisticsSeries
         instance = StatisticsInstance(17, 10)
         # check attributes
         self.assertEqual(3, instance.period)
         self.assertEqual(10, instance.depth)
         self.assertEqual(-1, instance.counter)
         self.assertIsNone(instance.ref_stats)
+        self.assertFalse(instance.dates)
         self.assertIs(list, type(instance.cpu))
         self.assertFalse(instance.cpu)
-        self.assertIs(list, type(instance.mem))
+        self.assertIs(StatisticsSeries, type(instance.mem))
         self.assertFalse(instance.mem)
         self.assertIs(dict, type(instance.io))
         self.assertFalse(instance.io)
         self.assertIs(dict, type(instance.proc))
         self.assertFalse(instance.proc)
+        self.assertIs(dict, type(instance.pressure))
+        self.assertFalse(instance.pressure)
 
     def test_clear(self):
         """ Test the clearance of an instance. """
-        from supvisors.statscompiler import StatisticsInstance
+        from supvisors.statscompiler import StatisticsInstance, StatisticsSeries
         instance = StatisticsInstance(17, 10)
         # change values
         instance.counter = 28
         instance.ref_stats = ('dummy', 0)
+        instance.dates.extend([5, 10])
         instance.cpu = [13.2,  14.8]
         instance.mem = [56.4, 71.3, 68.9]
         instance.io = {'eth0': (123465, 654321), 'lo': (321, 321)}
         instance.proc = {('myself', 5888): (25.0, 12.5)}
+        instance.pressure = {'load1': [0.5, 0.75]}
         # check clearance
         instance.clear()
         self.assertEqual(3, instance.period)
         self.assertEqual(10, instance.depth)
         self.assertEqual(-1, instance.counter)
         self.assertIsNone(instance.ref_stats)
+        self.assertFalse(instance.dates)
         self.assertIs(list, type(instance.cpu))
         self.assertFalse(instance.cpu)
-        self.assertIs(list, type(instance.mem))
+        self.assertIs(StatisticsSeries, type(instance.mem))
         self.assertFalse(instance.mem)
         self.assertIs(dict, type(instance.io))
         self.assertFalse(instance.io)
         self.assertIs(dict, type(instance.proc))
         self.assertFalse(instance.proc)
+        self.assertIs(dict, type(instance.pressure))
+        self.assertFalse(instance.pressure)
 
     def test_find_process_stats(self):
         """ Test the search method for process statistics. """
-        from supvisors.statscompiler import StatisticsInstance
+        from supvisors.statscompiler import ProcessStatistics, StatisticsInstance
         instance = StatisticsInstance(17, 10)
         # change values
-        instance.proc = {('the_other', 1234): (1.5, 2.4), ('myself', 5888): (25.0, 12.5)}
+        # the series are considered as viewed at creation
+        with patch('supvisors.statscompiler.time', return_value=1000.0):
+            myself = ProcessStatistics(1234, instance.new_series([25.0]), instance.new_series([12.5]))
+            instance.proc = {'the_other': ProcessStatistics(4321, instance.new_series(), instance.new_series()),
+                'myself': myself}
+        self.assertEqual(1000.0, myself.viewed)
         # test find method with wrong argument
         self.assertIsNone(instance.find_process_stats('someone'))
         # test find method with correct argument
-        stats = instance.find_process_stats('myself')
-        self.assertTupleEqual((25.0, 12.5), stats)
+        with patch('supvisors.statscompiler.time', return_value=1234.5):
+            self.assertIs(myself, instance.find_process_stats('myself'))
+        self.assertEqual(1234.5, myself.viewed)
+        self.assertEqual(1000.0, instance.proc['the_other'].viewed)
+        # an evicted process is not found but its series will be rebuilt
+        instance.evict('myself')
+        self.assertSetEqual({'myself'}, instance.evicted)
+        self.assertIsNone(instance.find_process_stats('myself'))
+        self.assertSetEqual(set(), instance.evicted)
+
+    def test_peek_process_stats(self):
+        """ Test the access to process statistics without request. """
+        from supvisors.statscompiler import ProcessStatistics, StatisticsInstance
+        instance = StatisticsInstance(17, 10)
+        with patch('supvisors.statscompiler.time', return_value=1000.0):
+            myself = ProcessStatistics(1234, instance.new_series([25.0]), instance.new_series([12.5]))
+        instance.proc = {'myself': myself}
+        instance.evicted = {'the_other'}
+        # the process is found but not considered as viewed
+        self.assertIs(myself, instance.peek_process_stats('myself'))
+        self.assertEqual(1000.0, myself.viewed)
+        # an evicted process is not rebuilt
+        self.assertIsNone(instance.peek_process_stats('the_other'))
+        self.assertSetEqual({'the_other'}, instance.evicted)
+
+    def test_downsample(self):
+        """ Test the downsampling of the oldest half of the statistics. """
+        from supvisors.statscompiler import ProcessStatistics, StatisticsInstance
+        instance = StatisticsInstance(5, 10)
+        self.assertFalse(instance.downsample())
+        instance.dates.extend(range(8))
+        instance.mem.extend(range(10, 18))
+        # process series aligned on the most recent dates
+        instance.proc['proc'] = ProcessStatistics(1234, instance.new_series(range(25, 30)), instance.new_series())
+        size = instance.memory_size()
+        self.assertTrue(instance.downsample())
+        self.assertListEqual([0, 2, 4, 5, 6, 7], list(instance.dates))
+        self.assertListEqual([10, 12, 14, 15, 16, 17], list(instance.mem))
+        self.assertListEqual([26, 27, 28, 29], list(instance.proc['proc'].cpu))
+        self.assertEqual(10, instance.dates.maxlen)
+        self.assertLess(instance.memory_size(), size)
+        # the values of the shorter series are not related to the dates removed
+        self.assertTrue(instance.downsample())
+        self.assertListEqual([0, 4, 5, 6, 7], list(instance.dates))
+        self.assertListEqual([10, 14, 15, 16, 17], list(instance.mem))
+        self.assertListEqual([26, 27, 28, 29], list(instance.proc['proc'].cpu))
+        # not enough values to downsample
+        self.assertTrue(instance.downsample())
+        self.assertTrue(instance.downsample())
+        self.assertListEqual([0, 6, 7], list(instance.dates))
+        self.assertFalse(instance.downsample())
 
-    def test_trunc_depth(self):
+    def test_new_series(self):
         """ Test the history depth. """
-        from supvisors.statscompiler import StatisticsInstance
+        from supvisors.statscompiler import StatisticsInstance, StatisticsSeries
         instance = StatisticsInstance(12, 5)
-        # test that the truc_depth method does nothing when less than 5 elements in list
-        test_list = [1, 2, 3, 4]
-        instance.trunc_depth(test_list)
-        self.assertListEqual([1, 2, 3, 4], test_list)
-        # test that the truc_depth method keeps only the last 5 elements in list
-        test_list = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
-        instance.trunc_depth(test_list)
-        self.assertListEqual([6, 7, 8, 9, 10], test_list)
+        # test that the series is created with the depth of the instance
+        series = instance.new_series([1, 2, 3, 4])
+        self.assertIs(StatisticsSeries, type(series))
+        self.assertEqual(5, series.maxlen)
+        self.assertListEqual([1, 2, 3, 4], list(series))
+        # test that the series keeps only the last 5 elements
+        series.extend([5, 6, 7, 8, 9, 10])
+        self.assertListEqual([6, 7, 8, 9, 10], list(series))
+
+    def test_get_series(self):
+        """ Test the export of a series as compact lists. """
+        from supvisors.statscompiler import StatisticsInstance
+        instance = StatisticsInstance(5, 10)
+        instance.dates.extend([5, 10, 15, 20, 25])
+        # series are aligned on the most recent date
+        series = instance.new_series([1.0, 2.0, 3.0])
+        quantiles = series.sketch.quantiles()
+        self.assertDictEqual({'dates': [15, 20, 25], 'values': [1.0, 2.0, 3.0], 'quantiles': quantiles},
+            instance.get_series(series))
+        self.assertDictEqual({'dates': [], 'values': []}, instance.get_series(instance.new_series()))
+        # test time range (quantiles are not affected)
+        self.assertDictEqual({'dates': [25], 'values': [3.0], 'quantiles': quantiles}, instance.get_series(series, 20))
+        # test downsampling
+        series = instance.new_series([1.0, 2.0, 8.0, 4.0, 5.0])
+        self.assertDictEqual({'dates': [5, 15, 25], 'values': [1.0, 8.0, 5.0], 'quantiles': series.sketch.quantiles()},
+            instance.get_series(series, 0, 3))
+        # test rolled-up series
+        from supvisors.statscompiler import RollupInstance
+        instance = RollupInstance(10, 10, 2)
+        instance.dates.extend([10, 20])
+        for values in [(1.0, 0.5, 1.5), (2.0, 1.5, 3.0)]:
+            instance.mem.accumulate(values)
+            instance.mem.flush()
+        self.assertDictEqual({'dates': [20], 'values': [2.0], 'minimum': [1.5], 'maximum': [3.0],
+            'quantiles': instance.mem.sketch.quantiles()}, instance.get_series(instance.mem, 15))
+
+    def test_get_series_gaps(self):
+        """ Test that the gaps of a series are not exported and do not misalign the dates. """
+        from supvisors.statscompiler import RollupInstance, StatisticsInstance
+        instance = StatisticsInstance(5, 4)
+        cpu, io = [(25, 400)], {'lo': (500, 500)}
+        instance.push_statistics((5, cpu, 10.0, io, {}, {'load1': 0.5, 'cpu_some': 0}))
+        instance.push_statistics((10, cpu, 10.0, io, {}, {'load1': 0.5, 'cpu_some': 50000}))
+        instance.push_statistics((15, cpu, 10.0, io, {}, {'load1': 0.5}))
+        instance.push_statistics((20, cpu, 10.0, io, {}, {'load1': 0.5, 'cpu_some': 100000}))
+        instance.push_statistics((25, cpu, 10.0, io, {}, {'load1': 0.5, 'cpu_some': 200000}))
+        series = instance.pressure['cpu_some']
+        self.assertListEqual([1.0, None, None, 2.0], list(series))
+        self.assertDictEqual({'dates': [10, 25], 'values': [1.0, 2.0], 'quantiles': series.sketch.quantiles()},
+            instance.get_series(series))
+        self.assertDictEqual({'dates': [25], 'values': [2.0], 'quantiles': series.sketch.quantiles()},
+            instance.get_series(series, 10))
+        # the extrema of a rolled-up series stay aligned on the values
+        instance = RollupInstance(10, 10, 3)
+        instance.dates.extend([10, 20, 30])
+        instance.mem.accumulate((1.0, 0.5, 1.5))
+        instance.mem.flush()
+        instance.mem.flush()
+        instance.mem.accumulate((2.0, 1.5, 3.0))
+        instance.mem.flush()
+        self.assertDictEqual({'dates': [10, 30], 'values': [1.0, 2.0], 'minimum': [0.5, 1.5], 'maximum': [1.5, 3.0],
+            'quantiles': instance.mem.sketch.quantiles()}, instance.get_series(instance.mem))
+
+    def test_get_address_series(self):
+        """ Test the export of the address series. """
+        from math import ceil, log
+        from supvisors.statscompiler import QuantileSketch, StatisticsInstance
+        instance = StatisticsInstance(5, 10)
+        instance.push_statistics((0, [(0, 0), (0, 0)], 10.0, {'lo': (0, 0)}, {}, {'load1': 0.5}))
+        instance.push_statistics((5, [(50, 50), (20, 80)], 20.0, {'lo': (640, 1280)}, {}, {'load1': 0.75}))
+        # quantiles of a single value
+        q = lambda value: [QuantileSketch.GAMMA ** ceil(log(value) / QuantileSketch.LOG_GAMMA) * 2.0
+            / (QuantileSketch.GAMMA + 1)] * 3
+        self.assertDictEqual({'cpu': [{'dates': [5], 'values': [50.0], 'quantiles': q(50.0)},
+                {'dates': [5], 'values': [20.0], 'quantiles': q(20.0)}],
+            'mem': {'dates': [5], 'values': [20.0], 'quantiles': q(20.0)},
+            'io': {'lo': {'recv': {'dates': [5], 'values': [1.0], 'quantiles': q(1.0)},
+                'sent': {'dates': [5], 'values': [2.0], 'quantiles': q(2.0)}}},
+            'pressure': {'load1': {'dates': [5], 'values': [0.75], 'quantiles': q(0.75)}}},
+            instance.get_address_series())
+
+    def test_get_process_series(self):
+        """ Test the export of the process series. """
+        from supvisors.statscompiler import StatisticsInstance
+        instance = StatisticsInstance(5, 10)
+        instance.push_statistics((0, [(0, 0)], 10.0, {}, {'myself': (118612, (0, 1.5))}))
+        instance.push_statistics((5, [(50, 50)], 20.0, {}, {'myself': (118612, (25, 2.5))}))
+        self.assertIsNone(instance.get_process_series('someone'))
+        proc_stats = instance.find_process_stats('myself')
+        self.assertDictEqual({'pid': 118612,
+            'cpu': {'dates': [5], 'values': [25.0], 'quantiles': proc_stats.cpu.sketch.quantiles()},
+            'mem': {'dates': [5], 'values': [2.5], 'quantiles': proc_stats.mem.sketch.quantiles()}},
+            instance.get_process_series('myself'))
 
     def test_push_statistics(self):
         """ Test the storage of the instant statistics. """
-        from supvisors.statscompiler import StatisticsInstance
+        from supvisors.statscompiler import StatisticsInstance, StatisticsSeries
         # testing with period 12 and history depth 2
         instance = StatisticsInstance(12, 2)
         # push first set of measures
@@ -186,16 +396,15 @@ class StatisticsInstanceTest(unittest.TestCase):
         self.assertFalse(instance.mem)
         self.assertItemsEqual(['eth0', 'lo'], instance.io.keys())
         for recv, sent in instance.io.values():
-            self.assertIs(list, type(recv))
+            self.assertIs(StatisticsSeries, type(recv))
             self.assertFalse(recv)
-            self.assertIs(list, type(sent))
+            self.assertIs(StatisticsSeries, type(sent))
             self.assertFalse(sent)
-        self.assertItemsEqual([('myself', 118612), ('other1', 7754), ('other2', 826)], instance.proc.keys())
-        for cpu_list, mem_list in instance.proc.values():
-            self.assertIs(list, type(cpu_list))
-            self.assertFalse(cpu_list)
-            self.assertIs(list, type(mem_list))
-            self.assertFalse(mem_list)
+        self.assertDictEqual({'myself': (118612, [], []), 'other1': (7754, [], []), 'other2': (826, [], [])},
+            process_to_lists(instance.proc))
+        for proc_stats in instance.proc.values():
+            self.assertIs(StatisticsSeries, type(proc_stats.cpu))
+            self.assertIs(StatisticsSeries, type(proc_stats.mem))
         self.assertIs(stats1, instance.ref_stats)
         # push second set of measures
         stats2 = (18.52, [(30, 600), (40, 150), (30, 200), (41, 550), (20, 300)],
@@ -212,16 +421,15 @@ class StatisticsInstanceTest(unittest.TestCase):
         self.assertFalse(instance.mem)
         self.assertItemsEqual(['eth0', 'lo'], instance.io.keys())
         for recv, sent in instance.io.values():
-            self.assertIs(list, type(recv))
+            self.assertIs(StatisticsSeries, type(recv))
             self.assertFalse(recv)
-            self.assertIs(list, type(sent))
+            self.assertIs(StatisticsSeries, type(sent))
             self.assertFalse(sent)
-        self.assertItemsEqual([('myself', 118612), ('other1', 7754), ('other2', 826)], instance.proc.keys())
-        for cpu_list, mem_list in instance.proc.values():
-            self.assertIs(list, type(cpu_list))
-            self.assertFalse(cpu_list)
-            self.assertIs(list, type(mem_list))
-            self.assertFalse(mem_list)
+        self.assertDictEqual({'myself': (118612, [], []), 'other1': (7754, [], []), 'other2': (826, [], [])},
+            process_to_lists(instance.proc))
+        for proc_stats in instance.proc.values():
+            self.assertIs(StatisticsSeries, type(proc_stats.cpu))
+            self.assertIs(StatisticsSeries, type(proc_stats.mem))
         self.assertIs(stats1, instance.ref_stats)
         # push third set of measures
         stats3 = (28.5, [(45, 700), (50, 225), (40, 250), (42, 598), (20, 400)],
@@ -231,10 +439,12 @@ class StatisticsInstanceTest(unittest.TestCase):
         # this update is taken into account
         # check evolution of instance
         self.assertEqual(2, instance.counter)
-        self.assertListEqual([[6.25], [20.0], [20.0], [1.0], [0.0]], instance.cpu)
-        self.assertListEqual([76.1], instance.mem)
-        self.assertDictEqual({'eth0': ([0.4], [0.2]), 'lo': ([0.1], [0.1])}, instance.io)
-        self.assertDictEqual({('myself', 118612): ([0.5], [1.9])}, instance.proc)
+        self.assertListEqual([[6.25], [20.0], [20.0], [1.0], [0.0]], [list(cpu) for cpu in instance.cpu])
+        self.assertListEqual([76.1], list(instance.mem))
+        self.assertDictEqual({'eth0': ([0.4], [0.2]), 'lo': ([0.1], [0.1])}, series_to_lists(instance.io))
+        # other1 has been restarted so its series are restarted
+        self.assertDictEqual({'myself': (118612, [0.5], [1.9]), 'other1': (8865, [], [])},
+            process_to_lists(instance.proc))
         self.assertIs(stats3, instance.ref_stats)
         # push fourth set of measures (reuse stats2)
         instance.push_statistics(stats2)
@@ -249,11 +459,11 @@ class StatisticsInstanceTest(unittest.TestCase):
         # this update is taken into account
         # check evolution of instance
         self.assertEqual(4, instance.counter)
-        self.assertListEqual([[6.25, 10.9375], [20.0, 19.5], [20.0, 16.0], [1.0, 0.0], [0.0, 15.0]], instance.cpu)
-        self.assertListEqual([76.1, 75.9], instance.mem)
-        self.assertDictEqual({'eth0': ([0.4, 0.8], [0.2, 0.2]), 'lo': ([0.1, 0.8], [0.1, 0.8])}, instance.io)
-        self.assertEqual({('myself', 118612): ([0.5, 3.125], [1.9, 1.87]),
-            ('other1', 8865): ([3.125], [1.87])}, instance.proc)
+        self.assertListEqual([[6.25, 10.9375], [20.0, 19.5], [20.0, 16.0], [1.0, 0.0], [0.0, 15.0]], [list(cpu) for cpu in instance.cpu])
+        self.assertListEqual([76.1, 75.9], list(instance.mem))
+        self.assertDictEqual({'eth0': ([0.4, 0.8], [0.2, 0.2]), 'lo': ([0.1, 0.8], [0.1, 0.8])}, series_to_lists(instance.io))
+        self.assertEqual({'myself': (118612, [0.5, 3.125], [1.9, 1.87]),
+            'other1': (8865, [3.125], [1.87])}, process_to_lists(instance.proc))
         self.assertIs(stats5, instance.ref_stats)
         # push sixth set of measures (reuse stats2)
         instance.push_statistics(stats2)
@@ -269,13 +479,415 @@ class StatisticsInstanceTest(unittest.TestCase):
         # this update is taken into account
         # check evolution of instance. max depth is reached so lists roll
         self.assertEqual(6, instance.counter)
-        self.assertListEqual([[ 10.9375, 5.0], [19.5, 10.0], [16.0, 0.0], [0.0, 1.5], [15.0, 1.25]], instance.cpu)
-        self.assertListEqual([75.9, 74.7], instance.mem)
-        self.assertDictEqual({'eth0': ([0.8, 0.4], [0.2, 0.8]), 'lo': ([0.8, 0.025], [0.8, 0.025])}, instance.io)
-        self.assertEqual({('myself', 118612): ([3.125, 36.25], [1.87, 2.34]),
-            ('other1', 8865): ([3.125, 36.25], [1.87, 2.34])}, instance.proc)
+        self.assertListEqual([[ 10.9375, 5.0], [19.5, 10.0], [16.0, 0.0], [0.0, 1.5], [15.0, 1.25]], [list(cpu) for cpu in instance.cpu])
+        self.assertListEqual([75.9, 74.7], list(instance.mem))
+        self.assertDictEqual({'eth0': ([0.8, 0.4], [0.2, 0.8]), 'lo': ([0.8, 0.025], [0.8, 0.025])}, series_to_lists(instance.io))
+        self.assertEqual({'myself': (118612, [3.125, 36.25], [1.87, 2.34]),
+            'other1': (8865, [3.125, 36.25], [1.87, 2.34])}, process_to_lists(instance.proc))
         self.assertIs(stats7, instance.ref_stats)
 
+    def test_push_restarted_process(self):
+        """ Test the storage of the statistics of a process restarted in the interval. """
+        from supvisors.statscompiler import StatisticsInstance
+        # testing with period 5 and history depth 2
+        instance = StatisticsInstance(5, 2)
+        cpu, io = [(25, 400)], {'lo': (500, 500)}
+        instance.push_statistics((5, cpu, 10.0, io, {'myself': (118612, (1, 1.85))}))
+        instance.push_statistics((10, [(30, 405)], 10.0, io, {'myself': (118612, (2, 1.85))}))
+        proc_stats = instance.find_process_stats('myself')
+        self.assertTupleEqual((118612, [10.0], [1.85]), process_to_lists(instance.proc)['myself'])
+        # process restarted: the series are restarted in place
+        instance.push_statistics((15, [(35, 410)], 10.0, io, {'myself': (118700, (1, 1.5))}))
+        self.assertIs(proc_stats, instance.find_process_stats('myself'))
+        self.assertTupleEqual((118700, [], []), process_to_lists(instance.proc)['myself'])
+        instance.push_statistics((20, [(40, 415)], 10.0, io, {'myself': (118700, (2, 1.6))}))
+        self.assertIs(proc_stats, instance.find_process_stats('myself'))
+        self.assertTupleEqual((118700, [10.0], [1.6]), process_to_lists(instance.proc)['myself'])
+        # process stopped
+        instance.push_statistics((25, [(45, 420)], 10.0, io, {}))
+        self.assertIsNone(instance.find_process_stats('myself'))
+
+    def test_push_pressure_statistics(self):
+        """ Test the storage of the instant host pressure statistics. """
+        from supvisors.statscompiler import StatisticsInstance
+        # testing with period 5 and history depth 2
+        instance = StatisticsInstance(5, 2)
+        cpu, io = [(25, 400)], {'lo': (500, 500)}
+        instance.push_statistics((5, cpu, 10.0, io, {}, {'load1': 0.5, 'cpu_some': 0}))
+        self.assertDictEqual({'load1': [], 'cpu_some': []}, series_to_lists(instance.pressure))
+        instance.push_statistics((10, cpu, 10.0, io, {}, {'load1': 0.75, 'cpu_some': 50000}))
+        self.assertDictEqual({'load1': [0.75], 'cpu_some': [1.0]}, series_to_lists(instance.pressure))
+        # missing value is recorded as a gap
+        instance.push_statistics((15, cpu, 10.0, io, {}, {'load1': 1.0}))
+        self.assertDictEqual({'load1': [0.75, 1.0], 'cpu_some': [1.0, None]}, series_to_lists(instance.pressure))
+        self.assertEqual(1, instance.pressure['cpu_some'].nb_values)
+        # reset of the pressure stall total is recorded as a gap
+        instance.push_statistics((20, cpu, 10.0, io, {}, {'load1': 0.25, 'cpu_some': 100000}))
+        instance.push_statistics((25, cpu, 10.0, io, {}, {'load1': 0.25, 'cpu_some': 150000}))
+        instance.push_statistics((30, cpu, 10.0, io, {}, {'load1': 0.5, 'cpu_some': 0}))
+        self.assertDictEqual({'load1': [0.25, 0.5], 'cpu_some': [1.0, None]}, series_to_lists(instance.pressure))
+        # all the series are aligned on the dates
+        self.assertListEqual([25, 30], list(instance.dates))
+
+    def test_push_missing_pressure(self):
+        """ Test the storage of a host pressure value that is missing at first and present later. """
+        from supvisors.statscompiler import StatisticsInstance
+        # testing with period 5 and history depth 3
+        instance = StatisticsInstance(5, 3)
+        cpu, io = [(25, 400)], {'lo': (500, 500)}
+        # pressure file not available
+        instance.push_statistics((5, cpu, 10.0, io, {}, {'load1': 0.5}))
+        instance.push_statistics((10, cpu, 10.0, io, {}, {'load1': 0.75}))
+        self.assertDictEqual({'load1': [0.75]}, series_to_lists(instance.pressure))
+        # pressure file available: the first value cannot be converted without reference
+        instance.push_statistics((15, cpu, 10.0, io, {}, {'load1': 1.0, 'cpu_some': 0}))
+        self.assertDictEqual({'load1': [0.75, 1.0]}, series_to_lists(instance.pressure))
+        instance.push_statistics((20, cpu, 10.0, io, {}, {'load1': 0.25, 'cpu_some': 50000}))
+        self.assertDictEqual({'load1': [0.75, 1.0, 0.25], 'cpu_some': [None, None, 1.0]},
+            series_to_lists(instance.pressure))
+        # the new series is aligned on the dates
+        self.assertListEqual([10, 15, 20], list(instance.dates))
+        avg, rate, (a, b), dev = instance.pressure['cpu_some'].get_stats()
+        self.assertEqual(1.0, avg)
+        self.assertIsNone(rate)
+
+
+class StatisticsSeriesTest(unittest.TestCase):
+    """ Test case for the StatisticsSeries class of the statscompiler module. """
+
+    def test_create(self):
+        """ Test the initialization of a series. """
+        from supvisors.statscompiler import StatisticsSeries
+        series = StatisticsSeries(5, [2, 3, 4])
+        self.assertEqual(5, series.maxlen)
+        self.assertListEqual([2, 3, 4], list(series))
+        self.assertEqual(0, series.first)
+        self.assertEqual(9, series.sum_y)
+        self.assertEqual(29, series.sum_yy)
+        self.assertEqual(11, series.sum_xy)
+
+    def test_running_sums(self):
+        """ Test the update of the running sums when values are appended and discarded. """
+        from supvisors.statscompiler import StatisticsSeries
+        series = StatisticsSeries(3, [1, 2, 3])
+        series.append(4)
+        self.assertEqual(1, series.first)
+        self.assertEqual(9, series.sum_y)
+        self.assertEqual(29, series.sum_yy)
+        # absolute indexes are 1, 2, 3
+        self.assertEqual(20, series.sum_xy)
+        series.extend([5, 6])
+        # sums have been rebuilt as 3 values have been discarded
+        self.assertListEqual([4, 5, 6], list(series))
+        self.assertEqual(0, series.first)
+        self.assertEqual(15, series.sum_y)
+        self.assertEqual(77, series.sum_yy)
+        self.assertEqual(17, series.sum_xy)
+        series.clear()
+        self.assertFalse(series)
+        self.assertEqual(0, series.sum_y)
+        self.assertEqual(0, series.sum_yy)
+        self.assertEqual(0, series.sum_xy)
+
+    def test_gaps(self):
+        """ Test that the gap markers are ignored by the statistics of the series. """
+        from supvisors.statscompiler import StatisticsSeries
+        series = StatisticsSeries(4)
+        series.add_gaps(6)
+        self.assertListEqual([None] * 4, list(series))
+        self.assertEqual(0, series.nb_values)
+        series.extend([1.0, None, 3.0])
+        self.assertListEqual([None, 1.0, None, 3.0], list(series))
+        self.assertEqual(2, series.nb_values)
+        # the regression uses the positions of the values, the rate is unknown across a gap
+        avg, rate, (a, b), dev = series.get_stats()
+        self.assertEqual(2.0, avg)
+        self.assertIsNone(rate)
+        self.assertAlmostEqual(1.0, a)
+        self.assertAlmostEqual(0.0, b)
+        # gaps and values are discarded
+        series.extend([None, 5.0])
+        self.assertListEqual([None, 3.0, None, 5.0], list(series))
+        self.assertEqual(2, series.nb_values)
+        avg, rate, (a, b), dev = series.get_stats()
+        self.assertEqual(4.0, avg)
+        self.assertAlmostEqual(1.0, a)
+        self.assertAlmostEqual(2.0, b)
+        # the sums are kept when rebuilt
+        series.reset_sums()
+        self.assertTupleEqual((avg, rate, (a, b), dev), series.get_stats())
+
+    def test_version(self):
+        """ Test that the version changes with the contents of the series and is unique. """
+        from supvisors.statscompiler import StatisticsSeries
+        series, other = StatisticsSeries(3), StatisticsSeries(3)
+        versions = {series.version, other.version}
+        for action in [lambda: series.append(1), lambda: series.extend([2, 3, 4]),
+                lambda: series.downsample({0}), series.clear]:
+            action()
+            self.assertNotIn(series.version, versions)
+            versions.add(series.version)
+        self.assertEqual(6, len(versions))
+
+    def test_downsample(self):
+        """ Test the removal of values and the memory estimate. """
+        from supvisors.statscompiler import StatisticsSeries
+        series = StatisticsSeries(5, [1, 2, 3, 4])
+        size = series.memory_size()
+        series.downsample({0, 2})
+        self.assertListEqual([2, 4], list(series))
+        self.assertEqual(5, series.maxlen)
+        self.assertEqual(6, series.sum_y)
+        self.assertEqual(4, series.sum_xy)
+        # the sketch keeps the values appended until the next window
+        self.assertEqual(4, series.sketch.count)
+        self.assertLess(series.memory_size(), size)
+
+    def test_sketch_window(self):
+        """ Test that the quantile sketch describes the history of the series. """
+        from supvisors.statscompiler import StatisticsSeries
+        series = StatisticsSeries(4, [90.0, 95.0, 99.0, 100.0])
+        self.assertEqual(4, series.sketch.count)
+        # the discarded values are counted until the depth of the series has been renewed
+        series.extend([1.0, 1.0, None])
+        self.assertEqual(6, series.sketch.count)
+        self.assertGreater(series.sketch.quantiles()[1], 90.0)
+        series.append(2.0)
+        self.assertListEqual([1.0, 1.0, None, 2.0], list(series))
+        self.assertEqual(3, series.sketch.count)
+        p50, p95, p99 = series.sketch.quantiles()
+        self.assertLess(p99, 2.1)
+        # a former peak does not show anymore in the high quantiles
+        for _ in range(10):
+            series.append(1.0)
+        self.assertLessEqual(series.sketch.count, 7)
+        self.assertLess(series.sketch.quantiles()[2], 2.1)
+
+    def test_get_stats(self):
+        """ Test that the statistics are identical to the ones of utils.get_stats. """
+        from supvisors.statscompiler import StatisticsSeries
+        from supvisors.utils import get_stats
+        series = StatisticsSeries(7)
+        series.append(3.5)
+        self.assertTupleEqual((3.5, None, (None, None), None), series.get_stats())
+        values = [3.5, 2.0, 8.25, 4.0, 6.5, 1.0, 9.75, 5.5, 2.25, 7.0, 0.5, 4.75, 6.0, 3.0, 8.5, 1.5]
+        for value in values[1:]:
+            series.append(value)
+            avg, rate, (a, b), dev = series.get_stats()
+            ref_avg, ref_rate, (ref_a, ref_b), ref_dev = get_stats(list(series))
+            self.assertAlmostEqual(ref_avg, avg)
+            self.assertAlmostEqual(ref_rate, rate)
+            self.assertAlmostEqual(ref_a, a)
+            self.assertAlmostEqual(ref_b, b)
+            self.assertAlmostEqual(ref_dev, dev)
+
+
+class QuantileSketchTest(unittest.TestCase):
+    """ Test case for the QuantileSketch class of the statscompiler module. """
+
+    def test_quantiles(self):
+        """ Test the approximate quantiles of a sketch. """
+        from supvisors.statscompiler import QuantileSketch
+        sketch = QuantileSketch()
+        self.assertListEqual([None, None, None], sketch.quantiles())
+        # a process that spikes to 100% for one sample in twenty
+        for value in [5.0] * 19 + [100.0]:
+            sketch.add(value)
+        self.assertEqual(20, sketch.count)
+        p50, p95, p99 = sketch.quantiles()
+        self.assertAlmostEqual(5.0, p50, delta=5.0 * QuantileSketch.ACCURACY)
+        self.assertAlmostEqual(100.0, p95, delta=100.0 * QuantileSketch.ACCURACY)
+        self.assertAlmostEqual(100.0, p99, delta=100.0 * QuantileSketch.ACCURACY)
+        # null values
+        for value in [0.0] * 80:
+            sketch.add(value)
+        self.assertEqual(80, sketch.zeros)
+        self.assertListEqual([0.0, 0.0], sketch.quantiles((0.1, 0.5)))
+        # relative accuracy on a wide range of values
+        sketch.clear()
+        values = [1.05 ** idx for idx in range(200)]
+        for value in values:
+            sketch.add(value)
+        for probability, value in zip([0.25, 0.5, 0.75], sketch.quantiles([0.25, 0.5, 0.75])):
+            expected = values[int(ceil(probability * 199))]
+            self.assertAlmostEqual(expected, value, delta=expected * QuantileSketch.ACCURACY)
+
+    @patch('supvisors.statscompiler.QuantileSketch.MAX_BUCKETS', 10)
+    def test_collapse(self):
+        """ Test that the number of buckets is bounded, keeping the accuracy of the high quantiles. """
+        from supvisors.statscompiler import QuantileSketch
+        sketch = QuantileSketch()
+        for idx in range(1, 101):
+            sketch.add(float(idx))
+        self.assertEqual(10, len(sketch.buckets))
+        self.assertEqual(100, sum(sketch.buckets.values()))
+        self.assertAlmostEqual(100.0, sketch.quantiles((0.99, ))[0], delta=100.0 * QuantileSketch.ACCURACY)
+
+    def test_merge(self):
+        """ Test the merge of two sketches. """
+        from supvisors.statscompiler import QuantileSketch
+        sketch1, sketch2, expected = QuantileSketch(), QuantileSketch(), QuantileSketch()
+        for idx in range(100):
+            sketch1.add(float(idx))
+            sketch2.add(idx * 2.0)
+            expected.add(float(idx))
+            expected.add(idx * 2.0)
+        sketch1.merge(sketch2)
+        self.assertEqual(200, sketch1.count)
+        self.assertEqual(2, sketch1.zeros)
+        self.assertDictEqual(expected.buckets, sketch1.buckets)
+        self.assertListEqual(expected.quantiles(), sketch1.quantiles())
+
+
+class RollupSeriesTest(unittest.TestCase):
+    """ Test case for the RollupSeries class of the statscompiler module. """
+
+    def test_rollup(self):
+        """ Test the accumulation and the rollup of values. """
+        from supvisors.statscompiler import RollupSeries
+        series = RollupSeries(2)
+        # gap stored when nothing accumulated
+        self.assertIsNone(series.flush())
+        self.assertListEqual([None], list(series))
+        self.assertListEqual([None], list(series.minimum))
+        self.assertListEqual([None], list(series.maximum))
+        self.assertEqual(0, series.nb_values)
+        # accumulate values
+        series.accumulate((2.0, 1.0, 3.0))
+        series.accumulate((4.0, 0.5, 6.0))
+        self.assertListEqual([6.0, 2, 0.5, 6.0], series.pending)
+        self.assertTupleEqual((3.0, 0.5, 6.0), series.flush())
+        self.assertIsNone(series.pending)
+        self.assertListEqual([None, 3.0], list(series))
+        self.assertListEqual([None, 0.5], list(series.minimum))
+        self.assertListEqual([None, 6.0], list(series.maximum))
+        # depth applies to all series
+        for value in [5.0, 7.0]:
+            series.accumulate((value, value, value))
+            series.flush()
+        self.assertListEqual([5.0, 7.0], list(series))
+        self.assertListEqual([5.0, 7.0], list(series.minimum))
+        self.assertListEqual([5.0, 7.0], list(series.maximum))
+        # test clearance
+        series.accumulate((1.0, 1.0, 1.0))
+        series.clear()
+        self.assertFalse(series)
+        self.assertFalse(series.minimum)
+        self.assertFalse(series.maximum)
+        self.assertIsNone(series.pending)
+
+    def test_downsample(self):
+        """ Test that the extrema are downsampled along with the mean values. """
+        from supvisors.statscompiler import RollupSeries, StatisticsSeries
+        series = RollupSeries(5)
+        for value in [1.0, 2.0, 3.0]:
+            series.accumulate((value, value - 1, value + 1))
+            series.flush()
+        self.assertEqual(StatisticsSeries(5, [1.0, 2.0, 3.0]).memory_size() * 3, series.memory_size())
+        series.downsample({1})
+        self.assertListEqual([1.0, 3.0], list(series))
+        self.assertListEqual([0.0, 2.0], list(series.minimum))
+        self.assertListEqual([2.0, 4.0], list(series.maximum))
+
+
+class RollupInstanceTest(unittest.TestCase):
+    """ Test case for the RollupInstance class of the statscompiler module. """
+
+    def test_push_statistics(self):
+        """ Test that the raw measures are ignored. """
+        from supvisors.statscompiler import RollupInstance
+        instance = RollupInstance(15, 10, 3)
+        instance.push_statistics((5, [(25, 400)], 10.0, {}, {}))
+        self.assertEqual(-1, instance.counter)
+        self.assertIsNone(instance.ref_stats)
+
+    def test_push_rollup(self):
+        """ Test the rollup of the statistics of a finer period. """
+        from supvisors.statscompiler import RollupInstance
+        instance = RollupInstance(10, 10, 2)
+        coarser = RollupInstance(20, 10, 2)
+        instance.rollups.append(coarser)
+        extrema = lambda x: (x, x, x)
+        # first interval
+        instance.push_rollup((5, [extrema(10.0)], extrema(20.0), {'lo': (extrema(1.0), extrema(1.0))},
+            {('myself', 118612): (extrema(2.0), extrema(1.5)), ('other', 1234): (extrema(1.0), extrema(1.0))},
+            {'load1': extrema(0.5)}))
+        self.assertEqual(0, instance.counter)
+        self.assertFalse(instance.mem)
+        instance.push_rollup((10, [extrema(30.0)], extrema(40.0), {'lo': (extrema(3.0), extrema(5.0))},
+            {('myself', 118612): (extrema(4.0), extrema(2.5))}, {}))
+        self.assertEqual(1, instance.counter)
+        self.assertListEqual([10], list(instance.dates))
+        self.assertListEqual([[20.0]], [list(series) for series in instance.cpu])
+        self.assertListEqual([30.0], list(instance.mem))
+        self.assertListEqual([20.0], list(instance.mem.minimum))
+        self.assertListEqual([40.0], list(instance.mem.maximum))
+        self.assertDictEqual({'lo': ([2.0], [3.0])}, series_to_lists(instance.io))
+        self.assertDictEqual({'myself': (118612, [3.0], [2.0]), 'other': (1234, [1.0], [1.0])},
+            process_to_lists(instance.proc))
+        self.assertDictEqual({'load1': [0.5]}, series_to_lists(instance.pressure))
+        # the rollup is provided to the coarser instance
+        self.assertEqual(0, coarser.counter)
+        self.assertListEqual([30.0, 1, 20.0, 40.0], coarser.mem.pending)
+        self.assertListEqual([3.0, 1, 2.0, 4.0], coarser.find_process_stats('myself').cpu.pending)
+        self.assertListEqual([0.5, 1, 0.5, 0.5], coarser.pressure['load1'].pending)
+        # second interval: process restarted and other process stopped
+        instance.push_rollup((15, [extrema(10.0)], extrema(20.0), {'lo': (extrema(1.0), extrema(1.0))},
+            {('myself', 118700): (extrema(2.0), extrema(1.5))}, {}))
+        proc_stats = instance.find_process_stats('myself')
+        self.assertEqual(118700, proc_stats.pid)
+        self.assertFalse(proc_stats.cpu)
+        instance.push_rollup((20, [extrema(10.0)], extrema(20.0), {'lo': (extrema(1.0), extrema(1.0))},
+            {('myself', 118700): (extrema(4.0), extrema(1.5))}, {}))
+        self.assertDictEqual({'myself': (118700, [3.0], [1.5])}, process_to_lists(instance.proc))
+        # pressure series got no value in the interval
+        self.assertDictEqual({'load1': [0.5, None]}, series_to_lists(instance.pressure))
+        # the coarser instance stores the rollup of the rollups
+        self.assertEqual(1, coarser.counter)
+        self.assertListEqual([25.0], list(coarser.mem))
+        self.assertListEqual([20.0], list(coarser.mem.minimum))
+        self.assertListEqual([40.0], list(coarser.mem.maximum))
+        # the other process was running in the first part of the coarser interval
+        self.assertDictEqual({'myself': (118700, [3.0], [1.5]), 'other': (1234, [1.0], [1.0])},
+            process_to_lists(coarser.proc))
+        self.assertDictEqual({'load1': [0.5]}, series_to_lists(coarser.pressure))
+
+
+class ClusterStatisticsTest(unittest.TestCase):
+    """ Test case for the ClusterStatistics class of the statscompiler module. """
+
+    def test_create(self):
+        """ Test the initialization of the cluster totals. """
+        from supvisors.statscompiler import ClusterStatistics
+        cluster = ClusterStatistics()
+        self.assertDictEqual({}, cluster.contributions)
+        self.assertDictEqual({}, cluster.applications)
+        self.assertDictEqual({'cpu': 0.0, 'mem': 0.0, 'nbcores': 0, 'addresses': 0}, cluster.get_cluster_stats())
+        self.assertDictEqual({'cpu': 0.0, 'mem': 0.0, 'processes': 0}, cluster.get_application_stats('appli'))
+
+    def test_update(self):
+        """ Test the incremental update of the cluster totals. """
+        from supvisors.statscompiler import ClusterStatistics
+        cluster = ClusterStatistics()
+        cluster.update('10.0.0.1', 4, (5, [20.0, 10.0, 30.0, 20.0, 20.0], 40.0, {},
+            {('appli:proc_1', 1234): (50.0, 5.0), ('appli:proc_2', 1235): (30.0, 2.0), ('other', 1236): (1.0, 1.0)}, {}))
+        # rolled-up statistics provide triplets of mean, minimum and maximum values
+        cluster.update('10.0.0.2', 2, (5, [(50.0, 40.0, 60.0)] * 3, (20.0, 10.0, 30.0), {},
+            {('appli:proc_3', 4567): ((20.0, 10.0, 30.0), (4.0, 3.0, 5.0))}, {}))
+        self.assertDictEqual({'cpu': 30.0, 'mem': 30.0, 'nbcores': 6, 'addresses': 2}, cluster.get_cluster_stats())
+        self.assertDictEqual({'cpu': 100.0, 'mem': 11.0, 'processes': 3}, cluster.get_application_stats('appli'))
+        self.assertDictEqual({'cpu': 1.0, 'mem': 1.0, 'processes': 1}, cluster.get_application_stats('other'))
+        # new statistics of an address replace its previous contribution
+        cluster.update('10.0.0.1', 4, (10, [50.0] * 5, 10.0, {}, {('appli:proc_1', 1234): (10.0, 5.0)}, {}))
+        self.assertDictEqual({'cpu': 50.0, 'mem': 15.0, 'nbcores': 6, 'addresses': 2}, cluster.get_cluster_stats())
+        self.assertDictEqual({'cpu': 30.0, 'mem': 9.0, 'processes': 2}, cluster.get_application_stats('appli'))
+        self.assertNotIn('other', cluster.applications)
+        # removal of an address
+        cluster.remove('10.0.0.2')
+        cluster.remove('10.0.0.3')
+        self.assertDictEqual({'cpu': 50.0, 'mem': 10.0, 'nbcores': 4, 'addresses': 1}, cluster.get_cluster_stats())
+        self.assertDictEqual({'cpu': 10.0, 'mem': 5.0, 'processes': 1}, cluster.get_application_stats('appli'))
+
 
 class StatisticsCompilerTest(unittest.TestCase):
     """ Test case for the StatisticsCompiler class of the statscompiler module. """
@@ -286,20 +898,130 @@ class StatisticsCompilerTest(unittest.TestCase):
 
     def test_create(self):
         """ Test the initialization for statistics of all addresses. """
-        from supvisors.statscompiler import StatisticsCompiler, StatisticsInstance
+        from supvisors.statscompiler import StatisticsCompiler, StatisticsInstance, RollupInstance
         compiler = StatisticsCompiler(self.supvisors)
+        self.assertFalse(compiler.vectorized)
+        self.assertEqual(0, compiler.version)
         # check compiler contents at initialisation
         self.assertItemsEqual(self.supvisors.address_mapper.addresses, compiler.data.keys())
         for period_instance in compiler.data.values():
             self.assertItemsEqual(self.supvisors.options.stats_periods, period_instance.keys())
             for period, instance in period_instance.items():
-                self.assertIs(StatisticsInstance, type(instance))
+                self.assertIs(RollupInstance if period > 5 else StatisticsInstance, type(instance))
                 self.assertEqual(period / 5, instance.period)
                 self.assertEqual(self.supvisors.options.stats_histo, instance.depth)
+            # check the cascade of rollups: 5 -> 15 -> 60
+            self.assertListEqual([period_instance[15]], period_instance[5].rollups)
+            self.assertListEqual([period_instance[60]], period_instance[15].rollups)
+            self.assertListEqual([], period_instance[60].rollups)
+            self.assertEqual(3, period_instance[15].ratio)
+            self.assertEqual(4, period_instance[60].ratio)
+
+    def test_store(self):
+        """ Test that the statistics compiled are written into the store. """
+        from supvisors.statscompiler import StatisticsCompiler
+        # compiled statistics are consumed by the store before being stored in series
+        appended = []
+        store = Mock(**{'append.side_effect': lambda *args: appended.append(repr(args))})
+        with patch('supvisors.statsstore.StatisticsStore', return_value=store) as mocked_store:
+            self.supvisors.options.stats_store = '/tmp'
+            compiler = StatisticsCompiler(self.supvisors)
+        mocked_store.assert_called_once_with('/tmp', 10485760, 10, self.supvisors.logger)
+        self.assertIs(store, compiler.store)
+        stats1 = (5, [(25, 400)], 10.0, {}, {}, {})
+        stats2 = (10, [(30, 405)], 11.0, {}, {}, {})
+        compiler.push_statistics('10.0.0.1', stats1)
+        compiler.push_statistics('10.0.0.1', stats2)
+        self.assertListEqual([repr(('10.0.0.1', 5, (10, [50.0], 11.0, {}, {}, {})))], appended)
+        compiler.close()
+        self.assertTrue(store.close.called)
+
+    def test_create_instances(self):
+        """ Test the creation of the statistics instances depending on the periods. """
+        from supvisors.statscompiler import StatisticsCompiler, StatisticsInstance, RollupInstance
+        instances = StatisticsCompiler.create_instances([3600, 10, 15, 60], 10)
+        self.assertIs(StatisticsInstance, type(instances[10]))
+        self.assertIs(StatisticsInstance, type(instances[15]))
+        self.assertIs(RollupInstance, type(instances[60]))
+        self.assertIs(RollupInstance, type(instances[3600]))
+        # the coarsest period that divides the period is used
+        self.assertListEqual([], instances[10].rollups)
+        self.assertListEqual([instances[60]], instances[15].rollups)
+        self.assertListEqual([instances[3600]], instances[60].rollups)
+        self.assertEqual(4, instances[60].ratio)
+        self.assertEqual(60, instances[3600].ratio)
+        # the writer is given the address and the period
+        writer = Mock()
+        instances = StatisticsCompiler.create_instances([5], 10, writer, '10.0.0.1')
+        instances[5].writer('stats')
+        writer.assert_called_once_with('10.0.0.1', 5, 'stats')
+
+    def test_clusters(self):
+        """ Test that the statistics compiled update the cluster totals. """
+        from supvisors.statscompiler import ClusterStatistics, StatisticsCompiler
+        compiler = StatisticsCompiler(self.supvisors)
+        self.assertItemsEqual([5, 15, 60], compiler.clusters.keys())
+        self.assertIs(ClusterStatistics, type(compiler.clusters[5]))
+        compiler.push_statistics('10.0.0.1', (5, [(25, 400), (25, 400), (25, 400)], 10.0, {},
+            {'appli:proc': (1234, (0, 2.5))}))
+        compiler.push_statistics('10.0.0.1', (10, [(50, 425), (75, 450), (25, 400)], 12.0, {},
+            {'appli:proc': (1234, (5, 2.5))}))
+        self.assertDictEqual({'cpu': 50.0, 'mem': 12.0, 'nbcores': 2, 'addresses': 1},
+            compiler.clusters[5].get_cluster_stats())
+        self.assertDictEqual({'cpu': 10.0, 'mem': 2.5, 'processes': 1},
+            compiler.clusters[5].get_application_stats('appli'))
+        self.assertFalse(compiler.clusters[15].contributions)
+        # clearance of the address removes its contribution
+        compiler.clear('10.0.0.1')
+        self.assertFalse(compiler.clusters[5].contributions)
+
+    def test_dead_address(self):
+        """ Test that an address that is not alive anymore does not contribute to the cluster totals. """
+        from supvisors.statscompiler import StatisticsCompiler
+        from supvisors.ttypes import AddressStates
+        compiler = StatisticsCompiler(self.supvisors)
+        status = Mock(state=AddressStates.RUNNING)
+        self.supvisors.context.addresses = {'10.0.0.1': status}
+        for idx in range(2):
+            compiler.push_statistics('10.0.0.1', (5 * idx, [(25, 400 + 25 * idx)], 10.0, {},
+                {'appli:proc': (1234, (idx, 2.5))}))
+        self.assertDictEqual({'cpu': 4.0, 'mem': 2.5, 'processes': 1}, compiler.clusters[5].get_application_stats('appli'))
+        version = compiler.version
+        # the address leaves RUNNING: its contribution is removed but its statistics are kept
+        status.state = AddressStates.SILENT
+        compiler.remove_contributions('10.0.0.1')
+        self.assertGreater(compiler.version, version)
+        for cluster in compiler.clusters.values():
+            self.assertFalse(cluster.contributions)
+        self.assertDictEqual({'cpu': 0.0, 'mem': 0.0, 'processes': 0}, compiler.clusters[5].get_application_stats('appli'))
+        self.assertEqual(1, len(compiler.data['10.0.0.1'][5].dates))
+        # the statistics still received do not contribute
+        compiler.push_statistics('10.0.0.1', (10, [(25, 450)], 10.0, {}, {'appli:proc': (1234, (2, 2.5))}))
+        self.assertFalse(compiler.clusters[5].contributions)
+        # the address contributes again when alive
+        status.state = AddressStates.RUNNING
+        compiler.push_statistics('10.0.0.1', (15, [(25, 475)], 10.0, {}, {'appli:proc': (1234, (3, 2.5))}))
+        self.assertListEqual(['10.0.0.1'], compiler.clusters[5].contributions.keys())
+
+    def test_application_sketches(self):
+        """ Test the merge of the sketches of the application processes on all addresses. """
+        from supvisors.statscompiler import StatisticsCompiler
+        compiler = StatisticsCompiler(self.supvisors)
+        for address, pid in [('10.0.0.1', 1234), ('10.0.0.2', 4567)]:
+            compiler.push_statistics(address, (5, [(25, 400), (25, 400), (25, 400)], 10.0, {},
+                {'appli:proc': (pid, (0, 2.5)), 'other': (pid + 1, (0, 2.5))}))
+            compiler.push_statistics(address, (10, [(50, 425), (75, 450), (25, 400)], 12.0, {},
+                {'appli:proc': (pid, (5, 2.5)), 'other': (pid + 1, (0, 2.5))}))
+        cpu, mem = compiler.get_application_sketches('appli', 5)
+        self.assertEqual(2, cpu.count)
+        self.assertEqual(2, mem.count)
+        self.assertAlmostEqual(10.0, cpu.quantiles((0.5, ))[0], delta=0.1)
+        cpu, mem = compiler.get_application_sketches('appli', 15)
+        self.assertEqual(0, cpu.count)
 
     def test_clear(self):
         """ Test the clearance for statistics of all addresses. """
-        from supvisors.statscompiler import StatisticsCompiler
+        from supvisors.statscompiler import StatisticsCompiler, StatisticsSeries
         compiler = StatisticsCompiler(self.supvisors)
         # set data to a given address
         for address, period_instance in compiler.data.items():
@@ -312,6 +1034,7 @@ class StatisticsCompilerTest(unittest.TestCase):
                 instance.proc = {('myself', 5888): (25.0, 12.5)}
         # check clearance of instance
         compiler.clear('10.0.0.2')
+        self.assertEqual(1, compiler.version)
         for address, period_instance in compiler.data.items():
             if address == '10.0.0.2':
                 for period, instance in period_instance.items():
@@ -321,7 +1044,7 @@ class StatisticsCompilerTest(unittest.TestCase):
                     self.assertIsNone(instance.ref_stats)
                     self.assertIs(list, type(instance.cpu))
                     self.assertFalse(instance.cpu)
-                    self.assertIs(list, type(instance.mem))
+                    self.assertIsInstance(instance.mem, StatisticsSeries)
                     self.assertFalse(instance.mem)
                     self.assertIs(dict, type(instance.io))
                     self.assertFalse(instance.io)
@@ -338,76 +1061,178 @@ class StatisticsCompilerTest(unittest.TestCase):
                     self.assertDictEqual({'eth0': (123465, 654321), 'lo': (321, 321)}, instance.io)
                     self.assertDictEqual({('myself', 5888): (25.0, 12.5)}, instance.proc)
 
+    def test_vectorized(self):
+        """ Test the conversion of the instant statistics into snapshots in vectorized mode. """
+        from supvisors.statscompiler import numpy, StatisticsCompiler, StatisticsSnapshot
+        if not numpy:
+            raise unittest.SkipTest('cannot test as optional numpy is not installed')
+        self.supvisors.options.stats_vectorized = True
+        compiler = StatisticsCompiler(self.supvisors)
+        self.assertTrue(compiler.vectorized)
+        stats = (8.5, [(25, 400), (25, 125)], 76.1, {}, {})
+        compiler.push_statistics('10.0.0.2', stats)
+        ref_stats = compiler.data['10.0.0.2'][5].ref_stats
+        self.assertIs(StatisticsSnapshot, type(ref_stats))
+        self.assertEqual(stats, ref_stats)
+
+    @patch('supvisors.statscompiler.numpy', None)
+    def test_vectorized_without_numpy(self):
+        """ Test the fallback to pure Python when numpy is not installed. """
+        from supvisors.statscompiler import StatisticsCompiler
+        self.supvisors.options.stats_vectorized = True
+        compiler = StatisticsCompiler(self.supvisors)
+        self.assertFalse(compiler.vectorized)
+        self.assertEqual(1, self.supvisors.logger.warn.call_count)
+        stats = (8.5, [(25, 400), (25, 125)], 76.1, {}, {})
+        compiler.push_statistics('10.0.0.2', stats)
+        self.assertIs(stats, compiler.data['10.0.0.2'][5].ref_stats)
+
     def test_push_statistics(self):
         """ Test the storage of the instant statistics of an address. """
         from supvisors.statscompiler import StatisticsCompiler
         compiler = StatisticsCompiler(self.supvisors)
+        instances = compiler.data['10.0.0.2']
         # push statistics to a given address
         stats1 = (8.5, [(25, 400), (25, 125), (15, 150), (40, 400), (20, 200)],
             76.1, {'eth0': (1024, 2000), 'lo': (500, 500)}, {'myself': (118612, (0.15, 1.85))})
         compiler.push_statistics('10.0.0.2', stats1)
         # check compiler contents
+        self.assertEqual(4, compiler.nbcores['10.0.0.2'])
+        self.assertEqual(1, compiler.version)
         for address, period_instance in compiler.data.items():
-            if address == '10.0.0.2':
-                for period, instance in period_instance.items():
+            for period, instance in period_instance.items():
+                if address == '10.0.0.2' and period == 5:
                     self.assertEqual(0, instance.counter)
                     self.assertIs(stats1, instance.ref_stats)
-            else:
-                for period, instance in period_instance.items():
+                else:
                     self.assertEqual(-1, instance.counter)
                     self.assertIsNone(instance.ref_stats)
         # push statistics to a given address
-        stats2 = (28.5, [(45, 700), (50, 225), (40, 250), (42, 598), (20, 400)],
-            76.1, {'eth0': (2048, 2512), 'lo': (756, 756)}, {'myself': (118612, (1.75, 1.9))})
+        stats2 = (13.5, [(45, 700), (50, 225), (40, 250), (42, 598), (20, 400)],
+            76.3, {'eth0': (2048, 2512), 'lo': (756, 756)}, {'myself': (118612, (1.75, 1.9))})
         compiler.push_statistics('10.0.0.2', stats2)
-        # check compiler contents
-        for address, period_instance in compiler.data.items():
-            if address == '10.0.0.2':
-                for period, instance in period_instance.items():
-                    self.assertEqual(1, instance.counter)
-                    if period == 5:
-                        self.assertIs(stats2, instance.ref_stats)
-                    else:
-                        self.assertIs(stats1, instance.ref_stats)
-            else:
-                for period, instance in period_instance.items():
-                    self.assertEqual(-1, instance.counter)
-                    self.assertIsNone(instance.ref_stats)
+        # the statistics compiled for period 5 are rolled up for period 15
+        self.assertEqual(1, instances[5].counter)
+        self.assertIs(stats2, instances[5].ref_stats)
+        self.assertListEqual([76.3], list(instances[5].mem))
+        self.assertEqual(0, instances[15].counter)
+        self.assertIsNone(instances[15].ref_stats)
+        self.assertFalse(instances[15].mem)
+        self.assertEqual(-1, instances[60].counter)
         # push statistics to a given address
-        stats3 = (38.5, [(80, 985), (89, 386), (48, 292), (42, 635), (32, 468)],
+        stats3 = (18.5, [(80, 985), (89, 386), (48, 292), (42, 635), (32, 468)],
             75.9, {'eth0': (3072, 2768), 'lo': (1780, 1780)}, {'myself': (118612, (11.75, 1.87))})
         compiler.push_statistics('10.0.0.2', stats3)
-        # check compiler contents
-        for address, period_instance in compiler.data.items():
-            if address == '10.0.0.2':
-                for period, instance in period_instance.items():
-                    self.assertEqual(2, instance.counter)
-                    if period == 5:
-                        self.assertIs(stats3, instance.ref_stats)
-                    else:
-                        self.assertIs(stats1, instance.ref_stats)
-            else:
-                for period, instance in period_instance.items():
-                    self.assertEqual(-1, instance.counter)
-                    self.assertIsNone(instance.ref_stats)
+        self.assertEqual(1, instances[15].counter)
+        self.assertFalse(instances[15].mem)
         # push statistics to a given address
-        stats4 = (48.5, [(84, 1061), (92, 413), (48, 480), (45, 832), (40, 1100)],
+        stats4 = (23.5, [(84, 1061), (92, 413), (48, 480), (45, 832), (40, 1100)],
             74.7, {'eth0': (3584, 3792), 'lo': (1812, 1812)}, {'myself': (118612, (40.75, 2.34))})
         compiler.push_statistics('10.0.0.2', stats4)
-        # check compiler contents
+        # 3 values of period 5 have been rolled up for period 15
+        self.assertListEqual([76.3, 75.9, 74.7], list(instances[5].mem))
+        self.assertEqual(2, instances[15].counter)
+        self.assertAlmostEqual(75.6333, instances[15].mem[0], 3)
+        self.assertListEqual([74.7], list(instances[15].mem.minimum))
+        self.assertListEqual([76.3], list(instances[15].mem.maximum))
+        self.assertItemsEqual(['eth0', 'lo'], instances[15].io.keys())
+        self.assertListEqual([118612], [proc_stats.pid for proc_stats in instances[15].proc.values()])
+        self.assertListEqual([1.87], list(instances[15].find_process_stats('myself').mem.minimum))
+        # period 60 has got its first rolled-up value from period 15
+        self.assertEqual(0, instances[60].counter)
+        self.assertFalse(instances[60].mem)
+        # other addresses are unchanged
         for address, period_instance in compiler.data.items():
-            if address == '10.0.0.2':
-                for period, instance in period_instance.items():
-                    self.assertEqual(3, instance.counter)
-                    if period in [5, 15]:
-                        self.assertIs(stats4, instance.ref_stats)
-                    else:
-                        self.assertIs(stats1, instance.ref_stats)
-            else:
+            if address != '10.0.0.2':
                 for period, instance in period_instance.items():
                     self.assertEqual(-1, instance.counter)
                     self.assertIsNone(instance.ref_stats)
 
+    def test_memory_budget(self):
+        """ Test the release of the statistics when the memory budget is exceeded. """
+        from supvisors.statscompiler import StatisticsCompiler
+        from supvisors.ttypes import AddressStates
+        compiler = StatisticsCompiler(self.supvisors)
+        self.assertEqual(0, compiler.budget)
+        # the series are created long ago
+        with patch('supvisors.statscompiler.time', return_value=0):
+            for address in ['10.0.0.1', '10.0.0.2']:
+                for idx in range(8):
+                    compiler.push_statistics(address, (5.0 * idx, [(10 * idx, 100 * idx)], 50.0, {},
+                        {'proc_1': (1234, (idx, 1.5)), 'proc_2': (4321, (2 * idx, 2.5))}))
+        self.assertListEqual([35.0] * 2, [compiler.data[address][5].dates[-1] for address in ['10.0.0.1', '10.0.0.2']])
+        self.assertEqual(sum(instance.memory_size() for instances in compiler.data.values()
+            for instance in instances.values()), compiler.get_memory_usage())
+        # the statistics of a dead address are released first
+        self.supvisors.context.addresses = {'10.0.0.1': Mock(state=AddressStates.SILENT),
+            '10.0.0.2': Mock(state=AddressStates.RUNNING)}
+        usage = compiler.get_memory_usage()
+        compiler.budget = usage
+        compiler.enforce_budget()
+        self.assertFalse(compiler.data['10.0.0.1'][5].dates)
+        self.assertEqual(7, len(compiler.data['10.0.0.2'][5].dates))
+        self.assertLess(compiler.get_memory_usage(), usage)
+        # the process series that have not been requested are released then
+        instance = compiler.data['10.0.0.2'][5]
+        self.assertIsNotNone(instance.find_process_stats('proc_2'))
+        compiler.budget = compiler.get_memory_usage()
+        compiler.enforce_budget()
+        self.assertListEqual(['proc_2'], instance.proc.keys())
+        self.assertSetEqual({'proc_1'}, instance.evicted)
+        self.assertEqual(7, len(instance.dates))
+        # the evicted series are not rebuilt until they are requested again
+        compiler.push_statistics('10.0.0.2', (40.0, [(80, 800)], 50.0, {},
+            {'proc_1': (1234, (8, 1.5)), 'proc_2': (4321, (16, 2.5))}))
+        self.assertListEqual(['proc_2'], instance.proc.keys())
+        # the oldest values are downsampled at last
+        compiler.budget = compiler.get_memory_usage()
+        with patch('supvisors.statscompiler.time', return_value=0):
+            compiler.enforce_budget()
+        self.assertListEqual(['proc_2'], instance.proc.keys())
+        self.assertLess(len(instance.dates), 8)
+        self.assertEqual(len(instance.dates), len(instance.proc['proc_2'].cpu))
+        self.assertLess(compiler.get_memory_usage(), compiler.budget)
+        # the series that have just been created are not released
+        compiler.data['10.0.0.2'][5].evicted.clear()
+        compiler.push_statistics('10.0.0.2', (45.0, [(90, 900)], 50.0, {},
+            {'proc_1': (1234, (9, 1.5)), 'proc_2': (4321, (18, 2.5))}))
+        self.assertIn('proc_1', instance.proc)
+        compiler.budget = compiler.get_memory_usage()
+        compiler.enforce_budget()
+        self.assertIn('proc_1', instance.proc)
+        self.assertFalse(instance.evicted)
+        # a warning is logged when the budget cannot be respected
+        compiler.budget = 1
+        compiler.enforce_budget()
+        self.assertTrue(self.supvisors.logger.warn.called)
+
+    def test_memory_accounting(self):
+        """ Test that the memory usage is only estimated periodically when a budget is set. """
+        from supvisors.statscompiler import StatisticsCompiler, StatisticsInstance
+        compiler = StatisticsCompiler(self.supvisors)
+        stats = lambda idx: (5.0 * idx, [(10 * idx, 100 * idx)], 50.0, {}, {'proc_1': (1234, (idx, 1.5))})
+        # no accounting without budget
+        with patch.object(StatisticsInstance, 'memory_size', return_value=100) as mocked_size:
+            for idx in range(compiler.USAGE_PERIOD):
+                compiler.push_statistics('10.0.0.1', stats(idx))
+            self.assertFalse(mocked_size.called)
+            # the usage is computed on demand
+            self.assertEqual(100 * len(compiler.data) * len(self.supvisors.options.stats_periods),
+                compiler.get_memory_usage())
+        # with a budget, the usage is estimated every USAGE_PERIOD pushes
+        compiler.budget = 1 << 30
+        with patch.object(StatisticsInstance, 'memory_size', return_value=100) as mocked_size:
+            for idx in range(compiler.USAGE_PERIOD - 1):
+                compiler.push_statistics('10.0.0.1', stats(idx))
+            self.assertFalse(mocked_size.called)
+            compiler.push_statistics('10.0.0.1', stats(compiler.USAGE_PERIOD))
+            self.assertEqual(len(self.supvisors.options.stats_periods), mocked_size.call_count)
+        # the budget is enforced when exceeded at the estimate
+        compiler.budget = 1
+        with patch.object(compiler, 'enforce_budget') as mocked_enforce:
+            for idx in range(compiler.USAGE_PERIOD):
+                compiler.push_statistics('10.0.0.1', stats(idx))
+            self.assertEqual(1, mocked_enforce.call_count)
 
 
 def test_suite():
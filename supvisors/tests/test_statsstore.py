@@ -0,0 +1,251 @@
+#!/usr/bin/python
+#-*- coding: utf-8 -*-
+
+# ======================================================================
+# Copyright 2016 Julien LE CLEACH
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ======================================================================
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+from mock import Mock, patch
+from StringIO import StringIO
+
+
+class StatisticsSegmentTest(unittest.TestCase):
+    """ Test case for the StatisticsSegment class of the statsstore module. """
+
+    def setUp(self):
+        """ Create a temporary directory. """
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'mem.seg')
+
+    def tearDown(self):
+        """ Remove the temporary directory. """
+        shutil.rmtree(self.directory)
+
+    def test_create(self):
+        """ Test the creation of a segment file. """
+        from supvisors.statsstore import StatisticsSegment, read_segment, segment_size
+        segment = StatisticsSegment(self.filename, 3)
+        self.assertEqual(3, segment.capacity)
+        self.assertEqual(0, segment.count)
+        self.assertEqual(0, segment.head)
+        segment.close()
+        self.assertEqual(segment_size(3), os.path.getsize(self.filename))
+        self.assertListEqual([], read_segment(self.filename))
+
+    def test_append(self):
+        """ Test the records written into a segment file. """
+        from supvisors.statsstore import StatisticsSegment, read_segment
+        segment = StatisticsSegment(self.filename, 3)
+        segment.append(5.0, 12.5)
+        segment.append(10.0, 13.5)
+        self.assertListEqual([(5.0, 12.5), (10.0, 13.5)], read_segment(self.filename))
+        # oldest records are overwritten when the capacity is reached
+        segment.append(15.0, 14.5)
+        segment.append(20.0, 15.5)
+        self.assertEqual(3, segment.count)
+        self.assertEqual(1, segment.head)
+        self.assertListEqual([(10.0, 13.5), (15.0, 14.5), (20.0, 15.5)], read_segment(self.filename))
+        segment.close()
+        # the records are kept when the segment is open again
+        segment = StatisticsSegment(self.filename, 3)
+        self.assertEqual(3, segment.count)
+        self.assertEqual(1, segment.head)
+        segment.append(25.0, 16.5)
+        self.assertListEqual([(15.0, 14.5), (20.0, 15.5), (25.0, 16.5)], read_segment(self.filename))
+        segment.close()
+        # the segment is reset when its capacity changes
+        segment = StatisticsSegment(self.filename, 5)
+        self.assertEqual(0, segment.count)
+        segment.close()
+        self.assertListEqual([], read_segment(self.filename))
+
+    def test_read_invalid_segment(self):
+        """ Test the reading of an invalid segment file. """
+        from supvisors.statsstore import read_segment
+        with open(self.filename, 'wb') as segment_file:
+            segment_file.write('\0' * 64)
+        with self.assertRaisesRegexp(ValueError, 'invalid statistics segment file'):
+            read_segment(self.filename)
+
+
+class StatisticsStoreTest(unittest.TestCase):
+    """ Test case for the StatisticsStore class of the statsstore module. """
+
+    def setUp(self):
+        """ Create a temporary directory. """
+        self.directory = tempfile.mkdtemp()
+        self.logger = Mock()
+
+    def tearDown(self):
+        """ Remove the temporary directory. """
+        shutil.rmtree(self.directory)
+
+    def test_series_values(self):
+        """ Test the naming of the series included in compiled statistics. """
+        from supvisors.statsstore import series_values
+        stats = (10, [5.0, 4.0, 6.0], 12.5, {'lo': (1.0, 2.0)}, {('group:proc', 1234): (0.5, 1.5)}, {'load1': 0.25})
+        self.assertItemsEqual([('cpu.all', 5.0), ('cpu.0', 4.0), ('cpu.1', 6.0), ('mem', 12.5),
+            ('io.lo.recv', 1.0), ('io.lo.sent', 2.0), ('proc.group:proc.cpu', 0.5), ('proc.group:proc.mem', 1.5),
+            ('pressure.load1', 0.25)], series_values(stats))
+        # rolled-up statistics
+        stats = (10, [(5.0, 4.0, 6.0)], (12.5, 12.0, 13.0), {}, {}, {})
+        self.assertItemsEqual([('cpu.all', 5.0), ('mem', 12.5)], series_values(stats))
+
+    def test_append(self):
+        """ Test the storage of compiled statistics. """
+        from supvisors.statsstore import StatisticsStore, read_store
+        store = StatisticsStore(self.directory, 1024 * 1024, 10, self.logger)
+        self.assertEqual(0, store.used)
+        store.append('10.0.0.1', 5, (5.0, [25.0], 12.5, {}, {('group:proc', 1234): (0.5, 1.5)}, {}))
+        store.append('10.0.0.1', 5, (10.0, [35.0], 13.5, {}, {}, {}))
+        store.append('10.0.0.2', 60, (60.0, [(30.0, 25.0, 35.0)], (13.0, 12.5, 13.5), {}, {}, {}))
+        store.close()
+        self.assertListEqual([('10.0.0.1', 5, 'cpu.all', [(5.0, 25.0), (10.0, 35.0)]),
+            ('10.0.0.1', 5, 'mem', [(5.0, 12.5), (10.0, 13.5)]),
+            ('10.0.0.1', 5, 'proc.group:proc.cpu', [(5.0, 0.5)]),
+            ('10.0.0.1', 5, 'proc.group:proc.mem', [(5.0, 1.5)]),
+            ('10.0.0.2', 60, 'cpu.all', [(60.0, 30.0)]),
+            ('10.0.0.2', 60, 'mem', [(60.0, 13.0)])], list(read_store(self.directory)))
+        # the existing segment files are counted at startup
+        store = StatisticsStore(self.directory, 1024 * 1024, 10, self.logger)
+        self.assertEqual(6 * (32 + 10 * 16), store.used)
+        store.append('10.0.0.1', 5, (15.0, [45.0], 14.5, {}, {}, {}))
+        store.close()
+        self.assertEqual(6 * (32 + 10 * 16), store.used)
+        self.assertEqual([(5.0, 12.5), (10.0, 13.5), (15.0, 14.5)], list(read_store(self.directory))[1][3])
+
+    def test_budget(self):
+        """ Test that the size of the segment files is bounded. """
+        from supvisors.statsstore import StatisticsStore, read_store
+        # budget allows 2 segments
+        store = StatisticsStore(self.directory, 2 * (32 + 10 * 16), 10, self.logger)
+        store.append('10.0.0.1', 5, (5.0, [25.0, 20.0, 30.0], 12.5, {}, {}, {}))
+        store.append('10.0.0.1', 5, (10.0, [25.0, 20.0, 30.0], 12.5, {}, {}, {}))
+        store.close()
+        self.assertEqual(1, self.logger.warn.call_count)
+        self.assertEqual(2, len(list(read_store(self.directory))))
+
+    def test_reclaim(self):
+        """ Test that the segment files of the idle series are reclaimed when the budget is reached. """
+        from supvisors.statsstore import StatisticsStore, read_store
+        size = 32 + 10 * 16
+        # segment files of a previous run, one of them unknown in this run
+        store = StatisticsStore(self.directory, 1024 * 1024, 10, self.logger)
+        store.append('10.0.0.1', 5, (5.0, [25.0], 12.5, {}, {('group:old', 1234): (0.5, 1.5)}, {}))
+        store.close()
+        old_file = store.get_filename('10.0.0.1', 5, 'proc.group:old.cpu')
+        os.utime(old_file, (1000, 1000))
+        os.utime(store.get_filename('10.0.0.1', 5, 'proc.group:old.mem'), (2000, 2000))
+        # budget allows 4 segments
+        store = StatisticsStore(self.directory, 4 * size, 10, self.logger)
+        self.assertEqual(4 * size, store.used)
+        with patch('supvisors.statsstore.time', return_value=10000):
+            store.append('10.0.0.1', 5, (10.0, [25.0], 12.5, {}, {('group:new', 4321): (0.5, 1.5)}, {}))
+        # the unknown series have been reclaimed, the oldest first
+        self.assertFalse(os.path.exists(old_file))
+        self.assertEqual(4 * size, store.used)
+        self.assertFalse(store.exhausted)
+        self.assertFalse(self.logger.warn.called)
+        # the series in use are not reclaimed
+        with patch('supvisors.statsstore.time', return_value=10030):
+            store.append('10.0.0.1', 5, (15.0, [25.0], 12.5, {}, {('group:other', 5678): (0.5, 1.5)}, {}))
+        self.assertTrue(store.exhausted)
+        self.assertEqual(1, self.logger.warn.call_count)
+        self.assertEqual(4 * size, store.used)
+        # the directory is not scanned again before the idle delay
+        with patch('supvisors.statsstore.time', return_value=10050):
+            with patch('os.walk') as mocked_walk:
+                store.append('10.0.0.1', 5, (20.0, [25.0], 12.5, {}, {('group:other', 5678): (0.5, 1.5)}, {}))
+                self.assertFalse(mocked_walk.called)
+        # the series that are not stored anymore are reclaimed once idle
+        with patch('supvisors.statsstore.time', return_value=10100):
+            store.append('10.0.0.1', 5, (25.0, [25.0], 12.5, {}, {('group:other', 5678): (0.5, 1.5)}, {}))
+        self.assertFalse(store.exhausted)
+        self.assertNotIn(('10.0.0.1', 5, 'proc.group:new.cpu'), store.segments)
+        store.close()
+        self.assertItemsEqual(['cpu.all', 'mem', 'proc.group:other.cpu', 'proc.group:other.mem'],
+            [name for _, _, name, _ in read_store(self.directory)])
+
+    def test_capacity_change(self):
+        """ Test that the size used is corrected when the capacity of the segments changes. """
+        from supvisors.statsstore import StatisticsStore
+        store = StatisticsStore(self.directory, 1024 * 1024, 10, self.logger)
+        store.append('10.0.0.1', 5, (5.0, [25.0], 12.5, {}, {}, {}))
+        store.close()
+        self.assertEqual(2 * (32 + 10 * 16), store.used)
+        store = StatisticsStore(self.directory, 1024 * 1024, 5, self.logger)
+        store.append('10.0.0.1', 5, (10.0, [25.0], 12.5, {}, {}, {}))
+        store.close()
+        self.assertEqual(2 * (32 + 5 * 16), store.used)
+        self.assertEqual(store.used, StatisticsStore(self.directory, 1024 * 1024, 5, self.logger).used)
+
+    def test_unmap_idle(self):
+        """ Test that the idle segments are unmapped beyond the maximum number of segments mapped. """
+        from supvisors.statsstore import StatisticsStore
+        store = StatisticsStore(self.directory, 1024 * 1024, 10, self.logger)
+        store.MAX_MAPPED = 2
+        with patch('supvisors.statsstore.time', return_value=1000):
+            store.append('10.0.0.1', 5, (5.0, [25.0, 25.0, 25.0], 12.5, {}, {}, {}))
+        # all the segments are in use
+        self.assertEqual(4, len(store.segments))
+        with patch('supvisors.statsstore.time', return_value=1070):
+            store.append('10.0.0.1', 15, (15.0, [25.0], 12.5, {}, {}, {}))
+        # the idle segments are unmapped, the least recently stored first
+        self.assertListEqual([('10.0.0.1', 15, 'cpu.all'), ('10.0.0.1', 15, 'mem')], store.segments.keys())
+        store.close()
+
+    def test_open_segments(self):
+        """ Test that each segment is mapped once, whatever the number of series. """
+        from supvisors.statsstore import StatisticsSegment, StatisticsStore, read_store
+        store = StatisticsStore(self.directory, 1024 * 1024, 10, self.logger)
+        cpu = [25.0] * 300
+        with patch('supvisors.statsstore.StatisticsSegment', side_effect=StatisticsSegment) as mocked_segment:
+            store.append('10.0.0.1', 5, (5.0, cpu, 12.5, {}, {}, {}))
+            self.assertEqual(301, mocked_segment.call_count)
+            self.assertEqual(301, len(store.segments))
+            # no segment is opened again on the next ticks
+            store.append('10.0.0.1', 5, (10.0, cpu, 13.5, {}, {}, {}))
+            store.append('10.0.0.1', 5, (15.0, cpu, 14.5, {}, {}, {}))
+            self.assertEqual(301, mocked_segment.call_count)
+        store.close()
+        self.assertFalse(store.segments)
+        records = [records for _, _, _, records in read_store(self.directory)]
+        self.assertEqual(301, len(records))
+        self.assertListEqual([(5.0, 12.5), (10.0, 13.5), (15.0, 14.5)], records[-1])
+
+    def test_export(self):
+        """ Test the offline export in CSV format. """
+        from supvisors.statsstore import StatisticsStore, main
+        store = StatisticsStore(self.directory, 1024 * 1024, 10, self.logger)
+        store.append('10.0.0.1', 5, (5.0, [25.0], 12.5, {}, {}, {}))
+        store.append('10.0.0.2', 5, (5.0, [35.0], 13.5, {}, {}, {}))
+        store.close()
+        with patch('sys.stdout', new_callable=StringIO) as mocked_stdout:
+            main([self.directory, '-a', '10.0.0.2', '-s', 'cpu.*'])
+        self.assertEqual('address,period,series,date,value\n10.0.0.2,5,cpu.all,5.0,35.0\n',
+            mocked_stdout.getvalue())
+
+
+def test_suite():
+    return unittest.findTestCases(sys.modules[__name__])
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='test_suite')
@@ -23,6 +23,8 @@ import time
 import unittest
 import zmq
 
+from mock import Mock
+
 from supvisors.tests.base import MockedSupvisors
 
 
@@ -91,6 +93,19 @@ class ZmqSocketTest(unittest.TestCase):
         self.assertTrue(publisher.socket.closed)
         self.assertTrue(subscriber.socket.closed)
 
+    def test_event_journal(self):
+        """ Test that the events published are kept in the event journal. """
+        from supvisors.eventjournal import EventJournal
+        from supvisors.supvisorszmq import EventPublisher
+        from supvisors.utils import EventHeaders
+        self.supvisors.event_journal = EventJournal()
+        publisher = EventPublisher(self.zmq_context, self.supvisors)
+        publisher.send_address_status(Mock(**{'serial.return_value': {'address_name': '10.0.0.1'}}))
+        publisher.send_process_status(Mock(**{'serial.return_value': {'process_name': 'xclock'}}))
+        self.assertListEqual([(1, EventHeaders.ADDRESS, {'address_name': '10.0.0.1'}),
+            (2, EventHeaders.PROCESS, {'process_name': 'xclock'})], self.supvisors.event_journal.get_events(0))
+        publisher.close()
+
     def test_internal_pusher_puller(self):
         """ Test the ZeroMQ push-pull sockets used internally in Supvisors. """
         from supvisors.supvisorszmq import RequestPusher, RequestPuller
@@ -284,6 +299,13 @@ class RequestTest(unittest.TestCase):
         request = self.receive('Shutdown')
         self.assertTupleEqual((DeferredRequestHeaders.SHUTDOWN, ('10.0.0.1', )), request)
 
+    def test_load_registry(self):
+        """ The method tests that the 'Load Registry' request is sent and received correctly. """
+        from supvisors.utils import DeferredRequestHeaders
+        self.pusher.send_load_registry('10.0.0.1')
+        request = self.receive('Load Registry')
+        self.assertTupleEqual((DeferredRequestHeaders.LOAD_REGISTRY, ('10.0.0.1', )), request)
+
 
 class Payload:
     """ Dummy class just implementing a serial method. """
@@ -317,6 +339,7 @@ class EventTest(unittest.TestCase):
         self.application_payload = Payload({'state': 'starting', 'name': 'supvisors'})
         self.process_payload = Payload({'state': 'running', 'process_name': 'plugin',
             'application_name': 'supvisors', 'date': 1230})
+        self.alert_payload = Payload({'alert_name': 'cpu', 'address_name': 'cliche01', 'active': True})
 
     def tearDown(self):
         """ Destroy the ZMQ context. """
@@ -376,6 +399,16 @@ class EventTest(unittest.TestCase):
         else:
             self.check_reception()
 
+    def check_alert_status(self, subscribed):
+        """ The method tests the emission and reception of an Alert status,
+        depending on the subscription status. """
+        from supvisors.utils import EventHeaders
+        self.publisher.send_alert_status(self.alert_payload)
+        if subscribed:
+            self.check_reception(EventHeaders.ALERT, self.alert_payload.data)
+        else:
+            self.check_reception()
+
     def check_subscription(self, supvisors_subscribed, address_subscribed,
             application_subscribed, process_subscribed):
         """ The method tests the emission and reception of all status,
@@ -427,6 +460,16 @@ class EventTest(unittest.TestCase):
         self.subscriber.unsubscribe_process_status()
         self.check_subscription(False, False, False, False)
 
+    def test_subscription_alert_status(self):
+        """ Test the reception of Alert status messages when related subscription is set. """
+        # subscribe to Alert status only
+        self.subscriber.subscribe_alert_status()
+        self.check_subscription(False, False, False, False)
+        self.check_alert_status(True)
+        # unsubscribe from Alert status
+        self.subscriber.unsubscribe_alert_status()
+        self.check_alert_status(False)
+
     def test_subscription_all_status(self):
         """ Test the reception of all status messages when related subscription is set. """
         # subscribe to every status
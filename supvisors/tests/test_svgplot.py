@@ -0,0 +1,86 @@
+#!/usr/bin/python
+#-*- coding: utf-8 -*-
+
+# ======================================================================
+# Copyright 2016 Julien LE CLEACH
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ======================================================================
+
+import sys
+import unittest
+
+from xml.etree import ElementTree
+
+
+class SvgPlotTest(unittest.TestCase):
+    """ Test case for the svgplot module. """
+
+    def parse(self, curves):
+        """ Return the SVG elements of the rendered curves, by tag. """
+        from supvisors.svgplot import render_svg
+        root = ElementTree.fromstring(render_svg(curves))
+        self.assertEqual('{http://www.w3.org/2000/svg}svg', root.tag)
+        elements = {}
+        for element in root:
+            elements.setdefault(element.tag.split('}')[1], []).append(element)
+        return elements
+
+    def test_render(self):
+        """ Test the elements drawn for each curve. """
+        from supvisors.utils import get_stats
+        elements = self.parse([('eth0 <recv>', 'kbits/s', [1, 2, 3], get_stats([1, 2, 3])),
+            ('eth0 sent', 'kbits/s', [10, 20, 30], get_stats([10, 20, 30]))])
+        # one plain line per curve
+        self.assertEqual(2, len(elements['polyline']))
+        self.assertEqual(3, len(elements['polyline'][0].get('points').split()))
+        # one dashed mean line and one dotted regression line per curve
+        self.assertListEqual(['6,4', '2,3', '6,4', '2,3'], [line.get('stroke-dasharray') for line in elements['line']])
+        # one deviation band per curve, in addition to the background, the frame and the legend colors
+        self.assertEqual(2, len([rect for rect in elements['rect'] if rect.get('fill-opacity')]))
+        # ticks and legends
+        texts = [text.text for text in elements['text']]
+        self.assertEqual(5 + 4, len(texts))
+        self.assertIn('eth0 <recv>', texts)
+        self.assertIn('Mean: 20.00kbits/s', texts)
+
+    def test_single_value(self):
+        """ Test the rendering of a constant series of a single value. """
+        from supvisors.utils import get_stats
+        elements = self.parse([('CPU', '%', [0], get_stats([0]))])
+        self.assertEqual(1, len(elements['polyline']))
+        # no regression line and no deviation band
+        self.assertEqual(1, len(elements['line']))
+        self.assertEqual(0, len([rect for rect in elements['rect'] if rect.get('fill-opacity')]))
+
+
+    def test_gaps(self):
+        """ Test that the gaps of a series break the plain line. """
+        from supvisors.statscompiler import StatisticsSeries
+        from supvisors.svgplot import get_segments
+        self.assertListEqual([], get_segments([None, None]))
+        self.assertListEqual([[(1, 1.0)], [(3, 3.0), (4, 4.0)]], get_segments([None, 1.0, None, 3.0, 4.0, None]))
+        series = StatisticsSeries(10, [1.0, None, 3.0, 4.0])
+        elements = self.parse([('eth0 recv', 'kbits/s', list(series), series.get_stats())])
+        self.assertListEqual(['40.0', '326.7'], [polyline.get('points').split()[0].split(',')[0]
+            for polyline in elements['polyline']])
+        self.assertListEqual([1, 2], [len(polyline.get('points').split()) for polyline in elements['polyline']])
+        # the regression and the deviation are still drawn over the whole series
+        self.assertEqual(2, len(elements['line']))
+
+
+def test_suite():
+    return unittest.findTestCases(sys.modules[__name__])
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='test_suite')
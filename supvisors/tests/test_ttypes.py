@@ -72,6 +72,37 @@ class TypesTest(unittest.TestCase):
         self.assertEqual('STOP_APPLICATION', RunningFailureStrategies._to_string(RunningFailureStrategies.STOP_APPLICATION))
         self.assertEqual('RESTART_APPLICATION', RunningFailureStrategies._to_string(RunningFailureStrategies.RESTART_APPLICATION))
 
+    def test_AlertSeries(self):
+        """ Test the AlertSeries enumeration. """
+        from supvisors.ttypes import AlertSeries
+        self.assertEqual('HOST_CPU', AlertSeries._to_string(AlertSeries.HOST_CPU))
+        self.assertEqual('HOST_MEM', AlertSeries._to_string(AlertSeries.HOST_MEM))
+        self.assertEqual('PROCESS_CPU', AlertSeries._to_string(AlertSeries.PROCESS_CPU))
+        self.assertEqual('PROCESS_MEM', AlertSeries._to_string(AlertSeries.PROCESS_MEM))
+
+    def test_AlertStatistics(self):
+        """ Test the AlertStatistics enumeration. """
+        from supvisors.ttypes import AlertStatistics
+        self.assertEqual('VALUE', AlertStatistics._to_string(AlertStatistics.VALUE))
+        self.assertEqual('MEAN', AlertStatistics._to_string(AlertStatistics.MEAN))
+        self.assertEqual('SLOPE', AlertStatistics._to_string(AlertStatistics.SLOPE))
+        self.assertEqual('P50', AlertStatistics._to_string(AlertStatistics.P50))
+        self.assertEqual('P95', AlertStatistics._to_string(AlertStatistics.P95))
+        self.assertEqual('P99', AlertStatistics._to_string(AlertStatistics.P99))
+
+    def test_AlertConditions(self):
+        """ Test the AlertConditions enumeration. """
+        from supvisors.ttypes import AlertConditions
+        self.assertEqual('ABOVE', AlertConditions._to_string(AlertConditions.ABOVE))
+        self.assertEqual('BELOW', AlertConditions._to_string(AlertConditions.BELOW))
+
+    def test_StatisticsCharts(self):
+        """ Test the StatisticsCharts enumeration. """
+        from supvisors.ttypes import StatisticsCharts
+        self.assertEqual('CLIENT', StatisticsCharts._to_string(StatisticsCharts.CLIENT))
+        self.assertEqual('MATPLOTLIB', StatisticsCharts._to_string(StatisticsCharts.MATPLOTLIB))
+        self.assertEqual('SVG', StatisticsCharts._to_string(StatisticsCharts.SVG))
+
     def test_SupvisorsStates(self):
         """ Test the SupvisorsStates enumeration. """
         from supvisors.ttypes import SupvisorsStates
@@ -146,6 +146,22 @@ class UtilsTest(unittest.TestCase):
         self.assertAlmostEqual(math.sqrt(2), dev)
 
 
+    def test_lttb_indexes(self):
+        """ Test the downsampling of a series of points. """
+        from supvisors.utils import get_lttb_indexes
+        xdata = range(10)
+        ydata = [0, 1, 9, 1, 0, 0, -7, 0, 1, 2]
+        # no downsampling
+        self.assertListEqual(range(10), get_lttb_indexes(xdata, ydata, 0))
+        self.assertListEqual(range(10), get_lttb_indexes(xdata, ydata, 10))
+        self.assertListEqual(range(10), get_lttb_indexes(xdata, ydata, 12))
+        # too few points for buckets
+        self.assertListEqual([8, 9], get_lttb_indexes(xdata, ydata, 2))
+        # the peaks are kept
+        self.assertListEqual([0, 2, 6, 9], get_lttb_indexes(xdata, ydata, 4))
+        self.assertEqual(6, len(get_lttb_indexes(xdata, ydata, 6)))
+
+
 def test_suite():
     return unittest.findTestCases(sys.modules[__name__])
 
@@ -0,0 +1,139 @@
+#!/usr/bin/python
+#-*- coding: utf-8 -*-
+
+# ======================================================================
+# Copyright 2016 Julien LE CLEACH
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ======================================================================
+
+import json
+import sys
+import unittest
+
+from mock import Mock
+
+from supvisors.tests.base import DummyHttpContext, MockedSupvisors
+
+
+class ChartUtilitiesTest(unittest.TestCase):
+    """ Test case for the utilities of the viewchart module. """
+
+    def test_address_plot(self):
+        """ Test the plots of the address series. """
+        from supvisors.viewchart import address_plot
+        stats_instance = Mock(cpu=[[1.0], [2.0]], mem=[3.0], io={'eth0': ([4.0], [5.0])})
+        self.assertDictEqual({('CPU #all', '%'): [1.0]}, address_plot(stats_instance, 'cpu').ydata)
+        self.assertDictEqual({('CPU #0', '%'): [2.0]}, address_plot(stats_instance, 'cpu', 1).ydata)
+        self.assertDictEqual({('MEM', '%'): [3.0]}, address_plot(stats_instance, 'mem').ydata)
+        self.assertDictEqual({('eth0 recv', 'kbits/s'): [4.0], ('eth0 sent', 'kbits/s'): [5.0]},
+            address_plot(stats_instance, 'io', interface='eth0').ydata)
+        with self.assertRaises(KeyError):
+            address_plot(stats_instance, 'io', interface='eth1')
+        with self.assertRaises(ValueError):
+            address_plot(stats_instance, 'disk')
+
+    def test_process_plot(self):
+        """ Test the plots of the process series. """
+        from supvisors.viewchart import process_plot
+        proc_stats = Mock(cpu=[1.0], mem=[2.0])
+        self.assertDictEqual({('CPU', '%'): [1.0]}, process_plot(proc_stats, 'cpu').ydata)
+        self.assertDictEqual({('MEM', '%'): [2.0]}, process_plot(proc_stats, 'mem').ydata)
+        with self.assertRaises(ValueError):
+            process_plot(proc_stats, 'io')
+
+    def test_get_chart(self):
+        """ Test the serializable chart of a plot. """
+        from supvisors.plot import StatisticsPlot
+        from supvisors.statscompiler import StatisticsSeries
+        from supvisors.viewchart import get_chart
+        series = StatisticsSeries(10, [1.0, 2.0, 3.0])
+        plot = StatisticsPlot()
+        plot.add_plot('CPU', '%', series)
+        avg, rate, (a, b), dev = series.get_stats()
+        chart = get_chart(plot)
+        self.assertDictEqual({'version': str(series.version), 'curves': [{'title': 'CPU', 'unit': '%',
+            'values': [1.0, 2.0, 3.0], 'mean': avg, 'rate': rate, 'slope': a, 'intercept': b, 'dev': dev}]}, chart)
+        # the curves are not provided again if the version is unchanged
+        self.assertDictEqual({'version': str(series.version)}, get_chart(plot, str(series.version)))
+        series.append(None)
+        series.append(4.123)
+        self.assertListEqual([1.0, 2.0, 3.0, None, 4.12], get_chart(plot, chart['version'])['curves'][0]['values'])
+        # series without version are always provided
+        plot.add_plot('MEM', '%', [1.0])
+        chart = get_chart(plot, None)
+        self.assertIsNone(chart['version'])
+        self.assertListEqual(['CPU', 'MEM'], [curve['title'] for curve in chart['curves']])
+
+
+class ChartViewTest(unittest.TestCase):
+    """ Test case for the chart views of the viewchart module. """
+
+    def setUp(self):
+        """ Create a Supvisors structure holding real statistics. """
+        from supvisors.statscompiler import StatisticsCompiler
+        self.supvisors = MockedSupvisors()
+        self.supvisors.statistician = StatisticsCompiler(self.supvisors)
+        for date in [5, 10, 15]:
+            self.supvisors.statistician.push_statistics('127.0.0.1', (date, [(date, date)], 10.0 + date,
+                {'eth0': (date * 100, date * 200)}, {'sample:xclock': (1234, (date / 100.0, 2.0))}, {}))
+        self.supvisors.context.processes = {'sample:xclock': Mock(addresses={'127.0.0.1'})}
+        self.context = DummyHttpContext('ui/empty.html')
+        self.context.supervisord = Mock(supvisors=self.supvisors)
+
+    def render(self, klass, **form):
+        """ Return the JSON chart rendered by the view. """
+        self.context.form = form
+        self.assertEqual('application/json', klass(self.context).content_type)
+        return json.loads(klass(self.context).render())
+
+    def test_address_chart(self):
+        """ Test the export of the charts of the address series. """
+        from supvisors.viewchart import AddressChartView
+        stats_instance = self.supvisors.statistician.data['127.0.0.1'][5]
+        chart = self.render(AddressChartView, series='mem')
+        self.assertEqual(str(stats_instance.mem.version), chart['version'])
+        self.assertEqual([('MEM', '%', len(stats_instance.mem))],
+            [(curve['title'], curve['unit'], len(curve['values'])) for curve in chart['curves']])
+        chart = self.render(AddressChartView, address='127.0.0.1', period='5', series='io', intf='eth0')
+        self.assertListEqual(['eth0 recv', 'eth0 sent'], [curve['title'] for curve in chart['curves']])
+        self.assertDictEqual({'version': chart['version']},
+            self.render(AddressChartView, series='io', intf='eth0', version=chart['version']))
+        # incorrect requests
+        for form in [{'series': 'disk'}, {'series': 'cpu', 'idx': 'all'}, {'series': 'cpu', 'period': '7'},
+                {'series': 'mem', 'address': '10.0.0.9'}, {'series': 'io', 'intf': 'eth1'}]:
+            self.assertDictEqual({'error': 'incorrect chart request'}, self.render(AddressChartView, **form))
+
+    def test_process_chart(self):
+        """ Test the export of the charts of the process series. """
+        from supvisors.viewchart import ProcessChartView
+        proc_stats = self.supvisors.statistician.data['127.0.0.1'][5].proc['sample:xclock']
+        proc_stats.viewed = 0
+        chart = self.render(ProcessChartView, namespec='sample:xclock', series='cpu')
+        self.assertEqual(str(proc_stats.cpu.version), chart['version'])
+        self.assertListEqual(['CPU'], [curve['title'] for curve in chart['curves']])
+        # the series displayed are protected from the memory budget
+        self.assertGreater(proc_stats.viewed, 0)
+        chart = self.render(ProcessChartView, address='127.0.0.1', namespec='sample:xclock', series='mem')
+        self.assertListEqual(['MEM'], [curve['title'] for curve in chart['curves']])
+        # incorrect requests
+        for form in [{'namespec': 'sample:xclock', 'series': 'io'}, {'namespec': 'sample:xlogo', 'series': 'cpu'},
+                {'namespec': 'sample:xlogo', 'address': '127.0.0.1', 'series': 'cpu'}]:
+            self.assertDictEqual({'error': 'incorrect chart request'}, self.render(ProcessChartView, **form))
+
+
+def test_suite():
+    return unittest.findTestCases(sys.modules[__name__])
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='test_suite')
@@ -0,0 +1,83 @@
+#!/usr/bin/python
+#-*- coding: utf-8 -*-
+
+# ======================================================================
+# Copyright 2016 Julien LE CLEACH
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ======================================================================
+
+import json
+import sys
+import unittest
+
+from mock import Mock
+
+from supvisors.tests.base import DummyHttpContext, MockedSupvisors
+
+
+class EventViewTest(unittest.TestCase):
+    """ Test case for the EventView class of the viewevents module. """
+
+    def setUp(self):
+        """ Create a Supvisors structure holding a real event journal. """
+        from supvisors.eventjournal import EventJournal
+        self.supvisors = MockedSupvisors()
+        self.supvisors.event_journal = EventJournal()
+
+    def create_view(self, **form):
+        """ Return an EventView for the request parameters given. """
+        from supvisors.viewevents import EventView
+        context = DummyHttpContext('ui/empty.html')
+        context.supervisord = Mock(supvisors=self.supvisors)
+        context.form = form
+        return EventView(context)
+
+    def test_last_event(self):
+        """ Test the answer without event number. """
+        self.supvisors.event_journal.add_event(u'address', {'address_name': '10.0.0.1'})
+        for form in [{}, {'since': 'dummy'}]:
+            view = self.create_view(**form)
+            self.assertEqual('application/json', view.content_type)
+            self.assertDictEqual({'last': 1, 'events': []}, json.loads(view.render()))
+
+    def test_events(self):
+        """ Test the long polling of the events. """
+        from supervisor.http import NOT_DONE_YET
+        from supvisors.viewevents import EventView
+        journal = self.supvisors.event_journal
+        journal.add_event(u'address', {'address_name': '10.0.0.1'})
+        view = self.create_view(since='1')
+        # no new event: the request is held
+        self.assertIs(NOT_DONE_YET, view.render())
+        # new events
+        journal.add_event(u'process', {'process_name': 'xclock'})
+        journal.add_event(u'application', {'application_name': 'sample'})
+        self.assertDictEqual({'last': 3, 'events': [{'header': 'process', 'payload': {'process_name': 'xclock'}},
+            {'header': 'application', 'payload': {'application_name': 'sample'}}]}, json.loads(view.render()))
+        # no new event until the timeout
+        view = self.create_view(since='3')
+        view.started -= EventView.TIMEOUT
+        self.assertDictEqual({'last': 3, 'events': []}, json.loads(view.render()))
+
+    def test_reload(self):
+        """ Test the answer when events are lost. """
+        view = self.create_view(since='5')
+        self.assertDictEqual({'last': 0, 'reload': True}, json.loads(view.render()))
+
+
+def test_suite():
+    return unittest.findTestCases(sys.modules[__name__])
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='test_suite')
@@ -20,6 +20,8 @@
 import sys
 import unittest
 
+from mock import call, patch, Mock
+
 from supvisors.tests.base import MockedSupvisors
 
 
@@ -32,6 +34,80 @@ class ViewHandlerTest(unittest.TestCase):
         handler = ViewHandler()
         self.assertIsNotNone(handler)
 
+    def test_sort_processes_by_config(self):
+        """ Test the sort of the processes using the group configurations. """
+        from supvisors.viewhandler import ViewHandler
+        handler = ViewHandler()
+        handler.supvisors = MockedSupvisors()
+        orderings = {'crash': {'late_segv': 0, 'segv': 1}, 'firefox': {'firefox': 0}}
+        handler.supvisors.info_source.get_process_ordering.side_effect = orderings.get
+        # test empty list
+        self.assertEqual([], handler.sort_processes_by_config([]))
+        # test known processes first, using the configuration ordering, then the unknown ones alphabetically
+        processes = [{'application_name': application_name, 'process_name': process_name}
+            for application_name, process_name in [('firefox', 'firefox'), ('crash', 'segv'),
+                ('crash', 'zombie'), ('crash', 'late_segv'), ('crash', 'abort')]]
+        self.assertListEqual([('crash', 'late_segv'), ('crash', 'segv'), ('crash', 'abort'),
+            ('crash', 'zombie'), ('firefox', 'firefox')],
+            [(process['application_name'], process['process_name'])
+                for process in handler.sort_processes_by_config(processes)])
+
+    def test_get_process_usage(self):
+        """ Test the last CPU and MEM values of a process. """
+        from supvisors.viewhandler import ViewHandler
+        handler = ViewHandler()
+        handler.supvisors = MockedSupvisors()
+        handler.supvisors.options.stats_irix_mode = False
+        handler.get_process_stats = Mock(return_value=(0, None))
+        # test without statistics
+        self.assertEqual((None, None), handler.get_process_usage('crash:segv'))
+        # test with empty series
+        handler.get_process_stats.return_value = (2, Mock(cpu=[], mem=[]))
+        self.assertEqual((None, None), handler.get_process_usage('crash:segv'))
+        # test with CPU divided by the number of cores
+        handler.get_process_stats.return_value = (2, Mock(cpu=[1.0, 8.0], mem=[3.0]))
+        self.assertEqual((4.0, 3.0), handler.get_process_usage('crash:segv'))
+        # test irix mode
+        handler.supvisors.options.stats_irix_mode = True
+        self.assertEqual((8.0, 3.0), handler.get_process_usage('crash:segv'))
+        # the statistics are only peeked
+        self.assertEqual([call('crash:segv', peek=True)] * 4, handler.get_process_stats.call_args_list)
+
+    def test_select_processes(self):
+        """ Test the filter, sort and pagination of the processes. """
+        from supvisors.viewhandler import ViewHandler
+        from supvisors.webfilter import ProcessFilter
+        handler = ViewHandler()
+        handler.supvisors = MockedSupvisors()
+        handler.supvisors.info_source.get_process_ordering.return_value = {'a': 0, 'b': 1, 'c': 2, 'd': 3}
+        usages = {'crash:a': (None, None), 'crash:b': (1.0, 5.0), 'crash:c': (3.0, 2.0), 'crash:d': (1.0, 1.0)}
+        handler.get_process_usage = Mock(side_effect=usages.get)
+        data = [{'application_name': 'crash', 'process_name': name, 'namespec': 'crash:' + name,
+            'statename': 'RUNNING' if name != 'c' else 'STOPPED'} for name in 'dcba']
+        def select(form):
+            handler.process_filter = ProcessFilter(form)
+            return [item['process_name'] for item in handler.select_processes(data)]
+        # test configuration ordering
+        self.assertListEqual(['a', 'b', 'c', 'd'], select({}))
+        self.assertListEqual(['a', 'b', 'd'], select({'state': 'RUNNING'}))
+        # test decreasing usage, processes without statistics last
+        self.assertListEqual(['c', 'b', 'd', 'a'], select({'sort': 'cpu'}))
+        self.assertListEqual(['b', 'c', 'd', 'a'], select({'sort': 'mem'}))
+        # test pagination
+        with patch.object(ProcessFilter, 'ROWS_PER_PAGE', 3):
+            self.assertListEqual(['a'], select({'sort': 'cpu', 'page': '2'}))
+            self.assertEqual((2, 4), (handler.process_filter.pages, handler.process_filter.count))
+
+    def test_url_context(self):
+        """ Test the extra parameters for the URL. """
+        from supvisors.viewhandler import ViewHandler
+        from supvisors.webfilter import ProcessFilter
+        handler = ViewHandler()
+        self.assertEqual('', handler.url_context())
+        handler.process_filter = ProcessFilter({'state': 'FATAL', 'page': '2'})
+        self.assertEqual('state=FATAL&amp;page=2&amp;', handler.url_context())
+        self.assertEqual('state=FATAL&amp;', handler.url_context(1))
+
 
 def test_suite():
     return unittest.findTestCases(sys.modules[__name__])
@@ -20,7 +20,9 @@
 import sys
 import unittest
 
-from supvisors.tests.base import DummyHttpContext
+from mock import Mock
+
+from supvisors.tests.base import DummyHttpContext, MockedSupvisors
 
 
 class StatsImageTest(unittest.TestCase):
@@ -42,76 +44,154 @@ class StatsImageTest(unittest.TestCase):
         self.assertIsNot(contents, image.contents)
         self.assertTrue(contents.closed)
         self.assertFalse(image.contents.closed)
-
-    def test_address_instances(self):
-        """ Test the values set at construction. """
-        from supvisors.viewimage import address_cpu_image, address_mem_image, address_io_image
-        self.assertIsNotNone(address_cpu_image)
-        self.assertIsNone(address_cpu_image.contents)
-        self.assertIsNotNone(address_mem_image)
-        self.assertIsNone(address_mem_image.contents)
-        self.assertIsNotNone(address_io_image)
-        self.assertIsNone(address_io_image.contents)
-
-    def test_process_instances(self):
-        """ Test the values set at construction. """
-        from supvisors.viewimage import process_cpu_image, process_mem_image
-        self.assertIsNotNone(process_cpu_image)
-        self.assertIsNone(process_cpu_image.contents)
-        self.assertIsNotNone(process_mem_image)
-        self.assertIsNone(process_mem_image.contents)
+        self.assertIsNone(image.key)
+        # create a buffer with a key
+        self.assertFalse(image.is_cached(None))
+        self.assertFalse(image.is_cached('key'))
+        image.new_image('key')
+        self.assertTrue(image.is_cached('key'))
+        self.assertFalse(image.is_cached('other'))
+
+
+class ImageCacheTest(unittest.TestCase):
+    """ Test case for the ImageCache class of the viewimage module. """
+
+    def test_get_image(self):
+        """ Test that the images are kept per selection, up to the limit. """
+        from supvisors.viewimage import ImageCache, StatsImage, stats_images
+        self.assertIsInstance(stats_images, ImageCache)
+        cache = ImageCache()
+        self.assertEqual(0, len(cache.images))
+        image = cache.get_image(('address', '10.0.0.1', 5, 'cpu', 0, ''))
+        self.assertIsInstance(image, StatsImage)
+        self.assertIs(image, cache.get_image(('address', '10.0.0.1', 5, 'cpu', 0, '')))
+        self.assertIsNot(image, cache.get_image(('address', '10.0.0.1', 15, 'cpu', 0, '')))
+        # the least recently used image is released beyond the limit
+        cache.MAX_IMAGES = 2
+        cache.get_image(('address', '10.0.0.1', 5, 'cpu', 0, ''))
+        cache.get_image(('address', '10.0.0.1', 5, 'mem', 0, ''))
+        self.assertEqual([('address', '10.0.0.1', 5, 'cpu', 0, ''), ('address', '10.0.0.1', 5, 'mem', 0, '')],
+            cache.images.keys())
 
 
 class ImageViewTest(unittest.TestCase):
-    """ Test case for the ImageView class of the viewimage module. """
+    """ Test case for the image views of the viewimage module. """
+
+    def setUp(self):
+        """ Create a Supvisors structure holding real statistics and rendering SVG images. """
+        from supvisors.plotpool import PlotPool
+        from supvisors.statscompiler import StatisticsCompiler
+        from supvisors.ttypes import StatisticsCharts
+        from supvisors.viewimage import stats_images
+        stats_images.images.clear()
+        self.supvisors = MockedSupvisors()
+        self.supvisors.options.stats_charts = StatisticsCharts.SVG
+        self.supvisors.statistician = StatisticsCompiler(self.supvisors)
+        self.supvisors.plot_pool = PlotPool(self.supvisors)
+        self.push_statistics(5)
+        self.push_statistics(10)
+        self.supvisors.context.processes = {'sample:xclock': Mock(addresses={'127.0.0.1'})}
+        self.context = DummyHttpContext('ui/empty.html')
+        self.context.supervisord = Mock(supvisors=self.supvisors)
+
+    def push_statistics(self, date):
+        """ Push statistics to the local address. """
+        self.supvisors.statistician.push_statistics('127.0.0.1', (date, [(date, date)], 10.0 + date,
+            {'eth0': (date * 100, date * 200)}, {'sample:xclock': (1234, (date / 100.0, 2.0))}, {}))
+
+    def render(self, klass, **form):
+        """ Return the view and the contents it has rendered. """
+        self.context.form = form
+        view = klass(self.context)
+        return view, view.render()
 
     def test_image_view(self):
-        """ Test the values set at construction. """
+        """ Test the rendering of the images per selection. """
+        from supvisors.viewimage import AddressMemoryImageView, stats_images
+        plot_pool = self.supvisors.plot_pool
+        view, contents = self.render(AddressMemoryImageView, period='5')
+        self.assertTrue(contents.startswith('<svg '))
+        self.assertEqual('image/svg+xml', view.content_type)
+        self.assertIs(view.buffer, stats_images.get_image(('address', '127.0.0.1', 5, 'mem', 0, '')))
+        self.assertEqual(1, plot_pool.renderings)
+        # same selection and same statistics: the image is not rendered again
+        view, contents = self.render(AddressMemoryImageView, address='127.0.0.1', period='5')
+        self.assertTrue(contents.startswith('<svg '))
+        self.assertEqual(1, plot_pool.renderings)
+        # another selection uses its own image, empty as long as no statistics are compiled for the period
+        view, contents = self.render(AddressMemoryImageView, period='15')
+        self.assertIsNot(view.buffer, stats_images.get_image(('address', '127.0.0.1', 5, 'mem', 0, '')))
+        self.assertTrue(contents.startswith('<!DOCTYPE html'))
+        self.assertEqual(1, plot_pool.renderings)
+        # new statistics: the image is rendered again
+        self.push_statistics(15)
+        self.render(AddressMemoryImageView, period='5')
+        self.assertEqual(2, plot_pool.renderings)
+        # incorrect selection
+        view, contents = self.render(AddressMemoryImageView, period='7')
+        self.assertIsNone(view.buffer)
+        self.assertTrue(contents.startswith('<!DOCTYPE html'))
+
+    def test_pending_image(self):
+        """ Test the deferred render of an image being rendered by a plot worker. """
+        from supervisor.http import NOT_DONE_YET
         from supvisors.viewimage import ImageView, StatsImage
-        # test creation
         image = StatsImage()
-        view = ImageView(DummyHttpContext('ui/empty.html'), image)
-        self.assertIs(image, view.buffer)
-        # test render with an image having no contents
-        data = view.render()
-        self.assertEqual("""<!DOCTYPE html PUBLIC "-//W3C//DTD XHTML 1.0 Transitional//EN" "http://www.w3.org/TR/xhtml1/DTD/xhtml1-transitional.dtd">
-<html>
-</html>""", data)
-        # test render with an image having contents
-        contents = image.new_image()
-        contents.write('Dummy contents')
-        data = view.render()
-        self.assertEqual('Dummy contents', data)
-
-    def test_address_cpu_image_view(self):
-        """ Test the values set at construction. """
-        from supvisors.viewimage import AddressCpuImageView, address_cpu_image
-        view = AddressCpuImageView(DummyHttpContext('ui/empty.html'))
-        self.assertIs(view.buffer, address_cpu_image)
-
-    def test_address_memory_image_view(self):
-        """ Test the values set at construction. """
-        from supvisors.viewimage import AddressMemoryImageView, address_mem_image
-        view = AddressMemoryImageView(DummyHttpContext('ui/empty.html'))
-        self.assertIs(view.buffer, address_mem_image)
-
-    def test_address_network_image_view(self):
-        """ Test the values set at construction. """
-        from supvisors.viewimage import AddressNetworkImageView, address_io_image
-        view = AddressNetworkImageView(DummyHttpContext('ui/empty.html'))
-        self.assertIs(view.buffer, address_io_image)
-
-    def test_process_cpu_image_view(self):
-        """ Test the values set at construction. """
-        from supvisors.viewimage import ProcessCpuImageView, process_cpu_image
-        view = ProcessCpuImageView(DummyHttpContext('ui/empty.html'))
-        self.assertIs(view.buffer, process_cpu_image)
-
-    def test_process_memory_image_view(self):
-        """ Test the values set at construction. """
-        from supvisors.viewimage import ProcessMemoryImageView, process_mem_image
-        view = ProcessMemoryImageView(DummyHttpContext('ui/empty.html'))
-        self.assertIs(view.buffer, process_mem_image)
+        context = DummyHttpContext('ui/empty.html')
+        context.supervisord = Mock()
+        view = ImageView(context)
+        view.buffer = image
+        result = Mock(**{'ready.return_value': False, 'get.return_value': ('PNG contents', 0.1)})
+        image.set_pending('key', result)
+        self.assertTrue(image.is_cached('key'))
+        # rendering in progress
+        self.assertIs(NOT_DONE_YET, view.render())
+        # rendering completed
+        result.ready.return_value = True
+        self.assertEqual('PNG contents', view.render())
+        self.assertEqual('image/png', view.content_type)
+        self.assertIsNone(image.pending)
+        self.assertTrue(image.is_cached('key'))
+        # rendering failed: the previous contents are kept but not cached anymore
+        result.get.side_effect = ValueError('matplotlib error')
+        image.set_pending('new key', result)
+        self.assertEqual('PNG contents', view.render())
+        self.assertFalse(image.is_cached('new key'))
+        self.assertEqual(1, context.supervisord.supvisors.logger.error.call_count)
+        # rendering timed out
+        result.ready.return_value = False
+        image.set_pending('new key', result)
+        image.submitted -= ImageView.TIMEOUT
+        self.assertEqual('PNG contents', view.render())
+        self.assertIsNone(image.pending)
+        self.assertFalse(image.is_cached('new key'))
+        self.assertEqual(2, context.supervisord.supvisors.logger.error.call_count)
+
+    def test_address_image_views(self):
+        """ Test the images of the address series. """
+        from supvisors.viewimage import AddressCpuImageView, AddressNetworkImageView
+        view, contents = self.render(AddressCpuImageView, idx='0')
+        self.assertEqual(('address', '127.0.0.1', 5, 'cpu', 0, ''), stats_images_keys()[-1])
+        self.assertIn('CPU #all', contents)
+        view, contents = self.render(AddressNetworkImageView, intf='eth0')
+        self.assertEqual(('address', '127.0.0.1', 5, 'io', 0, 'eth0'), stats_images_keys()[-1])
+        self.assertIn('eth0 recv', contents)
+
+    def test_process_image_views(self):
+        """ Test the images of the process series. """
+        from supvisors.viewimage import ProcessCpuImageView, ProcessMemoryImageView
+        view, contents = self.render(ProcessCpuImageView, namespec='sample:xclock')
+        self.assertEqual(('process', '127.0.0.1', 5, 'cpu', 'sample:xclock'), stats_images_keys()[-1])
+        self.assertIn('CPU', contents)
+        view, contents = self.render(ProcessMemoryImageView, namespec='sample:xclock', address='127.0.0.1')
+        self.assertEqual(('process', '127.0.0.1', 5, 'mem', 'sample:xclock'), stats_images_keys()[-1])
+        self.assertIn('MEM', contents)
+
+
+def stats_images_keys():
+    """ Return the selections of the cached images. """
+    from supvisors.viewimage import stats_images
+    return stats_images.images.keys()
 
 
 def test_suite():
@@ -0,0 +1,162 @@
+#!/usr/bin/python
+#-*- coding: utf-8 -*-
+
+# ======================================================================
+# Copyright 2016 Julien LE CLEACH
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# 
+#     http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ======================================================================
+
+import sys
+import unittest
+
+from mock import Mock
+
+from supvisors.tests.base import DummyHttpContext, MockedSupvisors
+
+
+class MetricsUtilitiesTest(unittest.TestCase):
+    """ Test case for the utilities of the viewmetrics module. """
+
+    def test_escape_label(self):
+        """ Test the escaping of label values. """
+        from supvisors.viewmetrics import escape_label
+        self.assertEqual('group:proc', escape_label('group:proc'))
+        self.assertEqual('1234', escape_label(1234))
+        self.assertEqual(r'a\\b\"c\nd', escape_label('a\\b"c\nd'))
+
+    def test_write_metric(self):
+        """ Test the formatting of a gauge. """
+        from supvisors.viewmetrics import write_metric
+        lines = []
+        write_metric(lines, 'dummy', 'Dummy gauge.', [])
+        self.assertListEqual([], lines)
+        write_metric(lines, 'dummy', 'Dummy gauge.', [([], 1), ([('address', '10.0.0.1'), ('cpu', 'all')], 2.5)])
+        self.assertListEqual(['# HELP dummy Dummy gauge.', '# TYPE dummy gauge', 'dummy 1',
+            'dummy{address="10.0.0.1",cpu="all"} 2.5'], lines)
+
+
+class MetricsViewTest(unittest.TestCase):
+    """ Test case for the MetricsView class of the viewmetrics module. """
+
+    def setUp(self):
+        """ Create a view on a Supvisors structure holding real statistics. """
+        from supvisors.statscompiler import StatisticsCompiler
+        from supvisors.plotpool import PlotPool
+        from supvisors.viewmetrics import statistics_metrics
+        statistics_metrics.version = None
+        self.supvisors = MockedSupvisors()
+        self.supvisors.fsm.state = 2
+        self.supvisors.fsm.state_string.return_value = 'OPERATION'
+        self.supvisors.context.processes = {}
+        self.supvisors.context.conflicts.return_value = []
+        self.supvisors.statistician = StatisticsCompiler(self.supvisors)
+        self.supvisors.plot_pool = PlotPool(self.supvisors)
+        context = DummyHttpContext('ui/empty.html')
+        context.supervisord = Mock(supvisors=self.supvisors)
+        from supvisors.viewmetrics import MetricsView
+        self.view = MetricsView(context)
+
+    def test_create(self):
+        """ Test the values set at construction. """
+        self.assertIs(self.supvisors, self.view.supvisors)
+        self.assertEqual('text/plain; version=0.0.4; charset=utf-8', self.view.content_type)
+
+    def test_internal_metrics(self):
+        """ Test the export of the Supvisors internal metrics. """
+        context = self.supvisors.context
+        context.addresses = {'10.0.0.1': Mock(address_name='10.0.0.1', state=2,
+            **{'state_string.return_value': 'RUNNING', 'loading.return_value': 15})}
+        context.applications = {'sample': Mock(application_name='sample', state=2, major_failure=False,
+            minor_failure=True, **{'state_string.return_value': 'RUNNING'})}
+        context.processes = {'sample:xclock': Mock(state=20,
+            **{'namespec.return_value': 'sample:xclock', 'state_string.return_value': 'RUNNING'})}
+        context.conflicts.return_value = [context.processes['sample:xclock']]
+        lines = self.view.write_internal_metrics().splitlines()
+        self.assertIn('supvisors_state{state="OPERATION"} 2', lines)
+        self.assertIn('supvisors_address_state{address="10.0.0.1",state="RUNNING"} 2', lines)
+        self.assertIn('supvisors_address_loading{address="10.0.0.1"} 15', lines)
+        self.assertIn('supvisors_application_state{application="sample",state="RUNNING"} 2', lines)
+        self.assertIn('supvisors_application_major_failure{application="sample"} 0', lines)
+        self.assertIn('supvisors_application_minor_failure{application="sample"} 1', lines)
+        self.assertIn('supvisors_process_state{namespec="sample:xclock",state="RUNNING"} 20', lines)
+        self.assertIn('supvisors_conflicts 1', lines)
+        self.assertIn('# TYPE supvisors_conflicts gauge', lines)
+        self.assertIn('supvisors_statistics_memory_bytes {}'.format(self.supvisors.statistician.get_memory_usage()),
+            lines)
+        self.assertFalse(any(line.startswith('supvisors_statistics_memory_budget_bytes') for line in lines))
+        self.supvisors.statistician.budget = 1024
+        lines = self.view.write_internal_metrics().splitlines()
+        self.assertIn('supvisors_statistics_memory_budget_bytes 1024', lines)
+
+    def test_plot_metrics(self):
+        """ Test the export of the metrics related to the rendering of the plots. """
+        plot_pool = self.supvisors.plot_pool
+        plot_pool.on_rendered(('', 0.25))
+        plot_pool.on_rendered(('', 0.5))
+        lines = self.view.write_internal_metrics().splitlines()
+        self.assertIn('# TYPE supvisors_plot_renderings_total counter', lines)
+        self.assertIn('supvisors_plot_renderings_total 2', lines)
+        self.assertIn('supvisors_plot_render_seconds_total 0.75', lines)
+        self.assertIn('# TYPE supvisors_plot_render_seconds gauge', lines)
+        self.assertIn('supvisors_plot_render_seconds 0.5', lines)
+        self.assertIn('supvisors_plot_pending 0', lines)
+
+    def test_statistics_metrics(self):
+        """ Test the export of the metrics related to the statistics compiled. """
+        statistician = self.supvisors.statistician
+        # no statistics compiled
+        self.assertEqual('', self.view.write_statistics_metrics())
+        statistician.push_statistics('10.0.0.1', (5, [(0, 0), (0, 0)], 20.0, {'eth0': (0, 0)},
+            {'sample:xclock': (1234, (0.0, 1.0))}, {'load1': 0.5}))
+        statistician.push_statistics('10.0.0.1', (10, [(25, 100), (25, 100)], 30.0, {'eth0': (1024, 2048)},
+            {'sample:xclock': (1234, (0.5, 2.0))}, {'load1': 0.75}))
+        lines = self.view.write_statistics_metrics().splitlines()
+        self.assertIn('supvisors_host_cpu_percent{address="10.0.0.1",cpu="all"} 20.0', lines)
+        self.assertIn('supvisors_host_cpu_percent{address="10.0.0.1",cpu="0"} 20.0', lines)
+        self.assertIn('supvisors_host_memory_percent{address="10.0.0.1"} 30.0', lines)
+        self.assertIn('supvisors_host_network_kbps{address="10.0.0.1",interface="eth0",direction="recv"} 1', lines)
+        self.assertIn('supvisors_host_network_kbps{address="10.0.0.1",interface="eth0",direction="sent"} 3', lines)
+        self.assertIn('supvisors_host_pressure{address="10.0.0.1",name="load1"} 0.75', lines)
+        self.assertIn('supvisors_process_memory_percent{address="10.0.0.1",namespec="sample:xclock"} 2.0', lines)
+        self.assertIn('supvisors_cluster_memory_percent 30.0', lines)
+        self.assertIn('supvisors_application_memory_percent{application="sample"} 2.0', lines)
+        self.assertIn('supvisors_process_cpu_percent{address="10.0.0.1",namespec="sample:xclock"} 0.4', lines)
+        self.assertIn('supvisors_process_info{address="10.0.0.1",namespec="sample:xclock",pid="1234"} 1', lines)
+        self.assertIn('supvisors_cluster_cpu_percent 20.0', lines)
+        self.assertIn('supvisors_application_cpu_percent{application="sample"} 0.4', lines)
+
+    def test_render(self):
+        """ Test that the statistics metrics are rebuilt only when the statistics change. """
+        from supvisors.viewmetrics import statistics_metrics
+        self.view.write_internal_metrics = Mock(return_value='internal\n')
+        self.view.write_statistics_metrics = Mock(return_value='statistics\n')
+        self.assertEqual('internal\nstatistics\n', self.view.render())
+        self.assertEqual(0, statistics_metrics.version)
+        self.assertEqual(1, self.view.write_statistics_metrics.call_count)
+        # no change in statistics
+        self.assertEqual('internal\nstatistics\n', self.view.render())
+        self.assertEqual(1, self.view.write_statistics_metrics.call_count)
+        self.assertEqual(2, self.view.write_internal_metrics.call_count)
+        # new statistics
+        self.supvisors.statistician.version += 1
+        self.view.write_statistics_metrics.return_value = 'new statistics\n'
+        self.assertEqual('internal\nnew statistics\n', self.view.render())
+        self.assertEqual(2, self.view.write_statistics_metrics.call_count)
+
+
+def test_suite():
+    return unittest.findTestCases(sys.modules[__name__])
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='test_suite')
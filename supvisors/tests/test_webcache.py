@@ -0,0 +1,108 @@
+#!/usr/bin/python
+#-*- coding: utf-8 -*-
+
+# ======================================================================
+# Copyright 2016 Julien LE CLEACH
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ======================================================================
+
+import sys
+import unittest
+
+from mock import Mock
+
+from supvisors.tests.base import DummyHttpContext
+
+
+class FragmentCacheTest(unittest.TestCase):
+    """ Test case for the FragmentCache class of the webcache module. """
+
+    def setUp(self):
+        """ Parse the template of the application page. """
+        import meld3
+        self.template = meld3.parse_xml(DummyHttpContext('ui/application.html').template)
+
+    def write_table(self, cache, key, writer, variables=None):
+        """ Return the page written with the table fragment. """
+        root = self.template.clone()
+        cache.write_fragment(root.findmeld('table_mid'), key, writer, variables)
+        return root.write_xhtmlstring()
+
+    @staticmethod
+    def write_rows(elt):
+        """ Write process names in the table. """
+        for tr_elt, item in elt.findmeld('tr_mid').repeat(['xclock', 'xfontsel & co']):
+            tr_elt.findmeld('name_a_mid').content(item)
+
+    def test_create(self):
+        """ Test the values set at construction. """
+        from supvisors.webcache import html_fragments, FragmentCache
+        self.assertIsInstance(html_fragments, FragmentCache)
+        self.assertDictEqual({}, FragmentCache().fragments)
+
+    def test_write_fragment(self):
+        """ Test that the fragment is written only once per key. """
+        from supvisors.webcache import FragmentCache
+        cache = FragmentCache()
+        writer = Mock(side_effect=self.write_rows)
+        page = self.write_table(cache, 1, writer)
+        self.assertIn('xfontsel &amp; co', page)
+        self.assertEqual(1, writer.call_count)
+        self.assertEqual([('table_mid', 1)], cache.fragments.keys())
+        # same key: the cached fragment gives the same page
+        self.assertEqual(page, self.write_table(cache, 1, writer))
+        self.assertEqual(1, writer.call_count)
+        # new key: the fragment is written again
+        self.assertEqual(page, self.write_table(cache, 2, writer))
+        self.assertEqual(2, writer.call_count)
+
+    def test_replaced_fragment(self):
+        """ Test the caching of an element replaced by the writer. """
+        from supvisors.webcache import FragmentCache
+        cache = FragmentCache()
+        writer = Mock(side_effect=lambda elt: elt.replace('No <programs>'))
+        page = self.write_table(cache, 1, writer)
+        self.assertIn('No &lt;programs>', page)
+        self.assertEqual(page, self.write_table(cache, 1, writer))
+        self.assertEqual(1, writer.call_count)
+
+    def test_variables(self):
+        """ Test the substitution of the variables in the cached fragment. """
+        from supvisors.webcache import FragmentCache
+        cache = FragmentCache()
+        writer = Mock(side_effect=lambda elt: elt.findmeld('name_a_mid').content('@@name@@'))
+        page = self.write_table(cache, 1, writer, {'@@name@@': 'xclock'})
+        self.assertIn('>xclock</a>', page)
+        self.assertNotIn('@@name@@', page)
+        self.assertIn('@@name@@', cache.fragments['table_mid', 1])
+        # same key: the cached fragment is used with the new values, escaped
+        page = self.write_table(cache, 1, writer, {'@@name@@': 'xfontsel <&> co'})
+        self.assertIn('>xfontsel &lt;&amp;&gt; co</a>', page)
+        self.assertEqual(1, writer.call_count)
+
+    def test_max_fragments(self):
+        """ Test that the least recently used fragments are released. """
+        from supvisors.webcache import FragmentCache
+        cache = FragmentCache()
+        cache.MAX_FRAGMENTS = 2
+        for key in [1, 2, 1, 3]:
+            self.write_table(cache, key, self.write_rows)
+        self.assertEqual([('table_mid', 1), ('table_mid', 3)], cache.fragments.keys())
+
+
+def test_suite():
+    return unittest.findTestCases(sys.modules[__name__])
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='test_suite')
@@ -0,0 +1,112 @@
+#!/usr/bin/python
+#-*- coding: utf-8 -*-
+
+# ======================================================================
+# Copyright 2016 Julien LE CLEACH
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ======================================================================
+
+import sys
+import unittest
+
+
+class ProcessFilterTest(unittest.TestCase):
+    """ Test case for the ProcessFilter class of the webfilter module. """
+
+    def setUp(self):
+        """ Create process data items. """
+        self.data = [{'application_name': 'crash', 'process_name': name, 'namespec': 'crash:' + name,
+            'statename': state, 'running_list': addresses} for name, state, addresses in [
+                ('late_segv', 'RUNNING', ['10.0.0.1']), ('segv', 'STOPPED', []),
+                ('abort', 'RUNNING', ['10.0.0.2'])]]
+
+    def test_create(self):
+        """ Test the values set at construction. """
+        from supvisors.webfilter import ProcessFilter
+        # test default values
+        process_filter = ProcessFilter({})
+        self.assertEqual(('', '', '', 'config', 1), process_filter.key())
+        self.assertEqual(0, process_filter.pages)
+        self.assertEqual(0, process_filter.count)
+        # test parameters
+        process_filter = ProcessFilter({'name': ' *segv ', 'state': 'RUNNING', 'address': '10.0.0.1',
+            'sort': 'mem', 'page': '3'})
+        self.assertEqual(('*segv', 'RUNNING', '10.0.0.1', 'mem', 3), process_filter.key())
+        # test incorrect parameters
+        process_filter = ProcessFilter({'state': 'DUMMY', 'sort': 'dummy', 'page': 'dummy'})
+        self.assertEqual(('', '', '', 'config', 1), process_filter.key())
+        self.assertEqual(1, ProcessFilter({'page': '-2'}).page)
+
+    def test_states(self):
+        """ Test the names of the process states. """
+        from supvisors.webfilter import ProcessFilter
+        self.assertListEqual(['STOPPED', 'STARTING', 'RUNNING', 'BACKOFF', 'STOPPING', 'EXITED', 'FATAL', 'UNKNOWN'],
+            ProcessFilter.STATES)
+
+    def test_match(self):
+        """ Test the selection of the process data items. """
+        from supvisors.webfilter import ProcessFilter
+        def matching(form):
+            process_filter = ProcessFilter(form)
+            return [item['process_name'] for item in self.data if process_filter.match(item)]
+        self.assertListEqual(['late_segv', 'segv', 'abort'], matching({}))
+        self.assertListEqual(['late_segv', 'abort'], matching({'state': 'RUNNING'}))
+        self.assertListEqual(['abort'], matching({'address': '10.0.0.2'}))
+        # test name pattern against process name and namespec
+        self.assertListEqual(['late_segv', 'segv'], matching({'name': '*segv'}))
+        self.assertListEqual(['segv'], matching({'name': 'crash:s*'}))
+        self.assertListEqual(['late_segv'], matching({'name': '*segv', 'state': 'RUNNING'}))
+        self.assertListEqual([], matching({'name': 'SEGV'}))
+        # test address filter on items without running list
+        del self.data[0]['running_list']
+        self.assertListEqual([], matching({'address': '10.0.0.1'}))
+
+    def test_paginate(self):
+        """ Test the pagination of the process data items. """
+        from supvisors.webfilter import ProcessFilter
+        data = range(120)
+        # test first page
+        process_filter = ProcessFilter({})
+        self.assertListEqual(range(50), process_filter.paginate(data))
+        self.assertEqual((1, 3, 120), (process_filter.page, process_filter.pages, process_filter.count))
+        # test last page
+        process_filter = ProcessFilter({'page': '3'})
+        self.assertListEqual(range(100, 120), process_filter.paginate(data))
+        # test page out of range
+        process_filter = ProcessFilter({'page': '5'})
+        self.assertListEqual(range(100, 120), process_filter.paginate(data))
+        self.assertEqual(3, process_filter.page)
+        # test empty data
+        process_filter = ProcessFilter({'page': '2'})
+        self.assertListEqual([], process_filter.paginate([]))
+        self.assertEqual((1, 1, 0), (process_filter.page, process_filter.pages, process_filter.count))
+
+    def test_url_context(self):
+        """ Test the parameters of the filter for the URL. """
+        from supvisors.webfilter import ProcessFilter
+        # test default values
+        process_filter = ProcessFilter({})
+        self.assertEqual('', process_filter.url_context())
+        self.assertEqual('page=2&amp;', process_filter.url_context(2))
+        # test parameters
+        process_filter = ProcessFilter({'name': 'x y*', 'state': 'FATAL', 'sort': 'cpu', 'page': '2'})
+        self.assertEqual('name=x%20y%2A&amp;state=FATAL&amp;sort=cpu&amp;page=2&amp;', process_filter.url_context())
+        self.assertEqual('name=x%20y%2A&amp;state=FATAL&amp;sort=cpu&amp;', process_filter.url_context(1))
+
+
+def test_suite():
+    return unittest.findTestCases(sys.modules[__name__])
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='test_suite')
@@ -0,0 +1,84 @@
+#!/usr/bin/python
+#-*- coding: utf-8 -*-
+
+# ======================================================================
+# Copyright 2016 Julien LE CLEACH
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ======================================================================
+
+import sys
+import unittest
+
+from mock import Mock
+
+
+class SessionManagerTest(unittest.TestCase):
+    """ Test case for the SessionManager class of the websession module. """
+
+    @staticmethod
+    def create_context(cookie=None):
+        """ Return a HTTP context whose request holds the cookie given. """
+        return Mock(request=Mock(**{'get_header.return_value': cookie}), response={'headers': {}})
+
+    def test_create(self):
+        """ Test the values set at construction. """
+        from supvisors.websession import browser_sessions, SessionManager
+        self.assertIsInstance(browser_sessions, SessionManager)
+        self.assertDictEqual({}, SessionManager().selections)
+
+    def test_get_selection(self):
+        """ Test the creation and the reuse of the browser sessions. """
+        from supvisors.websession import Selection, SessionManager
+        sessions = SessionManager()
+        # no cookie: a new session is created
+        context = self.create_context()
+        selection = sessions.get_selection(context, 5)
+        self.assertIsInstance(selection, Selection)
+        self.assertEqual((5, '', 0, ''), (selection.period, selection.namespec, selection.cpu_id, selection.interface))
+        session_id, = sessions.selections.keys()
+        self.assertEqual('supvisors_session={}; Path=/; HttpOnly'.format(session_id),
+            context.response['headers']['Set-Cookie'])
+        # known session: the selection is reused
+        context = self.create_context('other=1; supvisors_session={}'.format(session_id))
+        self.assertIs(selection, sessions.get_selection(context, 15))
+        self.assertNotIn('Set-Cookie', context.response['headers'])
+        # unknown or corrupted session: a new session is created
+        for cookie in ['supvisors_session=unknown', 'supvisors_session="bad']:
+            context = self.create_context(cookie)
+            self.assertIsNot(selection, sessions.get_selection(context, 15))
+            self.assertIn('Set-Cookie', context.response['headers'])
+        self.assertEqual(3, len(sessions.selections))
+
+    def test_max_sessions(self):
+        """ Test that the least recently used sessions are released. """
+        from supvisors.websession import SessionManager
+        sessions = SessionManager()
+        sessions.MAX_SESSIONS = 2
+        contexts = [self.create_context() for _ in range(3)]
+        sessions.get_selection(contexts[0], 5)
+        sessions.get_selection(contexts[1], 5)
+        session_ids = sessions.selections.keys()
+        # the first session is used again, so the second one is released
+        sessions.get_selection(self.create_context('supvisors_session={}'.format(session_ids[0])), 5)
+        sessions.get_selection(contexts[2], 5)
+        self.assertEqual(2, len(sessions.selections))
+        self.assertIn(session_ids[0], sessions.selections)
+        self.assertNotIn(session_ids[1], sessions.selections)
+
+
+def test_suite():
+    return unittest.findTestCases(sys.modules[__name__])
+
+if __name__ == '__main__':
+    unittest.main(defaultTest='test_suite')
@@ -57,6 +57,26 @@ class RunningFailureStrategies:
     """ Applicable strategies that can be applied on a failure of a running application. """
     CONTINUE, RESTART_PROCESS, STOP_APPLICATION, RESTART_APPLICATION = range(4)
 
+@enumeration_tools
+class AlertSeries:
+    """ Statistics series that can be watched by an alert rule. """
+    HOST_CPU, HOST_MEM, PROCESS_CPU, PROCESS_MEM = range(4)
+
+@enumeration_tools
+class AlertStatistics:
+    """ Values of a statistics series that can be compared to the threshold of an alert rule. """
+    VALUE, MEAN, SLOPE, P50, P95, P99 = range(6)
+
+@enumeration_tools
+class AlertConditions:
+    """ Comparisons that can be applied to the threshold of an alert rule. """
+    ABOVE, BELOW = range(2)
+
+@enumeration_tools
+class StatisticsCharts:
+    """ Renderers of the statistics charts displayed in the Supvisors web pages. """
+    CLIENT, MATPLOTLIB, SVG = range(3)
+
 @enumeration_tools
 class SupvisorsStates:
     """ Internal state of Supvisors. """
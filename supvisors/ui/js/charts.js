@@ -0,0 +1,145 @@
+/*
+ * Statistics charts drawn in the browser from the JSON curves exported by Supvisors.
+ * Each div element of class 'chart' holds the URL of its curves in data-url
+ * and the period of refresh in data-refresh (seconds).
+ */
+(function () {
+    'use strict';
+
+    var WIDTH = 480, HEIGHT = 240;
+    var MARGIN = {left: 40, right: 10, top: 10, bottom: 20};
+    var COLORS = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728'];
+
+    // same range as StatisticsPlot.get_range: additional space is left for the legend
+    function getRange(curves) {
+        var values = [];
+        curves.forEach(function (curve) {
+            values = values.concat(curve.values.filter(function (value) { return value !== null; }));
+        });
+        var min = Math.floor(Math.min.apply(null, values));
+        var max = Math.ceil(Math.max.apply(null, values));
+        var range = max - min;
+        return [Math.max(0, min - range * 0.1), max + range * 0.35];
+    }
+
+    function drawChart(canvas, curves) {
+        var ctx = canvas.getContext('2d');
+        ctx.clearRect(0, 0, WIDTH, HEIGHT);
+        ctx.fillStyle = 'white';
+        ctx.fillRect(0, 0, WIDTH, HEIGHT);
+        var range = getRange(curves);
+        if (range[1] <= range[0]) {
+            range[1] = range[0] + 1;
+        }
+        var width = WIDTH - MARGIN.left - MARGIN.right;
+        var height = HEIGHT - MARGIN.top - MARGIN.bottom;
+        var size = Math.max.apply(null, curves.map(function (curve) { return curve.values.length; }));
+        function x(index) { return MARGIN.left + (size > 1 ? index * width / (size - 1) : 0); }
+        function y(value) { return MARGIN.top + height * (range[1] - value) / (range[1] - range[0]); }
+        // draw the axes and the ticks of the values
+        ctx.strokeStyle = 'black';
+        ctx.lineWidth = 1;
+        ctx.setLineDash([]);
+        ctx.strokeRect(MARGIN.left, MARGIN.top, width, height);
+        ctx.fillStyle = 'black';
+        ctx.font = '10px sans-serif';
+        ctx.textAlign = 'right';
+        ctx.textBaseline = 'middle';
+        for (var tick = 0; tick <= 4; tick++) {
+            var value = range[0] + tick * (range[1] - range[0]) / 4;
+            ctx.fillText(value.toFixed(value < 10 ? 1 : 0), MARGIN.left - 4, y(value));
+        }
+        curves.forEach(function (curve, index) {
+            var color = COLORS[index % COLORS.length];
+            var last = curve.values.length - 1;
+            // draw the standard deviation
+            if (curve.dev !== null) {
+                ctx.globalAlpha = 0.3;
+                ctx.fillStyle = color;
+                ctx.fillRect(x(0), y(curve.mean + curve.dev), x(last) - x(0), y(curve.mean - curve.dev) - y(curve.mean + curve.dev));
+                ctx.globalAlpha = 1;
+            }
+            // draw the values, a null value being a gap that breaks the line
+            ctx.strokeStyle = color;
+            ctx.setLineDash([]);
+            ctx.beginPath();
+            var previous = null;
+            curve.values.forEach(function (value, idx) {
+                if (value !== null) {
+                    if (previous === null) { ctx.moveTo(x(idx), y(value)); } else { ctx.lineTo(x(idx), y(value)); }
+                }
+                previous = value;
+            });
+            ctx.stroke();
+            // draw the mean line
+            ctx.setLineDash([6, 4]);
+            ctx.beginPath();
+            ctx.moveTo(x(0), y(curve.mean));
+            ctx.lineTo(x(last), y(curve.mean));
+            ctx.stroke();
+            // draw the linear regression
+            if (curve.slope !== null) {
+                ctx.setLineDash([2, 3]);
+                ctx.beginPath();
+                ctx.moveTo(x(0), y(curve.intercept));
+                ctx.lineTo(x(last), y(curve.slope * last + curve.intercept));
+                ctx.stroke();
+            }
+            // draw the legend
+            var top = MARGIN.top + 6 + index * 28;
+            ctx.setLineDash([]);
+            ctx.fillStyle = color;
+            ctx.fillRect(MARGIN.left + 6, top, 12, 2);
+            ctx.fillStyle = 'black';
+            ctx.textAlign = 'left';
+            ctx.fillText(curve.title, MARGIN.left + 22, top);
+            ctx.fillText('Mean: ' + curve.mean.toFixed(2) + curve.unit, MARGIN.left + 22, top + 12);
+        });
+    }
+
+    function refreshChart(element) {
+        var request = new XMLHttpRequest();
+        var url = element.getAttribute('data-url');
+        if (element.chartVersion) {
+            url += '&version=' + encodeURIComponent(element.chartVersion);
+        }
+        request.onload = function () {
+            var chart = request.status === 200 ? JSON.parse(request.responseText) : {error: request.statusText};
+            if (chart.error) {
+                element.textContent = chart.error;
+                element.chartVersion = null;
+            } else if (chart.curves) {
+                // the curves are not provided when the version is unchanged
+                if (chart.curves.length > 0) {
+                    var canvas = element.querySelector('canvas');
+                    if (!canvas) {
+                        element.textContent = '';
+                        canvas = document.createElement('canvas');
+                        canvas.width = WIDTH;
+                        canvas.height = HEIGHT;
+                        element.appendChild(canvas);
+                    }
+                    drawChart(canvas, chart.curves);
+                } else {
+                    element.textContent = 'No data';
+                }
+                element.chartVersion = chart.version;
+            }
+        };
+        request.open('GET', url);
+        request.send();
+    }
+
+    function startChart(element) {
+        var refresh = parseFloat(element.getAttribute('data-refresh')) || 5;
+        refreshChart(element);
+        window.setInterval(function () { refreshChart(element); }, refresh * 1000);
+    }
+
+    document.addEventListener('DOMContentLoaded', function () {
+        var elements = document.querySelectorAll('div.chart[data-url]');
+        for (var i = 0; i < elements.length; i++) {
+            startChart(elements[i]);
+        }
+    });
+}());
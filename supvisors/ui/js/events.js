@@ -0,0 +1,214 @@
+/*
+ * Live update of the Supvisors pages from the events published by Supvisors.
+ * The events following the number given in the data-events attribute of the body are requested
+ * from events.json, that answers as soon as new events are published.
+ * The elements related to an address, an application or a process are identified by the attributes
+ * data-address, data-appli and data-namespec, and the elements to update by the following attributes:
+ *     - data-state: 'text' to display the state and/or 'class' to set the state as first class,
+ *     - data-loading: the loading of an address,
+ *     - data-led: the status led of an application,
+ *     - data-running: the list of addresses where a process is running,
+ *     - data-action: the start, stop or restart buttons of a process, whose hyperlink is held in data-href.
+ * When the processes displayed are the ones of a single address, given in the data-process-address attribute
+ * of the body, they are not updated by the events of the processes running on other addresses.
+ */
+(function () {
+    'use strict';
+
+    var RUNNING_STATES = ['STARTING', 'RUNNING', 'BACKOFF'];
+    var STOPPED_STATES = ['STOPPED', 'EXITED', 'FATAL', 'UNKNOWN'];
+    // the page is reloaded when Supvisors enters or leaves these states, as the page contents change
+    var RELOAD_STATES = ['INITIALIZATION', 'CONCILIATION'];
+    // delay in seconds before a new request when the previous one has failed
+    var RETRY_DELAY = 5;
+
+    // return the elements related to the entity and holding the attribute, including the entity elements
+    function findElements(selector, attribute) {
+        var found = [];
+        var entities = document.querySelectorAll(selector);
+        for (var i = 0; i < entities.length; i++) {
+            if (entities[i].hasAttribute(attribute)) {
+                found.push(entities[i]);
+            }
+            var children = entities[i].querySelectorAll('[' + attribute + ']');
+            for (var j = 0; j < children.length; j++) {
+                found.push(children[j]);
+            }
+        }
+        return found;
+    }
+
+    function quote(value) {
+        return '"' + value.replace(/["\\]/g, '\\$&') + '"';
+    }
+
+    function setState(selector, statename) {
+        findElements(selector, 'data-state').forEach(function (element) {
+            var modes = element.getAttribute('data-state').split(' ');
+            if (modes.indexOf('text') >= 0) {
+                element.textContent = statename;
+            }
+            if (modes.indexOf('class') >= 0) {
+                var classes = element.className.split(' ');
+                classes[0] = statename;
+                element.className = classes.join(' ');
+            }
+        });
+    }
+
+    function setLink(element, enabled, enabledClass) {
+        element.className = enabled ? enabledClass : enabledClass.replace(/\bon\b/, 'off');
+        element.setAttribute('href', enabled ? element.getAttribute('data-href') : '#');
+    }
+
+    function onSupvisorsStatus(payload) {
+        var elements = document.querySelectorAll('[data-supvisors]');
+        for (var i = 0; i < elements.length; i++) {
+            var previous = elements[i].textContent;
+            if (previous !== payload.statename
+                    && (RELOAD_STATES.indexOf(previous) >= 0 || RELOAD_STATES.indexOf(payload.statename) >= 0)) {
+                return false;
+            }
+        }
+        setState('[data-supvisors]', payload.statename);
+        return true;
+    }
+
+    function onAddressStatus(payload) {
+        var selector = '[data-address=' + quote(payload.address_name) + ']';
+        setState(selector, payload.statename);
+        findElements(selector, 'data-loading').forEach(function (element) {
+            element.textContent = payload.loading + '%';
+        });
+        // the address hyperlinks are only enabled for running addresses
+        findElements(selector, 'data-href').forEach(function (element) {
+            var master = element.className.indexOf('master') >= 0 ? ' master' : '';
+            setLink(element, payload.statename === 'RUNNING', 'on' + master);
+        });
+        return true;
+    }
+
+    function onApplicationStatus(payload) {
+        var selector = '[data-appli=' + quote(payload.application_name) + ']';
+        if (document.querySelector('#application-list') && !document.querySelector(selector)) {
+            // new application
+            return false;
+        }
+        setState(selector, payload.statename);
+        var running = RUNNING_STATES.indexOf(payload.statename) >= 0;
+        findElements(selector, 'data-led').forEach(function (element) {
+            if (!running) {
+                element.className = 'status_empty';
+            } else if (payload.major_failure) {
+                element.className = 'status_red';
+            } else if (payload.minor_failure) {
+                element.className = 'status_yellow';
+            } else {
+                element.className = 'status_green';
+            }
+        });
+        return true;
+    }
+
+    function onProcessStatus(payload) {
+        var namespec = payload.application_name + ':' + payload.process_name;
+        var address = document.body.getAttribute('data-process-address');
+        // the row is not updated when the process is running on other addresses than the one displayed
+        if (address === null || payload.addresses.length === 0 || payload.addresses.indexOf(address) >= 0) {
+            updateProcessRow('tr[data-namespec=' + quote(namespec) + ']', payload);
+        }
+        updateAddressBoxes(namespec, payload);
+        return true;
+    }
+
+    function updateProcessRow(selector, payload) {
+        setState(selector, payload.statename);
+        findElements(selector, 'data-action').forEach(function (element) {
+            var action = element.getAttribute('data-action');
+            var states = action === 'start' ? STOPPED_STATES : RUNNING_STATES;
+            setLink(element, states.indexOf(payload.statename) >= 0, 'button on');
+        });
+        findElements(selector, 'data-running').forEach(function (element) {
+            element.textContent = '';
+            if (payload.addresses.length > 0) {
+                var list = document.createElement('ul');
+                list.className = 'linear';
+                payload.addresses.forEach(function (address) {
+                    var item = document.createElement('li');
+                    var link = document.createElement('a');
+                    link.className = 'button on';
+                    link.setAttribute('href', 'procaddress.html?address=' + encodeURIComponent(address));
+                    link.textContent = address;
+                    item.appendChild(link);
+                    list.appendChild(item);
+                });
+                element.appendChild(list);
+            }
+        });
+    }
+
+    // update the processes running in the address boxes
+    function updateAddressBoxes(namespec, payload) {
+        var running = RUNNING_STATES.indexOf(payload.statename) >= 0;
+        var boxes = document.querySelectorAll('div[data-address]');
+        for (var i = 0; i < boxes.length; i++) {
+            var item = boxes[i].querySelector('li[data-namespec=' + quote(namespec) + ']');
+            var expected = running && payload.addresses.indexOf(boxes[i].getAttribute('data-address')) >= 0;
+            if (item && !expected) {
+                item.parentNode.removeChild(item);
+            } else if (!item && expected) {
+                item = document.createElement('li');
+                item.className = 'button';
+                item.setAttribute('data-namespec', namespec);
+                item.textContent = namespec;
+                boxes[i].querySelector('ul').appendChild(item);
+            }
+        }
+    }
+
+    var HANDLERS = {
+        supvisors: onSupvisorsStatus,
+        address: onAddressStatus,
+        application: onApplicationStatus,
+        process: onProcessStatus
+    };
+
+    // return false if the page has to be reloaded
+    function applyEvents(events) {
+        for (var i = 0; i < events.length; i++) {
+            var handler = HANDLERS[events[i].header];
+            if (handler && !handler(events[i].payload)) {
+                return false;
+            }
+        }
+        return true;
+    }
+
+    function requestEvents(since) {
+        var request = new XMLHttpRequest();
+        request.onload = function () {
+            if (request.status !== 200) {
+                window.setTimeout(function () { requestEvents(since); }, RETRY_DELAY * 1000);
+                return;
+            }
+            var answer = JSON.parse(request.responseText);
+            if (answer.reload || !applyEvents(answer.events)) {
+                window.location.reload();
+            } else {
+                requestEvents(answer.last);
+            }
+        };
+        request.onerror = function () {
+            window.setTimeout(function () { requestEvents(since); }, RETRY_DELAY * 1000);
+        };
+        request.open('GET', 'events.json?since=' + since);
+        request.send();
+    }
+
+    document.addEventListener('DOMContentLoaded', function () {
+        var since = document.body.getAttribute('data-events');
+        if (since !== null) {
+            requestEvents(since);
+        }
+    });
+}());
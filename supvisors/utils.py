@@ -30,6 +30,7 @@ class RemoteCommEvents:
     SUPVISORS_AUTH = u'auth'
     SUPVISORS_EVENT = u'event'
     SUPVISORS_INFO = u'info'
+    SUPVISORS_REGISTRY = u'registry'
 
 class EventHeaders:
     """ Strings used as headers in messages between EventPublisher and Supvisors' Client. """
@@ -37,6 +38,7 @@ class EventHeaders:
     ADDRESS = u'address'
     APPLICATION = u'application'
     PROCESS = u'process'
+    ALERT = u'alert'
 
 
 # for deferred XML-RPC requests
@@ -44,7 +46,7 @@ IPC_NAME = '/tmp/supvisors-ipc'
 
 class DeferredRequestHeaders:
     """ Enumeration class for the headers of deferred XML-RPC messages sent to MainLoop."""
-    CHECK_ADDRESS, ISOLATE_ADDRESSES, START_PROCESS, STOP_PROCESS, RESTART, SHUTDOWN = range(6)
+    CHECK_ADDRESS, ISOLATE_ADDRESSES, START_PROCESS, STOP_PROCESS, RESTART, SHUTDOWN, LOAD_REGISTRY = range(7)
 
 
 # used to convert enumeration-like value to string and vice-versa
@@ -153,3 +155,35 @@ def get_stats(lst):
         # calculate standard deviation
         dev = stddev(lst, avg)
     return avg, rate, (a,  b), dev
+
+# downsampling of a series of points
+def get_lttb_indexes(xdata, ydata, threshold):
+    """ Return the indexes of the points kept when downsampling a series of points to threshold points,
+    using the Largest-Triangle-Three-Buckets algorithm.
+    The first and the last points are always kept.
+    All indexes are returned if threshold is null or greater than the number of points. """
+    size = len(xdata)
+    if threshold <= 0 or threshold >= size:
+        return range(size)
+    if threshold < 3:
+        # no bucket possible: keep the most recent points
+        return range(size - threshold, size)
+    # the points between the first and the last ones are split into threshold - 2 buckets
+    bucket_size = (size - 2) / float(threshold - 2)
+    indexes = [0]
+    selected = 0
+    for bucket in range(threshold - 2):
+        start = int(bucket * bucket_size) + 1
+        end = int((bucket + 1) * bucket_size) + 1
+        # average point of the next bucket (the last point for the last bucket)
+        next_end = min(int((bucket + 2) * bucket_size) + 1, size)
+        avg_x = mean(xdata[end:next_end])
+        avg_y = mean(ydata[end:next_end])
+        # keep the point of the bucket making the largest triangle with the previous selected point
+        # and the average point of the next bucket
+        sel_x, sel_y = xdata[selected], ydata[selected]
+        selected = max(range(start, end), key=lambda idx: abs((sel_x - avg_x) * (ydata[idx] - sel_y)
+            - (sel_x - xdata[idx]) * (avg_y - sel_y)))
+        indexes.append(selected)
+    indexes.append(size - 1)
+    return indexes
@@ -26,6 +26,7 @@ from supervisor.xmlrpc import RPCError
 from supvisors.ttypes import DeploymentStrategies
 from supvisors.utils import supvisors_short_cuts
 from supvisors.viewhandler import ViewHandler
+from supvisors.webcache import html_fragments
 from supvisors.webutils import *
 
 
@@ -41,8 +42,8 @@ class ApplicationView(MeldView, ViewHandler):
         self.supvisors = self.context.supervisord.supvisors
         supvisors_short_cuts(self, ['logger'])
 
-    def url_context(self):
-        return 'appli={}&amp;'.format(self.application_name)
+    def url_context(self, page=None):
+        return 'appli={}&amp;'.format(self.application_name) + ViewHandler.url_context(self, page)
 
     def render(self):
         """ Method called by Supervisor to handle the rendering of the Supvisors Application page. """
@@ -67,9 +68,11 @@ class ApplicationView(MeldView, ViewHandler):
         # set application state
         application = self.supvisors.context.applications[self.application_name]
         elt = root.findmeld('state_mid')
+        elt.attrib['data-appli'] = self.application_name
         elt.content(application.state_string())
         # set LED iaw major/minor failures
         elt = root.findmeld('state_led_mid')
+        elt.attrib['data-appli'] = self.application_name
         if application.running():
             if application.major_failure:
                 elt.attrib['class'] = 'status_red'
@@ -82,6 +85,8 @@ class ApplicationView(MeldView, ViewHandler):
         # write periods of statistics
         self.write_deployment_strategy(root)
         self.write_periods(root)
+        # write resources consumed by the application
+        self.write_application_statistics(root)
         # write actions related to application
         self.write_application_actions(root)
 
@@ -122,15 +127,36 @@ class ApplicationView(MeldView, ViewHandler):
         elt = root.findmeld('restartapp_a_mid')
         elt.attributes(href='{}?{}action=restartapp'.format(self.page_name, self.url_context()))
 
+    def write_application_statistics(self, root):
+        """ Rendering of the resources consumed by the application on all addresses. """
+        _, cluster = self.get_cluster_stats()
+        stats = cluster.get_application_stats(self.application_name)
+        cpuvalue = stats['cpu']
+        if not self.supvisors.options.stats_irix_mode and cluster.nbcores:
+            # CPU given against the processor cores of the whole cluster
+            cpuvalue /= cluster.nbcores
+        root.findmeld('appcpu_td_mid').content('{:.2f}%'.format(cpuvalue))
+        root.findmeld('appmem_td_mid').content('{:.2f}%'.format(stats['mem']))
+
     def write_contents(self, root):
-        """ Rendering of the contents part of the page. """
-        self.write_process_table(root)
+        """ Rendering of the contents part of the page.
+        Only the processes of the page selected by the filter are written.
+        The process table is written again only if these processes or their statistics have changed. """
+        data = self.select_processes(self.get_process_data())
+        root.findmeld('appli_input_mid').attrib['value'] = self.application_name
+        self.write_process_filter(root, self.supvisors.address_mapper.addresses)
+        key = (self.page_name, self.application_name, self.server_port(), self.selection.period,
+            self.selection.namespec, self.process_filter.key(),
+            tuple((item['namespec'], self.get_process_status(item['namespec']).version,
+                self.get_stats_version(item['namespec'])) for item in data))
+        html_fragments.write_fragment(root.findmeld('table_mid'), key,
+            lambda elt: self.write_process_table(elt, data))
         # check selected Process Statistics
-        if ViewHandler.namespec_stats:
-            status = self.get_process_status(ViewHandler.namespec_stats)
+        if self.selection.namespec:
+            status = self.get_process_status(self.selection.namespec)
             if not status or status.application_name != self.application_name:
-                self.logger.warn('unselect Process Statistics for {}'.format(ViewHandler.namespec_stats))
-                ViewHandler.namespec_stats = ''
+                self.logger.warn('unselect Process Statistics for {}'.format(self.selection.namespec))
+                self.selection.namespec = ''
             else:
                 # addtional information for title
                 elt = root.findmeld('address_fig_mid')
@@ -138,31 +164,37 @@ class ApplicationView(MeldView, ViewHandler):
         # write selected Process Statistics
         self.write_process_statistics(root)
 
-    def get_process_stats(self, namespec):
-        """ Get the statistics structure related to the period selected and the address where the process named namespec is running. """
+    def get_process_address(self, namespec):
+        """ Get the address where the process named namespec is running. """
         status = self.get_process_status(namespec)
         if status:
             # get running address from procStatus
-            address = next(iter(status.addresses), None)
-            if address:
-                stats = self.supvisors.statistician.data[address][ViewHandler.period_stats]
-                nbcores = self.supvisors.statistician.nbcores[address]
-                return nbcores, stats.find_process_stats(namespec)
+            return next(iter(status.addresses), None)
+
+    def get_process_stats(self, namespec, peek=False):
+        """ Get the statistics structure related to the period selected and the address where the process named namespec is running.
+        When peek is set, the statistics are not considered as requested by the memory budget. """
+        address = self.get_process_address(namespec)
+        if address:
+            stats = self.supvisors.statistician.data[address][self.selection.period]
+            nbcores = self.supvisors.statistician.nbcores[address]
+            return nbcores, stats.peek_process_stats(namespec) if peek else stats.find_process_stats(namespec)
         return 0, None
 
-    def write_process_table(self, root):
-        """ Rendering of the application processes managed through Supervisor. """
-        # collect data on processes
+    def get_process_data(self):
+        """ Collect the information of the application processes. """
         data = []
         for process in self.supvisors.context.applications[self.application_name].processes.values():
             data.append({'application_name': process.application_name, 'process_name': process.process_name,
                 'namespec': process.namespec(), 'running_list': list(process.addresses),
                 'statename': process.state_string(), 'statecode': process.state})
+        return data
+
+    def write_process_table(self, root, data):
+        """ Rendering of the application processes managed through Supervisor. """
         # print processes
         if data:
-            # re-arrange data
-            data = self.sort_processes_by_config(data)
-            # loop on all processes
+            # loop on the processes of the page
             iterator = root.findmeld('tr_mid').repeat(data)
             shaded_tr = False # used to invert background style
             for tr_elt, item in iterator:
@@ -0,0 +1,156 @@
+#!/usr/bin/python
+#-*- coding: utf-8 -*-
+
+# ======================================================================
+# Copyright 2016 Julien LE CLEACH
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ======================================================================
+
+import json
+
+from supervisor.web import MeldView
+
+from supvisors.plot import StatisticsPlot
+
+
+def address_plot(stats_instance, series, cpu_id=0, interface=''):
+    """ Return the plot of an address series, among cpu, mem and io. """
+    plot = StatisticsPlot()
+    if series == 'cpu':
+        plot.add_plot('CPU #{}'.format(cpu_id - 1 if cpu_id > 0 else 'all'), '%', stats_instance.cpu[cpu_id])
+    elif series == 'mem':
+        plot.add_plot('MEM', '%', stats_instance.mem)
+    elif series == 'io':
+        recv_stats, sent_stats = stats_instance.io[interface]
+        plot.add_plot('{} recv'.format(interface), 'kbits/s', recv_stats)
+        plot.add_plot('{} sent'.format(interface), 'kbits/s', sent_stats)
+    else:
+        raise ValueError('unknown address series: {}'.format(series))
+    return plot
+
+
+def process_plot(proc_stats, series):
+    """ Return the plot of a process series, among cpu and mem. """
+    plot = StatisticsPlot()
+    if series == 'cpu':
+        plot.add_plot('CPU', '%', proc_stats.cpu)
+    elif series == 'mem':
+        plot.add_plot('MEM', '%', proc_stats.mem)
+    else:
+        raise ValueError('unknown process series: {}'.format(series))
+    return plot
+
+
+def get_chart(plot, version=None):
+    """ Return the serializable chart of the plot.
+    The version identifies the series of the plot, so the curves are not provided again if the version is unchanged.
+    The statistics of the curves are the ones compiled from the running sums of the series. """
+    key = plot.get_key()
+    chart = {'version': '-'.join(str(series_version) for _, series_version in key) if key is not None else None}
+    if chart['version'] is None or chart['version'] != version:
+        chart['curves'] = [{'title': title, 'unit': unit, 'values': [value if value is None else round(value, 2) for value in values],
+            'mean': avg, 'rate': rate, 'slope': a, 'intercept': b, 'dev': dev}
+            for title, unit, values, (avg, rate, (a, b), dev) in sorted(plot.get_curves())]
+    return chart
+
+
+# errors raised by an incorrect selection of statistics
+SELECTION_ERRORS = (KeyError, IndexError, ValueError, StopIteration)
+
+
+class PlotSelection(object):
+    """ Helper class to get the plot selected by the parameters of a request.
+    The selection is a tuple of the normalized parameters, so that it identifies the plot.
+    The series is given by the series parameter, unless set by the class. """
+
+    series = None
+
+    def get_period(self, form):
+        """ Return the period requested (smallest period by default). """
+        period = form.get('period')
+        return int(period) if period else next(iter(self.supvisors.options.stats_periods))
+
+    def get_selection(self, form):
+        """ Return the selection of the plot requested. """
+        raise NotImplementedError
+
+    def get_plot(self, selection):
+        """ Return the plot corresponding to the selection. """
+        raise NotImplementedError
+
+
+class AddressPlotSelection(PlotSelection):
+    """ Selection of an address series.
+    The parameters are the address (local address by default), the period, the series (cpu, mem or io),
+    the cpu index for the cpu series and the interface for the io series. """
+
+    def get_selection(self, form):
+        """ Return the selection of the address series requested. """
+        address = form.get('address') or self.supvisors.address_mapper.local_address
+        return ('address', address, self.get_period(form), self.series or form.get('series'),
+            int(form.get('idx') or 0), form.get('intf') or '')
+
+    def get_plot(self, selection):
+        """ Return the plot of the address series selected. """
+        _, address, period, series, cpu_id, interface = selection
+        return address_plot(self.supvisors.statistician.data[address][period], series, cpu_id, interface)
+
+
+class ProcessPlotSelection(PlotSelection):
+    """ Selection of a process series.
+    The parameters are the address (first running address of the process by default), the period,
+    the namespec and the series (cpu or mem). """
+
+    def get_selection(self, form):
+        """ Return the selection of the process series requested. """
+        namespec = form.get('namespec')
+        address = form.get('address') or next(iter(self.supvisors.context.processes[namespec].addresses))
+        return ('process', address, self.get_period(form), self.series or form.get('series'), namespec)
+
+    def get_plot(self, selection):
+        """ Return the plot of the process series selected. """
+        _, address, period, series, namespec = selection
+        proc_stats = self.supvisors.statistician.data[address][period].find_process_stats(namespec)
+        if not proc_stats:
+            raise KeyError(namespec)
+        return process_plot(proc_stats, series)
+
+
+class ChartView(MeldView):
+    """ Dummy view exporting a statistics chart in JSON, so that it is drawn by the browser. """
+
+    content_type = 'application/json'
+
+    def __init__(self, context):
+        """ Storage of the reference to Supvisors. """
+        MeldView.__init__(self, context)
+        self.supvisors = self.context.supervisord.supvisors
+
+    def render(self):
+        """ Export the chart corresponding to the request parameters. """
+        form = self.context.form
+        try:
+            chart = get_chart(self.get_plot(self.get_selection(form)), form.get('version'))
+        except SELECTION_ERRORS, exc:
+            self.supvisors.logger.debug('cannot export chart: {!r}'.format(exc))
+            chart = {'error': 'incorrect chart request'}
+        return json.dumps(chart, separators=(',', ':'))
+
+
+class AddressChartView(ChartView, AddressPlotSelection):
+    """ Dummy view exporting the chart of an address series. """
+
+
+class ProcessChartView(ChartView, ProcessPlotSelection):
+    """ Dummy view exporting the chart of a process series. """
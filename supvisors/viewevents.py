@@ -0,0 +1,64 @@
+#!/usr/bin/python
+#-*- coding: utf-8 -*-
+
+# ======================================================================
+# Copyright 2016 Julien LE CLEACH
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ======================================================================
+
+import json
+from time import time
+
+from supervisor.http import NOT_DONE_YET
+from supervisor.web import MeldView
+
+
+class EventView(MeldView):
+    """ Dummy view exporting in JSON the events published by Supvisors after the event number given.
+    The request is held until new events are available or until TIMEOUT, so that the browser is updated
+    as soon as an event is published without polling. """
+
+    content_type = 'application/json'
+    # polling period of the event journal
+    delay = 0.5
+    # time in seconds after which the request is answered without events
+    TIMEOUT = 20
+
+    def __init__(self, context):
+        """ Storage of the reference to Supvisors. """
+        MeldView.__init__(self, context)
+        self.supvisors = self.context.supervisord.supvisors
+        self.started = time()
+
+    def render(self):
+        """ Export the events following the event number given by the since parameter.
+        Without this parameter, only the number of the last event is given.
+        The browser is requested to reload the page if some events are lost. """
+        journal = self.supvisors.event_journal
+        try:
+            since = int(self.context.form.get('since'))
+        except (TypeError, ValueError):
+            return self.dump({'last': journal.last, 'events': []})
+        events = journal.get_events(since)
+        if events is None:
+            return self.dump({'last': journal.last, 'reload': True})
+        if not events and time() - self.started < self.TIMEOUT:
+            return NOT_DONE_YET
+        return self.dump({'last': events[-1][0] if events else since,
+            'events': [{'header': header, 'payload': payload} for _, header, payload in events]})
+
+    @staticmethod
+    def dump(answer):
+        """ Return the answer in JSON. """
+        return json.dumps(answer, separators=(',', ':'))
@@ -23,9 +23,10 @@ from supervisor.http import NOT_DONE_YET
 from supervisor.states import SupervisorStates, RUNNING_STATES, STOPPED_STATES
 
 from supvisors.rpcinterface import API_VERSION
-from supvisors.ttypes import AddressStates, SupvisorsStates
-from supvisors.utils import get_stats
-from supvisors.viewimage import process_cpu_image, process_mem_image
+from supvisors.ttypes import AddressStates, StatisticsCharts, SupvisorsStates
+from supvisors.webcache import html_fragments
+from supvisors.webfilter import ProcessFilter
+from supvisors.websession import browser_sessions
 from supvisors.webutils import *
 
 
@@ -33,23 +34,35 @@ class ViewHandler(object):
     """ Helper class to commonize rendering and behaviour between handlers inheriting from MeldView.
     The use of some 'self' attributes may appear quite strange as they actually belongs to MeldView inheritance.
     However it works because python interprets the attributes in the context of the instance inheriting from both MeldView and this class.
-    The choice of the statistics is made through class attributes for the moement because it would take too much place on the URL.
-    An change may be done later to use a short code that would be discriminating """
+    The choice of the statistics is kept in the browser session, so that each browser has its own selection.
+    The filter of the process tables is given in the parameters of the page request. """
 
-    # static attributes for statistics selection
-    period_stats = None
-    namespec_stats = ''
+    # labels of the sorts of the process tables
+    SORT_LABELS = {'config': 'Configuration', 'cpu': 'CPU', 'mem': 'MEM'}
+
+    # statistics selection of the browser session
+    selection = None
+    # filter of the process tables
+    process_filter = None
 
     def render(self):
         """ Method called by Supervisor to handle the rendering of the Supvisors pages """
         # clone the template and set navigation menu
         if self.supvisors.info_source.supervisor_state == SupervisorStates.RUNNING:
+            # get the statistics selection of the browser session
+            if self.selection is None:
+                self.selection = browser_sessions.get_selection(self.context,
+                    next(iter(self.supvisors.options.stats_periods)))
+            # get the filter of the process tables, kept in the hyperlinks of the page
+            self.process_filter = ProcessFilter(self.context.form)
             # manage action
             message = self.handle_action()
             if message is NOT_DONE_YET:
                 return NOT_DONE_YET
             # display result
             root = self.clone()
+            # give the number of the last event published, so that the browser updates the page from the next ones
+            root.findmeld('body_mid').attrib['data-events'] = str(self.supvisors.event_journal.last)
             form = self.context.form
             print_message(root, form.get('gravity'), form.get('message'))
             # manage parameters
@@ -66,28 +79,49 @@ class ViewHandler(object):
             return root.write_xhtmlstring()
 
     def write_nav(self, root, address=None, appli=None):
+        """ Write the navigation menu.
+        The lists of addresses and applications are written again only if their context entities have changed. """
+        context = self.supvisors.context
         server_port = self.server_port()
-        # update navigation addresses
+        key = (server_port, address, context.master_address,
+            tuple(context.addresses[item].version for item in self.supvisors.address_mapper.addresses))
+        html_fragments.write_fragment(root.findmeld('address_nav_mid'), key,
+            lambda elt: self.write_address_nav(elt, server_port, address))
+        key = (appli, self.supvisors.fsm.state == SupvisorsStates.INITIALIZATION,
+            tuple((item, application.version) for item, application in context.applications.items()))
+        html_fragments.write_fragment(root.findmeld('appli_nav_mid'), key,
+            lambda elt: self.write_appli_nav(elt, appli))
+
+    def write_address_nav(self, root, server_port, address):
+        """ Write the addresses of the navigation menu. """
         iterator = root.findmeld('address_li_mid').repeat(self.supvisors.address_mapper.addresses)
         for li_elt, item in iterator:
             status = self.supvisors.context.addresses[item]
             # set element class
             li_elt.attrib['class'] = status.state_string() + (' active' if item == address else '')
+            li_elt.attrib['data-address'] = item
+            li_elt.attrib['data-state'] = 'class'
             # set hyperlink attributes
             elt = li_elt.findmeld('address_a_mid')
+            # go to web page located on address, so as to reuse Supervisor StatusView
+            href = 'http://{}:{}/procaddress.html'.format(item, server_port)
+            elt.attrib['data-href'] = href
             if status.state == AddressStates.RUNNING:
-                # go to web page located on address, so as to reuse Supervisor StatusView
-                elt.attributes(href='http://{}:{}/procaddress.html'.format(item, server_port))
+                elt.attributes(href=href)
                 elt.attrib['class'] = 'on' + (' master' if item == self.supvisors.context.master_address else '')
             else:
                 elt.attrib['class'] = 'off'
             elt.content(item)
-        # update navigation applications
+
+    def write_appli_nav(self, root, appli):
+        """ Write the applications of the navigation menu. """
         iterator = root.findmeld('appli_li_mid').repeat(self.supvisors.context.applications.keys())
         for li_elt, item in iterator:
             application = self.supvisors.context.applications[item]
             # set element class
             li_elt.attrib['class'] = application.state_string() + (' active' if item == appli else '')
+            li_elt.attrib['data-appli'] = item
+            li_elt.attrib['data-state'] = 'class'
             # set hyperlink attributes
             elt = li_elt.findmeld('appli_a_mid')
             if self.supvisors.fsm.state == SupvisorsStates.INITIALIZATION:
@@ -99,23 +133,26 @@ class ViewHandler(object):
 
     def write_periods(self, root):
         """ Write configured periods for statistics """
-        # init period if necessary
-        if ViewHandler.period_stats is None:
-            ViewHandler.period_stats = next(iter(self.supvisors.options.stats_periods))
         # render periods
         iterator = root.findmeld('period_li_mid').repeat(self.supvisors.options.stats_periods)
         for li_elt, period in iterator:
             # print period button
             elt = li_elt.findmeld('period_a_mid')
-            if period == ViewHandler.period_stats:
+            if period == self.selection.period:
                 elt.attrib['class'] = "button off active"
             else:
                 elt.attributes(href='{}?{}period={}'.format(self.page_name, self.url_context(), period))
             elt.content('{}s'.format(period))
 
+    def get_cluster_stats(self):
+        """ Return the period selected and the related statistics of the applications and of the cluster. """
+        period = self.selection.period
+        return period, self.supvisors.statistician.clusters[period]
+
     def write_common_process_status(self, tr_elt, item):
         selected_tr = False
         namespec = item['namespec']
+        tr_elt.attrib['data-namespec'] = namespec
         # print state
         elt = tr_elt.findmeld('state_td_mid')
         elt.attrib['class'] = item['statename']
@@ -129,14 +166,14 @@ class ViewHandler(object):
         hide_cpu_link, hide_mem_link = (True, )*2
         nbcores, proc_stats = self.get_process_stats(namespec)
         if proc_stats:
-            if len(proc_stats[0]) > 0:
+            if len(proc_stats.cpu) > 0:
                 # print last CPU value of process
                 elt = tr_elt.findmeld('pcpu_a_mid')
-                cpuvalue = proc_stats[0][-1]
+                cpuvalue = proc_stats.cpu[-1]
                 if not self.supvisors.options.stats_irix_mode:
                     cpuvalue /= nbcores
                 elt.content('{:.2f}%'.format(cpuvalue))
-                if ViewHandler.namespec_stats == namespec:
+                if self.selection.namespec == namespec:
                     selected_tr = True
                     elt.attributes(href='#')
                     elt.attrib['class'] = 'button off active'
@@ -144,11 +181,11 @@ class ViewHandler(object):
                     elt.attributes(href='{}?{}processname={}'.format(self.page_name, self.url_context(), urllib.quote(namespec)))
                     elt.attrib['class'] = 'button on'
                 hide_cpu_link = False
-            if len(proc_stats[1]) > 0:
+            if len(proc_stats.mem) > 0:
                 # print last MEM value of process
                 elt = tr_elt.findmeld('pmem_a_mid')
-                elt.content('{:.2f}%'.format(proc_stats[1][-1]))
-                if ViewHandler.namespec_stats == namespec:
+                elt.content('{:.2f}%'.format(proc_stats.mem[-1]))
+                if self.selection.namespec == namespec:
                     selected_tr = True
                     elt.attributes(href='#')
                     elt.attrib['class'] = 'button off active'
@@ -165,47 +202,94 @@ class ViewHandler(object):
             elt.replace('--')
         # manage actions iaw state
         process_state = item['statecode']
+        # the hyperlinks of the actions are kept so that the browser enables them upon process events
         # start button
         elt = tr_elt.findmeld('start_a_mid')
+        elt.attrib['data-href'] = '{}?{}namespec={}&amp;action=start'.format(self.page_name, self.url_context(), urllib.quote(namespec))
         if process_state in STOPPED_STATES:
             elt.attrib['class'] = 'button on'
-            elt.attributes(href='{}?{}namespec={}&amp;action=start'.format(self.page_name, self.url_context(), urllib.quote(namespec)))
+            elt.attributes(href=elt.attrib['data-href'])
         else:
            elt.attrib['class'] = 'button off'
         # stop button
         elt = tr_elt.findmeld('stop_a_mid')
+        elt.attrib['data-href'] = '{}?{}namespec={}&amp;action=stop'.format(self.page_name, self.url_context(), urllib.quote(namespec))
         if process_state in RUNNING_STATES:
             elt.attrib['class'] = 'button on'
-            elt.attributes(href='{}?{}namespec={}&amp;action=stop'.format(self.page_name, self.url_context(), urllib.quote(namespec)))
+            elt.attributes(href=elt.attrib['data-href'])
         else:
            elt.attrib['class'] = 'button off'
         # restart button
         elt = tr_elt.findmeld('restart_a_mid')
+        elt.attrib['data-href'] = '{}?{}namespec={}&amp;action=restart'.format(self.page_name, self.url_context(), urllib.quote(namespec))
         if process_state in RUNNING_STATES:
             elt.attrib['class'] = 'button on'
-            elt.attributes(href='{}?{}namespec={}&amp;action=restart'.format(self.page_name, self.url_context(), urllib.quote(namespec)))
+            elt.attributes(href=elt.attrib['data-href'])
         else:
            elt.attrib['class'] = 'button off'
         return selected_tr
  
+    def select_processes(self, data):
+        """ Filter, sort and paginate the process data iaw the filter of the process table.
+        Only the processes of the page displayed are returned, so that only the visible rows are rendered. """
+        data = self.sort_processes_by_config([item for item in data if self.process_filter.match(item)])
+        if self.process_filter.sort != 'config':
+            # decreasing usage, the processes without statistics at the end
+            # as the sort is stable, processes with the same usage keep the configuration ordering
+            idx = 0 if self.process_filter.sort == 'cpu' else 1
+            usages = {item['namespec']: self.get_process_usage(item['namespec'])[idx] for item in data}
+            data.sort(key=lambda item: (usages[item['namespec']] is None, -(usages[item['namespec']] or 0)))
+        return self.process_filter.paginate(data)
+
+    def write_process_filter(self, root, addresses=None):
+        """ Rendering of the filter of the process table and of its pagination.
+        The address selection is displayed only when addresses are given. """
+        process_filter = self.process_filter
+        root.findmeld('name_input_mid').attrib['value'] = process_filter.name
+        options = [('state', [''] + ProcessFilter.STATES, process_filter.state),
+            ('sort', ProcessFilter.SORT_KEYS, process_filter.sort)]
+        if addresses is not None:
+            options.append(('address', [''] + list(addresses), process_filter.address))
+        for name, values, selected in options:
+            iterator = root.findmeld('{}_option_mid'.format(name)).repeat(values)
+            for elt, value in iterator:
+                elt.attrib['value'] = value
+                if value == selected:
+                    elt.attrib['selected'] = 'selected'
+                elt.content(self.SORT_LABELS.get(value, value) if name == 'sort' else value or 'All')
+        # write the number of processes selected and the hyperlinks to the pages around the current one
+        root.findmeld('count_mid').content('{} process{}'.format(process_filter.count,
+            'es' if process_filter.count > 1 else ''))
+        pages = sorted({1, process_filter.pages} | set(range(max(1, process_filter.page - 3),
+            min(process_filter.pages, process_filter.page + 3) + 1)))
+        iterator = root.findmeld('page_li_mid').repeat(pages)
+        for li_elt, page in iterator:
+            elt = li_elt.findmeld('page_a_mid')
+            if page == process_filter.page:
+                elt.attrib['class'] = 'button off active'
+            else:
+                elt.attributes(href='{}?{}'.format(self.page_name, self.url_context(page)))
+            elt.content(str(page))
+
     def write_process_statistics(self, root):
         """ Display detailed statistics about the selected process """
         stats_elt = root.findmeld('pstats_div_mid')
         # get data from statistics module iaw period selection
-        if ViewHandler.namespec_stats:
-            nbcores, proc_stats = self.get_process_stats(ViewHandler.namespec_stats)
-            if proc_stats and (len(proc_stats[0]) > 0 or len(proc_stats[1]) > 0):
+        namespec = self.selection.namespec
+        if namespec:
+            nbcores, proc_stats = self.get_process_stats(namespec)
+            if proc_stats and (len(proc_stats.cpu) > 0 or len(proc_stats.mem) > 0):
                 # set titles
                 elt = stats_elt.findmeld('process_h_mid')
-                elt.content(ViewHandler.namespec_stats)
+                elt.content(namespec)
                  # set CPU statistics
-                if len(proc_stats[0]) > 0:
-                    avg, rate, (a, b), dev = get_stats(proc_stats[0])
+                if len(proc_stats.cpu) > 0:
+                    avg, rate, (a, b), dev = proc_stats.cpu.get_stats()
                     # print last CPU value of process
                     elt = stats_elt.findmeld('pcpuval_td_mid')
                     if rate is not None:
                         self.set_slope_class(elt, rate)
-                    cpuvalue = proc_stats[0][-1]
+                    cpuvalue = proc_stats.cpu[-1]
                     if not self.supvisors.options.stats_irix_mode:
                         cpuvalue /= nbcores
                     elt.content('{:.2f}%'.format(cpuvalue))
@@ -220,14 +304,17 @@ class ViewHandler(object):
                         # set standard deviation
                         elt = stats_elt.findmeld('pcpudev_td_mid')
                         elt.content('{:.2f}'.format(dev))
+                    # set quantiles
+                    self.write_quantiles(stats_elt, 'pcpu', proc_stats.cpu.sketch,
+                        1 if self.supvisors.options.stats_irix_mode else nbcores)
                 # set MEM statistics
-                if len(proc_stats[1]) > 0:
-                    avg, rate, (a, b), dev = get_stats(proc_stats[1])
+                if len(proc_stats.mem) > 0:
+                    avg, rate, (a, b), dev = proc_stats.mem.get_stats()
                     # print last MEM value of process
                     elt = stats_elt.findmeld('pmemval_td_mid')
                     if rate is not None:
                         self.set_slope_class(elt, rate)
-                    elt.content('{:.2f}%'.format(proc_stats[1][-1]))
+                    elt.content('{:.2f}%'.format(proc_stats.mem[-1]))
                     # set mean value
                     elt = stats_elt.findmeld('pmemavg_td_mid')
                     elt.content('{:.2f}'.format(avg))
@@ -239,39 +326,54 @@ class ViewHandler(object):
                         # set standard deviation
                         elt = stats_elt.findmeld('pmemdev_td_mid')
                         elt.content('{:.2f}'.format(dev))
-                # write CPU / Memory plots
-                try:
-                    from supvisors.plot import StatisticsPlot
-                    # build CPU image
-                    cpu_img = StatisticsPlot()
-                    cpu_img.add_plot('CPU', '%', proc_stats[0])
-                    cpu_img.export_image(process_cpu_image)
-                    # build Memory image
-                    mem_img = StatisticsPlot()
-                    mem_img.add_plot('MEM', '%', proc_stats[1])
-                    mem_img.export_image(process_mem_image)
-                except ImportError:
-                    self.logger.warn("matplotlib module not found")
+                    # set quantiles
+                    self.write_quantiles(stats_elt, 'pmem', proc_stats.mem.sketch)
+                # write CPU / Memory charts
+                params = [('address', self.get_process_address(namespec)), ('namespec', namespec)]
+                self.write_chart(stats_elt, 'process_cpu', 'process_stats', params + [('series', 'cpu')])
+                self.write_chart(stats_elt, 'process_mem', 'process_stats', params + [('series', 'mem')])
             else:
-                if ViewHandler.namespec_stats:
-                    self.logger.warn('unselect Process Statistics for {}'.format(ViewHandler.namespec_stats))
-                    ViewHandler.namespec_stats = ''
+                self.logger.warn('unselect Process Statistics for {}'.format(namespec))
+                self.selection.namespec = ''
         # remove stats part if empty
-        if not ViewHandler.namespec_stats:
+        if not self.selection.namespec:
             stats_elt.replace('')
 
+    def write_chart(self, root, name, page, params):
+        """ Keep either the image rendered by the server or the chart drawn by the browser, iaw the stats_charts option.
+        The selection of the statistics is given in the URL of the image or of the JSON data of the chart,
+        so that the image can be cached per selection.
+        The chart is also given the period of refresh. """
+        img_elt = root.findmeld('{}_img_mid'.format(name))
+        chart_elt = root.findmeld('{}_chart_mid'.format(name))
+        query = urllib.urlencode([('period', self.selection.period)] + params)
+        if self.supvisors.options.stats_charts == StatisticsCharts.CLIENT:
+            img_elt.replace('')
+            chart_elt.attrib['data-url'] = '{}.json?{}'.format(page, query)
+            chart_elt.attrib['data-refresh'] = str(self.selection.period)
+        else:
+            img_elt.attrib['src'] = '{}.png?{}'.format(name, query)
+            chart_elt.replace('')
+
+    def write_quantiles(self, stats_elt, prefix, sketch, divisor=1):
+        """ Display the quantiles of a series of statistics. """
+        if sketch.count:
+            for name, value in zip(['p50', 'p95', 'p99'], sketch.quantiles()):
+                elt = stats_elt.findmeld('{}{}_td_mid'.format(prefix, name))
+                elt.content('{:.2f}'.format(value / divisor))
+
     def handle_parameters(self):
         """ Retrieve the parameters selected on the web page
-        These parameters are static to the current class, so they are shared between all browsers connected on this server """
+        These parameters are kept in the selection of the browser session """
         form = self.context.form
         # update context period
         period_string = form.get('period')
         if period_string:
             period = int(period_string)
             if period in self.supvisors.options.stats_periods:
-                if ViewHandler.period_stats != period:
+                if self.selection.period != period:
                     self.logger.info('statistics period set to %d' % period)
-                    ViewHandler.period_stats = period
+                    self.selection.period = period
             else:
                 self.message(error_message('Incorrect period: {}'.format(period_string)))
         # update process statistics selection
@@ -279,9 +381,9 @@ class ViewHandler(object):
         if process_name:
             _, proc_stats = self.get_process_stats(process_name)
             if proc_stats:
-                if ViewHandler.namespec_stats != process_name:
+                if self.selection.namespec != process_name:
                     self.logger.info('select detailed Process statistics for %s' % process_name)
-                    ViewHandler.namespec_stats = process_name
+                    self.selection.namespec = process_name
             else:
                 self.message(error_message('Incorrect stats processname: {}'.format(process_name)))
 
@@ -317,9 +419,13 @@ class ViewHandler(object):
         else:
             elt.attrib['class'] = 'decrease'
 
-    def url_context(self):
-        """ Get the extra parameters for the URL """
-        return ''
+    def url_context(self, page=None):
+        """ Get the extra parameters for the URL, i.e. the filter of the process tables, optionally for another page """
+        return self.process_filter.url_context(page) if self.process_filter else ''
+
+    def get_process_address(self, namespec):
+        """ Get the address of the statistics related to the process named namespec """
+        return self.supvisors.address_mapper.local_address
 
     def get_process_status(self, namespec):
         """ Get the ProcessStatus instance related to the process named namespec """
@@ -328,6 +434,27 @@ class ViewHandler(object):
         except KeyError:
             self.logger.debug('failed to get ProcessStatus from {}'.format(namespec))
 
+    def get_process_usage(self, namespec):
+        """ Get the last CPU and MEM values of the process named namespec, as displayed, or None if not available.
+        The statistics are only peeked, so that sorting the processes by usage does not protect all their series
+        from the memory budget. """
+        cpuvalue, memvalue = None, None
+        nbcores, proc_stats = self.get_process_stats(namespec, peek=True)
+        if proc_stats:
+            if len(proc_stats.cpu) > 0:
+                cpuvalue = proc_stats.cpu[-1]
+                if not self.supvisors.options.stats_irix_mode:
+                    cpuvalue /= nbcores
+            if len(proc_stats.mem) > 0:
+                memvalue = proc_stats.mem[-1]
+        return cpuvalue, memvalue
+
+    def get_stats_version(self, namespec):
+        """ Get the versions of the statistics displayed for the process named namespec, if any """
+        nbcores, proc_stats = self.get_process_stats(namespec)
+        if proc_stats:
+            return nbcores, proc_stats.cpu.version, proc_stats.mem.version
+
     def server_port(self):
         """ Get the port number of the web server """
         return self.context.form.get('SERVER_PORT')
@@ -339,23 +466,15 @@ class ViewHandler(object):
 
     def sort_processes_by_config(self, processes):
         """ This method sorts a process list using the internal configuration of supervisor.
-        The aim is to present processes sorted the same way as they are in group configuration file. """
-        sorted_processes = []
-        if processes:
-            # get the list of applications, sorted alphabetically
-            application_list = sorted({process['application_name'] for process in processes})
-            for application_name in application_list:
-                # get supervisor configuration for application
-                group_config = self.supvisors.info_source.get_group_config(application_name)
-                # get process name ordering in this configuration
-                ordering = [proc.name for proc in group_config.process_configs]
-                # add processes known to supervisor, using the same ordering
-                sorted_processes.extend(sorted([proc for proc in processes
-                    if proc['application_name'] == application_name and proc['process_name'] in ordering],
-                    key=lambda x: ordering.index(x['process_name'])))
-                # add processes unknown to supervisor, using the alphabetical ordering
-                sorted_processes.extend(sorted([proc for proc in processes
-                    if proc['application_name'] == application_name and proc['process_name'] not in ordering],
-                    key=lambda x: x['process_name']))
-        return sorted_processes
+        The aim is to present processes sorted the same way as they are in group configuration file.
+        Processes unknown to supervisor are added after the known ones, using the alphabetical ordering. """
+        # get the process ordering of the applications, built once per group configuration
+        orderings = {application_name: self.supvisors.info_source.get_process_ordering(application_name)
+            for application_name in {process['application_name'] for process in processes}}
+        def sort_key(process):
+            rank = orderings[process['application_name']].get(process['process_name'])
+            if rank is None:
+                return process['application_name'], 1, 0, process['process_name']
+            return process['application_name'], 0, rank, ''
+        return sorted(processes, key=sort_key)
 
@@ -19,22 +19,21 @@
 
 from supervisor.web import StatusView
 
-from supvisors.utils import get_stats, simple_localtime, supvisors_short_cuts
+from supvisors.utils import simple_localtime, supvisors_short_cuts
 from supvisors.viewhandler import ViewHandler
-from supvisors.viewimage import address_cpu_image, address_mem_image, address_io_image
 from supvisors.webutils import *
 
 
+# units of the host pressure metrics that are not percentages
+PRESSURE_UNITS = {'load1': '', 'load5': '', 'load15': '', 'available': 'MB'}
+
+
 class HostAddressView(StatusView, ViewHandler):
     """ View renderer of the Host section of the Supvisors Address page. """
 
     # Name of the HTML page
     page_name = 'hostaddress.html'
 
-    # static attributes for statistics selection
-    cpu_id_stats = 0
-    interface_stats = ''
-
     def __init__(self, context):
         """ Initialization of the attributes. """
         StatusView.__init__(self, context)
@@ -49,7 +48,7 @@ class HostAddressView(StatusView, ViewHandler):
 
     def handle_parameters(self):
         """ Retrieve the parameters selected on the web page
-        These parameters are static to the current class, so they are shared between all browsers connected on this server. """
+        These parameters are kept in the selection of the browser session. """
         # call parent
         ViewHandler.handle_parameters(self)
         # get owned parameters
@@ -64,9 +63,9 @@ class HostAddressView(StatusView, ViewHandler):
             else:
                 address_stats = self.get_address_stats()
                 if cpuid < len(address_stats.cpu):
-                    if HostAddressView.cpu_id_stats != cpuid:
+                    if self.selection.cpu_id != cpuid:
                         self.logger.info('select cpu#{} statistics for address'.format(self.cpu_id_to_string(cpuid)))
-                        HostAddressView.cpu_id_stats = cpuid
+                        self.selection.cpu_id = cpuid
                 else:
                     self.message(error_message('Incorrect stats cpu id: {}'.format(cpuid)))
         # update Network statistics selection
@@ -75,9 +74,9 @@ class HostAddressView(StatusView, ViewHandler):
             # check if interface requested exists
             address_stats = self.get_address_stats()
             if interface in address_stats.io.keys():
-                if HostAddressView.interface_stats != interface:
+                if self.selection.interface != interface:
                     self.logger.info('select Interface graph for {}'.format(interface))
-                    HostAddressView.interface_stats = interface
+                    self.selection.interface = interface
             else:
                 self.message(error_message('Incorrect stats interface: {}'.format(interface)))
 
@@ -95,9 +94,11 @@ class HostAddressView(StatusView, ViewHandler):
         # set address state
         status = self.supvisors.context.addresses[self.address]
         elt = root.findmeld('state_mid')
+        elt.attrib['data-address'] = self.address
         elt.content(status.state_string())
         # set loading
         elt = root.findmeld('percent_mid')
+        elt.attrib['data-address'] = self.address
         elt.content('{}%'.format(status.loading()))
         # set last tick date: remote_time and local_time should be identical since self is running on the 'remote' address
         elt = root.findmeld('date_mid')
@@ -107,7 +108,7 @@ class HostAddressView(StatusView, ViewHandler):
 
     def get_address_stats(self):
         """ Get the statistics structure related to the local address and the period selected. """
-        return self.supvisors.statistician.data[self.address][ViewHandler.period_stats]
+        return self.supvisors.statistician.data[self.address][self.selection.period]
 
     def write_contents(self, root):
         """ Rendering of tables and figures for address statistics. """
@@ -116,34 +117,22 @@ class HostAddressView(StatusView, ViewHandler):
         self.write_memory_statistics(root, stats_instance.mem)
         self.write_processor_statistics(root, stats_instance.cpu)
         self.write_network_statistics(root, stats_instance.io)
-        # write CPU / Memory / Network plots
-        try:
-            from supvisors.plot import StatisticsPlot
-            # build CPU image
-            cpu_img = StatisticsPlot()
-            cpu_img.add_plot('CPU #{}'.format(self.cpu_id_to_string(HostAddressView.cpu_id_stats)), '%',
-                stats_instance.cpu[HostAddressView.cpu_id_stats])
-            cpu_img.export_image(address_cpu_image)
-            # build Memory image
-            mem_img = StatisticsPlot()
-            mem_img.add_plot('MEM', '%', stats_instance.mem)
-            mem_img.export_image(address_mem_image)
-            # build Network image
-            if HostAddressView.interface_stats:
-                io_img = StatisticsPlot()
-                io_img.add_plot('{} recv'.format(HostAddressView.interface_stats), 'kbits/s',
-                    stats_instance.io[HostAddressView.interface_stats][0])
-                io_img.add_plot('{} sent'.format(HostAddressView.interface_stats), 'kbits/s',
-                    stats_instance.io[HostAddressView.interface_stats][1])
-                io_img.export_image(address_io_image)
-        except ImportError:
-            self.logger.warn("matplotlib module not found")
+        self.write_pressure_statistics(root, stats_instance.pressure)
+        # write CPU / Memory / Network charts
+        params = [('address', self.address)]
+        self.write_chart(root, 'address_cpu', 'address_stats', params + [('series', 'cpu'), ('idx', self.selection.cpu_id)])
+        self.write_chart(root, 'address_mem', 'address_stats', params + [('series', 'mem')])
+        if self.selection.interface:
+            self.write_chart(root, 'address_io', 'address_stats',
+                params + [('series', 'io'), ('intf', self.selection.interface)])
+        else:
+            root.findmeld('address_io_fig_mid').replace('')
 
     def write_memory_statistics(self, root, mem_stats):
         """ Rendering of the memory statistics. """
         if len(mem_stats) > 0:
             # get additional statistics
-            avg, rate, (a, b), dev = get_stats(mem_stats)
+            avg, rate, (a, b), dev = mem_stats.get_stats()
             # set last value
             elt = root.findmeld('memval_td_mid')
             if rate is not None:
@@ -169,14 +158,14 @@ class HostAddressView(StatusView, ViewHandler):
             selected_tr = False
             # set CPU id
             elt = tr_element.findmeld('cpunum_a_mid')
-            if HostAddressView.cpu_id_stats == idx:
+            if self.selection.cpu_id == idx:
                 selected_tr = True
                 elt.attrib['class'] = 'button off active'
             else:
                 elt.attributes(href='{}?idx={}'.format(HostAddressView.page_name, idx))
             elt.content('cpu#{}'.format(idx-1 if idx > 0 else 'all'))
             if len(single_cpu_stats) > 0:
-                avg, rate, (a, b), dev = get_stats(single_cpu_stats)
+                avg, rate, (a, b), dev = single_cpu_stats.get_stats()
                 # set last value with instant slope
                 elt = tr_element.findmeld('cpuval_td_mid')
                 if rate is not None:
@@ -201,11 +190,9 @@ class HostAddressView(StatusView, ViewHandler):
 
     def write_network_statistics(self, root, io_stats):
         """ Rendering of the network statistics. """
-        if not HostAddressView.interface_stats:
+        if not self.selection.interface:
             # choose first interface name by default
-            address_stats = self.get_address_stats()
-            io_stats = address_stats.io
-            HostAddressView.interface_stats = next(iter(io_stats.keys()))
+            self.selection.interface = next(iter(io_stats.keys()), '')
         # display io statistics
         flatten_io_stats = [(intf, lst) for intf, lsts in io_stats.items() for lst in lsts]
         iterator = root.findmeld('intf_tr_mid').repeat(flatten_io_stats)
@@ -218,26 +205,28 @@ class HostAddressView(StatusView, ViewHandler):
                 elt.attrib['rowspan'] = "2"
                 # set interface name
                 elt = elt.findmeld('intf_a_mid')
-                if HostAddressView.interface_stats == intf:
+                if self.selection.interface == intf:
                     selected_tr = True
                     elt.attrib['class'] = 'button off active'
                 else:
                     elt.attributes(href='{}?intf={}'.format(HostAddressView.page_name, intf))
                 elt.content(intf)
             else:
-                if HostAddressView.interface_stats == intf:
+                if self.selection.interface == intf:
                     selected_tr = True
                 elt.replace('')
             # set interface direction
             elt = tr_element.findmeld('intfrxtx_td_mid')
             elt.content('Rx' if rowspan else 'Tx')
-            if len(single_io_stats) > 0:
-                avg, rate, (a, b), dev = get_stats(single_io_stats)
+            # the series may hold gaps
+            if single_io_stats.nb_values > 0:
+                avg, rate, (a, b), dev = single_io_stats.get_stats()
                 # set last value
                 elt = tr_element.findmeld('intfval_td_mid')
                 if rate is not None:
                     self.set_slope_class(elt, rate)
-                elt.content('{:.2f}'.format(single_io_stats[-1]))
+                if single_io_stats[-1] is not None:
+                    elt.content('{:.2f}'.format(single_io_stats[-1]))
                 # set mean value
                 elt = tr_element.findmeld('intfavg_td_mid')
                 elt.content('{:.2f}'.format(avg))
@@ -257,6 +246,38 @@ class HostAddressView(StatusView, ViewHandler):
                 shaded_tr = not shaded_tr
             rowspan = not rowspan
 
+    def write_pressure_statistics(self, root, pressure_stats):
+        """ Rendering of the host pressure statistics. """
+        iterator = root.findmeld('pressure_tr_mid').repeat(sorted(pressure_stats.items()))
+        shaded_tr = False
+        for tr_element, (name, single_pressure_stats) in iterator:
+            # set metric name
+            elt = tr_element.findmeld('pressurename_td_mid')
+            elt.content('{} {}'.format(name, PRESSURE_UNITS.get(name, '%')))
+            # the series may hold gaps
+            if single_pressure_stats.nb_values > 0:
+                avg, rate, (a, b), dev = single_pressure_stats.get_stats()
+                # set last value with instant slope
+                elt = tr_element.findmeld('pressureval_td_mid')
+                if rate is not None:
+                    self.set_slope_class(elt, rate)
+                if single_pressure_stats[-1] is not None:
+                    elt.content('{:.2f}'.format(single_pressure_stats[-1]))
+                # set mean value
+                elt = tr_element.findmeld('pressureavg_td_mid')
+                elt.content('{:.2f}'.format(avg))
+                if a is not None:
+                    # set slope of linear regression
+                    elt = tr_element.findmeld('pressureslope_td_mid')
+                    elt.content('{:.2f}'.format(a))
+                if dev is not None:
+                    # set standard deviation
+                    elt = tr_element.findmeld('pressuredev_td_mid')
+                    elt.content('{:.2f}'.format(dev))
+            if shaded_tr:
+                tr_element.attrib['class'] = 'shaded'
+            shaded_tr = not shaded_tr
+
     def make_callback(self, namespec, action):
         """ Triggers the action requested. """
         if action == 'restartsup':
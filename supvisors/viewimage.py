@@ -17,85 +17,166 @@
 # limitations under the License.
 # ======================================================================
 
+from collections import OrderedDict
 from io import BytesIO
+from time import time
 
+from supervisor.http import NOT_DONE_YET
 from supervisor.web import MeldView
 
+from supvisors.viewchart import AddressPlotSelection, ProcessPlotSelection, SELECTION_ERRORS
+
 
 # exchange class for images
 class StatsImage(object):
-    """ Buffer class holding PNG contents. """
+    """ Buffer class holding PNG or SVG contents, along with the key of the statistics rendered.
+    When the image is rendered by a plot worker, the buffer holds the pending result until the image is requested. """
 
     def __init__(self):
         self.contents = None
+        self.content_type = None
+        self.key = None
+        self.pending = None
+        self.submitted = 0
 
-    def new_image(self):
+    def new_image(self, key=None, content_type='image/png'):
         if self.contents:
             self.contents.close()
         self.contents = BytesIO()
+        self.content_type = content_type
+        self.key = key
+        self.pending = None
         return self.contents
 
-# instance for image buffers
-address_cpu_image = StatsImage()
-address_mem_image = StatsImage()
-address_io_image = StatsImage()
+    def set_pending(self, key, result):
+        """ Store the result of a rendering in progress. """
+        self.key = key
+        self.pending = result
+        self.submitted = time()
+
+    def resolve(self, timeout):
+        """ Take the image from the pending result if the rendering is completed.
+        Return False if the rendering is still in progress.
+        The exception raised by a failed rendering is raised again. """
+        result = self.pending
+        if not result.ready() and time() - self.submitted < timeout:
+            return False
+        self.pending = None
+        # on failure, the previous contents do not correspond to the key anymore
+        if not result.ready():
+            self.key = None
+            raise RuntimeError('plot rendering timed out')
+        try:
+            contents, _ = result.get()
+        except:
+            self.key = None
+            raise
+        self.new_image(self.key).write(contents)
+        return True
+
+    def is_cached(self, key):
+        """ Return True if the contents correspond to the statistics identified by key,
+        including when they are being rendered. """
+        return key is not None and (self.contents is not None or self.pending is not None) and self.key == key
+
+# cache of images
+class ImageCache(object):
+    """ Cache of the images, per selection of statistics.
+    The least recently used images are released beyond MAX_IMAGES.
+
+    Attributes are:
+
+        - images: the StatsImage buffers per selection, ordered from the least recently used. """
+
+    # maximum number of images kept
+    MAX_IMAGES = 64
 
-process_cpu_image = StatsImage()
-process_mem_image = StatsImage()
+    def __init__(self):
+        """ Initialization of the attributes. """
+        self.images = OrderedDict()
+
+    def get_image(self, selection):
+        """ Return the image buffer related to the selection, created if unknown. """
+        image = self.images.pop(selection, None)
+        if image is None:
+            image = StatsImage()
+            while len(self.images) >= self.MAX_IMAGES:
+                self.images.popitem(last=False)
+        self.images[selection] = image
+        return image
+
+# instance for image buffers
+stats_images = ImageCache()
 
 
 # simple handlers for web images
 class ImageView(MeldView):
-    """ Dummy view holding an image. """
+    """ Dummy view holding the image of the statistics selected by the request parameters.
+    The image is rendered again only if its statistics have changed since the last request of the same selection.
+    The view is deferred while the image is being rendered by a plot worker. """
+
+    # polling period of the rendering in progress
+    delay = 0.1
+    # time in seconds after which a rendering is abandoned
+    TIMEOUT = 10
 
-    def __init__(self, context, buffer):
-        """ Storage of the reference to the buffer. """
+    def __init__(self, context):
+        """ Storage of the reference to Supvisors. """
         MeldView.__init__(self, context)
-        self.buffer = buffer
+        self.supvisors = self.context.supervisord.supvisors
+        self.buffer = None
 
     def render(self):
-        """ Export the internal memory buffer. """
+        """ Export the image buffer related to the selection. """
+        if self.buffer is None:
+            try:
+                selection = self.get_selection(self.context.form)
+                plot = self.get_plot(selection)
+            except SELECTION_ERRORS, exc:
+                self.supvisors.logger.debug('cannot export image: {!r}'.format(exc))
+                return self.clone().write_xhtmlstring()
+            self.buffer = stats_images.get_image(selection)
+            try:
+                plot.export_image(self.buffer, self.supvisors.plot_pool)
+            except ImportError:
+                self.supvisors.logger.warn("matplotlib module not found")
+        if self.buffer.pending:
+            try:
+                if not self.buffer.resolve(self.TIMEOUT):
+                    return NOT_DONE_YET
+            except Exception, exc:
+                self.supvisors.logger.error('cannot render plot: {}'.format(exc))
         if self.buffer.contents:
+            self.content_type = self.buffer.content_type
             return self.buffer.contents.getvalue()
         return self.clone().write_xhtmlstring()
 
 
-class AddressCpuImageView(ImageView):
+class AddressCpuImageView(ImageView, AddressPlotSelection):
     """ Dummy view holding the Address CPU image. """
 
-    def __init__(self, context):
-        """ Link to the Address CPU buffer. """
-        ImageView.__init__(self, context, address_cpu_image)
+    series = 'cpu'
 
 
-class AddressMemoryImageView(ImageView):
+class AddressMemoryImageView(ImageView, AddressPlotSelection):
     """ Dummy view holding the Address Memory image. """
 
-    def __init__(self, context):
-        """ Link to the Address Memory buffer. """
-        ImageView.__init__(self, context, address_mem_image)
+    series = 'mem'
 
 
-class AddressNetworkImageView(ImageView):
+class AddressNetworkImageView(ImageView, AddressPlotSelection):
     """ Dummy view holding the Address Network image. """
 
-    def __init__(self, context):
-        """ Link to the Address Network buffer. """
-        ImageView.__init__(self, context, address_io_image)
+    series = 'io'
 
 
-class ProcessCpuImageView(ImageView):
+class ProcessCpuImageView(ImageView, ProcessPlotSelection):
     """ Dummy view holding the Process CPU image. """
 
-    def __init__(self, context):
-        """ Link to the Process CPU buffer. """
-        ImageView.__init__(self, context, process_cpu_image)
+    series = 'cpu'
 
 
-class ProcessMemoryImageView(ImageView):
+class ProcessMemoryImageView(ImageView, ProcessPlotSelection):
     """ Dummy view holding the Process Memory image. """
 
-    def __init__(self, context):
-        """ Link to the Process Memory buffer. """
-        ImageView.__init__(self, context, process_mem_image)
-
+    series = 'mem'
@@ -0,0 +1,176 @@
+#!/usr/bin/python
+#-*- coding: utf-8 -*-
+
+# ======================================================================
+# Copyright 2016 Julien LE CLEACH
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+# 
+#     http://www.apache.org/licenses/LICENSE-2.0
+# 
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ======================================================================
+
+from supervisor.web import MeldView
+
+
+def escape_label(value):
+    """ Escape a label value as required by the Prometheus text exposition format. """
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def write_metric(lines, name, description, samples, metric_type='gauge'):
+    """ Append the HELP and TYPE lines of a metric and its samples, given as pairs of labels and value.
+    Nothing is written if there is no sample. """
+    if samples:
+        lines.append('# HELP {} {}'.format(name, description))
+        lines.append('# TYPE {} {}'.format(name, metric_type))
+        for labels, value in samples:
+            if labels:
+                labels = ','.join('{}="{}"'.format(key, escape_label(label)) for key, label in labels)
+                lines.append('{}{{{}}} {}'.format(name, labels, value))
+            else:
+                lines.append('{} {}'.format(name, value))
+
+
+def last_value(series):
+    """ Return the last value of a statistics series. """
+    return series[-1] if series else None
+
+
+# exchange class for metrics
+class MetricsCache(object):
+    """ Buffer class holding the metrics built from the compiled statistics.
+
+    Attributes are:
+
+        - version: the version of the statistics used to build the contents,
+        - contents: the metrics in the text exposition format. """
+
+    def __init__(self):
+        self.version = None
+        self.contents = ''
+
+# instance for metrics buffer
+statistics_metrics = MetricsCache()
+
+
+class MetricsView(MeldView):
+    """ Dummy view exporting the Supvisors metrics in the Prometheus text exposition format.
+    The metrics related to the statistics are rebuilt only when new statistics have been compiled. """
+
+    content_type = 'text/plain; version=0.0.4; charset=utf-8'
+
+    def __init__(self, context):
+        """ Storage of the reference to Supvisors. """
+        MeldView.__init__(self, context)
+        self.supvisors = self.context.supervisord.supvisors
+
+    def render(self):
+        """ Export the internal metrics and the cached statistics metrics. """
+        statistician = self.supvisors.statistician
+        if statistics_metrics.version != statistician.version:
+            statistics_metrics.contents = self.write_statistics_metrics()
+            statistics_metrics.version = statistician.version
+        return self.write_internal_metrics() + statistics_metrics.contents
+
+    def write_internal_metrics(self):
+        """ Return the metrics related to the Supvisors state. """
+        context = self.supvisors.context
+        lines = []
+        write_metric(lines, 'supvisors_state', 'Supvisors state code.',
+            [([('state', self.supvisors.fsm.state_string())], self.supvisors.fsm.state)])
+        addresses = [context.addresses[address] for address in sorted(context.addresses.keys())]
+        write_metric(lines, 'supvisors_address_state', 'Address state code.',
+            [([('address', status.address_name), ('state', status.state_string())], status.state)
+                for status in addresses])
+        write_metric(lines, 'supvisors_address_loading', 'Sum of the expected loading of the processes running on the address.',
+            [([('address', status.address_name)], status.loading()) for status in addresses])
+        applications = [context.applications[name] for name in sorted(context.applications.keys())]
+        write_metric(lines, 'supvisors_application_state', 'Application state code.',
+            [([('application', application.application_name), ('state', application.state_string())],
+                application.state) for application in applications])
+        write_metric(lines, 'supvisors_application_major_failure', '1 if the application has a major failure.',
+            [([('application', application.application_name)], int(application.major_failure))
+                for application in applications])
+        write_metric(lines, 'supvisors_application_minor_failure', '1 if the application has a minor failure.',
+            [([('application', application.application_name)], int(application.minor_failure))
+                for application in applications])
+        write_metric(lines, 'supvisors_process_state', 'Process state code.',
+            [([('namespec', process.namespec()), ('state', process.state_string())], process.state)
+                for _, process in sorted(context.processes.items())])
+        write_metric(lines, 'supvisors_conflicts', 'Number of processes running on more than one address.',
+            [([], len(context.conflicts()))])
+        statistician = self.supvisors.statistician
+        write_metric(lines, 'supvisors_statistics_memory_bytes', 'Estimate of the memory used by the statistics.',
+            [([], statistician.get_memory_usage())])
+        if statistician.budget:
+            write_metric(lines, 'supvisors_statistics_memory_budget_bytes', 'Memory budget of the statistics.',
+                [([], statistician.budget)])
+        plot_pool = self.supvisors.plot_pool
+        write_metric(lines, 'supvisors_plot_renderings_total', 'Number of statistics plots rendered.',
+            [([], plot_pool.renderings)], 'counter')
+        write_metric(lines, 'supvisors_plot_render_seconds_total', 'Time spent to render the statistics plots.',
+            [([], plot_pool.render_time)], 'counter')
+        write_metric(lines, 'supvisors_plot_render_seconds', 'Time spent to render the last statistics plot.',
+            [([], plot_pool.last_render_time)])
+        write_metric(lines, 'supvisors_plot_pending', 'Number of statistics plots being rendered.',
+            [([], plot_pool.pending())])
+        return '\n'.join(lines) + '\n'
+
+    def write_statistics_metrics(self):
+        """ Return the metrics related to the last statistics compiled for the finest period. """
+        statistician = self.supvisors.statistician
+        period = min(self.supvisors.options.stats_periods)
+        host_cpu, host_mem, host_io, host_pressure = [], [], [], []
+        proc_info, proc_cpu, proc_mem = [], [], []
+        for address in sorted(statistician.data.keys()):
+            instance = statistician.data[address][period]
+            if not instance.dates:
+                continue
+            for idx, series in enumerate(instance.cpu):
+                host_cpu.append(([('address', address), ('cpu', idx - 1 if idx else 'all')], last_value(series)))
+            host_mem.append(([('address', address)], last_value(instance.mem)))
+            for intf, (recv, sent) in sorted(instance.io.items()):
+                for direction, series in [('recv', recv), ('sent', sent)]:
+                    host_io.append(([('address', address), ('interface', intf), ('direction', direction)],
+                        last_value(series)))
+            for name, series in sorted(instance.pressure.items()):
+                host_pressure.append(([('address', address), ('name', name)], last_value(series)))
+            for namespec, proc_stats in sorted(instance.proc.items()):
+                # the pid is kept out of the value metrics so that a process restart does not create new series
+                labels = [('address', address), ('namespec', namespec)]
+                proc_info.append((labels + [('pid', proc_stats.pid)], 1))
+                proc_cpu.append((labels, last_value(proc_stats.cpu)))
+                proc_mem.append((labels, last_value(proc_stats.mem)))
+        # series may be empty for a short time, e.g. when a process has just been restarted
+        filter_empty = lambda samples: [sample for sample in samples if sample[1] is not None]
+        lines = []
+        write_metric(lines, 'supvisors_host_cpu_percent', 'Host CPU occupation per processor core.',
+            filter_empty(host_cpu))
+        write_metric(lines, 'supvisors_host_memory_percent', 'Host memory occupation.', filter_empty(host_mem))
+        write_metric(lines, 'supvisors_host_network_kbps', 'Host network flow per interface.', filter_empty(host_io))
+        write_metric(lines, 'supvisors_host_pressure', 'Host pressure indicators.', filter_empty(host_pressure))
+        write_metric(lines, 'supvisors_process_info', 'Process identifier of the statistics.', proc_info)
+        write_metric(lines, 'supvisors_process_cpu_percent', 'Process CPU occupation (IRIX mode).',
+            filter_empty(proc_cpu))
+        write_metric(lines, 'supvisors_process_memory_percent', 'Process memory occupation.', filter_empty(proc_mem))
+        cluster = statistician.clusters[period]
+        if cluster.contributions:
+            cluster_stats = cluster.get_cluster_stats()
+            write_metric(lines, 'supvisors_cluster_cpu_percent', 'CPU occupation of the whole cluster.',
+                [([], cluster_stats['cpu'])])
+            write_metric(lines, 'supvisors_cluster_memory_percent', 'Mean memory occupation of the cluster addresses.',
+                [([], cluster_stats['mem'])])
+            applications = sorted(cluster.applications.keys())
+            write_metric(lines, 'supvisors_application_cpu_percent', 'Sum of the CPU occupation of the application processes (IRIX mode).',
+                [([('application', name)], cluster.get_application_stats(name)['cpu']) for name in applications])
+            write_metric(lines, 'supvisors_application_memory_percent', 'Sum of the memory occupation of the application processes.',
+                [([('application', name)], cluster.get_application_stats(name)['mem']) for name in applications])
+        return '\n'.join(lines) + '\n' if lines else ''
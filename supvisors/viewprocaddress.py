@@ -25,6 +25,7 @@ from supervisor.xmlrpc import RPCError
 
 from supvisors.utils import simple_localtime, supvisors_short_cuts
 from supvisors.viewhandler import ViewHandler
+from supvisors.webcache import html_fragments
 from supvisors.webutils import *
 
 
@@ -33,6 +34,8 @@ class ProcAddressView(StatusView, ViewHandler):
 
     # Name of the HTML page
     page_name = 'procaddress.html'
+    # name of the description variables of the process table
+    DESC_VARIABLE = '@@desc_{}@@'
 
     def __init__(self, context):
         """ Initialization of the attributes. """
@@ -60,9 +63,11 @@ class ProcAddressView(StatusView, ViewHandler):
         # set address state
         status = self.supvisors.context.addresses[self.address]
         elt = root.findmeld('state_mid')
+        elt.attrib['data-address'] = self.address
         elt.content(status.state_string())
         # set loading
         elt = root.findmeld('percent_mid')
+        elt.attrib['data-address'] = self.address
         elt.content('{}%'.format(status.loading()))
         # set last tick date: remote_time and local_time should be identical since self is running on the 'remote' address
         elt = root.findmeld('date_mid')
@@ -71,23 +76,41 @@ class ProcAddressView(StatusView, ViewHandler):
         self.write_periods(root)
 
     def write_contents(self, root):
-        """ Rendering of the contents part of the page """
-        self.write_process_table(root)
+        """ Rendering of the contents part of the page.
+        Only the processes of the page selected by the filter are written.
+        The process table is written again only if the process states or the statistics have changed.
+        The description provided by Supervisor includes the uptime, so it is substituted in the cached table. """
+        # the processes displayed are the ones of the local address
+        root.findmeld('body_mid').attrib['data-process-address'] = self.address
+        data = self.select_processes(self.get_process_data())
+        self.write_process_filter(root)
+        key = (self.page_name, self.server_port(), self.selection.period, self.selection.namespec,
+            self.process_filter.key(), tuple((item['namespec'], item['statecode'], self.get_expected_loading(item['namespec']),
+                self.get_stats_version(item['namespec'])) for item in data))
+        descriptions = {self.DESC_VARIABLE.format(idx): item['desc'] for idx, item in enumerate(data)}
+        html_fragments.write_fragment(root.findmeld('table_mid'), key,
+            lambda elt: self.write_process_table(elt, data), descriptions)
         self.write_process_statistics(root)
 
     def get_address_stats(self):
         """ Get the statistics structure related to the local address and the period selected """
         return (self.supvisors.statistician.nbcores[self.address],
-            self.supvisors.statistician.data[self.address][ViewHandler.period_stats])
+            self.supvisors.statistician.data[self.address][self.selection.period])
 
-    def get_process_stats(self, namespec):
-        """ Get the statistics structure related to the local address and the period selected """
+    def get_process_stats(self, namespec, peek=False):
+        """ Get the statistics structure related to the local address and the period selected.
+        When peek is set, the statistics are not considered as requested by the memory budget. """
         nbcores, address_stats = self.get_address_stats()
-        return nbcores, address_stats.find_process_stats(namespec)
+        return nbcores, address_stats.peek_process_stats(namespec) if peek else address_stats.find_process_stats(namespec)
 
-    def write_process_table(self, root):
-        """ Rendering of the processes managed through Supervisor """
-        # collect data on processes
+    def get_expected_loading(self, namespec):
+        """ Get the loading declared for the process named namespec, if known """
+        status = self.get_process_status(namespec)
+        if status:
+            return status.rules.expected_loading
+
+    def get_process_data(self):
+        """ Collect the information of the processes managed through Supervisor """
         data = []
         try:
             for info in self.info_source.supervisor_rpc_interface.getAllProcessInfo():
@@ -97,14 +120,16 @@ class ProcAddressView(StatusView, ViewHandler):
                         'desc': info['description']})
         except RPCError, e:
             self.logger.warn('failed to get all process info from {}: {}'.format(self.address, e.text))
+        return data
+
+    def write_process_table(self, root, data):
+        """ Rendering of the processes managed through Supervisor """
         # print processes
         if data:
-            # re-arrange data
-            data = self.sort_processes_by_config(data)
-            # loop on all processes
+            # loop on the processes of the page
             iterator = root.findmeld('tr_mid').repeat(data)
             shaded_tr = False # used to invert background style
-            for tr_elt, item in iterator:
+            for idx, (tr_elt, item) in enumerate(iterator):
                 selected_tr = self.write_common_process_status(tr_elt, item)
                 # print process name (tail allowed if STOPPED)
                 namespec = item['namespec']
@@ -112,9 +137,9 @@ class ProcAddressView(StatusView, ViewHandler):
                 elt = tr_elt.findmeld('name_a_mid')
                 elt.attributes(href='http://{}:{}/tail.html?processname={}'.format(self.address, self.server_port(), urllib.quote(namespec)))
                 elt.content(process_name)
-                # print description
+                # print description, substituted by the fragment cache
                 elt = tr_elt.findmeld('desc_td_mid')
-                elt.content(item['desc'])
+                elt.content(self.DESC_VARIABLE.format(idx))
                 # manage process log actions
                 namespec = item['namespec']
                 elt = tr_elt.findmeld('clear_a_mid')
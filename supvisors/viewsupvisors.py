@@ -27,6 +27,7 @@ from supvisors.strategy import conciliate
 from supvisors.ttypes import AddressStates, ConciliationStrategies, SupvisorsStates
 from supvisors.utils import simple_gmtime
 from supvisors.viewhandler import ViewHandler
+from supvisors.webcache import html_fragments
 from supvisors.webutils import *
 
 
@@ -62,6 +63,16 @@ class SupvisorsView(MeldView, ViewHandler):
         """ Rendering of the header part of the Supvisors main page. """
         # set Supvisors state
         root.findmeld('state_mid').content(self.supvisors.fsm.state_string())
+        # set resources consumed on all addresses
+        self.write_cluster_statistics(root)
+
+    def write_cluster_statistics(self, root):
+        """ Rendering of the resources consumed on all addresses. """
+        period, cluster = self.get_cluster_stats()
+        stats = cluster.get_cluster_stats()
+        root.findmeld('cluster_period_mid').content('{}s'.format(period))
+        root.findmeld('clustercpu_td_mid').content('{:.2f}%'.format(stats['cpu']))
+        root.findmeld('clustermem_td_mid').content('{:.2f}%'.format(stats['mem']))
 
     def write_contents(self, root):
         """ Rendering of the contents of the Supvisors main page.
@@ -75,19 +86,25 @@ class SupvisorsView(MeldView, ViewHandler):
         else:
             # remove conflicts table
             root.findmeld('conflicts_div_mid').replace('')
-            # write address boxes
-            self.write_address_boxes(root)
+            # write address boxes, unless the addresses and their processes are unchanged
+            context = self.supvisors.context
+            key = (self.server_port(), tuple((address, context.addresses[address].version,
+                tuple(process.version for process in context.addresses[address].processes.values()))
+                for address in self.supvisors.address_mapper.addresses))
+            html_fragments.write_fragment(root.findmeld('boxes_div_mid'), key, self.write_address_boxes)
 
     def write_address_boxes(self, root):
         """ Rendering of the addresses boxes """
         address_iterator = root.findmeld('address_div_mid').repeat(self.supvisors.address_mapper.addresses)
         for div_elt, address in address_iterator:
             status = self.supvisors.context.addresses[address]
+            div_elt.attrib['data-address'] = address
             # set address
             elt = div_elt.findmeld('address_tda_mid')
+            # go to web page located on address, so as to reuse Supervisor StatusView
+            elt.attrib['data-href'] = 'http://{}:{}/address.html'.format(urllib.quote(address), self.server_port())
             if status.state == AddressStates.RUNNING:
-                # go to web page located on address, so as to reuse Supervisor StatusView
-                elt.attributes(href='http://{}:{}/address.html'.format(urllib.quote(address), self.server_port()))
+                elt.attributes(href=elt.attrib['data-href'])
                 elt.attrib['class'] = 'on'
             elt.content(address)
             # set state
@@ -101,6 +118,7 @@ class SupvisorsView(MeldView, ViewHandler):
             data = status.running_processes()
             processIterator = div_elt.findmeld('process_li_mid').repeat(data)
             for li_elt, process in processIterator:
+                li_elt.attrib['data-namespec'] = process.namespec()
                 li_elt.content(process.namespec())
 
     def write_conciliation_strategies(self, root):
@@ -0,0 +1,69 @@
+#!/usr/bin/python
+#-*- coding: utf-8 -*-
+
+# ======================================================================
+# Copyright 2016 Julien LE CLEACH
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ======================================================================
+
+from cgi import escape
+from collections import OrderedDict
+
+
+class FragmentCache(object):
+    """ Cache of the HTML fragments of the Supvisors pages.
+    A fragment is identified by the meld id of its element and by a key built from the versions of the context
+    entities it displays, so that it is written again only when one of these entities has changed.
+    The least recently used fragments are released beyond MAX_FRAGMENTS.
+
+    Attributes are:
+
+        - fragments: the XHTML fragments per meld id and key, ordered from the least recently used. """
+
+    # maximum number of fragments kept
+    MAX_FRAGMENTS = 256
+
+    def __init__(self):
+        """ Initialization of the attributes. """
+        self.fragments = OrderedDict()
+
+    def write_fragment(self, elt, key, writer, variables=None):
+        """ Write the element with the writer, called with the element as parameter, unless the fragment is cached.
+        The writer may replace the element, so the node found at its place is the one cached.
+        The variables are the texts of the fragment that change too often to be part of the key (e.g. uptimes).
+        The writer writes their names in place of their values, and the values are substituted at each call. """
+        cache_key = elt.meldid(), key
+        fragment = self.fragments.pop(cache_key, None)
+        if fragment is None:
+            parent = elt.parent
+            index = parent.getchildren().index(elt)
+            writer(elt)
+            fragment = parent[index].write_xhtmlstring(fragment=True)
+            while len(self.fragments) >= self.MAX_FRAGMENTS:
+                self.fragments.popitem(last=False)
+            if variables:
+                parent[index].replace(self.substitute(fragment, variables), structure=True)
+        else:
+            elt.replace(self.substitute(fragment, variables), structure=True)
+        self.fragments[cache_key] = fragment
+
+    @staticmethod
+    def substitute(fragment, variables):
+        """ Return the fragment where the variable names are replaced with their escaped values. """
+        for name, value in (variables or {}).items():
+            fragment = fragment.replace(name, escape(value, quote=True))
+        return fragment
+
+# instance for the HTML fragments
+html_fragments = FragmentCache()
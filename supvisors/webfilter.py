@@ -0,0 +1,97 @@
+#!/usr/bin/python
+#-*- coding: utf-8 -*-
+
+# ======================================================================
+# Copyright 2016 Julien LE CLEACH
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ======================================================================
+
+import urllib
+
+from fnmatch import fnmatchcase
+
+from supervisor.states import ProcessStates, getProcessStateDescription
+
+
+class ProcessFilter(object):
+    """ Filter, sort and pagination of the process tables, given in the parameters of the page request.
+    Incorrect parameters are ignored.
+
+    Attributes are:
+
+        - name: the glob pattern applied to the process names and namespecs,
+        - state: the name of the state of the processes selected,
+        - address: the address where the processes selected are running,
+        - sort: the sort of the processes, among SORT_KEYS,
+        - page: the number of the page displayed, starting from 1,
+        - pages: the number of pages, set when the processes are paginated,
+        - count: the number of processes selected, set when the processes are paginated. """
+
+    # number of process rows displayed per page
+    ROWS_PER_PAGE = 50
+    # sorts of the process tables: configuration ordering or decreasing CPU / MEM
+    SORT_KEYS = ('config', 'cpu', 'mem')
+    # names of the process states, ordered by state code
+    STATES = [getProcessStateDescription(state) for state in sorted(
+        getattr(ProcessStates, name) for name in dir(ProcessStates) if name.isupper())]
+
+    def __init__(self, form):
+        """ Initialization of the attributes from the parameters of the page request. """
+        self.name = form.get('name', '').strip()
+        self.state = form.get('state', '')
+        if self.state not in self.STATES:
+            self.state = ''
+        self.address = form.get('address', '')
+        self.sort = form.get('sort', '')
+        if self.sort not in self.SORT_KEYS:
+            self.sort = self.SORT_KEYS[0]
+        try:
+            self.page = max(1, int(form.get('page', 1)))
+        except ValueError:
+            self.page = 1
+        self.pages = self.count = 0
+
+    def match(self, item):
+        """ Return True if the process data item is selected by the filter. """
+        if self.state and item['statename'] != self.state:
+            return False
+        if self.address and self.address not in item.get('running_list', ()):
+            return False
+        if self.name and not (fnmatchcase(item['process_name'], self.name)
+                or fnmatchcase(item['namespec'], self.name)):
+            return False
+        return True
+
+    def paginate(self, data):
+        """ Return the process data items of the page displayed.
+        The page is set to the last one when it is out of range. """
+        self.count = len(data)
+        self.pages = max(1, (self.count + self.ROWS_PER_PAGE - 1) // self.ROWS_PER_PAGE)
+        self.page = min(self.page, self.pages)
+        start = (self.page - 1) * self.ROWS_PER_PAGE
+        return data[start:start + self.ROWS_PER_PAGE]
+
+    def key(self):
+        """ Return the parameters of the filter, used to identify the process table written. """
+        return self.name, self.state, self.address, self.sort, self.page
+
+    def url_context(self, page=None):
+        """ Get the parameters of the filter for the URL, optionally for another page.
+        Default values are not given. """
+        params = [('name', self.name), ('state', self.state), ('address', self.address),
+            ('sort', '' if self.sort == self.SORT_KEYS[0] else self.sort)]
+        page = self.page if page is None else page
+        if page > 1:
+            params.append(('page', page))
+        return ''.join('{}={}&amp;'.format(param, urllib.quote(str(value))) for param, value in params if value)
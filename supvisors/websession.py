@@ -0,0 +1,87 @@
+#!/usr/bin/python
+#-*- coding: utf-8 -*-
+
+# ======================================================================
+# Copyright 2016 Julien LE CLEACH
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ======================================================================
+
+import os
+
+from binascii import hexlify
+from collections import OrderedDict
+from Cookie import CookieError, SimpleCookie
+
+
+class Selection(object):
+    """ Statistics selection of a browser session.
+
+    Attributes are:
+
+        - period: the period of the statistics displayed,
+        - namespec: the process whose detailed statistics are displayed, if any,
+        - cpu_id: the index of the processor whose statistics are plotted (0 for all processors),
+        - interface: the network interface whose statistics are plotted. """
+
+    def __init__(self, period):
+        """ Initialization of the attributes. """
+        self.period = period
+        self.namespec = ''
+        self.cpu_id = 0
+        self.interface = ''
+
+
+class SessionManager(object):
+    """ Holder of the statistics selections of the browser sessions, identified by a cookie.
+    The least recently used selections are released beyond MAX_SESSIONS.
+
+    Attributes are:
+
+        - selections: the selections of the browser sessions, ordered from the least recently used. """
+
+    # name of the cookie holding the session identifier
+    COOKIE_NAME = 'supvisors_session'
+    # maximum number of browser sessions kept
+    MAX_SESSIONS = 64
+
+    def __init__(self):
+        """ Initialization of the attributes. """
+        self.selections = OrderedDict()
+
+    def get_selection(self, context, period):
+        """ Return the selection of the browser session of the request.
+        A new session is created, with the period given, if the request does not hold a known session. """
+        session_id = self.get_session_id(context.request)
+        selection = self.selections.pop(session_id, None)
+        if selection is None:
+            session_id = hexlify(os.urandom(8))
+            selection = Selection(period)
+            context.response['headers']['Set-Cookie'] = '{}={}; Path=/; HttpOnly'.format(self.COOKIE_NAME, session_id)
+            while len(self.selections) >= self.MAX_SESSIONS:
+                self.selections.popitem(last=False)
+        self.selections[session_id] = selection
+        return selection
+
+    def get_session_id(self, request):
+        """ Return the session identifier held in the cookies of the request. """
+        cookie = SimpleCookie()
+        try:
+            cookie.load(request.get_header('cookie') or '')
+        except CookieError:
+            return None
+        morsel = cookie.get(self.COOKIE_NAME)
+        return morsel.value if morsel else None
+
+# instance for browser sessions
+browser_sessions = SessionManager()